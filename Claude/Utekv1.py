@@ -10,11 +10,16 @@ Build: Production Ready for IBM Audit
 
 import hashlib
 import json
+import math
+import queue
+import signal
+import stat
 import threading
 import time
 import uuid
 import yaml
 import os
+import platform
 import sys
 import subprocess
 import tempfile
@@ -25,7 +30,8 @@ import gzip
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Union
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple, Union
 from dataclasses import dataclass, asdict
 from contextlib import contextmanager
 import cryptography.hazmat.primitives.hashes as crypto_hashes
@@ -217,14 +223,508 @@ class SecurityManager:
             return False
 
 
+# Pool worker Python hangat untuk EXECUTE .py. Bootstrap worker (fork per eksekusi, RLIMIT) dan protokol frame
+# hanya ada satu salinan di gemini/asu_python_worker.py, dipakai bersama dengan AsuGemini1
+def _load_python_worker_module():
+    import importlib.util
+    path = os.environ.get("UTEK_PYTHON_WORKER_MODULE") or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), os.pardir, "gemini", "asu_python_worker.py")
+    spec = importlib.util.spec_from_file_location("asu_python_worker", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+asu_python_worker = _load_python_worker_module()
+PYTHON_WORKER_POOL_SIZE = min(4, os.cpu_count() or 1)
+
+
+def _sandbox_limits() -> Dict[str, Optional[int]]:
+    """RLIMIT_CPU/RLIMIT_AS untuk proses EXECUTE (hanya jika SANDBOX_ENABLED)"""
+    if not SANDBOX_ENABLED:
+        return {"cpu_seconds": None, "memory_bytes": None}
+    return {
+        "cpu_seconds": max(1, math.ceil(DEFAULT_TIMEOUTS["EXECUTE"])),
+        "memory_bytes": MEMORY_LIMIT_MB * 1024 * 1024
+    }
+
+
+def _apply_sandbox_limits() -> None:
+    """preexec_fn untuk subprocess cold: terapkan RLIMIT sebelum exec"""
+    import resource
+    limits = _sandbox_limits()
+    if limits["cpu_seconds"]:
+        resource.setrlimit(resource.RLIMIT_CPU, (limits["cpu_seconds"], limits["cpu_seconds"]))
+    if limits["memory_bytes"]:
+        resource.setrlimit(resource.RLIMIT_AS, (limits["memory_bytes"], limits["memory_bytes"]))
+
+
+def _kill_process_group(proc: subprocess.Popen) -> None:
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+class PythonWorkerPool:
+    """Pool interpreter Python hangat yang dipakai bersama oleh semua ExecutionUnit"""
+    
+    def __init__(self, size: int = PYTHON_WORKER_POOL_SIZE):
+        self.size = size
+        self._idle: "queue.Queue[Optional[subprocess.Popen]]" = queue.Queue()
+        for _ in range(size):
+            self._idle.put(None)  # None = slot kosong, worker di-spawn saat pertama dipakai
+        self._workers_lock = threading.Lock()
+        self._workers = set()
+        
+    @staticmethod
+    def is_supported() -> bool:
+        return os.name == "posix" and hasattr(os, "fork")
+    
+    def _spawn_worker(self) -> subprocess.Popen:
+        proc = subprocess.Popen(
+            [sys.executable, asu_python_worker.WORKER_SCRIPT],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True  # Grup proses sendiri agar timeout bisa membunuh worker + anaknya
+        )
+        with self._workers_lock:
+            self._workers.add(proc)
+        return proc
+    
+    def _discard_worker(self, proc: subprocess.Popen) -> None:
+        _kill_process_group(proc)
+        proc.wait()
+        with self._workers_lock:
+            self._workers.discard(proc)
+    
+    @staticmethod
+    def _read_exact(stream, n: int) -> Optional[bytes]:
+        buf = b""
+        while len(buf) < n:
+            chunk = stream.read(n - len(buf))
+            if not chunk:
+                return None
+            buf += chunk
+        return buf
+    
+    def run(self, file_path: str, args: List[str], cwd: str, stdout_file, stderr_file,
+            timeout: float, sys_path: Optional[List[str]] = None) -> int:
+        """Jalankan script di worker hangat, stream output ke file. Return exit code."""
+        with open(file_path, "rb") as f:
+            source = f.read()  # Bytes: worker membaca deklarasi encoding script sendiri
+        
+        proc = self._idle.get()
+        healthy = False
+        timed_out = threading.Event()
+        try:
+            if proc is None or proc.poll() is not None:
+                proc = self._spawn_worker()
+            
+            proc.stdin.write(asu_python_worker.encode_request(
+                source, file_path, cwd, args=args, sys_path=sys_path or [], **_sandbox_limits()))
+            proc.stdin.flush()
+            
+            def _on_timeout(p=proc):
+                timed_out.set()
+                _kill_process_group(p)
+            
+            timer = threading.Timer(timeout, _on_timeout)
+            timer.start()
+            try:
+                while True:
+                    header = self._read_exact(proc.stdout, asu_python_worker.FRAME_HEADER_BYTES)
+                    if header is None:
+                        break
+                    kind, length = asu_python_worker.decode_frame_header(header)
+                    payload = self._read_exact(proc.stdout, length) or b""
+                    if kind == asu_python_worker.FRAME_EXIT:
+                        healthy = True
+                        return json.loads(payload)["returncode"]
+                    target = stdout_file if kind == asu_python_worker.FRAME_STDOUT else stderr_file
+                    target.write(payload)
+                    target.flush()
+            finally:
+                timer.cancel()
+            
+            if timed_out.is_set():
+                raise subprocess.TimeoutExpired([sys.executable, file_path] + list(args), timeout)
+            raise RuntimeError("Worker Python berhenti di tengah eksekusi")
+        finally:
+            # Worker yang timeout/rusak dibuang, slotnya di-spawn ulang saat dipakai berikutnya
+            if not healthy and proc is not None:
+                self._discard_worker(proc)
+                proc = None
+            self._idle.put(proc)
+    
+    def shutdown(self) -> None:
+        """Matikan semua worker"""
+        with self._workers_lock:
+            workers = list(self._workers)
+            self._workers.clear()
+        for proc in workers:
+            _kill_process_group(proc)
+            proc.wait()
+
+
+# Direktori cache per user: binary/environment di cache dijalankan apa adanya, jadi tidak boleh di temp dir
+# bersama (path bisa ditebak dan world-writable, user lain bisa menanam artefak lebih dulu)
+UTEK_STATE_DIR = os.environ.get("UTEK_STATE_DIR") or os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "utek")
+
+
+def ensure_private_dir(path: str) -> str:
+    """Buat direktori (mode 0700) bila belum ada; tolak jika bukan milik user proses ini atau bisa ditulis user lain"""
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode):
+        raise PermissionError(f"Direktori cache {path} bukan direktori (symlink?)")
+    if hasattr(os, "getuid") and info.st_uid != os.getuid():
+        raise PermissionError(f"Direktori cache {path} dimiliki uid {info.st_uid}, bukan user proses ini")
+    if info.st_mode & 0o022:
+        raise PermissionError(f"Direktori cache {path} bisa ditulis user lain (mode {stat.S_IMODE(info.st_mode):o})")
+    return path
+
+
+# Cache build C/C++ untuk EXECUTE .c/.cpp
+BUILD_CACHE_DIR = os.environ.get("UTEK_BUILD_CACHE_DIR", os.path.join(UTEK_STATE_DIR, "build_cache"))
+BUILD_CACHE_MAX_MB = 512
+
+
+class BuildCache:
+    """Cache binary hasil kompilasi, dialamatkan oleh (hash source, compiler, flags, platform target)"""
+    
+    def __init__(self, cache_dir: str = BUILD_CACHE_DIR, max_bytes: int = BUILD_CACHE_MAX_MB * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index: "OrderedDict[str, int]" = OrderedDict()  # key -> ukuran, urut LRU
+        self._total_bytes = 0
+        self._inflight: Dict[str, threading.Event] = {}
+        self._compiler_ids: Dict[str, str] = {}
+        self.stats = {"hits": 0, "misses": 0, "deduplicated": 0, "evictions": 0}
+        self._load_index()
+        
+    def _artifact_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key)
+    
+    def _load_index(self) -> None:
+        """Bangun index LRU dari isi direktori cache (mtime = waktu akses terakhir)"""
+        ensure_private_dir(self.cache_dir)
+        entries = []
+        for shard in os.listdir(self.cache_dir):
+            shard_dir = os.path.join(self.cache_dir, shard)
+            if not os.path.isdir(shard_dir):
+                continue
+            for name in os.listdir(shard_dir):
+                if name.startswith("."):
+                    continue  # Sisa build yang terputus
+                st = os.stat(os.path.join(shard_dir, name))
+                entries.append((st.st_mtime, name, st.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._total_bytes += size
+    
+    def make_key(self, source_hash: str, compiler: str, flags: List[str], target_platform: str) -> str:
+        """Key cache; identitas compiler = path + mtime + ukuran binary-nya"""
+        with self._lock:
+            if compiler not in self._compiler_ids:
+                resolved = shutil.which(compiler)
+                if not resolved:
+                    raise FileNotFoundError(f"Compiler tidak ditemukan: {compiler}")
+                st = os.stat(os.path.realpath(resolved))
+                self._compiler_ids[compiler] = f"{os.path.realpath(resolved)}:{st.st_mtime_ns}:{st.st_size}"
+            compiler_id = self._compiler_ids[compiler]
+        material = json.dumps([source_hash, compiler_id, list(flags), target_platform], separators=(",", ":"))
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+    
+    def _lookup_locked(self, key: str) -> Optional[str]:
+        if key not in self._index:
+            return None
+        path = self._artifact_path(key)
+        if not os.path.exists(path):
+            self._total_bytes -= self._index.pop(key)
+            return None
+        self._index.move_to_end(key)
+        os.utime(path)
+        return path
+    
+    def _store_locked(self, key: str, built_artifact: str) -> str:
+        path = self._artifact_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = os.path.join(os.path.dirname(path), f".{key}.{os.getpid()}.{threading.get_ident()}.tmp")
+        shutil.copy2(built_artifact, tmp_path)
+        os.replace(tmp_path, path)  # Atomic
+        size = os.path.getsize(path)
+        self._total_bytes += size - self._index.pop(key, 0)
+        self._index[key] = size
+        while self._total_bytes > self.max_bytes and len(self._index) > 1:
+            oldest = next(iter(self._index))
+            if oldest == key:
+                break
+            self._total_bytes -= self._index.pop(oldest)
+            try:
+                os.remove(self._artifact_path(oldest))
+            except FileNotFoundError:
+                pass
+            self.stats["evictions"] += 1
+        return path
+    
+    def get_or_build(self, key: str, build) -> str:
+        """Return path binary di cache; build(output_path) hanya dipanggil sekali per key"""
+        while True:
+            with self._lock:
+                cached = self._lookup_locked(key)
+                if cached:
+                    self.stats["hits"] += 1
+                    return cached
+                event = self._inflight.get(key)
+                if event is None:
+                    event = self._inflight[key] = threading.Event()
+                    self.stats["misses"] += 1
+                    break
+                self.stats["deduplicated"] += 1
+            # Thread lain sedang build key yang sama: tunggu lalu cek ulang (build gagal -> coba sendiri)
+            event.wait()
+        
+        try:
+            with tempfile.TemporaryDirectory(prefix="utek_build_") as build_dir:
+                built_artifact = os.path.join(build_dir, "artifact")
+                build(built_artifact)
+                with self._lock:
+                    return self._store_locked(key, built_artifact)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            event.set()
+
+
+# Mirror git bare bersama untuk FETCH_REPO (clone jaringan sekali per URL, checkout berikutnya lokal)
+GIT_MIRROR_DIR = os.environ.get("UTEK_GIT_MIRROR_DIR", os.path.join(UTEK_STATE_DIR, "git_mirrors"))
+GIT_MIRROR_FETCH_INTERVAL = 300.0  # Detik sebelum ref branch/tag dianggap basi dan mirror di-fetch ulang
+GIT_MIRROR_TIMEOUT = 600.0  # Clone/fetch mirror dari jaringan; checkout lokal tetap memakai DEFAULT_TIMEOUTS
+
+
+# Cache dependency INSTALL: artefak (wheel/tarball) + environment prebuilt, dimaterialisasi lewat hard-link
+DEPENDENCY_CACHE_DIR = os.environ.get("UTEK_DEPENDENCY_CACHE_DIR", os.path.join(UTEK_STATE_DIR, "dep_cache"))
+DEPENDENCY_BUILD_TIMEOUT = 600.0  # Build environment baru; INSTALL yang kena cache tidak menjalankan pip/npm
+
+
+class DependencyCache:
+    """Environment dependency prebuilt, dialamatkan oleh (manager, interpreter, set package, opsi index)"""
+    
+    LIB_DIRS = {"pip": "site", "npm": "node_modules"}
+    
+    def __init__(self, cache_dir: str = DEPENDENCY_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, threading.Event] = {}
+        self._tool_ids: Dict[str, str] = {}
+        self.stats = {"hits": 0, "misses": 0, "deduplicated": 0}
+        os.makedirs(os.path.join(ensure_private_dir(cache_dir), "envs"), exist_ok=True)
+    
+    def env_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, "envs", key[:2], key)
+    
+    def make_key(self, manager: str, executable: str, packages: List[str], index_options: List[str],
+                 manifest_hash: str = "") -> str:
+        """Key environment; identitas interpreter = path + mtime + ukuran binary-nya"""
+        with self._lock:
+            if executable not in self._tool_ids:
+                resolved = shutil.which(executable)
+                if not resolved:
+                    raise FileNotFoundError(f"Package manager tidak ditemukan: {executable}")
+                st = os.stat(os.path.realpath(resolved))
+                self._tool_ids[executable] = f"{os.path.realpath(resolved)}:{st.st_mtime_ns}:{st.st_size}"
+            tool_id = self._tool_ids[executable]
+        # Set package selalu ikut key; manifest_hash (isi requirements + hash header) hanya input tambahan
+        spec = sorted(p.strip().lower() for p in packages)
+        material = json.dumps([manager, tool_id, spec, list(index_options), manifest_hash], separators=(",", ":"))
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+    
+    @staticmethod
+    def _run(cmd: List[str]) -> None:
+        result = subprocess.run(cmd, timeout=DEPENDENCY_BUILD_TIMEOUT, capture_output=True, text=True,
+                                stdin=subprocess.DEVNULL)
+        if result.returncode != 0:
+            raise RuntimeError(f"Instalasi gagal: {result.stderr.strip()[-1000:]}")
+    
+    def _build(self, manager: str, executable: str, packages: List[str], index_options: List[str],
+               env_dir: str) -> None:
+        artifacts = os.path.join(self.cache_dir, "artifacts", manager)
+        os.makedirs(artifacts, exist_ok=True)
+        if manager == "pip":
+            pip = [executable, "-m", "pip", "--disable-pip-version-check", "--no-input"]
+            # Wheel yang sudah ada di cache artefak tidak diunduh ulang
+            self._run(pip + ["download", "--dest", artifacts, "--find-links", artifacts] + index_options + ["--", *packages])
+            self._run(pip + ["install", "--no-index", "--find-links", artifacts, "--target",
+                             os.path.join(env_dir, "site"), "--no-warn-script-location", "--", *packages])
+        else:
+            self._run([executable, "install", "--prefix", env_dir, "--cache", artifacts, "--prefer-offline",
+                       "--no-audit", "--no-fund", *index_options, *packages])
+    
+    def get_or_build(self, manager: str, executable: str, packages: List[str], index_options: List[str],
+                     manifest_hash: str = "") -> str:
+        """Return direktori library environment (site/ atau node_modules/); dibangun sekali per key"""
+        if manager not in self.LIB_DIRS:
+            raise ValueError(f"Package manager tidak didukung: {manager}")
+        key = self.make_key(manager, executable, packages, index_options, manifest_hash)
+        path = self.env_path(key)
+        lib_dir = os.path.join(path, self.LIB_DIRS[manager])
+        while True:
+            with self._lock:
+                if os.path.isdir(path):
+                    self.stats["hits"] += 1
+                    return lib_dir
+                event = self._inflight.get(key)
+                if event is None:
+                    event = self._inflight[key] = threading.Event()
+                    self.stats["misses"] += 1
+                    break
+                self.stats["deduplicated"] += 1
+            # Thread lain sedang membangun key yang sama: tunggu lalu cek ulang (build gagal -> coba sendiri)
+            event.wait()
+        
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            build_dir = tempfile.mkdtemp(prefix=f".{key[:12]}_", dir=os.path.dirname(path))
+            try:
+                self._build(manager, executable, packages, index_options, build_dir)
+                os.makedirs(os.path.join(build_dir, self.LIB_DIRS[manager]), exist_ok=True)
+                try:
+                    os.rename(build_dir, path)  # Atomic
+                except OSError:
+                    if not os.path.isdir(path):
+                        raise  # Selain itu proses lain sudah membangun key yang sama
+            finally:
+                shutil.rmtree(build_dir, ignore_errors=True)
+            return lib_dir
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            event.set()
+    
+    @staticmethod
+    def materialize(lib_dir: str, target: str) -> int:
+        """Hard-link isi environment ke workspace (copy jika beda filesystem). Return jumlah file."""
+        count = 0
+        for dirpath, dirnames, filenames in os.walk(lib_dir):
+            dest_dir = os.path.join(target, os.path.relpath(dirpath, lib_dir))
+            os.makedirs(dest_dir, exist_ok=True)
+            for name in filenames:
+                src, dest = os.path.join(dirpath, name), os.path.join(dest_dir, name)
+                if os.path.lexists(dest):
+                    os.remove(dest)
+                try:
+                    os.link(src, dest)
+                except OSError:
+                    shutil.copy2(src, dest)
+                count += 1
+        return count
+
+
+class GitMirrorCache:
+    """Mirror bare per URL di <cache_dir>/<sha256(url)[:2]>/<sha256(url)>.git, dipakai bersama semua Tempik"""
+    
+    def __init__(self, cache_dir: str = GIT_MIRROR_DIR, fetch_interval: float = GIT_MIRROR_FETCH_INTERVAL):
+        self.cache_dir = ensure_private_dir(cache_dir)
+        self.fetch_interval = fetch_interval
+        self._lock = threading.Lock()
+        self._url_locks: Dict[str, threading.Lock] = {}  # Clone/fetch URL yang sama tidak pernah paralel
+        self._last_fetch: Dict[str, float] = {}
+        self.stats = {"clones": 0, "fetches": 0, "hits": 0}
+        
+    def mirror_path(self, url: str) -> str:
+        key = hashlib.sha256(url.strip().encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, key[:2], f"{key}.git")
+    
+    @staticmethod
+    def _git(args: List[str], timeout: float) -> str:
+        result = subprocess.run(
+            ["git", *args],
+            timeout=timeout,
+            capture_output=True,
+            text=True,
+            stdin=subprocess.DEVNULL,
+            env=dict(os.environ, GIT_TERMINAL_PROMPT="0")
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"git {args[2] if args[0] == '--git-dir' else args[0]} gagal: {result.stderr.strip()}")
+        return result.stdout.strip()
+    
+    def _resolve(self, mirror: str, ref: str) -> Optional[str]:
+        try:
+            return self._git(["--git-dir", mirror, "rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}"],
+                             DEFAULT_TIMEOUTS["CHECKOUT"]) or None
+        except RuntimeError:
+            return None
+    
+    def ensure_mirror(self, url: str, ref: str = "HEAD") -> Tuple[str, str]:
+        """Pastikan mirror memuat ref; return (path_mirror, commit_sha)"""
+        if ref.startswith("-"):
+            raise ValueError(f"Ref tidak valid: {ref}")
+        mirror = self.mirror_path(url)
+        with self._lock:
+            url_lock = self._url_locks.setdefault(mirror, threading.Lock())
+        with url_lock:
+            if not os.path.isdir(mirror):
+                os.makedirs(os.path.dirname(mirror), exist_ok=True)
+                tmp_dir = tempfile.mkdtemp(prefix=".clone_", dir=os.path.dirname(mirror))
+                try:
+                    self._git(["clone", "--mirror", "--quiet", "--", url, tmp_dir], GIT_MIRROR_TIMEOUT)
+                    # Checkout memakai objek mirror lewat alternates: jangan biarkan gc membuang objeknya
+                    self._git(["--git-dir", tmp_dir, "config", "gc.auto", "0"], GIT_MIRROR_TIMEOUT)
+                    try:
+                        os.rename(tmp_dir, mirror)  # Atomic
+                    except OSError:
+                        if not os.path.isdir(mirror):
+                            raise  # Selain itu proses lain sudah membuat mirror yang sama
+                finally:
+                    shutil.rmtree(tmp_dir, ignore_errors=True)
+                self._last_fetch[mirror] = time.time()
+                self.stats["clones"] += 1
+            else:
+                commit = self._resolve(mirror, ref)
+                is_full_sha = len(ref) == 40 and all(c in "0123456789abcdef" for c in ref.lower())
+                stale = time.time() - self._last_fetch.get(mirror, 0.0) > self.fetch_interval
+                if commit is not None and (is_full_sha or not stale):
+                    self.stats["hits"] += 1
+                    return mirror, commit
+                self._git(["--git-dir", mirror, "fetch", "--prune", "--quiet", "origin"], GIT_MIRROR_TIMEOUT)
+                self._last_fetch[mirror] = time.time()
+                self.stats["fetches"] += 1
+            commit = self._resolve(mirror, ref)
+            if commit is None:
+                raise ValueError(f"Ref '{ref}' tidak ditemukan di repository {url}")
+            return mirror, commit
+    
+    def checkout(self, url: str, ref: str, target: str) -> str:
+        """Checkout url@ref ke target sebagai clone --shared dari mirror (tanpa akses jaringan). Return commit."""
+        mirror, commit = self.ensure_mirror(url, ref)
+        if os.path.exists(target):
+            shutil.rmtree(target)  # Sisa percobaan sebelumnya (retry)
+        self._git(["clone", "--shared", "--no-checkout", "--quiet", mirror, target], DEFAULT_TIMEOUTS["FETCH_REPO"])
+        self._git(["-C", target, "checkout", "--quiet", "--detach", commit], DEFAULT_TIMEOUTS["FETCH_REPO"])
+        self._git(["-C", target, "remote", "set-url", "origin", url], DEFAULT_TIMEOUTS["FETCH_REPO"])
+        return commit
+
+
 class ExecutionUnit:
     """Unit eksekusi Tempik dengan kemampuan UTEK Hybride emulation"""
     
-    def __init__(self, tempik_id: int):
+    def __init__(self, tempik_id: int, python_pool: Optional[PythonWorkerPool] = None,
+                 build_cache: Optional[BuildCache] = None, git_mirrors: Optional[GitMirrorCache] = None,
+                 dependency_cache: Optional[DependencyCache] = None):
         self.tempik_id = f"Tempik-{tempik_id:03d}"
         self.virtual_memory = VirtualMemory()
         self.virtual_fs = VirtualFilesystem(str(tempik_id))
         self.security_mgr = SecurityManager()
+        self.python_pool = python_pool  # None = selalu cold subprocess
+        self.build_cache = build_cache  # None = kompilasi ulang setiap kali
+        self.git_mirrors = git_mirrors  # None = git clone penuh dari jaringan setiap kali
+        self.dependency_cache = dependency_cache  # None = pip/npm install langsung setiap kali
+        self.dependency_paths: List[str] = []  # Direktori hasil INSTALL, ditambahkan ke sys.path EXECUTE Python
         self.current_context = {}
         self.execution_state = "IDLE"
         
@@ -309,9 +809,10 @@ class ExecutionUnit:
             logging.info(log_entry)
     
     def handle_fetch_repo(self, instruction: Dict, context: Dict) -> None:
-        """Handler untuk instruksi FETCH_REPO dengan git clone nyata"""
+        """Handler untuk instruksi FETCH_REPO: checkout dari mirror lokal, atau git clone nyata tanpa mirror"""
         repo_url = instruction.get("url", "")
         target_dir = instruction.get("target", "repo")
+        ref = instruction.get("ref", "HEAD")
         
         if not repo_url:
             raise ValueError("URL repository tidak ditemukan")
@@ -320,6 +821,11 @@ class ExecutionUnit:
         jail_dir = self.virtual_fs.create_chroot_jail()
         repo_path = os.path.join(jail_dir, target_dir)
         
+        if self.git_mirrors is not None:
+            commit = self.git_mirrors.checkout(repo_url, ref, repo_path)
+            logging.info(f"{self.tempik_id} - Repository {repo_url}@{commit[:12]} di-checkout dari mirror lokal")
+            return
+        
         # Eksekusi git clone nyata dengan timeout
         cmd = ["git", "clone", repo_url, repo_path]
         result = subprocess.run(
@@ -362,7 +868,7 @@ class ExecutionUnit:
         if file_path.endswith(".py"):
             self._execute_python(file_path, args)
         elif file_path.endswith((".cpp", ".c")):
-            self._execute_cpp(file_path, args)
+            self._execute_cpp(file_path, args, instruction.get("flags", []))
         elif file_path.endswith(".sh"):
             self._execute_shell(file_path, args)
         elif file_path.endswith(".wasm"):
@@ -370,35 +876,84 @@ class ExecutionUnit:
         else:
             raise ValueError(f"Tipe file tidak didukung: {file_path}")
     
-    def _execute_python(self, file_path: str, args: List[str]) -> None:
-        """Eksekusi file Python dalam sandbox"""
-        cmd = [sys.executable, file_path] + args
-        result = subprocess.run(
+    @contextmanager
+    def _output_streams(self, file_path: str):
+        """Buka file stdout/stderr di <root_dir>/output untuk menampung output proses"""
+        output_dir = os.path.join(self.virtual_fs.root_dir, "output")
+        os.makedirs(output_dir, exist_ok=True)
+        base = os.path.join(output_dir, os.path.basename(file_path))
+        with open(base + ".stdout", "wb") as stdout_file, open(base + ".stderr", "wb") as stderr_file:
+            yield stdout_file, stderr_file
+    
+    @staticmethod
+    def _stderr_tail(stderr_file, limit: int = 2000) -> str:
+        with open(stderr_file.name, "rb") as f:
+            return f.read()[-limit:].decode("utf-8", errors="replace")
+    
+    def _run_cold(self, cmd: List[str], stdout_file, stderr_file, env: Optional[Dict[str, str]] = None) -> int:
+        """Fallback: proses baru per eksekusi, output langsung ditulis ke file"""
+        return subprocess.run(
             cmd,
             timeout=DEFAULT_TIMEOUTS["EXECUTE"],
-            capture_output=True,
-            text=True,
-            cwd=self.virtual_fs.root_dir
-        )
-        
-        if result.returncode != 0:
-            raise RuntimeError(f"Eksekusi Python gagal: {result.stderr}")
+            stdin=subprocess.DEVNULL,
+            stdout=stdout_file,
+            stderr=stderr_file,
+            cwd=self.virtual_fs.root_dir,
+            env=env,
+            preexec_fn=_apply_sandbox_limits if os.name == "posix" else None
+        ).returncode
+    
+    def _execute_python(self, file_path: str, args: List[str]) -> None:
+        """Eksekusi file Python dalam sandbox (worker hangat jika tersedia)"""
+        script_path = os.path.join(self.virtual_fs.root_dir, file_path)
+        with self._output_streams(file_path) as (stdout_file, stderr_file):
+            if self.python_pool is not None:
+                returncode = self.python_pool.run(
+                    script_path, args, self.virtual_fs.root_dir,
+                    stdout_file, stderr_file, DEFAULT_TIMEOUTS["EXECUTE"], sys_path=self.dependency_paths
+                )
+            else:
+                env = None
+                if self.dependency_paths:
+                    env = dict(os.environ, PYTHONPATH=os.pathsep.join(
+                        self.dependency_paths + [p for p in [os.environ.get("PYTHONPATH")] if p]))
+                returncode = self._run_cold([sys.executable, file_path] + args, stdout_file, stderr_file, env=env)
+            
+            if returncode != 0:
+                raise RuntimeError(f"Eksekusi Python gagal: {self._stderr_tail(stderr_file)}")
     
-    def _execute_cpp(self, file_path: str, args: List[str]) -> None:
-        """Kompilasi dan eksekusi file C++"""
-        # Kompilasi terlebih dahulu
-        binary_path = file_path.replace(".cpp", "").replace(".c", "")
-        compile_cmd = ["gcc", "-o", binary_path, file_path]
+    def _execute_cpp(self, file_path: str, args: List[str], flags: Optional[List[str]] = None) -> None:
+        """Kompilasi (lewat build cache) dan eksekusi file C/C++"""
+        compiler = "g++" if file_path.endswith(".cpp") else "gcc"
+        flags = list(flags or [])
         
-        compile_result = subprocess.run(
-            compile_cmd,
-            timeout=DEFAULT_TIMEOUTS["COMPILE"],
-            capture_output=True,
-            text=True
-        )
+        def _compile(binary_path: str) -> None:
+            compile_result = subprocess.run(
+                [compiler, *flags, "-o", binary_path, file_path],
+                timeout=DEFAULT_TIMEOUTS["COMPILE"],
+                capture_output=True,
+                text=True
+            )
+            if compile_result.returncode != 0:
+                raise RuntimeError(f"Kompilasi gagal: {compile_result.stderr}")
         
-        if compile_result.returncode != 0:
-            raise RuntimeError(f"Kompilasi gagal: {compile_result.stderr}")
+        if self.build_cache is not None:
+            # Header lokal di direktori yang sama ikut di-hash supaya perubahan header tidak memakai binary lama
+            source_dir = os.path.dirname(file_path) or "."
+            hashed_files = [file_path] + sorted(
+                os.path.join(source_dir, name) for name in os.listdir(source_dir)
+                if name.endswith((".h", ".hpp", ".hh"))
+            )
+            digest = b""
+            for path in hashed_files:
+                with open(path, "rb") as f:
+                    digest += os.path.basename(path).encode() + b"\0" + hashlib.sha256(f.read()).digest()
+            source_hash = self.security_mgr.generate_sha256_hash(digest)
+            key = self.build_cache.make_key(source_hash, compiler, flags, f"{sys.platform}-{platform.machine()}")
+            binary_path = self.build_cache.get_or_build(key, _compile)
+        else:
+            binary_path = os.path.splitext(file_path)[0]
+            _compile(binary_path)
         
         # Eksekusi binary
         exec_cmd = [binary_path] + args
@@ -414,17 +969,9 @@ class ExecutionUnit:
     
     def _execute_shell(self, file_path: str, args: List[str]) -> None:
         """Eksekusi shell script"""
-        cmd = ["bash", file_path] + args
-        result = subprocess.run(
-            cmd,
-            timeout=DEFAULT_TIMEOUTS["EXECUTE"],
-            capture_output=True,
-            text=True,
-            cwd=self.virtual_fs.root_dir
-        )
-        
-        if result.returncode != 0:
-            raise RuntimeError(f"Eksekusi shell script gagal: {result.stderr}")
+        with self._output_streams(file_path) as (stdout_file, stderr_file):
+            if self._run_cold(["bash", file_path] + args, stdout_file, stderr_file) != 0:
+                raise RuntimeError(f"Eksekusi shell script gagal: {self._stderr_tail(stderr_file)}")
     
     def _execute_wasm(self, file_path: str, args: List[str]) -> None:
         """Eksekusi WebAssembly file (memerlukan wasmtime atau wasmer)"""
@@ -446,10 +993,14 @@ class ExecutionUnit:
         raise RuntimeError("Runtime WebAssembly tidak ditemukan (wasmtime/wasmer)")
     
     def handle_install(self, instruction: Dict, context: Dict) -> None:
-        """Handler untuk instalasi dependencies"""
+        """Handler untuk instalasi dependencies (environment prebuilt dari cache jika tersedia)"""
         package_manager = instruction.get("manager", "pip")
         packages = instruction.get("packages", [])
         
+        if self.dependency_cache is not None:
+            self._install_cached(package_manager, list(packages), instruction, context)
+            return
+        
         if package_manager == "pip":
             cmd = [sys.executable, "-m", "pip", "install"] + packages
         elif package_manager == "npm":
@@ -467,6 +1018,36 @@ class ExecutionUnit:
         if result.returncode != 0:
             raise RuntimeError(f"Instalasi gagal: {result.stderr}")
     
+    def _install_cached(self, package_manager: str, packages: List[str], instruction: Dict, context: Dict) -> None:
+        """INSTALL lewat DependencyCache lalu hard-link environment ke workspace Tempik"""
+        manifest_hash = ""
+        if instruction.get("requirements"):
+            with open(os.path.join(self.virtual_fs.root_dir, instruction["requirements"]), "r", encoding="utf-8") as f:
+                requirements = f.read()
+            packages += [line.split("#", 1)[0].strip() for line in requirements.splitlines()
+                         if line.split("#", 1)[0].strip() and not line.lstrip().startswith("-")]
+            manifest_hash = hashlib.sha256(f"{context.get('dependency_manifest_hash') or ''}\0{requirements}".encode("utf-8")).hexdigest()
+        if not packages:
+            raise ValueError("Package tidak ditemukan untuk INSTALL")
+        if any(p.startswith("-") for p in packages):
+            raise ValueError("Spesifikasi package tidak boleh berupa opsi")
+        
+        index_options = []
+        for link in instruction.get("find_links", []):
+            index_options += ["--find-links", str(link)]
+        if instruction.get("index_url"):
+            index_options += ["--registry" if package_manager == "npm" else "--index-url", str(instruction["index_url"])]
+        if instruction.get("offline"):
+            index_options.append("--offline" if package_manager == "npm" else "--no-index")
+        
+        executable = sys.executable if package_manager == "pip" else "npm"
+        lib_dir = self.dependency_cache.get_or_build(package_manager, executable, packages, index_options, manifest_hash)
+        target = os.path.join(self.virtual_fs.root_dir, instruction.get("target", f".deps/{package_manager}"))
+        file_count = DependencyCache.materialize(lib_dir, target)
+        if package_manager == "pip" and target not in self.dependency_paths:
+            self.dependency_paths.append(target)
+        logging.info(f"{self.tempik_id} - INSTALL {packages}: {file_count} file di-link dari {lib_dir}")
+    
     def handle_verify_hash(self, instruction: Dict, context: Dict) -> None:
         """Handler untuk verifikasi hash file"""
         file_path = instruction.get("file", "")
@@ -480,6 +1061,10 @@ class ExecutionUnit:
         instr_type = instruction.get("type", "UNKNOWN")
         raise NotImplementedError(f"Instruksi tidak didukung: {instr_type}")
     
+    def reset_job_state(self) -> None:
+        """Dipanggil di awal setiap job: hasil INSTALL job sebelumnya tidak boleh ikut ke sys.path job ini"""
+        self.dependency_paths = []
+
     def cleanup(self) -> None:
         """Pembersihan resource unit eksekusi"""
         self.virtual_fs.cleanup()
@@ -580,6 +1165,10 @@ class ASUScheduler:
     
     def __init__(self):
         self.executor = ThreadPoolExecutor(max_workers=MAX_TEMPIKS)
+        self.python_pool = PythonWorkerPool() if PythonWorkerPool.is_supported() else None
+        self.build_cache = BuildCache()
+        self.git_mirrors = GitMirrorCache()
+        self.dependency_cache = DependencyCache()
         self.active_tempiks = {}
         self.load_stats = {}
         
@@ -596,6 +1185,8 @@ class ASUScheduler:
         
         futures = []
         tempik_counter = 0
+        for unit in self.active_tempiks.values():  # Unit dipakai ulang antar job
+            unit.reset_job_state()
         
         for instruction in sorted_instructions:
             # Pilih Tempik dengan load balancing round-robin
@@ -603,7 +1194,10 @@ class ASUScheduler:
             
             # Buat atau ambil ExecutionUnit
             if tempik_id not in self.active_tempiks:
-                self.active_tempiks[tempik_id] = ExecutionUnit(tempik_id)
+                self.active_tempiks[tempik_id] = ExecutionUnit(
+                    tempik_id, python_pool=self.python_pool, build_cache=self.build_cache,
+                    git_mirrors=self.git_mirrors, dependency_cache=self.dependency_cache
+                )
             
             unit = self.active_tempiks[tempik_id]
             
@@ -635,6 +1229,9 @@ class ASUScheduler:
         """Shutdown scheduler dan cleanup semua Tempik"""
         self.executor.shutdown(wait=True)
         
+        if self.python_pool is not None:
+            self.python_pool.shutdown()
+        
         for unit in self.active_tempiks.values():
             unit.cleanup()
         
@@ -14,28 +14,60 @@ Refactored based on Enterprise Audit.
 """
 
 import asyncio
+import copy
+import fnmatch
 import hashlib
+import heapq
+import hmac
+import io
+import ipaddress
+import itertools
 import json
 import logging
 import os
+import platform
+import shlex
 import shutil
+import signal
+import socket
+import stat
+import ssl
+import struct
 import subprocess
 import tempfile
+import threading
 import time
 import zipfile
+import zlib
+from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor # AUDIT POINT 1
 import sys # For Profiler
 import random # For VirtualFS latency simulation
+import re
+import secrets
+from abc import ABC, abstractmethod
+from collections import Counter, OrderedDict, deque
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union, Callable, Tuple, Coroutine
+from urllib.parse import parse_qs, unquote, urlencode, urlsplit
+from typing import Any, Dict, List, Optional, Set, Union, Callable, Tuple, Coroutine, Iterator
 
 import gzip
 import lz4.frame  # pip install lz4
+try:
+    import zstandard  # pip install zstandard (opsional: UNPACK tar.zst)
+except ImportError:
+    zstandard = None
+try:
+    import blake3  # pip install blake3 (opsional: VERIFY_HASH algorithm=blake3)
+except ImportError:
+    blake3 = None
 # import requests # Digunakan oleh NetworkUnit nantinya
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import rsa, padding as rsa_padding
-from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM, ChaCha20Poly1305
+from cryptography.exceptions import InvalidSignature, InvalidTag
+import asu_python_worker # Worker EXECUTE .py (satu salinan, juga dipakai Claude/Utekv1.py)
 # from pyfakefs.fake_filesystem_unittest import TestCase
 # from flask import Flask, request, jsonify
 
@@ -64,6 +96,11 @@ class TempikStatus(Enum):
     PROFILING = "profiling" # AUDIT POINT 16
 
 
+# Tahap pipeline per instruksi: hanya field lokal Tempik.pipeline_stage, tidak dipublikasikan ke executor
+PIPELINE_STAGES = frozenset({TempikStatus.FETCH, TempikStatus.DECODE, TempikStatus.EXECUTE,
+                             TempikStatus.MEMORY_ACCESS, TempikStatus.WRITE_BACK})
+
+
 class InstruksiASU(Enum):
     """Daftar instruksi yang didukung dalam format .asu"""
     # ENVIRONMENT & KONFIGURASI
@@ -98,6 +135,7 @@ class InstruksiASU(Enum):
     VERIFY = "VERIFY" 
     SIGN = "SIGN" 
     DECRYPT = "DECRYPT"
+    ENCRYPT = "ENCRYPT"
     LOCK_EXEC = "LOCK_EXEC" 
     
     # AUDIT, LOGGING & EVENTS
@@ -146,6 +184,11 @@ class InstruksiASU(Enum):
     JZ = "JZ" 
     JNZ = "JNZ" 
 
+# Instruksi yang mengatur PC sendiri (tidak di-increment otomatis oleh ControlUnit)
+BRANCH_INSTRUCTIONS = frozenset({InstruksiASU.JMP, InstruksiASU.JZ, InstruksiASU.JNZ, InstruksiASU.CALL, InstruksiASU.RET})
+# Instruksi yang wajib punya parameter target_label
+LABEL_TARGET_INSTRUCTIONS = frozenset({InstruksiASU.JMP, InstruksiASU.JZ, InstruksiASU.JNZ, InstruksiASU.CALL, InstruksiASU.SPAWN_THREAD})
+
 # AUDIT POINT 6: Virtual IRQ / Event Types
 class InterruptType(Enum):
     TIMER_EXPIRED = "TIMER_EXPIRED" # Untuk Watchdog (AUDIT POINT 11)
@@ -182,7 +225,8 @@ class HeaderASU:
     security_flags: str = "sandboxed"
     time_budget: str = "max-exec-time=60s" # AUDIT POINT 11
     checksum_signature: str = "" 
-    compression_info: str = "gzip" # gzip, lz4, none
+    compression_info: str = "gzip" # gzip, lz4, none (satu stream) | zstd, lz4-frames (multi-frame, lihat ASUFrameContainer)
+    compression_level: int = 0 # 0 = default codec
     asu_build_info: str = ""
     
     dependency_manifest_hash: str = ""  
@@ -193,7 +237,11 @@ class HeaderASU:
     max_size: str = "1GB" # AUDIT POINT 9, e.g., "10MB", "2GB"
     
     def to_dict(self) -> Dict[str, str]:
-        return self.__dict__
+        data = dict(self.__dict__)
+        if not data.get('compression_level'):
+            # Level default tidak ditulis agar header tetap bisa dibaca pembaca lama (cls(**data))
+            data.pop('compression_level', None)
+        return data
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'HeaderASU':
@@ -204,7 +252,14 @@ class HeaderASU:
 
     # AUDIT POINT 9: Helper untuk max_size
     def get_max_size_bytes(self) -> int:
-        size_str = self.max_size.upper()
+        return self._parse_size_bytes(self.max_size, "max_size")
+
+    def get_memory_profile_bytes(self) -> int: # Batas atas peak memori untuk estimasi biaya Scheduler
+        return self._parse_size_bytes(self.memory_profile, "memory_profile")
+
+    @staticmethod
+    def _parse_size_bytes(value: str, field_name: str) -> int:
+        size_str = value.upper()
         if size_str.endswith("KB") or size_str.endswith("KIB"):
             return int(size_str.replace("KB", "").replace("KIB", "")) * 1024
         elif size_str.endswith("MB") or size_str.endswith("MIB"):
@@ -214,7 +269,7 @@ class HeaderASU:
         try:
             return int(size_str) # Asumsi bytes jika tidak ada unit
         except ValueError:
-            logger.warning(f"Format max_size tidak valid: {self.max_size}. Default ke 1GB.")
+            logger.warning(f"Format {field_name} tidak valid: {value}. Default ke 1GB.")
             return 1 * 1024 * 1024 * 1024 # Default 1GB
 
     # AUDIT POINT 11: Helper untuk time_budget
@@ -236,6 +291,8 @@ class InstruksiEksekusi:
     parameter: Dict[str, Any] = field(default_factory=dict)
     timeout: float = 30.0 # Timeout per instruksi
     retry_count: int = 1 
+    # PC hasil resolve target_label, diisi sekali oleh Tempik.load_program (tidak ikut diserialisasi/hash)
+    target_pc: Optional[int] = field(default=None, compare=False, repr=False)
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -272,7 +329,9 @@ class FileASU:
     
     def generate_hash(self, for_signing: bool = False) -> str:
         # for_signing=True berarti hash ini akan di-sign, jadi checksum_signature di header harus kosong
-        header_dict_for_hash = self.header.to_dict()
+        header_dict_for_hash = dict(self.header.to_dict())
+        # compression_level hanya detail transport: kompresi ulang tidak boleh mengubah identitas/signature file
+        header_dict_for_hash.pop('compression_level', None)
         if for_signing and 'checksum_signature' in header_dict_for_hash:
             # Kosongkan signature saat menghitung hash yang akan di-sign
             # agar verifikasi konsisten
@@ -314,8 +373,196 @@ class FileASU:
         logger.info(f"FileASU ditandatangani. Signature: {self.header.checksum_signature[:16]}..., Final hash: {self.hash_sha256}")
 
 
+# Format kontainer .asu multi-frame (compression_info "zstd" / "lz4-frames"):
+#   MAGIC | frame... | index JSON | trailer(index_offset u64, index_len u32, TRAILER_MAGIC)
+# Tiap section (header, body, virtual_fs) dipotong menjadi frame independen berukuran frame_size
+# (sebelum kompresi), jadi reader bisa membaca header saja, atau decode frame secara paralel.
+ASU_FRAME_MAGIC = b"ASUFRM01"
+ASU_FRAME_TRAILER_MAGIC = b"ASUFIDX1"
+ASU_FRAME_TRAILER = struct.Struct("<QI8s")
+DEFAULT_ASU_FRAME_SIZE = 1024 * 1024
+MAX_ASU_FRAME_SIZE = 64 * 1024 * 1024 # Batas raw_len per frame dari index (index berasal dari file, tidak dipercaya)
+ASU_FRAMED_CODECS = {"zstd": "zstd", "lz4-frames": "lz4"} # compression_info -> codec frame
+
+
+class ASUFrameContainer:
+    """Encode/decode kontainer .asu multi-frame yang bisa di-seek per section."""
+    _pool: Optional[ThreadPoolExecutor] = None # Dibagi semua reader/writer; dibuat saat pertama dipakai
+
+    @classmethod
+    def _thread_pool(cls) -> ThreadPoolExecutor:
+        if cls._pool is None:
+            cls._pool = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1), thread_name_prefix="asu-frame")
+        return cls._pool
+
+    @staticmethod
+    def _compress(codec: str, level: int, data: bytes) -> bytes:
+        if codec == "zstd":
+            if zstandard is None:
+                raise RuntimeError("Kompresi zstd memerlukan paket 'zstandard' (pip install zstandard).")
+            return zstandard.ZstdCompressor(level=level or 3).compress(data)
+        return lz4.frame.compress(data, compression_level=level or 0)
+
+    @staticmethod
+    def _decompress(codec: str, data: bytes, raw_len: int) -> bytes:
+        """Dekompresi satu frame dengan output dibatasi raw_len: frame yang mengembang melebihi index ditolak
+        sebelum memori dialokasikan, bukan dicek setelahnya."""
+        if codec == "zstd":
+            if zstandard is None:
+                raise RuntimeError("File .asu ini memakai zstd; install paket 'zstandard'.")
+            # max_output_size diabaikan zstandard jika frame mencantumkan content size; cek dulu ke index
+            declared = zstandard.frame_content_size(data)
+            if declared not in (-1, raw_len):
+                raise ValueError(f"Frame zstd mengklaim {declared} bytes, index {raw_len} bytes.")
+            return zstandard.ZstdDecompressor().decompress(data, max_output_size=raw_len)
+        decompressor = lz4.frame.LZ4FrameDecompressor()
+        raw = decompressor.decompress(data, max_length=raw_len)
+        if not decompressor.eof:
+            raise ValueError(f"Frame lz4 tidak selesai dalam {raw_len} bytes (ukuran di index salah atau frame terpotong).")
+        return raw
+
+    @classmethod
+    def _map(cls, fn: Callable, items: List[Any]) -> List[Any]:
+        # zstd dan lz4 melepas GIL saat (de)kompresi, jadi thread pool benar-benar paralel
+        if len(items) <= 1: return [fn(item) for item in items]
+        return list(cls._thread_pool().map(fn, items))
+
+    @staticmethod
+    def is_container(data: bytes) -> bool:
+        return data[:len(ASU_FRAME_MAGIC)] == ASU_FRAME_MAGIC
+
+    @classmethod
+    def encode(cls, sections: Dict[str, bytes], codec: str, level: int = 0,
+               frame_size: int = DEFAULT_ASU_FRAME_SIZE) -> bytes:
+        if not 1 <= frame_size <= MAX_ASU_FRAME_SIZE: # Reader menolak frame_size di luar rentang ini
+            raise ValueError(f"frame_size harus 1..{MAX_ASU_FRAME_SIZE} bytes, diberikan {frame_size}.")
+        jobs = [(name, start, payload[start:start + frame_size])
+                for name, payload in sections.items() for start in range(0, max(len(payload), 1), frame_size)]
+        compressed = cls._map(lambda job: cls._compress(codec, level, job[2]), jobs)
+
+        out = bytearray(ASU_FRAME_MAGIC)
+        index: Dict[str, Any] = {"version": 1, "codec": codec, "frame_size": frame_size, "sections": {}}
+        for (name, _, raw), frame in zip(jobs, compressed):
+            index["sections"].setdefault(name, []).append([len(out), len(frame), len(raw), zlib.crc32(raw)])
+            out += frame
+        index_bytes = json.dumps(index, separators=(",", ":")).encode("utf-8")
+        index_offset = len(out)
+        out += index_bytes
+        out += ASU_FRAME_TRAILER.pack(index_offset, len(index_bytes), ASU_FRAME_TRAILER_MAGIC)
+        return bytes(out)
+
+    @staticmethod
+    def _check_trailer(index_offset: int, index_len: int, file_size: int):
+        if index_offset < len(ASU_FRAME_MAGIC) or index_offset + index_len + ASU_FRAME_TRAILER.size != file_size:
+            raise ValueError("Trailer kontainer .asu menunjuk index di luar file.")
+
+    @staticmethod
+    def _validate_index(index: Any, index_offset: int) -> Dict[str, Any]:
+        """Index dibaca dari file itu sendiri: pastikan frame benar-benar muat di area frame file
+        (tanpa tumpang tindih) dan raw_len tiap frame tidak melebihi frame_size sebelum ada yang didekompresi."""
+        if not isinstance(index, dict) or not isinstance(index.get("sections"), dict):
+            raise ValueError("Index kontainer .asu tidak valid.")
+        if index.get("codec") not in ASU_FRAMED_CODECS.values():
+            raise ValueError(f"Codec kontainer .asu tidak dikenal: {index.get('codec')}")
+        frame_size = index.get("frame_size")
+        if not isinstance(frame_size, int) or not 1 <= frame_size <= MAX_ASU_FRAME_SIZE:
+            raise ValueError(f"frame_size kontainer .asu tidak valid: {frame_size}")
+        spans = []
+        for name, frames in index["sections"].items():
+            if not isinstance(frames, list) or not frames:
+                raise ValueError(f"Section '{name}' di index kontainer .asu tidak valid.")
+            for frame in frames:
+                if (not isinstance(frame, list) or len(frame) != 4
+                        or not all(isinstance(v, int) and not isinstance(v, bool) for v in frame)):
+                    raise ValueError(f"Entri frame section '{name}' tidak valid.")
+                offset, comp_len, raw_len, _ = frame
+                if comp_len < 1 or not 0 <= raw_len <= frame_size:
+                    raise ValueError(f"Ukuran frame section '{name}' tidak masuk akal (comp {comp_len}, raw {raw_len}).")
+                spans.append((offset, offset + comp_len))
+        spans.sort()
+        previous_end = len(ASU_FRAME_MAGIC)
+        for start, end in spans:
+            if start < previous_end or end > index_offset:
+                raise ValueError("Frame kontainer .asu tumpang tindih atau di luar area frame file.")
+            previous_end = end
+        return index
+
+    @classmethod
+    def read_index(cls, data: bytes) -> Dict[str, Any]:
+        if len(data) < len(ASU_FRAME_MAGIC) + ASU_FRAME_TRAILER.size or not cls.is_container(data):
+            raise ValueError("Bukan kontainer .asu multi-frame.")
+        index_offset, index_len, trailer_magic = ASU_FRAME_TRAILER.unpack(data[-ASU_FRAME_TRAILER.size:])
+        if trailer_magic != ASU_FRAME_TRAILER_MAGIC:
+            raise ValueError("Trailer kontainer .asu rusak atau file terpotong.")
+        cls._check_trailer(index_offset, index_len, len(data))
+        return cls._validate_index(json.loads(data[index_offset:index_offset + index_len]), index_offset)
+
+    @staticmethod
+    def section_size(index: Dict[str, Any], name: str) -> int:
+        return sum(frame[2] for frame in index["sections"].get(name, []))
+
+    @classmethod
+    def decode_sections(cls, data: bytes, names: Optional[List[str]] = None,
+                        index: Optional[Dict[str, Any]] = None) -> Dict[str, bytes]:
+        """Decode section tertentu (default: semua). Frame dari semua section didekompresi paralel."""
+        index = index or cls.read_index(data)
+        codec = index["codec"]
+        names = [n for n in (names or index["sections"]) if n in index["sections"]]
+        view = memoryview(data)
+        jobs = [(name, frame) for name in names for frame in index["sections"][name]]
+
+        def _decode(job):
+            name, (offset, comp_len, raw_len, crc) = job
+            raw = cls._decompress(codec, view[offset:offset + comp_len], raw_len)
+            if len(raw) != raw_len or zlib.crc32(raw) != crc:
+                raise ValueError(f"Frame rusak di section '{name}' (offset {offset}).")
+            return raw
+
+        decoded = cls._map(_decode, jobs)
+        result: Dict[str, bytearray] = {name: bytearray() for name in names}
+        for (name, _), raw in zip(jobs, decoded):
+            result[name] += raw
+        return {name: bytes(buf) for name, buf in result.items()}
+
+    @classmethod
+    def read_section_from_file(cls, file_path: str, name: str) -> bytes:
+        """Baca satu section langsung dari disk: hanya trailer, index, dan frame section itu yang dibaca."""
+        with open(file_path, "rb") as f:
+            if f.read(len(ASU_FRAME_MAGIC)) != ASU_FRAME_MAGIC:
+                raise ValueError(f"{file_path} bukan kontainer .asu multi-frame.")
+            f.seek(-ASU_FRAME_TRAILER.size, os.SEEK_END)
+            index_offset, index_len, trailer_magic = ASU_FRAME_TRAILER.unpack(f.read(ASU_FRAME_TRAILER.size))
+            if trailer_magic != ASU_FRAME_TRAILER_MAGIC:
+                raise ValueError("Trailer kontainer .asu rusak atau file terpotong.")
+            cls._check_trailer(index_offset, index_len, f.tell())
+            f.seek(index_offset)
+            index = cls._validate_index(json.loads(f.read(index_len)), index_offset)
+            frames = index["sections"].get(name)
+            if frames is None:
+                raise KeyError(f"Section '{name}' tidak ada di {file_path}.")
+            # Frame satu section ditulis berurutan, jadi cukup satu read kontigu
+            start = frames[0][0]
+            end = frames[-1][0] + frames[-1][1]
+            f.seek(start)
+            chunk = f.read(end - start)
+        relocated = {"codec": index["codec"], "sections": {name: [[o - start, c, r, crc] for o, c, r, crc in frames]}}
+        return cls.decode_sections(chunk, [name], index=relocated)[name]
+
+
 # --- Komponen Arsitektur Mikro (Low-Level) ---
 
+def _pack_int(value: int) -> bytes:
+    """Integer bertanda ukuran bebas: len u8 | bytes little-endian (register ALU tidak dibatasi 64-bit)."""
+    raw = value.to_bytes((value.bit_length() + 8) // 8, "little", signed=True)
+    if len(raw) > 255:
+        raise ValueError(f"Integer terlalu besar untuk checkpoint ({value.bit_length()} bit).")
+    return bytes((len(raw),)) + raw
+
+def _unpack_int(data: bytes, offset: int) -> Tuple[int, int]:
+    length = data[offset]
+    return int.from_bytes(data[offset + 1:offset + 1 + length], "little", signed=True), offset + 1 + length
+
+
 class RegisterFile:
     """Mewakili register seperti r0–r15, pc, sp, fp dan flags."""
     def __init__(self, num_general_registers: int = 16, stack_size_registers: int = 1024): # AUDIT POINT 4
@@ -366,6 +613,28 @@ class RegisterFile:
         for flag in self.flags:
             self.flags[flag] = False
 
+    def snapshot(self) -> bytes:
+        """Checkpoint: count u8 | flags bitmask u8 | pc, sp, fp, status, r0..rN (_pack_int) | f0..fN (f64)."""
+        flag_mask = sum(1 << i for i, value in enumerate(self.flags.values()) if value)
+        out = bytearray((len(self.general_registers), flag_mask))
+        for value in (self.pc, self.sp, self.fp, self.status_register, *self.general_registers):
+            out += _pack_int(value)
+        out += struct.pack(f"<{len(self.float_registers)}d", *self.float_registers)
+        return bytes(out)
+
+    def restore(self, data: bytes):
+        count, flag_mask = data[0], data[1]
+        values, offset = [], 2
+        for _ in range(4 + count):
+            value, offset = _unpack_int(data, offset)
+            values.append(value)
+        self.pc, self.sp, self.fp, self.status_register = values[:4]
+        self.general_registers = values[4:]
+        self.float_registers = list(struct.unpack_from(f"<{count}d", data, offset))
+        for i, flag in enumerate(self.flags):
+            self.flags[flag] = bool(flag_mask >> i & 1)
+        self.instruction_register = None
+
 
 class ProgramCounter: # Sebagian besar sudah terintegrasi dengan RegisterFile.pc
     def __init__(self, initial_address: int = 0):
@@ -486,6 +755,8 @@ class ALU: # AUDIT POINT 5: Perluasan ALU
             logger.error(f"ALU Exception: {e} saat operasi {op_str}")
             raise
 
+MEMORY_SNAPSHOT_HEADER = struct.Struct("<QQQ")
+
 class MemoryUnit: # AUDIT POINT 4: Stack support
     """Bentuk nyata WADAEH. Menyimpan data runtime .asu, termasuk stack."""
     def __init__(self, size_bytes: int = 1024 * 1024, register_file_ref: Optional[RegisterFile] = None):
@@ -518,8 +789,7 @@ class MemoryUnit: # AUDIT POINT 4: Stack support
     def push_stack(self, value_bytes: bytes):
         if not self.register_file: raise RuntimeError("RegisterFile tidak terhubung ke MemoryUnit untuk operasi stack.")
         
-        new_sp = self.register_file.sp - len(value_bytes) + 1 # SP menunjuk ke item terakhir yang di-push
-        actual_write_addr = new_sp - (len(value_bytes)-1) # Alamat awal data
+        actual_write_addr = self.register_file.sp - len(value_bytes) # Alamat awal data; SP menunjuk ke item terakhir yang di-push
         
         if actual_write_addr < self.stack_limit_address:
             raise MemoryError("Stack overflow!")
@@ -545,6 +815,34 @@ class MemoryUnit: # AUDIT POINT 4: Stack support
         address = self.register_file.sp + offset_from_sp
         return self.read(address, num_bytes)
 
+    def snapshot(self) -> bytes:
+        """Checkpoint: size, stack_base, stack_limit (u64) | isi memori. Area kosong dikompresi oleh TempikCheckpoint."""
+        return MEMORY_SNAPSHOT_HEADER.pack(self.size, self.stack_base_address, self.stack_limit_address) + bytes(self.memory)
+
+    def restore(self, data: bytes):
+        size, stack_base, stack_limit = MEMORY_SNAPSHOT_HEADER.unpack_from(data)
+        if len(data) - MEMORY_SNAPSHOT_HEADER.size != size:
+            raise ValueError("Snapshot memori terpotong.")
+        self.memory = bytearray(data[MEMORY_SNAPSHOT_HEADER.size:])
+        self.size, self.stack_base_address, self.stack_limit_address = size, stack_base, stack_limit
+
+    def create_stack_segment(self, register_file: RegisterFile, slot: int, segment_size: int) -> 'MemoryUnit':
+        """View MemoryUnit untuk thread: bytearray yang sama, SP/FP dan batas stack sendiri.
+
+        Segmen ke-`slot` dipotong di bawah area stack utama sehingga tidak pernah tumpang tindih.
+        """
+        top = self.stack_limit_address - slot * segment_size
+        bottom = top - segment_size
+        if bottom < 0:
+            raise MemoryError(f"Tidak cukup memori untuk segmen stack thread slot {slot}.")
+        segment = copy.copy(self) # Shallow copy: self.memory dibagi
+        segment.register_file = register_file
+        segment.stack_base_address = top - 1
+        segment.stack_limit_address = bottom
+        register_file.sp = segment.stack_base_address
+        register_file.fp = segment.stack_base_address
+        return segment
+
 class InstructionCache:
     def __init__(self, capacity: int = 128): 
         self.cache: Dict[int, InstruksiEksekusi] = {} 
@@ -566,6 +864,10 @@ class InstructionCache:
         self.cache[address] = instruction
         self.access_order.append(address)
 
+    def clear(self):
+        self.cache.clear()
+        self.access_order.clear()
+
 class DataCache:
     def __init__(self, capacity_bytes: int = 1024 * 64): # 64KB cache
         self.cache: Dict[int, bytes] = {} 
@@ -643,19 +945,22 @@ class IOHandler:
     def __init__(self, virtual_fs: 'VirtualFS', tempik_id: str):
         self.virtual_fs = virtual_fs
         self.tempik_id = tempik_id
+        self.job_events: Optional['JobEventLog'] = None # Diisi Tempik.run: LOG ikut di-stream ke klien API job
 
-    def read_file(self, path: str) -> bytes:
+    async def read_file(self, path: str) -> bytes:
         logger.debug(f"{self.tempik_id}: Reading file from VFS: {path}")
-        return self.virtual_fs.read_file(path) # VirtualFS akan handle latency (AUDIT POINT 7)
+        return await self.virtual_fs.read_file(path) # VirtualFS akan handle latency (AUDIT POINT 7)
 
-    def write_file(self, path: str, content: bytes, mode: str = 'wb'): # AUDIT POINT 7 (mode)
+    async def write_file(self, path: str, content: bytes, mode: str = 'wb'): # AUDIT POINT 7 (mode)
         logger.debug(f"{self.tempik_id}: Writing file to VFS: {path} (mode: {mode})")
         # Mode 'ab' (append) bisa diimplementasikan di VirtualFS
-        self.virtual_fs.write_file(path, content, mode=mode)
+        await self.virtual_fs.write_file(path, content, mode=mode)
 
     def log_to_terminal(self, message: str, level: str = "INFO"):
         log_level = getattr(logging, level.upper(), logging.INFO)
         logger.log(log_level, f"TEMPİK_IO [{self.tempik_id}]: {message}")
+        if self.job_events is not None:
+            self.job_events.append("log", level=level.upper(), message=message)
 
     def get_user_input(self, prompt: str, tempik: 'Tempik') -> str: # AUDIT POINT 15 (interactive)
         if tempik.execution_mode == ExecutionMode.INTERACTIVE:
@@ -677,11 +982,29 @@ class ExecutionContextManager: # AUDIT POINT 8 (sudah OK, isolasi per Tempik)
         self.role: Optional[str] = None
         self.namespace: Optional[str] = "default" # Untuk isolasi lebih lanjut jika diperlukan
         self.timeout_profile: float = 60.0 
-        self.resource_limits: Dict[str, Any] = {"max_vfs_size_bytes": 100 * 1024 * 1024} # AUDIT POINT 7 (quota)
+        self.resource_limits: Dict[str, Any] = {"max_vfs_size_bytes": 100 * 1024 * 1024, # AUDIT POINT 7 (quota)
+                                                "execute_cpu_seconds": 30, # RLIMIT_CPU untuk proses EXECUTE
+                                                "execute_memory_bytes": DEFAULT_EXECUTE_MEMORY_BYTES, # RLIMIT_AS
+                                                "preempt_check_interval": DEFAULT_PREEMPT_CHECK_INTERVAL} # Yield ControlUnit tiap N instruksi
         self.current_user: Optional[str] = None 
         self.security_policy: Dict[str, Any] = {} 
         self.conditional_flags = {"last_if_condition": False, "in_else_block": False, "last_if_condition_evaluated": False, "currently_skipping_if_block": False}
 
+    def snapshot(self) -> Dict[str, Any]:
+        return {"env_vars": self.env_vars, "cwd": self.current_working_directory, "role": self.role,
+                "namespace": self.namespace, "timeout_profile": self.timeout_profile,
+                "resource_limits": self.resource_limits, "current_user": self.current_user,
+                "security_policy": self.security_policy, "conditional_flags": self.conditional_flags}
+
+    def restore(self, state: Dict[str, Any]):
+        self.env_vars = dict(state["env_vars"])
+        self.current_working_directory = state["cwd"]
+        self.role, self.namespace, self.current_user = state["role"], state["namespace"], state["current_user"]
+        self.timeout_profile = state["timeout_profile"]
+        self.resource_limits.update(state["resource_limits"])
+        self.security_policy = dict(state["security_policy"])
+        self.conditional_flags = dict(state["conditional_flags"])
+
     def set_env_var(self, key: str, value: str):
         self.env_vars[key] = value
         logger.debug(f"{self.tempik_id}: ENV_VAR set: {key}={value}")
@@ -735,6 +1058,7 @@ class VFSNodeMetadata:
     modification_time: float = field(default_factory=time.time)
     access_time: float = field(default_factory=time.time)
     node_type: str = "file" # "file" atau "dir"
+    digests: Dict[str, str] = field(default_factory=dict) # Cache digest konten file; dikosongkan saat konten berubah
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -744,6 +1068,8 @@ class VFSNodeMetadata:
             "access_time": datetime.fromtimestamp(self.access_time).isoformat(), "type": self.node_type
         }
 
+VFS_SNAPSHOT_RECORD = struct.Struct("<BIdddHBBQ")
+
 class VirtualFS:
     def __init__(self, tempik_id: str, context_manager_ref: Optional[ExecutionContextManager] = None):
         self.tempik_id = tempik_id
@@ -879,6 +1205,7 @@ class VirtualFS:
             
             new_content = existing_content + content
             existing_meta.size = len(new_content)
+            existing_meta.digests.clear() # Konten berubah: digest lama tidak berlaku
             existing_meta.modification_time = current_time
             existing_meta.access_time = current_time
             target_dir_dict[filename] = (new_content, existing_meta)
@@ -888,6 +1215,84 @@ class VirtualFS:
         parent_node_content_and_meta[1].modification_time = current_time # Update mod time direktori parent
         logger.debug(f"{self.tempik_id} VFS: File '{path}' ditulis ({len(content)} bytes, mode {mode}).")
 
+    async def write_files_batch(self, files: List[Tuple[str, bytes, int]], dirs: Optional[List[str]] = None) -> int:
+        """Commit banyak file sekaligus (misal hasil UNPACK): satu latency, satu cek quota, satu walk VFS.
+
+        `files` berisi (path_absolut, konten, permissions). Semua-atau-tidak sama sekali untuk cek quota.
+        Return total byte yang ditulis.
+        """
+        await self._latency()
+        for dir_path in dirs or []:
+            self._create_dir_recursive(dir_path)
+
+        # Resolve semua direktori parent dulu (sekali per direktori), lalu hitung delta quota
+        parents: Dict[str, Tuple[Dict, VFSNodeMetadata]] = {}
+        delta_size = 0
+        for path, content, _ in files:
+            dir_path, filename = os.path.dirname(path).replace('\\', '/') or "/", os.path.basename(path)
+            if not filename: raise ValueError(f"Nama file tidak valid dari path: {path}")
+            if dir_path not in parents:
+                if not self.dir_exists(dir_path): self._create_dir_recursive(dir_path)
+                _, _, parent_node = self._get_node_and_parent(dir_path)
+                if not self._check_permissions(parent_node[1], "write"):
+                    raise PermissionError(f"Tidak ada izin tulis di direktori '{dir_path}'.")
+                parents[dir_path] = parent_node
+            existing = parents[dir_path][0].get(filename)
+            if existing is not None and existing[1].node_type != "file":
+                raise IsADirectoryError(f"Path '{path}' sudah berupa direktori.")
+            delta_size += len(content) - (existing[1].size if existing else 0)
+
+        if self.context_manager:
+            max_size = self.context_manager.resource_limits.get("max_vfs_size_bytes", float('inf'))
+            new_total = self.get_total_vfs_size() + delta_size
+            if new_total > max_size:
+                raise MemoryError(f"VFS Quota terlampaui. Size: {new_total}, Max: {max_size}")
+
+        current_time = time.time()
+        total_written = 0
+        for path, content, permissions in files:
+            dir_path = os.path.dirname(path).replace('\\', '/') or "/"
+            parents[dir_path][0][os.path.basename(path)] = (content, VFSNodeMetadata(
+                size=len(content), node_type="file", permissions=permissions,
+                modification_time=current_time, access_time=current_time))
+            total_written += len(content)
+        for _, parent_meta in parents.values():
+            parent_meta.modification_time = current_time
+        logger.debug(f"{self.tempik_id} VFS: Batch {len(files)} file ditulis ({total_written} bytes).")
+        return total_written
+
+    async def get_file_digests(self, path: str, algorithms: List[str]) -> Dict[str, str]:
+        """Digest file VFS untuk beberapa algoritma. Digest di-cache di metadata node (invalidasi saat ditulis),
+        yang belum ada dihitung dalam satu lintasan; file besar di-hash di thread agar event loop tidak terblokir."""
+        await self._latency()
+        _, _, node_content_and_meta = self._get_node_and_parent(path)
+        if not node_content_and_meta or node_content_and_meta[1].node_type != "file":
+            raise FileNotFoundError(f"File tidak ditemukan di VFS: {path}")
+        content, meta = node_content_and_meta
+        if not self._check_permissions(meta, "read"):
+            raise PermissionError(f"Tidak ada izin baca untuk file '{path}'.")
+        meta.access_time = time.time()
+
+        algorithms = [algorithm.lower() for algorithm in algorithms]
+        missing = [algorithm for algorithm in dict.fromkeys(algorithms) if algorithm not in meta.digests]
+        if missing:
+            if len(content) >= HASH_OFFLOAD_MIN_BYTES:
+                computed = await asyncio.to_thread(CryptoEngine.calculate_digests, content, missing)
+            else:
+                computed = CryptoEngine.calculate_digests(content, missing)
+            # Node bisa ditimpa selama hashing di thread; simpan hanya jika konten masih sama
+            _, _, current = self._get_node_and_parent(path)
+            if current is not None and current[0] is content and current[1] is meta:
+                meta.digests.update(computed)
+            return {algorithm: meta.digests.get(algorithm) or computed[algorithm] for algorithm in algorithms}
+        return {algorithm: meta.digests[algorithm] for algorithm in algorithms}
+
+    async def open_file(self, path: str) -> Callable[[], io.BytesIO]:
+        """Opener stream baca untuk file VFS: tiap panggilan membuat file object baru (posisi sendiri, aman dipakai
+        per thread) di atas konten yang sama tanpa menyalinnya. Izin dicek sekali di sini."""
+        content = await self.read_file(path)
+        return lambda: io.BytesIO(content)
+
     async def read_file(self, path: str) -> bytes:
         await self._latency()
         parent_dict, item_name, node_content_and_meta = self._get_node_and_parent(path)
@@ -984,6 +1389,70 @@ class VirtualFS:
             else:
                 logger.warning(f"Tipe konten tidak didukung untuk VFS population di '{current_path}': {type(content_or_struct)}")
     
+    async def read_tree(self, path: str) -> Dict[str, bytes]:
+        """Baca semua file di bawah direktori VFS sekaligus. Return {path_relatif: konten}, urut per path."""
+        await self._latency()
+        _, _, node_content_and_meta = self._get_node_and_parent(path)
+        if not node_content_and_meta or node_content_and_meta[1].node_type != "dir":
+            raise NotADirectoryError(f"Path bukan direktori atau tidak ditemukan di VFS: {path}")
+        if not self._check_permissions(node_content_and_meta[1], "read"):
+            raise PermissionError(f"Tidak ada izin baca untuk direktori '{path}'.")
+
+        files: Dict[str, bytes] = {}
+        def _walk(current_dir_dict: Dict[str, Tuple[Any, VFSNodeMetadata]], prefix: str):
+            for item_name in sorted(current_dir_dict):
+                item_content, item_meta = current_dir_dict[item_name]
+                rel_path = f"{prefix}{item_name}"
+                if item_meta.node_type == "dir":
+                    _walk(item_content, rel_path + "/")
+                elif self._check_permissions(item_meta, "read"):
+                    files[rel_path] = item_content
+        _walk(node_content_and_meta[0], "")
+        return files
+
+    def snapshot(self) -> bytes:
+        """Checkpoint seluruh tree: satu record per node (pre-order, direktori sebelum isinya).
+
+        Record = VFS_SNAPSHOT_RECORD (type, perms, ctime, mtime, atime, len path/owner/group/konten) | path | owner | group | konten.
+        """
+        out = bytearray()
+        def _emit(path: str, content: Any, meta: VFSNodeMetadata):
+            is_dir = meta.node_type == "dir"
+            path_b, owner_b, group_b = path.encode(), meta.owner_user.encode(), meta.owner_group.encode()
+            body = b"" if is_dir else bytes(content)
+            out.extend(VFS_SNAPSHOT_RECORD.pack(int(is_dir), meta.permissions, meta.creation_time, meta.modification_time,
+                                                meta.access_time, len(path_b), len(owner_b), len(group_b), len(body)))
+            out.extend(path_b); out.extend(owner_b); out.extend(group_b); out.extend(body)
+            if is_dir:
+                prefix = path.rstrip("/") + "/"
+                for item_name, (item_content, item_meta) in content.items():
+                    _emit(prefix + item_name, item_content, item_meta)
+        root_content, root_meta = self.fs_root["/"]
+        _emit("/", root_content, root_meta)
+        return bytes(out)
+
+    def restore(self, data: bytes):
+        """Bangun ulang tree dari snapshot() langsung (tanpa latency/cek quota per file)."""
+        dirs: Dict[str, Dict] = {}
+        view, offset = memoryview(data), 0
+        while offset < len(data):
+            is_dir, perms, ctime, mtime, atime, path_len, owner_len, group_len, size = VFS_SNAPSHOT_RECORD.unpack_from(data, offset)
+            offset += VFS_SNAPSHOT_RECORD.size
+            path = bytes(view[offset:offset + path_len]).decode(); offset += path_len
+            owner = bytes(view[offset:offset + owner_len]).decode(); offset += owner_len
+            group = bytes(view[offset:offset + group_len]).decode(); offset += group_len
+            meta = VFSNodeMetadata(size=size, owner_user=owner, owner_group=group, permissions=perms, creation_time=ctime,
+                                   modification_time=mtime, access_time=atime, node_type="dir" if is_dir else "file")
+            node = ({}, meta) if is_dir else (bytes(view[offset:offset + size]), meta)
+            offset += size
+            if path == "/":
+                self.fs_root = {"/": node}
+            else:
+                parent, name = path.rsplit("/", 1)
+                dirs[parent or "/"][name] = node
+            if is_dir:
+                dirs[path] = node[0]
+
     def get_total_vfs_size(self) -> int:
         """Hitung total ukuran file dalam VFS."""
         total_size = 0
@@ -1000,23 +1469,95 @@ class VirtualFS:
         return total_size
 
 
+# Envelope encryption (ENCRYPT/DECRYPT): data key acak 256-bit di-wrap RSA-OAEP, data dienkripsi AEAD per chunk.
+#   MAGIC | alg u8 | chunk_size u32 | nonce_prefix 7B | wrapped_len u16 | wrapped_key | chunk...
+# Nonce chunk = nonce_prefix | index u32 | flag_final u8 (konstruksi STREAM), AAD = seluruh header,
+# jadi chunk yang ditukar, dipotong, atau header yang diubah gagal diautentikasi.
+ENVELOPE_MAGIC = b"ASUENV01"
+ENVELOPE_ALGORITHMS = {"aes-256-gcm": 1, "chacha20-poly1305": 2}
+ENVELOPE_HEADER = struct.Struct(">8sBI7sH")
+ENVELOPE_TAG_BYTES = 16
+DEFAULT_ENVELOPE_CHUNK_BYTES = 64 * 1024
+HASH_CHUNK_BYTES = 1024 * 1024
+HASH_OFFLOAD_MIN_BYTES = 1024 * 1024 # File VFS di atas ini di-hash di thread, bukan di event loop
+
+
+class KeyStore:
+    """Key pair RSA bersama per executor. Dibuat/di-load sekali (bukan generate 2048-bit per Tempik);
+    PEM dari VFS (private_key_ref/public_key_ref) juga di-cache per fingerprint (PEM + password untuk private key)."""
+    def __init__(self, max_cached_keys: int = 32):
+        self._lock = threading.Lock()
+        self.private_key: Optional[rsa.RSAPrivateKey] = None
+        self.public_key: Optional[rsa.RSAPublicKey] = None
+        self.max_cached_keys = max_cached_keys
+        self._pem_cache: "OrderedDict[str, Any]" = OrderedDict() # sha256(pem [+ password]) -> key
+
+    def load_private_pem(self, pem_bytes: bytes, password: Optional[bytes] = None, set_default: bool = False) -> rsa.RSAPrivateKey:
+        # Password ikut fingerprint: PEM terenkripsi yang sudah dibuka satu job tidak terbuka untuk password lain
+        key = self._cached_pem(pem_bytes, lambda: serialization.load_pem_private_key(pem_bytes, password=password),
+                               secret=password if password is not None else b"")
+        if set_default:
+            with self._lock:
+                self.private_key, self.public_key = key, key.public_key()
+        return key
+
+    def load_public_pem(self, pem_bytes: bytes) -> rsa.RSAPublicKey:
+        return self._cached_pem(pem_bytes, lambda: serialization.load_pem_public_key(pem_bytes))
+
+    def default_key_pair(self) -> Tuple[rsa.RSAPrivateKey, rsa.RSAPublicKey]:
+        with self._lock: # Generate hanya sekali walau banyak Tempik meminta bersamaan
+            if not self.private_key:
+                self.private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+                self.public_key = self.private_key.public_key()
+                logger.info("KeyStore: Key pair default executor digenerate.")
+            return self.private_key, self.public_key
+
+    def _cached_pem(self, pem_bytes: bytes, loader: Callable[[], Any], secret: Optional[bytes] = None) -> Any:
+        digest = hashlib.sha256(pem_bytes)
+        if secret is not None:
+            digest.update(b"\0" + hashlib.sha256(secret).digest())
+        fingerprint = digest.hexdigest()
+        with self._lock:
+            key = self._pem_cache.get(fingerprint)
+            if key is not None:
+                self._pem_cache.move_to_end(fingerprint)
+                return key
+        key = loader()
+        with self._lock:
+            self._pem_cache[fingerprint] = key
+            while len(self._pem_cache) > self.max_cached_keys:
+                self._pem_cache.popitem(last=False)
+        return key
+
+
 class CryptoEngine:
-    def __init__(self):
+    def __init__(self, key_store: Optional[KeyStore] = None):
         self.private_key: Optional[rsa.RSAPrivateKey] = None
         self.public_key: Optional[rsa.RSAPublicKey] = None
+        self.key_store = key_store # Jika ada, kunci default diambil dari key store executor
+
+    def reset_keys(self):
+        """Lupakan kunci yang di-load job sebelumnya (load_private_key/load_public_key); default kembali ke KeyStore."""
+        self.private_key = None
+        self.public_key = None
 
     def generate_key_pair_if_needed(self): # Diubah dari _generate_key_pair
+        if not self.private_key and self.key_store:
+            self.private_key, self.public_key = self.key_store.default_key_pair()
         if not self.private_key:
             self.private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
             self.public_key = self.private_key.public_key()
             logger.info("CryptoEngine: Key pair baru digenerate.")
 
     def load_private_key(self, key_bytes: bytes, password: Optional[bytes] = None):
-        self.private_key = serialization.load_pem_private_key(key_bytes, password=password)
+        if self.key_store:
+            self.private_key = self.key_store.load_private_pem(key_bytes, password=password)
+        else:
+            self.private_key = serialization.load_pem_private_key(key_bytes, password=password)
         self.public_key = self.private_key.public_key()
 
     def load_public_key(self, key_bytes: bytes):
-        self.public_key = serialization.load_pem_public_key(key_bytes)
+        self.public_key = self.key_store.load_public_pem(key_bytes) if self.key_store else serialization.load_pem_public_key(key_bytes)
 
     def sign_data(self, data: bytes) -> bytes:
         self.generate_key_pair_if_needed() # Pastikan ada kunci
@@ -1061,6 +1602,8 @@ class CryptoEngine:
         )
 
     def decrypt_data(self, ciphertext: bytes) -> bytes:
+        if self.is_envelope(ciphertext): # Payload besar: envelope AEAD (lihat encrypt_envelope)
+            return self.decrypt_envelope(ciphertext)
         self.generate_key_pair_if_needed()
         if not self.private_key:
             raise ValueError("Private key tidak di-load untuk dekripsi.")
@@ -1069,67 +1612,587 @@ class CryptoEngine:
             rsa_padding.OAEP(mgf=rsa_padding.MGF1(algorithm=hashes.SHA256()), algorithm=hashes.SHA256(), label=None)
         )
 
+    @staticmethod
+    def _envelope_aead(alg_id: int, data_key: bytes):
+        return AESGCM(data_key) if alg_id == ENVELOPE_ALGORITHMS["aes-256-gcm"] else ChaCha20Poly1305(data_key)
+
+    @staticmethod
+    def _envelope_nonce(nonce_prefix: bytes, index: int, is_final: bool) -> bytes:
+        return nonce_prefix + struct.pack(">IB", index, 1 if is_final else 0)
+
+    @staticmethod
+    def is_envelope(data: bytes) -> bool:
+        return data[:len(ENVELOPE_MAGIC)] == ENVELOPE_MAGIC
+
+    @staticmethod
+    def _read_full(reader, size: int) -> bytes:
+        """Baca tepat `size` byte (kurang hanya di EOF): batas chunk envelope harus tetap walau read() pendek."""
+        data = reader.read(size)
+        if len(data) == size or not data:
+            return data
+        buf = bytearray(data)
+        while len(buf) < size:
+            more = reader.read(size - len(buf))
+            if not more: break
+            buf += more
+        return bytes(buf)
+
+    def encrypt_envelope_stream(self, reader, writer, algorithm: str = "aes-256-gcm",
+                                chunk_size: int = DEFAULT_ENVELOPE_CHUNK_BYTES,
+                                public_key: Optional[rsa.RSAPublicKey] = None) -> Tuple[int, int]:
+        """Enkripsi stream ke stream per chunk; hanya dua chunk plaintext (read-ahead untuk flag final) di memori.
+        Return (byte plaintext, byte envelope)."""
+        if algorithm not in ENVELOPE_ALGORITHMS:
+            raise ValueError(f"Algoritma envelope tidak didukung: {algorithm} (pilihan: {', '.join(ENVELOPE_ALGORITHMS)})")
+        if not 1 <= chunk_size <= 0xFFFFFFFF:
+            raise ValueError(f"chunk_size envelope tidak valid: {chunk_size}")
+        if public_key is None:
+            self.generate_key_pair_if_needed()
+            public_key = self.public_key
+        if not public_key:
+            raise ValueError("Public key tidak di-load untuk enkripsi.")
+
+        alg_id = ENVELOPE_ALGORITHMS[algorithm]
+        data_key = os.urandom(32)
+        wrapped_key = public_key.encrypt(
+            data_key, rsa_padding.OAEP(mgf=rsa_padding.MGF1(algorithm=hashes.SHA256()), algorithm=hashes.SHA256(), label=None))
+        nonce_prefix = os.urandom(7)
+        header = ENVELOPE_HEADER.pack(ENVELOPE_MAGIC, alg_id, chunk_size, nonce_prefix, len(wrapped_key)) + wrapped_key
+        aead = self._envelope_aead(alg_id, data_key)
+
+        writer.write(header)
+        plaintext_bytes, envelope_bytes = 0, len(header)
+        current, index = self._read_full(reader, chunk_size), 0
+        while True:
+            following = self._read_full(reader, chunk_size)
+            is_final = not following
+            sealed = aead.encrypt(self._envelope_nonce(nonce_prefix, index, is_final), current, header)
+            writer.write(sealed)
+            plaintext_bytes += len(current)
+            envelope_bytes += len(sealed)
+            if is_final:
+                return plaintext_bytes, envelope_bytes
+            current, index = following, index + 1
+
+    def encrypt_envelope(self, data: bytes, algorithm: str = "aes-256-gcm", chunk_size: int = DEFAULT_ENVELOPE_CHUNK_BYTES,
+                         public_key: Optional[rsa.RSAPublicKey] = None) -> bytes:
+        """Enkripsi data ukuran berapa pun (lihat encrypt_envelope_stream)."""
+        sink = io.BytesIO()
+        self.encrypt_envelope_stream(io.BytesIO(data), sink, algorithm, chunk_size, public_key)
+        return sink.getvalue()
+
+    def decrypt_envelope_stream(self, reader, writer, private_key: Optional[rsa.RSAPrivateKey] = None) -> int:
+        """Dekripsi envelope dari stream ke stream per chunk. Return byte plaintext yang ditulis.
+        Plaintext chunk ditulis begitu lolos autentikasi; jika chunk berikutnya gagal (InvalidTag), output parsial
+        harus dibuang pemanggil."""
+        fixed = self._read_full(reader, ENVELOPE_HEADER.size)
+        if len(fixed) < ENVELOPE_HEADER.size or not self.is_envelope(fixed):
+            raise ValueError("Data bukan envelope terenkripsi ASU.")
+        _, alg_id, chunk_size, nonce_prefix, wrapped_len = ENVELOPE_HEADER.unpack(fixed)
+        if alg_id not in ENVELOPE_ALGORITHMS.values():
+            raise ValueError(f"Algoritma envelope tidak dikenal: {alg_id}")
+        wrapped_key = self._read_full(reader, wrapped_len)
+        sealed_chunk = chunk_size + ENVELOPE_TAG_BYTES
+        current = self._read_full(reader, sealed_chunk)
+        if len(wrapped_key) < wrapped_len or len(current) < ENVELOPE_TAG_BYTES:
+            raise ValueError("Envelope terpotong.")
+        if private_key is None:
+            self.generate_key_pair_if_needed()
+            private_key = self.private_key
+        if not private_key:
+            raise ValueError("Private key tidak di-load untuk dekripsi.")
+
+        header = fixed + wrapped_key
+        data_key = private_key.decrypt(
+            wrapped_key, rsa_padding.OAEP(mgf=rsa_padding.MGF1(algorithm=hashes.SHA256()), algorithm=hashes.SHA256(), label=None))
+        aead = self._envelope_aead(alg_id, data_key)
+
+        plaintext_bytes, index = 0, 0
+        while True:
+            following = self._read_full(reader, sealed_chunk)
+            is_final = not following
+            # InvalidTag jika chunk diubah, ditukar urutannya, atau envelope dipotong (flag final tidak cocok)
+            plaintext = aead.decrypt(self._envelope_nonce(nonce_prefix, index, is_final), current, header)
+            writer.write(plaintext)
+            plaintext_bytes += len(plaintext)
+            if is_final:
+                return plaintext_bytes
+            current, index = following, index + 1
+
+    def decrypt_envelope(self, data: bytes, private_key: Optional[rsa.RSAPrivateKey] = None) -> bytes:
+        sink = io.BytesIO()
+        self.decrypt_envelope_stream(io.BytesIO(data), sink, private_key)
+        return sink.getvalue()
+
+    @staticmethod
+    def new_hasher(algorithm: str):
+        algorithm = algorithm.lower()
+        if algorithm == "sha256": return hashlib.sha256()
+        if algorithm == "sha512": return hashlib.sha512()
+        if algorithm == "blake2b": return hashlib.blake2b()
+        if algorithm == "blake3":
+            if blake3 is None: raise ValueError("Algoritma blake3 memerlukan paket 'blake3' (pip install blake3).")
+            return blake3.blake3()
+        raise ValueError(f"Algoritma hash tidak didukung: {algorithm}")
+
+    @staticmethod
+    def calculate_digests(data: bytes, algorithms: List[str], chunk_size: int = HASH_CHUNK_BYTES) -> Dict[str, str]:
+        """Hitung beberapa digest dalam satu lintasan: tiap chunk di-update ke semua hasher selagi masih di cache CPU."""
+        hashers = {algorithm.lower(): CryptoEngine.new_hasher(algorithm) for algorithm in algorithms}
+        view = memoryview(data)
+        for offset in range(0, len(view), chunk_size):
+            chunk = view[offset:offset + chunk_size]
+            for hasher in hashers.values():
+                hasher.update(chunk) # hashlib melepas GIL untuk chunk besar
+        return {algorithm: hasher.hexdigest() for algorithm, hasher in hashers.items()}
+
     @staticmethod
     def calculate_hash(data: bytes, algorithm: str = "sha256") -> str:
-        h = None
-        if algorithm.lower() == "sha256": h = hashlib.sha256()
-        elif algorithm.lower() == "sha512": h = hashlib.sha512()
-        else: raise ValueError(f"Algoritma hash tidak didukung: {algorithm}")
-        h.update(data)
-        return h.hexdigest()
+        return CryptoEngine.calculate_digests(data, [algorithm])[algorithm.lower()]
+
+# --- Klien HTTP bersama (NetworkUnit) ---
+
+DEFAULT_HTTP_CONNECTIONS_PER_HOST = 16
+DEFAULT_HTTP_KEEPALIVE_SECONDS = 30.0 # 0 = tanpa keep-alive (koneksi baru per request)
+DEFAULT_HTTP_DNS_TTL_SECONDS = 60.0
+DEFAULT_HTTP_TIMEOUT_SECONDS = 30.0 # Per operasi baca/connect, bukan total request
+HTTP_STREAM_CHUNK_BYTES = 64 * 1024
+HTTP_MAX_LINE_BYTES = 64 * 1024
+HTTP_USER_AGENT = "UTEK-963-Tempik/1.0"
+
+
+class _StaleConnection(Exception):
+    """Koneksi keep-alive dari pool ternyata sudah ditutup server sebelum respons; request aman diulang."""
+
+
+@dataclass
+class _PooledConnection:
+    reader: asyncio.StreamReader
+    writer: asyncio.StreamWriter
+    idle_since: float = 0.0
+
+
+class AsyncHTTPClient:
+    """Klien HTTP/1.1 asyncio yang dipakai bersama semua Tempik di satu executor.
+
+    Koneksi keep-alive di-pool per (scheme, host, port) dan dipakai ulang selama idle < keepalive_seconds,
+    jadi Tempik yang memanggil host yang sama tidak membayar handshake TCP/TLS per request. Request
+    bersamaan per host dibatasi semaphore (max_connections_per_host), hasil DNS di-cache selama
+    dns_ttl_seconds, dan body respons bisa dikirim per potongan ke `sink` tanpa ditampung klien.
+    """
+
+    def __init__(self, max_connections_per_host: int = DEFAULT_HTTP_CONNECTIONS_PER_HOST,
+                 keepalive_seconds: float = DEFAULT_HTTP_KEEPALIVE_SECONDS,
+                 dns_ttl_seconds: float = DEFAULT_HTTP_DNS_TTL_SECONDS,
+                 timeout_seconds: float = DEFAULT_HTTP_TIMEOUT_SECONDS,
+                 ssl_context: Optional[ssl.SSLContext] = None):
+        self.max_connections_per_host = max_connections_per_host
+        self.keepalive_seconds = keepalive_seconds
+        self.dns_ttl_seconds = dns_ttl_seconds
+        self.timeout_seconds = timeout_seconds
+        self._ssl_context = ssl_context
+        self._idle: Dict[Tuple[str, str, int], List[_PooledConnection]] = {} # LIFO per host
+        self._limits: Dict[Tuple[str, str, int], asyncio.Semaphore] = {}
+        self._dns: Dict[Tuple[str, int], Tuple[List[str], float]] = {} # (host, port) -> (alamat, kedaluwarsa)
+        self._closed = False
+        self.stats = {"requests": 0, "connections_opened": 0, "connections_reused": 0, "stale_retries": 0,
+                      "dns_hits": 0, "dns_misses": 0, "bytes_received": 0}
+
+    async def _io(self, awaitable):
+        return await asyncio.wait_for(awaitable, timeout=self.timeout_seconds)
+
+    async def _resolve(self, host: str, port: int) -> List[str]:
+        cached = self._dns.get((host, port))
+        if cached and cached[1] > time.monotonic():
+            self.stats["dns_hits"] += 1
+            return cached[0]
+        self.stats["dns_misses"] += 1
+        infos = await self._io(asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM))
+        addresses = list(dict.fromkeys(info[4][0] for info in infos)) # Urutan resolver dipertahankan, tanpa duplikat
+        self._dns[(host, port)] = (addresses, time.monotonic() + self.dns_ttl_seconds)
+        return addresses
+
+    async def _connect(self, scheme: str, host: str, port: int) -> _PooledConnection:
+        ssl_context = None
+        if scheme == "https":
+            if self._ssl_context is None: self._ssl_context = ssl.create_default_context()
+            ssl_context = self._ssl_context
+        last_error: Optional[BaseException] = None
+        for address in await self._resolve(host, port):
+            try:
+                reader, writer = await self._io(asyncio.open_connection(
+                    address, port, ssl=ssl_context, server_hostname=host if ssl_context else None, limit=HTTP_MAX_LINE_BYTES))
+                self.stats["connections_opened"] += 1
+                return _PooledConnection(reader, writer)
+            except (OSError, asyncio.TimeoutError) as e:
+                last_error = e
+        self._dns.pop((host, port), None) # Semua alamat gagal: resolve ulang di percobaan berikutnya
+        raise ConnectionError(f"Gagal terhubung ke {host}:{port}: {last_error}")
+
+    def _take_idle(self, key: Tuple[str, str, int]) -> Optional[_PooledConnection]:
+        pool = self._idle.get(key)
+        now = time.monotonic()
+        while pool:
+            conn = pool.pop() # Koneksi yang paling baru dipakai paling mungkin masih hidup
+            if now - conn.idle_since < self.keepalive_seconds and not conn.reader.at_eof() and not conn.writer.is_closing():
+                return conn
+            conn.writer.close()
+        return None
+
+    def _release(self, key: Tuple[str, str, int], conn: _PooledConnection, reusable: bool):
+        if reusable and self.keepalive_seconds > 0 and not self._closed:
+            conn.idle_since = time.monotonic()
+            self._idle.setdefault(key, []).append(conn)
+        else:
+            conn.writer.close()
+
+    def _drop_idle(self, key: Tuple[str, str, int]):
+        for conn in self._idle.pop(key, []):
+            conn.writer.close()
+
+    async def request(self, method: str, url: str, body: Optional[bytes] = None, headers: Optional[Dict[str, str]] = None,
+                      sink: Optional[Callable[[bytes], Coroutine]] = None) -> Dict[str, Any]:
+        """Kirim satu request. Tanpa `sink`, body respons dikembalikan di "body"; dengan `sink`, tiap potongan
+        body di-`await sink(chunk)` dan "body" bernilai None."""
+        if self._closed: raise RuntimeError("AsyncHTTPClient sudah ditutup.")
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"URL HTTP tidak valid: {url}")
+        port = parts.port or (443 if scheme == "https" else 80)
+        host_header = parts.netloc.rsplit("@", 1)[-1]
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        key = (scheme, parts.hostname, port)
+        limit = self._limits.setdefault(key, asyncio.Semaphore(self.max_connections_per_host))
+
+        async with limit:
+            self.stats["requests"] += 1
+            for attempt in range(2):
+                conn = self._take_idle(key) if attempt == 0 else None
+                reused = conn is not None
+                if reused: self.stats["connections_reused"] += 1
+                else: conn = await self._connect(scheme, parts.hostname, port)
+                try:
+                    return await self._exchange(conn, key, method.upper(), host_header, target, body, headers or {}, sink, reused)
+                except _StaleConnection:
+                    conn.writer.close()
+                    self._drop_idle(key) # Server kemungkinan menutup semua koneksi idle (restart/timeout)
+                    self.stats["stale_retries"] += 1
+                except BaseException:
+                    conn.writer.close() # Posisi stream tidak diketahui: koneksi tidak boleh kembali ke pool
+                    raise
+        raise ConnectionError(f"Koneksi ke {parts.hostname}:{port} ditutup sebelum respons.")
+
+    async def _exchange(self, conn: _PooledConnection, key: Tuple[str, str, int], method: str, host_header: str,
+                        target: str, body: Optional[bytes], headers: Dict[str, str],
+                        sink: Optional[Callable[[bytes], Coroutine]], reused: bool) -> Dict[str, Any]:
+        request_headers = {"Host": host_header, "User-Agent": HTTP_USER_AGENT,
+                           "Connection": "keep-alive" if self.keepalive_seconds > 0 else "close"}
+        request_headers.update({str(k): str(v) for k, v in headers.items()})
+        if body is not None or method in ("POST", "PUT", "PATCH"):
+            request_headers["Content-Length"] = str(len(body or b""))
+        head = f"{method} {target} HTTP/1.1\r\n" + "".join(f"{k}: {v}\r\n" for k, v in request_headers.items()) + "\r\n"
+        reader = conn.reader
+        try:
+            conn.writer.write(head.encode("latin-1") + (body or b""))
+            await self._io(conn.writer.drain())
+            status_line = await self._io(reader.readline())
+        except ConnectionError:
+            if reused: raise _StaleConnection()
+            raise
+        if not status_line:
+            if reused: raise _StaleConnection()
+            raise ConnectionError("Server menutup koneksi sebelum mengirim respons.")
+
+        while True:
+            version, _, rest = status_line.decode("latin-1").strip().partition(" ")
+            status_code = int(rest[:3])
+            reason = rest[4:]
+            response_headers: Dict[str, str] = {}
+            while True:
+                line = await self._io(reader.readline())
+                if line in (b"\r\n", b"\n", b""): break
+                name, _, value = line.decode("latin-1").partition(":")
+                name = name.strip().lower()
+                response_headers[name] = f"{response_headers[name]}, {value.strip()}" if name in response_headers else value.strip()
+            if not 100 <= status_code < 200: break
+            status_line = await self._io(reader.readline()) # 1xx (misal 100 Continue): respons final menyusul
+
+        received = 0
+        chunks: List[bytes] = []
+        async def _deliver(data: bytes):
+            nonlocal received
+            received += len(data)
+            if sink is not None: await sink(data)
+            else: chunks.append(data)
+
+        connection_header = response_headers.get("connection", "").lower()
+        reusable = connection_header != "close" and (version == "HTTP/1.1" or connection_header == "keep-alive")
+        if method == "HEAD" or status_code in (204, 304):
+            pass
+        elif "chunked" in response_headers.get("transfer-encoding", "").lower():
+            while True:
+                size = int((await self._io(reader.readline())).split(b";", 1)[0].strip() or b"0", 16)
+                if size == 0:
+                    while (await self._io(reader.readline())) not in (b"\r\n", b"\n", b""): pass # Trailer
+                    break
+                while size:
+                    data = await self._io(reader.read(min(size, HTTP_STREAM_CHUNK_BYTES)))
+                    if not data: raise asyncio.IncompleteReadError(b"", size)
+                    size -= len(data)
+                    await _deliver(data)
+                await self._io(reader.readexactly(2))
+        elif "content-length" in response_headers:
+            remaining = int(response_headers["content-length"])
+            while remaining:
+                data = await self._io(reader.read(min(remaining, HTTP_STREAM_CHUNK_BYTES)))
+                if not data: raise asyncio.IncompleteReadError(b"", remaining)
+                remaining -= len(data)
+                await _deliver(data)
+        else:
+            reusable = False # Body dibatasi EOF: koneksi habis dipakai
+            while True:
+                data = await self._io(reader.read(HTTP_STREAM_CHUNK_BYTES))
+                if not data: break
+                await _deliver(data)
+
+        self.stats["bytes_received"] += received
+        self._release(key, conn, reusable)
+        return {"status_code": status_code, "reason": reason, "headers": response_headers,
+                "body": b"".join(chunks) if sink is None else None, "bytes": received, "reused_connection": reused}
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "idle_connections": sum(len(pool) for pool in self._idle.values()),
+                "dns_cached_hosts": len(self._dns)}
+
+    async def close(self):
+        self._closed = True
+        for key in list(self._idle):
+            self._drop_idle(key)
+
+
+class LoopbackHTTPServer:
+    """Server HTTP/1.1 minimal di 127.0.0.1 untuk uji dan benchmark AsyncHTTPClient tanpa jaringan luar.
+
+    Route: GET /bytes/<n>[?chunked=1] -> n byte; POST|PUT|PATCH /echo -> JSON {method, path, headers, body};
+    GET /status/<code> -> respons kosong dengan status tsb. Keep-alive dihormati; `stats` mencatat jumlah
+    koneksi dan request yang diterima (untuk membuktikan koneksi dipakai ulang).
+    """
+    _PATTERN = (b"0123456789abcdef" * (HTTP_STREAM_CHUNK_BYTES // 16))
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self.port = port
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._writers: Set[asyncio.StreamWriter] = set()
+        self.stats = {"connections": 0, "requests": 0}
+
+    async def start(self) -> str:
+        """Mulai server; return base URL (port 0 = port bebas dari OS)."""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return f"http://{self.host}:{self.port}"
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._writers): # Koneksi keep-alive yang masih terbuka ikut ditutup
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _write_body(self, writer: asyncio.StreamWriter, size: int, chunked: bool):
+        remaining = size
+        while remaining:
+            piece = self._PATTERN[:min(remaining, len(self._PATTERN))]
+            writer.write(f"{len(piece):x}\r\n".encode() + piece + b"\r\n" if chunked else piece)
+            remaining -= len(piece)
+            await writer.drain()
+        if chunked: writer.write(b"0\r\n\r\n")
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.stats["connections"] += 1
+        self._writers.add(writer)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line: break
+                method, target, version = request_line.decode("latin-1").split()
+                headers: Dict[str, str] = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""): break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                self.stats["requests"] += 1
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                path, _, query = target.partition("?")
+
+                status, payload, stream_size, chunked = 200, b"", None, "chunked=1" in query
+                if method == "GET" and path.startswith("/bytes/"):
+                    stream_size = int(path[len("/bytes/"):])
+                elif method in ("POST", "PUT", "PATCH") and path == "/echo":
+                    payload = json.dumps({"method": method, "path": target, "headers": headers,
+                                          "body": body.decode("utf-8", errors="replace")}).encode()
+                elif path.startswith("/status/"):
+                    status = int(path[len("/status/"):])
+                else:
+                    status, payload = 404, b'{"error": "not found"}'
+                content_type = "application/json" if payload else "application/octet-stream"
+                framing = "Transfer-Encoding: chunked" if chunked and stream_size is not None \
+                    else f"Content-Length: {stream_size if stream_size is not None else len(payload)}"
+                writer.write((f"HTTP/1.1 {status} {'OK' if status < 400 else 'Error'}\r\nContent-Type: {content_type}\r\n"
+                              f"{framing}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n").encode("latin-1") + payload)
+                if stream_size is not None:
+                    await self._write_body(writer, stream_size, chunked)
+                await writer.drain()
+                if not keep_alive: break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+
+async def benchmark_http_client(requests: int = 2000, payload_bytes: int = 1024,
+                                concurrency: int = DEFAULT_HTTP_CONNECTIONS_PER_HOST) -> Dict[str, Any]:
+    """Bandingkan AsyncHTTPClient ber-pool vs koneksi baru per request terhadap LoopbackHTTPServer."""
+    server = LoopbackHTTPServer()
+    base_url = await server.start()
+    results: Dict[str, Any] = {}
+    try:
+        for label, keepalive in (("pooled", DEFAULT_HTTP_KEEPALIVE_SECONDS), ("no_keepalive", 0.0)):
+            client = AsyncHTTPClient(max_connections_per_host=concurrency, keepalive_seconds=keepalive)
+            connections_before = server.stats["connections"]
+            start_time = time.perf_counter()
+            await asyncio.gather(*(client.request("GET", f"{base_url}/bytes/{payload_bytes}") for _ in range(requests)))
+            elapsed = time.perf_counter() - start_time
+            await client.close()
+            results[label] = {"requests_per_second": round(requests / elapsed), "seconds": round(elapsed, 3),
+                              "tcp_connections": server.stats["connections"] - connections_before}
+    finally:
+        await server.close()
+    return results
+
+
+NETWORK_LOCAL_REPO_ENTRY = "file://" # Entri allowed_hosts yang mengizinkan repo lokal (path host / file://) di mode restricted
+SCP_REPO_URL_PATTERN = re.compile(r"^(?:[^@/:]+@)?(\[[^\]]+\]|[^:/]+):(?!//)") # git@host:owner/repo.git
+
+
+def repo_url_host(url: str) -> Optional[str]:
+    """Host dari URL repo git (termasuk gaya scp `user@host:path`); None untuk repo lokal (path atau file://)."""
+    if "://" in url:
+        return urlsplit(url).hostname or None
+    match = SCP_REPO_URL_PATTERN.match(url)
+    return match.group(1).strip("[]") if match else None
+
 
 class NetworkUnit:
-    def __init__(self, context_manager: ExecutionContextManager, tempik_id_str: str):
+    def __init__(self, context_manager: ExecutionContextManager, tempik_id_str: str,
+                 git_mirror_cache: Optional['GitMirrorCache'] = None, http_client: Optional[AsyncHTTPClient] = None):
         self.context_manager = context_manager
         self.tempik_id_str = tempik_id_str
-        # import requests # Pindahkan ke atas jika global, atau lazy import
-        # import aiohttp # Untuk async
+        self.git_mirror_cache = git_mirror_cache or GitMirrorCache() # Biasanya milik executor (dibagi semua Tempik)
+        self.http_client = http_client or AsyncHTTPClient() # Pool koneksi; biasanya milik executor
 
-    async def _check_network_policy(self) -> bool:
+    async def _check_network_policy(self, host: Optional[str] = None, local: bool = False) -> bool:
         policy = self.context_manager.security_policy.get("networking_mode", "isolated")
         if policy == "isolated":
             logger.warning(f"{self.tempik_id_str} NetworkUnit: Operasi jaringan diblokir (mode isolated).")
             return False
-        # "restricted" bisa punya whitelist domain/IP (belum diimplementasikan)
+        # "restricted": jika executor punya whitelist host (pola fnmatch), hanya host tsb yang boleh dihubungi
+        allowed_hosts = self.context_manager.security_policy.get("allowed_hosts") or []
+        if policy == "restricted" and local and NETWORK_LOCAL_REPO_ENTRY not in allowed_hosts:
+            # Repo lokal tidak punya host untuk dicocokkan whitelist: hanya boleh jika diizinkan eksplisit
+            logger.warning(f"{self.tempik_id_str} NetworkUnit: Repo lokal diblokir (mode restricted, "
+                           f"'{NETWORK_LOCAL_REPO_ENTRY}' tidak ada di whitelist).")
+            return False
+        if policy == "restricted" and host and allowed_hosts \
+                and not any(fnmatch.fnmatch(host.lower(), pattern.lower()) for pattern in allowed_hosts):
+            logger.warning(f"{self.tempik_id_str} NetworkUnit: Host '{host}' tidak ada di whitelist (mode restricted).")
+            return False
         return True
 
-    async def fetch_repo(self, url: str, target_dir_vfs: str, io_handler: IOHandler) -> Dict[str, Any]:
-        if not await self._check_network_policy():
-            return {"status": "failed", "error": "Operasi jaringan tidak diizinkan (mode isolated)."}
+    async def fetch_repo(self, url: str, target_dir_vfs: str, io_handler: IOHandler, ref: Optional[str] = None) -> Dict[str, Any]:
+        host = repo_url_host(url)
+        if not await self._check_network_policy(host, local=host is None):
+            return {"status": "failed", "error": "Operasi jaringan tidak diizinkan oleh policy."}
 
-        logger.info(f"{self.tempik_id_str} NetworkUnit: Fetching repo from {url} to VFS:{target_dir_vfs}")
+        logger.info(f"{self.tempik_id_str} NetworkUnit: Fetching repo from {url} (ref: {ref or 'HEAD'}) to VFS:{target_dir_vfs}")
         try:
-            # Simulasi:
-            # Dalam implementasi nyata, gunakan subprocess.run(['git', 'clone', url, host_temp_dir])
-            # lalu salin hasilnya ke VFS.
-            # Untuk sekarang, kita buat file placeholder.
-            await io_handler.virtual_fs._create_dir_recursive(target_dir_vfs) 
-            readme_content = f"# Simulated repo from {url}\nTimestamp: {datetime.now()}".encode('utf-8')
-            await io_handler.write_file(os.path.join(target_dir_vfs, "README.md").replace('\\', '/'), readme_content)
-            return {"status": "success", "message": f"Simulated fetch to VFS:{target_dir_vfs}"}
+            # Clone/fetch hanya menyentuh mirror bare bersama; VFS diisi dari snapshot commit (git archive)
+            start_time = time.perf_counter()
+            snapshot = await self.git_mirror_cache.materialize(url, ref)
+            base = target_dir_vfs.rstrip("/")
+            files = [(f"{base}/{rel}", content, perms) for rel, content, perms in snapshot["files"]]
+            dirs = [target_dir_vfs] + [f"{base}/{rel}" for rel in snapshot["dirs"]]
+            total_bytes = await io_handler.virtual_fs.write_files_batch(files, dirs=dirs)
+            return {"status": "success", "url": url, "ref": ref or "HEAD", "commit": snapshot["commit"],
+                    "target": target_dir_vfs, "files": len(files), "bytes": total_bytes,
+                    "mirror": snapshot["mirror"], "snapshot_cache": snapshot["snapshot_cache"],
+                    "duration_seconds": round(time.perf_counter() - start_time, 4)}
         except Exception as e:
-            logger.error(f"{self.tempik_id_str} NetworkUnit: Gagal simulasi fetch_repo: {e}")
+            logger.error(f"{self.tempik_id_str} NetworkUnit: Gagal fetch_repo {url}: {e}")
             return {"status": "failed", "error": str(e)}
 
-    async def invoke_remote(self, endpoint: str, method: str = "POST", data: Optional[Dict] = None, headers: Optional[Dict]=None) -> Dict[str, Any]:
-        if not await self._check_network_policy():
+    async def invoke_remote(self, endpoint: str, method: str = "POST", data: Optional[Any] = None, headers: Optional[Dict]=None,
+                            output_vfs_path: Optional[str] = None, io_handler: Optional[IOHandler] = None) -> Dict[str, Any]:
+        """Request HTTP lewat klien ber-pool. Dengan output_vfs_path, body di-stream ke VFS (quota dicek per potongan)."""
+        if not await self._check_network_policy(urlsplit(endpoint).hostname):
              return {"status": "failed", "error": "Operasi jaringan tidak diizinkan."}
         
+        method = method.upper()
         logger.info(f"{self.tempik_id_str} NetworkUnit: Invoking remote {method} {endpoint}")
-        # Contoh dengan aiohttp (perlu diinstal: pip install aiohttp)
-        # try:
-        #     import aiohttp
-        #     async with aiohttp.ClientSession(headers=headers) as session:
-        #         async with session.request(method, endpoint, json=data if method in ["POST", "PUT"] else None, 
-        #                                    params=data if method in ["GET", "DELETE"] else None) as response:
-        #             return {
-        #                 "status_code": response.status,
-        #                 "response_body": await response.json() if response.content_type == 'application/json' else await response.text()
-        #             }
-        # except Exception as e:
-        #     logger.error(f"{self.tempik_id_str} NetworkUnit: Gagal invoke_remote: {e}")
-        #     return {"status_code": 500, "error": str(e)}
-        return {"status": "simulated_success", "endpoint": endpoint, "message": "Remote invocation simulated."}
+        url, body, request_headers = endpoint, None, dict(headers or {})
+        if data is not None:
+            if method in ("POST", "PUT", "PATCH"):
+                if isinstance(data, bytes): body = data
+                else:
+                    body = json.dumps(data, default=str).encode("utf-8")
+                    request_headers.setdefault("Content-Type", "application/json")
+            else:
+                url += ("&" if "?" in url else "?") + urlencode(data)
+
+        sink = None
+        chunks: List[bytes] = []
+        if output_vfs_path:
+            if io_handler is None: raise ValueError("io_handler diperlukan untuk output_vfs_path.")
+            # VFS in-memory tidak punya file handle inkremental (append per potongan = copy O(n^2)): potongan
+            # dikumpulkan terhadap sisa quota lalu di-commit dengan satu write. Download yang melebihi quota
+            # dihentikan di potongan pertama yang melewati batas, bukan setelah body utuh diterima.
+            budget = self.context_manager.resource_limits.get("max_vfs_size_bytes", float('inf')) - io_handler.virtual_fs.get_total_vfs_size()
+            streamed = 0
+            async def sink(chunk: bytes):
+                nonlocal streamed
+                streamed += len(chunk)
+                if streamed > budget:
+                    raise MemoryError(f"VFS Quota terlampaui saat streaming respons ({streamed} > {budget} byte).")
+                chunks.append(chunk)
+
+        start_time = time.perf_counter()
+        try:
+            response = await self.http_client.request(method, url, body=body, headers=request_headers, sink=sink)
+        except (OSError, ValueError, MemoryError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+            logger.error(f"{self.tempik_id_str} NetworkUnit: Gagal invoke_remote {method} {endpoint}: {e}")
+            return {"status": "failed", "endpoint": endpoint, "error": str(e) or type(e).__name__}
+
+        status_code = response["status_code"]
+        result = {"status": "success" if 200 <= status_code < 300 else "failed", "endpoint": endpoint,
+                  "status_code": status_code, "headers": response["headers"], "bytes": response["bytes"],
+                  "reused_connection": response["reused_connection"],
+                  "duration_ms": int((time.perf_counter() - start_time) * 1000)}
+        if output_vfs_path:
+            await io_handler.write_file(output_vfs_path, b"".join(chunks))
+            result["output_vfs_path"] = output_vfs_path
+        elif "json" in response["headers"].get("content-type", ""):
+            try: result["response_body"] = json.loads(response["body"] or b"null")
+            except ValueError: result["response_body"] = response["body"].decode("utf-8", errors="replace")
+        else:
+            result["response_body"] = response["body"].decode("utf-8", errors="replace")
+        if result["status"] == "failed":
+            result["error"] = f"HTTP {status_code} {response['reason']}"
+        return result
 
     async def push_result(self, destination_url: str, data: Any, tempik: 'Tempik') -> Dict[str, Any]: # AUDIT POINT 3
         if not await self._check_network_policy():
@@ -1138,26 +2201,207 @@ class NetworkUnit:
         logger.info(f"{self.tempik_id_str} NetworkUnit: Pushing result to {destination_url}")
         # Mirip invoke_remote, tapi biasanya POST dengan payload hasil
         payload = {"source_tempik": tempik.tempik_id, "file_hash": tempik.current_file_hash, "result_data": data}
-        # return await self.invoke_remote(destination_url, method="POST", data=payload)
-        return {"status": "simulated_push_success", "url": destination_url, "data_pushed_summary": str(data)[:100]}
+        result = await self.invoke_remote(destination_url, method="POST", data=payload)
+        result["data_pushed_summary"] = str(data)[:100]
+        return result
+
+
+DEFAULT_VERIFIED_SIGNATURE_TTL_SECONDS = 300.0
+
+
+class SignatureVerificationCache:
+    """Cache public key hasil parse PEM (per fingerprint) dan hasil verifikasi signature yang sukses (dengan TTL).
+    Dipakai bersama executor dan semua Tempik, jadi file yang sudah diverifikasi saat parse tidak di-verify RSA ulang."""
+    def __init__(self, ttl_seconds: float = DEFAULT_VERIFIED_SIGNATURE_TTL_SECONDS,
+                 max_keys: int = 32, max_verified: int = 4096):
+        self.ttl_seconds = ttl_seconds
+        self.max_keys = max_keys
+        self.max_verified = max_verified
+        self._keys: "OrderedDict[str, rsa.RSAPublicKey]" = OrderedDict() # fingerprint PEM -> key
+        self._verified: "OrderedDict[Tuple[str, str, str], float]" = OrderedDict() # (fingerprint, hash, signature) -> expiry
+        self._lock = threading.Lock() # Diakses dari thread pool batch verify
+        self.stats = {"key_hits": 0, "key_loads": 0, "verify_hits": 0, "verify_misses": 0}
+
+    @staticmethod
+    def fingerprint_pem(pem_bytes: bytes) -> str:
+        return hashlib.sha256(pem_bytes).hexdigest()
+
+    @staticmethod
+    def fingerprint_key(public_key: rsa.RSAPublicKey) -> str:
+        der = public_key.public_bytes(serialization.Encoding.DER, serialization.PublicFormat.SubjectPublicKeyInfo)
+        return hashlib.sha256(der).hexdigest()
+
+    def load_public_key(self, pem_bytes: bytes) -> Tuple[str, rsa.RSAPublicKey]:
+        fingerprint = self.fingerprint_pem(pem_bytes)
+        with self._lock:
+            key = self._keys.get(fingerprint)
+            if key is not None:
+                self._keys.move_to_end(fingerprint)
+                self.stats["key_hits"] += 1
+                return fingerprint, key
+        key = serialization.load_pem_public_key(pem_bytes) # Di luar lock; parse ganda yang jarang tidak masalah
+        with self._lock:
+            self._keys[fingerprint] = key
+            self.stats["key_loads"] += 1
+            while len(self._keys) > self.max_keys:
+                self._keys.popitem(last=False)
+        return fingerprint, key
+
+    def is_verified(self, fingerprint: str, content_hash: str, signature_hex: str) -> bool:
+        entry_key = (fingerprint, content_hash, signature_hex)
+        with self._lock:
+            expiry = self._verified.get(entry_key)
+            if expiry is not None and expiry > time.monotonic():
+                self.stats["verify_hits"] += 1
+                return True
+            if expiry is not None:
+                del self._verified[entry_key]
+            self.stats["verify_misses"] += 1
+            return False
+
+    def mark_verified(self, fingerprint: str, content_hash: str, signature_hex: str):
+        # Hanya hasil sukses yang di-cache; signature gagal selalu diverifikasi ulang
+        with self._lock:
+            self._verified[(fingerprint, content_hash, signature_hex)] = time.monotonic() + self.ttl_seconds
+            self._verified.move_to_end((fingerprint, content_hash, signature_hex))
+            while len(self._verified) > self.max_verified:
+                self._verified.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._keys.clear()
+            self._verified.clear()
+
+
+# Command EXECUTE yang diblokir. Semua pola digabung menjadi satu regex saat policy di-compile,
+# jadi satu command hanya di-scan sekali berapa pun jumlah polanya.
+DANGEROUS_COMMAND_PATTERNS = (
+    r"\brm\s+-[a-zA-Z]*(?:r[a-zA-Z]*f|f[a-zA-Z]*r)", # rm -rf / -fr / -Rf
+    r"\b(?:curl|wget)\b[^|;]*\|\s*(?:ba|z)?sh\b", # curl ... | sh
+    r"\bmkfs\b",
+    r":\(\)\s*\{\s*:\s*\|\s*:\s*&\s*\}\s*;\s*:", # Fork bomb
+)
+POLICY_ALLOW, POLICY_DENY, POLICY_INSPECT = 0, 1, 2
+
+
+class CompiledSecurityPolicy:
+    """Policy instruksi satu job, di-compile sekali saat program dimuat.
+
+    `decisions` adalah tabel per opcode (opcode yang tidak ada = ALLOW): DENY langsung diputuskan tanpa membaca
+    security_policy lagi; INSPECT (hanya EXECUTE) mencocokkan command+args ke satu regex gabungan. Parameter
+    instruksi statis setelah load, jadi verdict INSPECT di-cache per instruksi (divalidasi dengan identitas
+    objek command/args). Dry-run = tabel kosong.
+    """
+
+    def __init__(self, security_policy: Dict[str, Any], execution_mode: 'ExecutionMode',
+                 dangerous_patterns: Tuple[str, ...] = DANGEROUS_COMMAND_PATTERNS):
+        self.dry_run = execution_mode == ExecutionMode.DRY_RUN
+        self.decisions: Dict[InstruksiASU, Tuple[int, str]] = {InstruksiASU.EXECUTE: (POLICY_INSPECT, "")}
+        if self.dry_run:
+            self.decisions.clear() # Dry-run tidak melakukan aksi destruktif
+        elif security_policy.get("networking_mode") == "isolated":
+            self.decisions[InstruksiASU.FETCH_REPO] = (POLICY_DENY, "policy jaringan")
+        if "readonly" in security_policy.get("flags", []) and not self.dry_run:
+            for opcode in (InstruksiASU.INJECT, InstruksiASU.EXPORT): # Instruksi tulis VFS
+                self.decisions[opcode] = (POLICY_DENY, "policy readonly")
+        self.dangerous_command = re.compile("|".join(f"(?:{p})" for p in dangerous_patterns))
+        self._verdicts: Dict[int, Tuple[InstruksiEksekusi, Any, Any, bool]] = {} # id(instr) -> (instr, command, args, verdict)
+        self.stats = {"inspected": 0, "denied": 0} # inspected = scan regex (verdict cache miss)
+
+    @staticmethod
+    def command_string(command: Any, args: Any) -> str:
+        parts = list(map(str, command)) if isinstance(command, (list, tuple)) else [str(command)]
+        if isinstance(args, (list, tuple)): parts.extend(map(str, args))
+        return " ".join(parts)
+
+    def check(self, instruction: InstruksiEksekusi) -> bool:
+        entry = self.decisions.get(instruction.instruksi)
+        if entry is None: return True # Jalur tercepat: sebagian besar opcode (ALU, branch, ...) selalu ALLOW
+        decision, reason = entry
+        if decision == POLICY_DENY:
+            self.stats["denied"] += 1
+            logger.warning(f"Instruksi {instruction.instruksi.value} diblokir oleh {reason}.")
+            return False
+
+        params = instruction.parameter
+        cached = self._verdicts.get(id(instruction))
+        if cached is not None and cached[0] is instruction and cached[1] is params.get("command", "") \
+                and cached[2] is params.get("args"):
+            verdict = cached[3]
+        else:
+            self.stats["inspected"] += 1
+            command, args = params.get("command", ""), params.get("args")
+            command_str = self.command_string(command, args)
+            verdict = self.dangerous_command.search(command_str) is None
+            self._verdicts[id(instruction)] = (instruction, command, args, verdict)
+        if not verdict:
+            self.stats["denied"] += 1
+            logger.error(f"Potensi command berbahaya terdeteksi dan diblokir: {self.command_string(params.get('command', ''), params.get('args'))}")
+        return verdict
+
+
+def benchmark_security_policy(iterations: int = 200_000) -> Dict[str, Any]:
+    """Overhead policy per instruksi: evaluasi lama (baca dict + bangun list + scan substring tiap panggilan)
+    vs CompiledSecurityPolicy, untuk campuran instruksi ALU/VFS/EXECUTE."""
+    security_policy = {"networking_mode": "isolated", "flags": ["sandboxed"]}
+    program = [InstruksiEksekusi(InstruksiASU.ADD, parameter={"operand1_reg": 1, "operand2_val": 1, "dest_reg": 1}),
+               InstruksiEksekusi(InstruksiASU.INJECT, parameter={"path": "/a", "content": "x"}),
+               InstruksiEksekusi(InstruksiASU.EXECUTE, parameter={"command": ["python3", "/job/main.py"], "args": ["--fast"]}),
+               InstruksiEksekusi(InstruksiASU.JNZ, parameter={"target_label": "top"})]
+
+    def _uncompiled_check(instruction: InstruksiEksekusi) -> bool: # Referensi: algoritma sebelum policy di-compile
+        if instruction.instruksi == InstruksiASU.FETCH_REPO and security_policy.get("networking_mode") == "isolated":
+            return False
+        is_readonly_mode = "readonly" in security_policy.get("flags", [])
+        if is_readonly_mode and instruction.instruksi in [InstruksiASU.INJECT, InstruksiASU.EXPORT]:
+            return False
+        if instruction.instruksi == InstruksiASU.EXECUTE:
+            command_str = "".join(map(str, instruction.parameter.get("command", "")))
+            return not any(dc in command_str for dc in ["rm -rf", "curl | sh", "mkfs", ":(){ :|:& };:"])
+        return True
+
+    compiled = CompiledSecurityPolicy(security_policy, ExecutionMode.BATCH)
+    results: Dict[str, Any] = {}
+    loop_ns = 0.0
+    for label, check in (("loop", lambda instruction: True), ("uncompiled", _uncompiled_check), ("compiled", compiled.check)):
+        start_time = time.perf_counter()
+        for i in range(iterations):
+            check(program[i & 3])
+        elapsed_ns = (time.perf_counter() - start_time) * 1e9 / iterations
+        if label == "loop": loop_ns = elapsed_ns # Biaya loop + panggilan kosong, dikurangkan dari hasil
+        else: results[f"{label}_ns_per_instruction"] = round(max(elapsed_ns - loop_ns, 0.1), 1)
+    results["speedup"] = round(results["uncompiled_ns_per_instruction"] / results["compiled_ns_per_instruction"], 2)
+    return results
 
 
 class SecurityModule:
-    def __init__(self, context_manager: ExecutionContextManager, crypto_engine: CryptoEngine):
+    _verify_pool: Optional[ThreadPoolExecutor] = None # Thread pool batch verify, dibagi semua instance
+
+    def __init__(self, context_manager: ExecutionContextManager, crypto_engine: CryptoEngine,
+                 signature_cache: Optional[SignatureVerificationCache] = None, profiler: Optional['Profiler'] = None):
         self.context_manager = context_manager
         self.crypto_engine = crypto_engine
+        self.signature_cache = signature_cache or SignatureVerificationCache()
+        self.profiler = profiler # Latensi verifikasi dicatat di sini jika ada
+        self.compiled_policy: Optional[CompiledSecurityPolicy] = None # Di-compile per job oleh compile_policy()
+
+    def compile_policy(self, execution_mode: 'ExecutionMode') -> CompiledSecurityPolicy:
+        """Compile security_policy job saat ini menjadi tabel keputusan; panggil ulang bila policy berubah."""
+        self.compiled_policy = CompiledSecurityPolicy(self.context_manager.security_policy, execution_mode)
+        return self.compiled_policy
 
     def verify_asu_signature(self, file_asu: FileASU, public_key_pem_bytes: Optional[bytes] = None) -> bool:
         if not file_asu.header.checksum_signature:
             logger.warning("Tidak ada checksum_signature di header .asu untuk diverifikasi.")
             return True # Atau False jika signature wajib
 
-        # Load public key jika disediakan, atau gunakan yang sudah ada di engine
+        start_time = time.perf_counter()
+        # Load public key jika disediakan (dari cache per fingerprint PEM), atau gunakan yang sudah ada di engine
         key_to_use = self.crypto_engine.public_key
+        fingerprint = None
         if public_key_pem_bytes:
             try:
-                temp_pub_key = serialization.load_pem_public_key(public_key_pem_bytes)
-                key_to_use = temp_pub_key
+                fingerprint, key_to_use = self.signature_cache.load_public_key(public_key_pem_bytes)
             except Exception as e:
                 logger.error(f"Gagal load public key PEM untuk verifikasi .asu: {e}")
                 return False
@@ -1165,41 +2409,49 @@ class SecurityModule:
         if not key_to_use:
             logger.error("Public key tidak tersedia untuk verifikasi signature .asu.")
             return False
+        if fingerprint is None:
+            fingerprint = self.signature_cache.fingerprint_key(key_to_use)
 
         # Data yang di-sign adalah hash dari konten file (sebelum signature ditambahkan ke header)
         data_to_verify_hash = file_asu.generate_hash(for_signing=True)
-        signature_bytes = bytes.fromhex(file_asu.header.checksum_signature)
+        signature_hex = file_asu.header.checksum_signature
+        if self.signature_cache.is_verified(fingerprint, data_to_verify_hash, signature_hex):
+            self._record_latency(start_time, cache_hit=True)
+            return True
 
-        return self.crypto_engine.verify_signature(data_to_verify_hash.encode('utf-8'), signature_bytes, public_key_override=key_to_use)
+        signature_bytes = bytes.fromhex(signature_hex)
+        is_valid = self.crypto_engine.verify_signature(data_to_verify_hash.encode('utf-8'), signature_bytes, public_key_override=key_to_use)
+        if is_valid:
+            self.signature_cache.mark_verified(fingerprint, data_to_verify_hash, signature_hex)
+        self._record_latency(start_time, cache_hit=False)
+        return is_valid
+
+    def verify_asu_signatures_batch(self, file_asus: List[FileASU], public_key_pem_bytes: Optional[bytes] = None,
+                                    max_workers: Optional[int] = None) -> List[bool]:
+        """Verifikasi banyak file .asu sekaligus di thread pool. Urutan hasil = urutan input."""
+        if len(file_asus) <= 1:
+            return [self.verify_asu_signature(fa, public_key_pem_bytes) for fa in file_asus]
+        if public_key_pem_bytes:
+            self.signature_cache.load_public_key(public_key_pem_bytes) # Parse PEM sekali sebelum fan-out
+        if max_workers:
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="asu-verify") as pool:
+                return list(pool.map(lambda fa: self.verify_asu_signature(fa, public_key_pem_bytes), file_asus))
+        if SecurityModule._verify_pool is None:
+            SecurityModule._verify_pool = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1), thread_name_prefix="asu-verify")
+        return list(SecurityModule._verify_pool.map(lambda fa: self.verify_asu_signature(fa, public_key_pem_bytes), file_asus))
+
+    def _record_latency(self, start_time: float, cache_hit: bool):
+        if self.profiler: # AUDIT POINT 16
+            self.profiler.record_verification_metric((time.perf_counter() - start_time) * 1000, cache_hit)
 
     def check_instruction_policy(self, instruction: InstruksiEksekusi, tempik: 'Tempik') -> bool: # AUDIT POINT 15 (dry-run)
-        if tempik.execution_mode == ExecutionMode.DRY_RUN:
-            # Untuk dry-run, log instruksi tapi jangan blokir kecuali sangat berbahaya
+        policy = self.compiled_policy
+        if policy is None: # ControlUnit dipakai tanpa Tempik.run (misal uji langsung): compile sekali di sini
+            policy = self.compile_policy(tempik.execution_mode)
+        if policy.dry_run and logger.isEnabledFor(logging.INFO):
+            # Untuk dry-run, log instruksi tapi jangan blokir (dry-run tidak melakukan aksi destruktif)
             logger.info(f"DRY_RUN Policy Check: Instruction {instruction.instruksi.value} with params {instruction.parameter}")
-            # Beberapa instruksi mungkin tetap perlu diblokir bahkan dalam dry-run jika sangat berbahaya
-            # if instruction.instruksi == InstruksiASU.SHUTDOWN: return False 
-            return True # Umumnya, dry-run tidak melakukan aksi destruktif
-
-        if instruction.instruksi == InstruksiASU.FETCH_REPO and \
-           self.context_manager.security_policy.get("networking_mode") == "isolated":
-            logger.warning(f"Instruksi {instruction.instruksi.value} diblokir oleh policy jaringan.")
-            return False
-        
-        is_readonly_mode = "readonly" in self.context_manager.security_policy.get("flags", [])
-        write_instructions = [InstruksiASU.INJECT, InstruksiASU.EXPORT] # Tambahkan instruksi tulis VFS lainnya
-        # Perlu cara untuk tahu apakah EXECUTE akan menulis
-        if is_readonly_mode and instruction.instruksi in write_instructions:
-            logger.warning(f"Instruksi {instruction.instruksi.value} diblokir oleh policy readonly.")
-            return False
-            
-        if instruction.instruksi == InstruksiASU.EXECUTE:
-            command_str = "".join(map(str,instruction.parameter.get("command", ""))) 
-            # Filter command berbahaya (contoh sederhana)
-            dangerous_commands = ["rm -rf", "curl | sh", "mkfs", ":(){ :|:& };:"] # Fork bomb
-            if any(dc in command_str for dc in dangerous_commands):
-                logger.error(f"Potensi command berbahaya terdeteksi dan diblokir: {command_str}")
-                return False
-        return True
+        return policy.check(instruction)
 
     def apply_resource_limits(self, tempik: 'Tempik'): # AUDIT POINT 7, 11
         # Cek VFS quota
@@ -1214,31 +2466,87 @@ class SecurityModule:
         # Cek max_exec_time (ditangani oleh Watchdog atau loop utama Tempik)
 
 
+DEFAULT_PREEMPT_CHECK_INTERVAL = 64 # ControlUnit yield ke event loop tiap N instruksi (resource_limits["preempt_check_interval"])
+
+# Prioritas interrupt (kecil = lebih dulu). Dalam satu kelas prioritas urutannya tetap FIFO.
+INTERRUPT_PRIORITIES: Dict[InterruptType, int] = {
+    InterruptType.HALT_REQUESTED: 0, InterruptType.SECURITY_VIOLATION: 0, InterruptType.TIMER_EXPIRED: 0,
+    InterruptType.MEMORY_FAULT: 1, InterruptType.INVALID_INSTRUCTION: 1, InterruptType.INVALID_JUMP_LABEL: 1,
+    InterruptType.ARITHMETIC_ERROR: 1, InterruptType.ASSERTION_FAILURE: 1, InterruptType.RESOURCE_LIMIT_EXCEEDED: 1,
+    InterruptType.MAX_INSTRUCTIONS_REACHED: 1, InterruptType.DEADLINE_MISSED: 1,
+    InterruptType.EXTERNAL_SIGNAL: 2,
+    InterruptType.IO_COMPLETED: 3,
+}
+# Interrupt penegak batas (watchdog, kuota instruksi/resource) juga tidak bisa di-mask: jika bisa, job cukup
+# MASK_INTERRUPT lalu berjalan melewati timeout/limitnya sendiri.
+NON_MASKABLE_INTERRUPTS = frozenset({
+    InterruptType.HALT_REQUESTED, InterruptType.SECURITY_VIOLATION, InterruptType.TIMER_EXPIRED,
+    InterruptType.MAX_INSTRUCTIONS_REACHED, InterruptType.RESOURCE_LIMIT_EXCEEDED,
+})
+
+
 class InterruptController: # AUDIT POINT 6 (diperluas)
-    def __init__(self):
-        self.pending_interrupts: List[Tuple[InterruptType, Optional[Callable], Optional[Dict]]] = [] # (type, handler, details)
+    def __init__(self, profiler: Optional['Profiler'] = None):
+        # Heap (prioritas, urutan, type, handler, details); urutan menjaga FIFO dalam satu prioritas
+        self.pending_interrupts: List[Tuple[int, int, InterruptType, Optional[Callable], Optional[Dict]]] = []
         self.interrupt_vector_table: Dict[InterruptType, Callable] = {} # Handler default
+        self.masked: Set[InterruptType] = set() # Tetap pending sampai di-unmask
+        self.profiler = profiler # Counter per type (AUDIT POINT 16)
+        self._sequence = itertools.count()
+        self.preempt_requested = False # Dicek ControlUnit tiap siklus; True jika ada interrupt unmasked pending
 
     def register_handler(self, interrupt_type: InterruptType, handler: Callable[['Tempik', InterruptType, Optional[Dict]], None]):
         self.interrupt_vector_table[interrupt_type] = handler
 
     def raise_interrupt(self, interrupt_type: InterruptType, handler: Optional[Callable] = None, details: Optional[Dict] = None):
-        self.pending_interrupts.append((interrupt_type, handler, details))
+        heapq.heappush(self.pending_interrupts, (INTERRUPT_PRIORITIES.get(interrupt_type, 2), next(self._sequence),
+                                                 interrupt_type, handler, details))
+        if interrupt_type not in self.masked:
+            self.preempt_requested = True
+        if self.profiler: self.profiler.record_interrupt(interrupt_type.value, "raised")
         logger.warning(f"INTERRUPT: {interrupt_type.value} diajukan. Details: {details}")
 
-    def clear_interrupts(self): # Mungkin tidak diperlukan jika ditangani satu per satu
+    def mask(self, *interrupt_types: InterruptType):
+        non_maskable = NON_MASKABLE_INTERRUPTS.intersection(interrupt_types)
+        if non_maskable:
+            raise ValueError(f"Interrupt tidak bisa di-mask: {', '.join(t.value for t in non_maskable)}")
+        self.masked.update(interrupt_types)
+
+    def unmask(self, *interrupt_types: InterruptType):
+        self.masked.difference_update(interrupt_types)
+        self.preempt_requested = self.has_pending()
+
+    def has_pending(self) -> bool:
+        return any(entry[2] not in self.masked for entry in self.pending_interrupts) if self.masked else bool(self.pending_interrupts)
+
+    def clear_interrupts(self): # Dipanggil saat Tempik mulai job baru
         self.pending_interrupts.clear()
+        self.preempt_requested = False
 
     def handle_interrupt_if_pending(self, tempik: 'Tempik'): 
+        """Safe point: tangani semua interrupt pending (yang tidak di-mask) berurutan menurut prioritas.
+        Berhenti lebih awal jika salah satu handler membuat Tempik FAILED/HALTED."""
         if not self.pending_interrupts:
             return
 
-        interrupt_type, custom_handler, details = self.pending_interrupts.pop(0) # FIFO
-        
-        handler_to_call = custom_handler
-        if not handler_to_call and interrupt_type in self.interrupt_vector_table:
-            handler_to_call = self.interrupt_vector_table[interrupt_type]
-        
+        deferred = [] # Interrupt yang di-mask dikembalikan ke heap setelah drain
+        while self.pending_interrupts:
+            entry = heapq.heappop(self.pending_interrupts)
+            _, _, interrupt_type, custom_handler, details = entry
+            if interrupt_type in self.masked:
+                deferred.append(entry)
+                continue
+            self._dispatch(tempik, interrupt_type, custom_handler, details)
+            if tempik.status in (TempikStatus.FAILED, TempikStatus.HALTED):
+                break
+        for entry in deferred:
+            heapq.heappush(self.pending_interrupts, entry)
+        self.preempt_requested = self.has_pending()
+        # Interrupt mungkin sudah mengubah status Tempik (misal, ke HALTED atau FAILED)
+
+    def _dispatch(self, tempik: 'Tempik', interrupt_type: InterruptType, custom_handler: Optional[Callable], details: Optional[Dict]):
+        handler_to_call = custom_handler or self.interrupt_vector_table.get(interrupt_type)
+        if self.profiler: self.profiler.record_interrupt(interrupt_type.value, "handled" if handler_to_call else "ignored")
         if handler_to_call:
             logger.info(f"Tempik-{tempik.tempik_id}: Menangani interrupt {interrupt_type.value}")
             try:
@@ -1248,8 +2556,6 @@ class InterruptController: # AUDIT POINT 6 (diperluas)
                 tempik.set_status(TempikStatus.FAILED) # Gagal jika handler error
         else:
             logger.warning(f"Tempik-{tempik.tempik_id}: Tidak ada handler untuk interrupt {interrupt_type.value}. Mengabaikan.")
-        
-        # Interrupt mungkin sudah mengubah status Tempik (misal, ke HALTED atau FAILED)
 
 
 # AUDIT POINT 16: Profiler
@@ -1260,6 +2566,10 @@ class Profiler:
         self.instruction_memory_usage: Dict[str, List[int]] = {} # instruction_name -> [mem_bytes_delta]
         self.instruction_utek_units: Dict[str, List[int]] = {} # instruction_name -> [utek_units]
         self.active_timers: Dict[str, float] = {} # key -> start_time
+        self.interrupt_counts: Dict[str, Dict[str, int]] = {} # type -> {"raised"|"handled"|"ignored": n}
+        self.verification_timings: List[float] = [] # Latensi verifikasi signature .asu (ms)
+        self.verification_cache_hits = 0
+        self._verification_lock = threading.Lock() # Batch verify mencatat dari banyak thread
 
     def start_timer(self, key: str = "instruction"):
         self.active_timers[key] = time.perf_counter()
@@ -1274,8 +2584,32 @@ class Profiler:
         self.instruction_memory_usage.setdefault(instruction_name, []).append(mem_delta)
         self.instruction_utek_units.setdefault(instruction_name, []).append(utek_units)
 
+    def record_interrupt(self, interrupt_type: str, event: str):
+        counts = self.interrupt_counts.setdefault(interrupt_type, {"raised": 0, "handled": 0, "ignored": 0})
+        counts[event] += 1
+
+    def record_verification_metric(self, duration_ms: float, cache_hit: bool = False):
+        with self._verification_lock:
+            self.verification_timings.append(duration_ms)
+            if cache_hit: self.verification_cache_hits += 1
+
+    def get_verification_summary(self) -> Dict[str, Any]:
+        with self._verification_lock:
+            timings = list(self.verification_timings)
+            cache_hits = self.verification_cache_hits
+        return {
+            "count": len(timings),
+            "cache_hits": cache_hits,
+            "avg_duration_ms": sum(timings) / len(timings) if timings else 0,
+            "max_duration_ms": max(timings) if timings else 0,
+        }
+
     def get_summary(self) -> Dict[str, Any]:
         summary = {}
+        if self.verification_timings:
+            summary["SIGNATURE_VERIFY"] = self.get_verification_summary()
+        if self.interrupt_counts:
+            summary["INTERRUPTS"] = {t: dict(c) for t, c in self.interrupt_counts.items()}
         for instr, timings in self.instruction_timings.items():
             summary[instr] = {
                 "count": len(timings),
@@ -1318,6 +2652,1259 @@ class Bus:
     def subscribe(self, callback: Callable):
         self.subscribers.append(callback)
 
+# --- Event bus executor (EMIT_EVENT, publish_event) ---
+
+DEFAULT_EVENT_QUEUE_SIZE = 1024
+DEFAULT_EVENT_BATCH_SIZE = 64
+EVENT_OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "block")
+
+
+@dataclass
+class BusEvent:
+    source_id: str
+    event_type: str
+    data: Dict[str, Any]
+    timestamp: float = field(default_factory=time.time)
+
+
+class EventSubscription:
+    """Satu subscriber: queue asyncio terbatas + task pengirim sendiri, jadi subscriber lambat tidak menahan publisher."""
+    def __init__(self, subscription_id: int, pattern: str, callback: Callable, max_queue: int,
+                 overflow: str, batch_size: int, batched: bool):
+        if overflow not in EVENT_OVERFLOW_POLICIES:
+            raise ValueError(f"Overflow policy tidak dikenal: {overflow} (pilihan: {', '.join(EVENT_OVERFLOW_POLICIES)})")
+        self.subscription_id = subscription_id
+        self.pattern = pattern
+        self.callback = callback
+        self.overflow = overflow
+        self.batch_size = max(1, batch_size)
+        self.batched = batched # True: callback(List[BusEvent]); False: callback(source_id, event_type, data) per event
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.task: Optional[asyncio.Task] = None
+        self.stats = {"delivered": 0, "dropped": 0, "errors": 0, "max_depth": 0}
+
+    def matches(self, event_type: str) -> bool:
+        return fnmatch.fnmatchcase(event_type, self.pattern)
+
+    def offer(self, event: BusEvent) -> bool:
+        """Masukkan event tanpa menunggu. Policy 'block' tidak bisa menunggu di sini, jadi diperlakukan drop_newest."""
+        if self.queue.full():
+            if self.overflow != "drop_oldest":
+                self.stats["dropped"] += 1
+                return False
+            self.queue.get_nowait()
+            self.queue.task_done()
+            self.stats["dropped"] += 1
+        self.queue.put_nowait(event)
+        self.stats["max_depth"] = max(self.stats["max_depth"], self.queue.qsize())
+        return True
+
+    async def put(self, event: BusEvent) -> bool:
+        if self.overflow == "block":
+            await self.queue.put(event) # Backpressure: publisher menunggu sampai ada ruang
+            self.stats["max_depth"] = max(self.stats["max_depth"], self.queue.qsize())
+            return True
+        return self.offer(event)
+
+    async def run(self):
+        while True:
+            batch = [await self.queue.get()]
+            while len(batch) < self.batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            try:
+                if self.batched:
+                    await self._invoke(batch)
+                else:
+                    for event in batch:
+                        await self._invoke(event.source_id, event.event_type, event.data)
+                self.stats["delivered"] += len(batch)
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"EventBus: subscriber '{self.pattern}' ({getattr(self.callback, '__name__', self.callback)}) error: {e}")
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    async def _invoke(self, *args):
+        result = self.callback(*args)
+        if asyncio.iscoroutine(result):
+            await result
+
+
+class EventBus:
+    """Fan-out event dengan queue terbatas per subscriber, policy overflow (drop_oldest/drop_newest/block),
+    batching ke subscriber, dan pola topic wildcard (fnmatch: 'build.*', '*')."""
+    def __init__(self, name: str = "EventBus"):
+        self.name = name
+        self.subscriptions: Dict[int, EventSubscription] = {}
+        self._ids = itertools.count(1)
+        self._route_cache: Dict[str, List[EventSubscription]] = {} # event_type -> subscriber yang cocok
+        self.stats = {"published": 0, "unrouted": 0}
+
+    def subscribe(self, pattern: str, callback: Callable, max_queue: int = DEFAULT_EVENT_QUEUE_SIZE,
+                  overflow: str = "drop_oldest", batch_size: int = DEFAULT_EVENT_BATCH_SIZE,
+                  batched: bool = False) -> EventSubscription:
+        subscription = EventSubscription(next(self._ids), pattern, callback, max_queue, overflow, batch_size, batched)
+        self.subscriptions[subscription.subscription_id] = subscription
+        self._route_cache.clear()
+        return subscription
+
+    def unsubscribe(self, subscription: EventSubscription):
+        self.subscriptions.pop(subscription.subscription_id, None)
+        self._route_cache.clear()
+        if subscription.task:
+            subscription.task.cancel()
+
+    def _routes(self, event_type: str) -> List[EventSubscription]:
+        routes = self._route_cache.get(event_type)
+        if routes is None:
+            routes = [s for s in self.subscriptions.values() if s.matches(event_type)]
+            self._route_cache[event_type] = routes
+        return routes
+
+    def _ensure_running(self, subscription: EventSubscription):
+        if subscription.task is None or subscription.task.done():
+            subscription.task = asyncio.get_running_loop().create_task(subscription.run())
+
+    def publish(self, source_id: str, event_type: str, data: Dict[str, Any]) -> int:
+        """Publish tanpa menunggu (bisa dipanggil dari kode sync di dalam event loop). Return jumlah subscriber yang menerima."""
+        self.stats["published"] += 1
+        routes = self._routes(event_type)
+        if not routes:
+            self.stats["unrouted"] += 1
+            return 0
+        event = BusEvent(source_id, event_type, data)
+        accepted = 0
+        for subscription in routes:
+            self._ensure_running(subscription)
+            accepted += subscription.offer(event)
+        return accepted
+
+    async def publish_async(self, source_id: str, event_type: str, data: Dict[str, Any]) -> int:
+        """Seperti publish(), tapi subscriber dengan policy 'block' memberi backpressure ke publisher."""
+        self.stats["published"] += 1
+        routes = self._routes(event_type)
+        if not routes:
+            self.stats["unrouted"] += 1
+            return 0
+        event = BusEvent(source_id, event_type, data)
+        accepted = 0
+        for subscription in routes:
+            self._ensure_running(subscription)
+            accepted += await subscription.put(event)
+        return accepted
+
+    async def drain(self):
+        """Tunggu sampai semua event yang sudah di-queue diproses subscriber."""
+        for subscription in list(self.subscriptions.values()):
+            if subscription.task and not subscription.task.done():
+                await subscription.queue.join()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "published": self.stats["published"],
+            "unrouted": self.stats["unrouted"],
+            "subscribers": [{"id": s.subscription_id, "pattern": s.pattern, "overflow": s.overflow,
+                             "queue_depth": s.queue.qsize(), "queue_capacity": s.queue.maxsize, **s.stats}
+                            for s in self.subscriptions.values()],
+        }
+
+    async def close(self):
+        tasks = [s.task for s in self.subscriptions.values() if s.task and not s.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# --- Arsip (UNPACK) ---
+
+ARCHIVE_READ_CHUNK_BYTES = 1024 * 1024
+ARCHIVE_COMMIT_BATCH_BYTES = 8 * 1024 * 1024 # Member hasil ekstraksi di-commit ke VFS per batch sebesar ini
+# zlib melepas GIL hanya untuk buffer besar; member kecil lebih cepat diekstrak berurutan
+ARCHIVE_PARALLEL_MIN_AVG_MEMBER_BYTES = 256 * 1024
+ARCHIVE_FORMATS = ("zip", "tar", "tar.gz", "tar.xz", "tar.zst", "tar.lz4")
+_ARCHIVE_EXTENSIONS = ((".tar.gz", "tar.gz"), (".tgz", "tar.gz"), (".tar.xz", "tar.xz"), (".txz", "tar.xz"),
+                       (".tar.zst", "tar.zst"), (".tzst", "tar.zst"), (".tar.lz4", "tar.lz4"), (".tar", "tar"),
+                       (".zip", "zip"))
+
+
+def detect_archive_format(path: str, data: bytes) -> Optional[str]:
+    """Deteksi format dari ekstensi, lalu dari magic bytes jika ekstensi tidak dikenal."""
+    lowered = path.lower()
+    for ext, fmt in _ARCHIVE_EXTENSIONS:
+        if lowered.endswith(ext): return fmt
+    if data[:4] == b"PK\x03\x04": return "zip"
+    if data[:2] == b"\x1f\x8b": return "tar.gz"
+    if data[:6] == b"\xfd7zXZ\x00": return "tar.xz"
+    if data[:4] == b"\x28\xb5\x2f\xfd": return "tar.zst"
+    if data[:4] == b"\x04\x22\x4d\x18": return "tar.lz4"
+    if data[257:262] == b"ustar": return "tar"
+    return None
+
+
+class ArchiveExtractor:
+    """Ekstraksi arsip dari stream baca ke batch entri VFS, tanpa menyentuh VFS.
+
+    iter_batches() dijalankan langkah demi langkah di thread (bukan event loop): member dibaca satu per satu per
+    chunk dan dikumpulkan paling banyak `batch_bytes` sebelum di-yield, jadi memori puncak sebatas satu batch,
+    bukan seluruh isi arsip. Total byte hasil ekstraksi dibatasi `max_total_bytes` (quota VFS yang tersisa)
+    dan dicek per member, supaya arsip bom gagal cepat sebelum memakan memori.
+    """
+
+    def __init__(self, opener: Callable[[], Any], fmt: str, target_dir: str, max_total_bytes: float = float('inf'),
+                 workers: int = 1, batch_bytes: int = ARCHIVE_COMMIT_BATCH_BYTES):
+        if fmt not in ARCHIVE_FORMATS:
+            raise ValueError(f"Format arsip tidak didukung: {fmt}")
+        self.opener = opener # Membuat file object baca baru (zip paralel butuh satu per thread)
+        self.fmt = fmt
+        self.target_dir = target_dir.rstrip("/") or "/"
+        self.max_total_bytes = max_total_bytes
+        self.workers = max(1, workers)
+        self.batch_bytes = batch_bytes
+        self.skipped: List[str] = []
+        self._total_bytes = 0
+
+    def _vfs_path(self, member_name: str) -> Optional[str]:
+        """Path VFS untuk member, atau None jika keluar dari target_dir (Zip Slip / path absolut / '..')."""
+        parts = [p for p in member_name.replace('\\', '/').split('/') if p not in ("", ".")]
+        if not parts or ".." in parts:
+            return None
+        return f"{self.target_dir.rstrip('/')}/{'/'.join(parts)}"
+
+    def _charge(self, size: int, member_name: str):
+        self._total_bytes += size
+        if self._total_bytes > self.max_total_bytes:
+            raise MemoryError(f"Isi arsip melebihi quota VFS yang tersisa ({self.max_total_bytes} bytes) di member {member_name}")
+
+    @staticmethod
+    def _read_chunked(stream) -> bytes:
+        buf = bytearray()
+        while True:
+            chunk = stream.read(ARCHIVE_READ_CHUNK_BYTES)
+            if not chunk: return bytes(buf)
+            buf += chunk
+
+    def iter_batches(self) -> Iterator[Tuple[List[Tuple[str, bytes, int]], List[str]]]:
+        """Yield (files, dirs) per batch; dirs hanya direktori baru sejak batch sebelumnya."""
+        if self.fmt == "zip": return self._iter_zip()
+        return self._iter_tar()
+
+    def _iter_zip(self):
+        with zipfile.ZipFile(self.opener(), 'r') as zf:
+            members, dirs = [], []
+            for info in zf.infolist():
+                vfs_path = self._vfs_path(info.filename)
+                if vfs_path is None:
+                    logger.warning(f"Potensi Zip Slip terdeteksi: {info.filename}. Dilewati.")
+                    self.skipped.append(info.filename)
+                elif info.is_dir():
+                    dirs.append(vfs_path)
+                else:
+                    permissions = (info.external_attr >> 16) & 0o777 or 0o644
+                    members.append((info, vfs_path, permissions | 0o600))
+
+            # Batch berdasar ukuran di header: ZipExtFile berhenti di file_size, jadi itu batas atas yang valid
+            batches, current, current_bytes = [], [], 0
+            for member in members:
+                if current and current_bytes + member[0].file_size > self.batch_bytes:
+                    batches.append(current)
+                    current, current_bytes = [], 0
+                current.append(member)
+                current_bytes += member[0].file_size
+            if current: batches.append(current)
+
+            declared_bytes = sum(info.file_size for info, _, _ in members)
+            parallel = self.workers > 1 and len(members) > 1 and declared_bytes / len(members) >= ARCHIVE_PARALLEL_MIN_AVG_MEMBER_BYTES
+            local = threading.local()
+
+            def _read_members(archive: zipfile.ZipFile, batch):
+                out = []
+                for info, vfs_path, permissions in batch:
+                    with archive.open(info) as member_stream:
+                        out.append((vfs_path, self._read_chunked(member_stream), permissions))
+                return out
+
+            def _extract_slice(batch):
+                # Satu ZipFile per thread (dipakai ulang antar batch): ZipFile tidak aman dibaca paralel
+                if getattr(local, "zf", None) is None:
+                    local.zf = zipfile.ZipFile(self.opener(), 'r')
+                return _read_members(local.zf, batch)
+
+            pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="asu-unpack") if parallel else None
+            try:
+                if not batches and dirs:
+                    yield [], dirs
+                for batch in batches:
+                    for info, _, _ in batch:
+                        self._charge(info.file_size, info.filename)
+                    if pool is not None:
+                        files = [entry for extracted in pool.map(_extract_slice, [batch[i::self.workers] for i in range(self.workers)])
+                                 for entry in extracted]
+                    else:
+                        files = _read_members(zf, batch)
+                    yield files, dirs
+                    dirs = []
+            finally:
+                if pool is not None:
+                    pool.shutdown(wait=True)
+
+    def _open_tar_stream(self):
+        import lzma
+        import tarfile
+        raw = self.opener()
+        # Dekompresi lewat file object buffered, bukan mode "r|gz" bawaan tarfile: _Stream memotong
+        # buffer hasil dekompresi per blok 512 byte sehingga kuadratik untuk arsip dengan rasio tinggi.
+        if self.fmt == "tar.gz":
+            raw = gzip.GzipFile(fileobj=raw, mode="rb")
+        elif self.fmt == "tar.xz":
+            raw = lzma.LZMAFile(raw, mode="rb")
+        elif self.fmt == "tar.zst":
+            if zstandard is None:
+                raise RuntimeError("Dukungan tar.zst memerlukan paket 'zstandard' (pip install zstandard).")
+            # read_across_frames: arsip hasil EXPORT (dan zstd -T) terdiri dari banyak frame
+            raw = io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True),
+                                    buffer_size=ARCHIVE_READ_CHUNK_BYTES)
+        elif self.fmt == "tar.lz4":
+            raw = lz4.frame.LZ4FrameFile(raw, mode="rb")
+        return tarfile.open(fileobj=raw, mode="r|") # Mode stream: member dibaca berurutan tanpa seek
+
+    def _iter_tar(self):
+        files, dirs, batch_bytes = [], [], 0
+        with self._open_tar_stream() as tf:
+            for member in tf:
+                vfs_path = self._vfs_path(member.name)
+                if vfs_path is None:
+                    logger.warning(f"Potensi path traversal di arsip tar: {member.name}. Dilewati.")
+                    self.skipped.append(member.name)
+                elif member.isdir():
+                    dirs.append(vfs_path)
+                elif member.isfile():
+                    self._charge(member.size, member.name)
+                    files.append((vfs_path, self._read_chunked(tf.extractfile(member)), (member.mode & 0o777) | 0o600))
+                    batch_bytes += member.size
+                    if batch_bytes >= self.batch_bytes:
+                        yield files, dirs
+                        files, dirs, batch_bytes = [], [], 0
+                else: # Symlink, hardlink, device: VFS tidak mendukung, dan symlink bisa dipakai untuk keluar dari target
+                    self.skipped.append(member.name)
+        if files or dirs:
+            yield files, dirs
+
+
+EXPORT_CODECS = {"zip": ("store", "deflate"), "tar": ("none", "gz", "lz4", "zstd")}
+EXPORT_BLOCK_BYTES = 4 * 1024 * 1024 # Ukuran blok tar yang dikompresi sebagai frame independen
+_ZIP64_LIMIT = 0xFFFFFFFF # Nilai >= ini wajib memakai extra field zip64
+_ZIP64_MARKER = 0xFFFFFFFF # Isi field 32-bit yang nilainya dipindah ke extra zip64
+
+
+def _compress_export_block(codec: str, level: Optional[int], data) -> bytes:
+    """Kompresi satu blok sebagai frame/member mandiri; gabungan frame tetap stream gz/lz4/zstd yang valid."""
+    if codec == "gz": return gzip.compress(data, compresslevel=6 if level is None else level)
+    if codec == "lz4": return lz4.frame.compress(data, compression_level=level or 0)
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Codec zstd memerlukan paket 'zstandard' (pip install zstandard).")
+        return zstandard.ZstdCompressor(level=3 if level is None else level).compress(data)
+    return bytes(data)
+
+
+class ArchiveWriter:
+    """Tulis pohon file VFS sebagai arsip zip/tar ke sink (file host atau BytesIO) secara streaming.
+
+    Kompresi (per member untuk zip, per blok untuk tar) dijalankan di thread pool dengan jendela terbatas,
+    hasilnya ditulis berurutan begitu siap; arsip tidak pernah disusun utuh di memori sebelum ditulis.
+    """
+
+    def __init__(self, files: Dict[str, bytes], fmt: str, codec: str, sink, level: Optional[int] = None,
+                 workers: int = 1, metadata: Optional[Dict[str, VFSNodeMetadata]] = None,
+                 manifest_name: Optional[str] = None):
+        if fmt not in EXPORT_CODECS or codec not in EXPORT_CODECS[fmt]:
+            raise ValueError(f"Kombinasi format/codec tidak didukung: {fmt}/{codec}. Pilihan: {EXPORT_CODECS}")
+        self.files = files
+        self.fmt = fmt
+        self.codec = codec
+        self.sink = sink
+        self.level = level
+        self.workers = max(1, workers)
+        self.metadata = metadata or {}
+        self.manifest_name = manifest_name
+        self.bytes_written = 0
+
+    def _emit(self, data):
+        self.sink.write(data)
+        self.bytes_written += len(data)
+
+    def _ordered_map(self, pool: ThreadPoolExecutor, fn: Callable, items):
+        """map() berurutan dengan paling banyak 2*workers tugas di udara (batas memori)."""
+        pending = []
+        for item in items:
+            pending.append(pool.submit(fn, item))
+            if len(pending) >= self.workers * 2:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+    def write(self) -> Dict[str, Any]:
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="asu-export") as pool:
+            members = list(self.files.items())
+            manifest_sha256 = None
+            if self.manifest_name:
+                hashes = pool.map(lambda item: hashlib.sha256(item[1]).hexdigest(), members)
+                manifest = {path: {"sha256": digest, "size": len(content)}
+                            for (path, content), digest in zip(members, hashes)}
+                manifest_bytes = json.dumps({"files": manifest}, indent=2, sort_keys=True).encode("utf-8")
+                manifest_sha256 = hashlib.sha256(manifest_bytes).hexdigest()
+                members.append((self.manifest_name, manifest_bytes))
+            if self.fmt == "zip": self._write_zip(pool, members)
+            else: self._write_tar(pool, members)
+        return {"members": len(members), "bytes_in": sum(len(c) for _, c in members),
+                "bytes_out": self.bytes_written, "manifest_sha256": manifest_sha256}
+
+    def _meta(self, path: str) -> Tuple[int, float]:
+        meta = self.metadata.get(path)
+        return (meta.permissions, meta.modification_time) if meta else (0o644, time.time())
+
+    # -- zip --
+    def _compress_zip_member(self, item):
+        path, content = item
+        crc = zlib.crc32(content)
+        if self.codec == "deflate" and content:
+            compressor = zlib.compressobj(6 if self.level is None else self.level, zlib.DEFLATED, -15)
+            compressed = compressor.compress(content) + compressor.flush()
+            if len(compressed) < len(content):
+                return path, content, compressed, zipfile.ZIP_DEFLATED, crc
+        return path, content, content, zipfile.ZIP_STORED, crc # Tidak mengecil: simpan apa adanya
+
+    def _write_zip(self, pool: ThreadPoolExecutor, members):
+        central_directory = []
+        for path, content, data, method, crc in self._ordered_map(pool, self._compress_zip_member, members):
+            permissions, mtime = self._meta(path)
+            t = time.localtime(mtime)
+            if t.tm_year < 1980: t = time.localtime(315532800) # Epoch DOS
+            dos_time = t.tm_hour << 11 | t.tm_min << 5 | t.tm_sec // 2
+            dos_date = (t.tm_year - 1980) << 9 | t.tm_mon << 5 | t.tm_mday
+            name = path.encode("utf-8")
+            offset = self.bytes_written
+            zip64 = len(content) >= _ZIP64_LIMIT or len(data) >= _ZIP64_LIMIT
+            extra = struct.pack("<HHQQ", 0x0001, 16, len(content), len(data)) if zip64 else b""
+            size_fields = (_ZIP64_MARKER, _ZIP64_MARKER) if zip64 else (len(data), len(content))
+            version = 45 if zip64 else 20
+            self._emit(struct.pack("<IHHHHHIIIHH", 0x04034b50, version, 0x0800, method, dos_time, dos_date,
+                                   crc, *size_fields, len(name), len(extra)) + name + extra)
+            self._emit(data)
+            central_directory.append((name, version, method, dos_time, dos_date, crc, len(data), len(content),
+                                      offset, permissions))
+
+        cd_offset = self.bytes_written
+        for name, version, method, dos_time, dos_date, crc, csize, usize, offset, permissions in central_directory:
+            # Field yang tidak muat 32-bit diisi 0xFFFFFFFF dan nilainya dipindah ke extra zip64 (urutan: usize, csize, offset)
+            zip64_values = []
+            if usize >= _ZIP64_LIMIT or csize >= _ZIP64_LIMIT:
+                zip64_values += [usize, csize]
+                usize = csize = _ZIP64_MARKER
+            if offset >= _ZIP64_LIMIT:
+                zip64_values.append(offset)
+                offset = _ZIP64_MARKER
+            extra = struct.pack(f"<HH{len(zip64_values)}Q", 0x0001, 8 * len(zip64_values), *zip64_values) if zip64_values else b""
+            self._emit(struct.pack("<IHHHHHHIIIHHHHHII", 0x02014b50, (3 << 8) | 45, 45 if zip64_values else version,
+                                   0x0800, method, dos_time, dos_date, crc, csize, usize, len(name), len(extra),
+                                   0, 0, 0, (0o100000 | permissions) << 16, offset) + name + extra)
+        cd_size = self.bytes_written - cd_offset
+        count = len(central_directory)
+        if count >= 0xFFFF or cd_size >= _ZIP64_LIMIT or cd_offset >= _ZIP64_LIMIT:
+            zip64_eocd_offset = self.bytes_written
+            self._emit(struct.pack("<IQHHIIQQQQ", 0x06064b50, 44, 45, 45, 0, 0, count, count, cd_size, cd_offset))
+            self._emit(struct.pack("<IIQI", 0x07064b50, 0, zip64_eocd_offset, 1))
+        self._emit(struct.pack("<IHHHHIIH", 0x06054b50, 0, 0, min(count, 0xFFFF), min(count, 0xFFFF),
+                               min(cd_size, _ZIP64_MARKER), min(cd_offset, _ZIP64_MARKER), 0))
+
+    # -- tar --
+    def _tar_pieces(self, members):
+        import tarfile
+        for path, content in members:
+            permissions, mtime = self._meta(path)
+            info = tarfile.TarInfo(path)
+            info.size, info.mode, info.mtime = len(content), permissions, int(mtime)
+            yield info.tobuf(format=tarfile.PAX_FORMAT, encoding="utf-8", errors="surrogateescape")
+            yield memoryview(content)
+            if len(content) % tarfile.BLOCKSIZE:
+                yield b"\0" * (tarfile.BLOCKSIZE - len(content) % tarfile.BLOCKSIZE)
+        yield b"\0" * (2 * tarfile.BLOCKSIZE) # Penanda akhir arsip
+
+    def _tar_blocks(self, members):
+        block = bytearray()
+        for piece in self._tar_pieces(members):
+            while len(piece):
+                take = EXPORT_BLOCK_BYTES - len(block)
+                block += piece[:take]
+                piece = piece[take:]
+                if len(block) >= EXPORT_BLOCK_BYTES:
+                    yield block
+                    block = bytearray()
+        if block: yield block
+
+    def _write_tar(self, pool: ThreadPoolExecutor, members):
+        if self.codec == "none":
+            for piece in self._tar_pieces(members): self._emit(piece)
+            return
+        compress = lambda block: _compress_export_block(self.codec, self.level, block)
+        for frame in self._ordered_map(pool, compress, self._tar_blocks(members)):
+            self._emit(frame)
+
+
+# --- Backend EXECUTE (proses nyata) ---
+
+DEFAULT_PYTHON_WORKERS = 2
+DEFAULT_EXECUTE_MEMORY_BYTES = 1024 * 1024 * 1024 # RLIMIT_AS default per eksekusi
+EXECUTE_OUTPUT_CHUNK_BYTES = asu_python_worker.OUTPUT_CHUNK_BYTES
+EXECUTE_OUTPUT_TAIL_BYTES = 4096 # Potongan stdout/stderr yang ikut dikembalikan di hasil instruksi
+
+# Worker Python hangat: lihat asu_python_worker (bootstrap, fork per request, RLIMIT, protokol frame).
+
+
+@dataclass
+class ExecuteRequest:
+    """Permintaan EXECUTE yang sudah di-resolve dari VFS, siap dijalankan oleh backend."""
+    argv: List[str] # argv[0] = interpreter/command
+    script_source: Optional[bytes] = None # Isi script dari VFS (jika argv[1] adalah file VFS)
+    script_vfs_path: Optional[str] = None
+    script_argv_index: int = 1 # 0 = script adalah executable itu sendiri (misal hasil COMPILE)
+    env: Dict[str, str] = field(default_factory=dict)
+    cwd: Optional[str] = None # Direktori host sementara tempat proses berjalan
+    cpu_seconds: Optional[int] = None # RLIMIT_CPU
+    memory_bytes: Optional[int] = None # RLIMIT_AS
+    timeout_seconds: float = 60.0
+
+
+def _kill_process_group(proc) -> None:
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError, AttributeError):
+        try: proc.kill()
+        except ProcessLookupError: pass
+
+
+class ExecuteBackend(ABC):
+    """Antarmuka backend EXECUTE. Backend dipilih berurutan: yang pertama `supports()` dipakai."""
+    name = "base"
+
+    @abstractmethod
+    def supports(self, request: ExecuteRequest) -> bool:
+        """True jika backend ini bisa menjalankan request."""
+
+    @abstractmethod
+    async def run(self, request: ExecuteRequest, on_output: Callable[[str, bytes], Coroutine]) -> Dict[str, Any]:
+        """Jalankan request, kirim potongan output via on_output(stream, data). Return {"returncode", "timed_out"}."""
+
+    async def close(self):
+        pass
+
+
+class PythonWorkerPool(ExecuteBackend):
+    """Pool worker Python hangat (pre-forked) yang dipakai ulang antar instruksi EXECUTE."""
+    name = "python_worker_pool"
+    PYTHON_COMMANDS = ("python", "python3")
+
+    def __init__(self, size: int = DEFAULT_PYTHON_WORKERS, python_executable: Optional[str] = None,
+                 preload_modules: Optional[List[str]] = None):
+        self.size = size
+        self.python_executable = python_executable or sys.executable
+        self.preload_modules = list(preload_modules or [])
+        self._idle: Optional[asyncio.Queue] = None # Berisi proses worker, atau None = slot perlu respawn
+        self._workers: Set[Any] = set()
+        self.stats = {"runs": 0, "workers_spawned": 0, "workers_replaced": 0}
+
+    @staticmethod
+    def is_supported() -> bool:
+        return os.name == "posix" and hasattr(os, "fork")
+
+    def supports(self, request: ExecuteRequest) -> bool:
+        return (self.is_supported() and request.script_source is not None and request.script_argv_index == 1
+                and os.path.basename(request.argv[0]) in self.PYTHON_COMMANDS)
+
+    async def start(self):
+        if self._idle is not None: return
+        self._idle = asyncio.Queue()
+        for _ in range(self.size):
+            self._idle.put_nowait(None)
+        workers = await asyncio.gather(*(self._spawn_worker() for _ in range(self.size)), return_exceptions=True)
+        # Ganti slot kosong dengan worker yang berhasil start; sisanya di-spawn saat dipakai
+        for worker in workers:
+            if not isinstance(worker, BaseException):
+                self._idle.get_nowait()
+                self._idle.put_nowait(worker)
+
+    async def _spawn_worker(self):
+        proc = await asyncio.create_subprocess_exec(
+            self.python_executable, asu_python_worker.WORKER_SCRIPT, *self.preload_modules,
+            stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL,
+            start_new_session=True) # Grup proses sendiri supaya timeout bisa membunuh worker + anak fork-nya
+        self._workers.add(proc)
+        self.stats["workers_spawned"] += 1
+        return proc
+
+    def _discard_worker(self, proc):
+        _kill_process_group(proc)
+        self._workers.discard(proc)
+        self.stats["workers_replaced"] += 1
+
+    async def _read_frames(self, proc, on_output) -> Dict[str, Any]:
+        while True:
+            header = await proc.stdout.readexactly(asu_python_worker.FRAME_HEADER_BYTES)
+            kind, length = asu_python_worker.decode_frame_header(header)
+            payload = await proc.stdout.readexactly(length)
+            if kind == asu_python_worker.FRAME_EXIT:
+                return json.loads(payload)
+            await on_output("stdout" if kind == asu_python_worker.FRAME_STDOUT else "stderr", payload)
+
+    async def run(self, request: ExecuteRequest, on_output) -> Dict[str, Any]:
+        await self.start()
+        proc = await self._idle.get()
+        healthy = False
+        try:
+            if proc is None or proc.returncode is not None:
+                if proc is not None: self._discard_worker(proc)
+                proc = await self._spawn_worker()
+            proc.stdin.write(asu_python_worker.encode_request(
+                request.script_source, request.script_vfs_path, request.cwd, args=request.argv[2:], env=request.env,
+                cpu_seconds=request.cpu_seconds, memory_bytes=request.memory_bytes))
+            await proc.stdin.drain()
+            self.stats["runs"] += 1
+            try:
+                exit_info = await asyncio.wait_for(self._read_frames(proc, on_output), request.timeout_seconds)
+            except asyncio.TimeoutError:
+                return {"returncode": None, "timed_out": True}
+            except (asyncio.IncompleteReadError, ConnectionResetError) as e:
+                raise RuntimeError(f"Worker Python berhenti di tengah eksekusi: {e}")
+            healthy = True
+            return {"returncode": exit_info["returncode"], "timed_out": False}
+        finally:
+            # Worker yang timeout/rusak dibunuh dan slotnya di-respawn saat dipakai berikutnya
+            if not healthy and proc is not None:
+                self._discard_worker(proc)
+                proc = None
+            self._idle.put_nowait(proc)
+
+    async def close(self):
+        for proc in list(self._workers):
+            if proc.returncode is None:
+                try: proc.stdin.close()
+                except Exception: pass
+                _kill_process_group(proc)
+            try: await proc.wait()
+            except Exception: pass
+        self._workers.clear()
+        self._idle = None
+
+
+class ColdSubprocessBackend(ExecuteBackend):
+    """Fallback: satu proses baru per instruksi (interpreter selain Python, atau platform tanpa fork)."""
+    name = "cold_subprocess"
+
+    def supports(self, request: ExecuteRequest) -> bool:
+        return True
+
+    @staticmethod
+    def _make_preexec(request: ExecuteRequest) -> Optional[Callable[[], None]]:
+        if os.name != "posix" or not (request.cpu_seconds or request.memory_bytes):
+            return None
+        def _apply_limits():
+            import resource
+            if request.cpu_seconds:
+                resource.setrlimit(resource.RLIMIT_CPU, (request.cpu_seconds, request.cpu_seconds))
+            if request.memory_bytes:
+                resource.setrlimit(resource.RLIMIT_AS, (request.memory_bytes, request.memory_bytes))
+        return _apply_limits
+
+    async def run(self, request: ExecuteRequest, on_output) -> Dict[str, Any]:
+        argv = list(request.argv)
+        if request.script_source is not None:
+            # Materialisasi script VFS ke direktori kerja host
+            host_script = os.path.join(request.cwd, os.path.basename(request.script_vfs_path))
+            with open(host_script, "wb") as f:
+                f.write(request.script_source)
+            if request.script_argv_index == 0:
+                os.chmod(host_script, 0o755)
+            argv[request.script_argv_index] = host_script
+        if os.path.basename(argv[0]) in PythonWorkerPool.PYTHON_COMMANDS:
+            argv[0] = sys.executable # Interpreter host yang sama dengan executor
+        env = dict(os.environ)
+        env.update(request.env)
+        proc = await asyncio.create_subprocess_exec(
+            *argv, stdin=asyncio.subprocess.DEVNULL, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+            cwd=request.cwd, env=env, preexec_fn=self._make_preexec(request), start_new_session=(os.name == "posix"))
+
+        async def _pump(stream, stream_name):
+            while True:
+                data = await stream.read(EXECUTE_OUTPUT_CHUNK_BYTES)
+                if not data: return
+                await on_output(stream_name, data)
+
+        try:
+            await asyncio.wait_for(asyncio.gather(_pump(proc.stdout, "stdout"), _pump(proc.stderr, "stderr"), proc.wait()),
+                                   request.timeout_seconds)
+        except asyncio.TimeoutError:
+            return {"returncode": None, "timed_out": True}
+        finally:
+            if proc.returncode is None: # Timeout atau instruksi di-cancel: jangan tinggalkan proses yatim
+                _kill_process_group(proc)
+                await proc.wait()
+        return {"returncode": proc.returncode, "timed_out": False}
+
+
+# --- Direktori state lokal per user (cache build/git/dependency, checkpoint, riwayat biaya) ---
+# Bukan di temp dir bersama: isi cache dieksekusi/di-load apa adanya, jadi path yang bisa ditebak dan
+# world-writable memungkinkan user lain menanam artefak sebelum executor membuatnya.
+DEFAULT_STATE_DIR = os.environ.get("ASU_STATE_DIR") or os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "asu")
+
+
+def ensure_private_dir(path: str) -> str:
+    """Buat direktori (mode 0700) bila belum ada; tolak jika bukan direktori milik user proses ini
+    atau bisa ditulis user lain."""
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode):
+        raise PermissionError(f"Direktori state {path} bukan direktori (symlink?).")
+    if hasattr(os, "getuid") and info.st_uid != os.getuid():
+        raise PermissionError(f"Direktori state {path} dimiliki uid {info.st_uid}, bukan user proses ini.")
+    if info.st_mode & 0o022: # Direktori yang sudah ada tapi bisa ditulis group/other tidak dipercaya
+        raise PermissionError(f"Direktori state {path} bisa ditulis user lain (mode {stat.S_IMODE(info.st_mode):o}).")
+    return path
+
+
+# --- Cache build C/C++ (COMPILE) ---
+
+DEFAULT_BUILD_CACHE_DIR = os.environ.get("ASU_BUILD_CACHE_DIR", os.path.join(DEFAULT_STATE_DIR, "build_cache"))
+DEFAULT_BUILD_CACHE_MAX_BYTES = 512 * 1024 * 1024
+DEFAULT_COMPILE_TIMEOUT_SECONDS = 120.0
+C_SOURCE_EXTENSIONS = (".c",)
+CPP_SOURCE_EXTENSIONS = (".cpp", ".cc", ".cxx")
+
+
+def host_target_platform() -> str:
+    return f"{sys.platform}-{platform.machine() or 'unknown'}"
+
+
+class _BuildAbandoned(Exception):
+    """Builder in-flight dibatalkan. Waiter tidak ikut dibatalkan: mereka cek ulang cache dan salah satunya build sendiri."""
+
+
+class BuildCache:
+    """Cache artefak build yang dialamatkan oleh konten, disimpan di disk lokal.
+
+    Key = sha256(source_hash, identitas compiler, flags, target_platform). Artefak disimpan di
+    <cache_dir>/<key[:2]>/<key>; urutan LRU dipertahankan di memori (dan via mtime di disk supaya
+    bertahan antar proses). Build bersamaan untuk key yang sama digabung menjadi satu build.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_BUILD_CACHE_DIR, max_bytes: int = DEFAULT_BUILD_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._index: "OrderedDict[str, int]" = OrderedDict() # key -> ukuran artefak, urut LRU (lama -> baru)
+        self._total_bytes = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._compiler_ids: Dict[str, str] = {}
+        self.stats = {"hits": 0, "misses": 0, "deduplicated": 0, "evictions": 0}
+        self._load_index()
+
+    def _artifact_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def _load_index(self):
+        ensure_private_dir(self.cache_dir)
+        entries = []
+        for shard in os.listdir(self.cache_dir):
+            shard_dir = os.path.join(self.cache_dir, shard)
+            if not os.path.isdir(shard_dir): continue
+            for name in os.listdir(shard_dir):
+                if name.startswith("."): continue # File sementara dari build yang terputus
+                st = os.stat(os.path.join(shard_dir, name))
+                entries.append((st.st_mtime, name, st.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._total_bytes += size
+
+    def compiler_id(self, compiler: str) -> str:
+        """Identitas compiler untuk key: path absolut + mtime + ukuran binary (upgrade compiler = key baru)."""
+        if compiler not in self._compiler_ids:
+            resolved = shutil.which(compiler)
+            if not resolved:
+                raise FileNotFoundError(f"Compiler tidak ditemukan: {compiler}")
+            real = os.path.realpath(resolved)
+            st = os.stat(real)
+            self._compiler_ids[compiler] = f"{real}:{st.st_mtime_ns}:{st.st_size}"
+        return self._compiler_ids[compiler]
+
+    @staticmethod
+    def make_key(source_hash: str, compiler_id: str, flags: List[str], target_platform: str) -> str:
+        material = json.dumps([source_hash, compiler_id, list(flags), target_platform], separators=(",", ":"))
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def lookup(self, key: str) -> Optional[str]:
+        if key not in self._index: return None
+        path = self._artifact_path(key)
+        if not os.path.exists(path): # Dihapus dari luar proses
+            self._total_bytes -= self._index.pop(key)
+            return None
+        self._index.move_to_end(key)
+        os.utime(path) # Simpan urutan LRU di disk
+        return path
+
+    def _store(self, key: str, built_artifact: str) -> str:
+        path = self._artifact_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = os.path.join(os.path.dirname(path), f".{key}.{os.getpid()}.tmp")
+        shutil.copyfile(built_artifact, tmp_path)
+        shutil.copymode(built_artifact, tmp_path)
+        os.replace(tmp_path, path) # Atomic: pembaca tidak pernah melihat artefak setengah jadi
+        size = os.path.getsize(path)
+        self._total_bytes += size - self._index.pop(key, 0)
+        self._index[key] = size
+        self._evict(keep=key)
+        return path
+
+    def _evict(self, keep: Optional[str] = None):
+        while self._total_bytes > self.max_bytes and len(self._index) > 1:
+            oldest = next(iter(self._index))
+            if oldest == keep: break
+            self._total_bytes -= self._index.pop(oldest)
+            try: os.remove(self._artifact_path(oldest))
+            except FileNotFoundError: pass
+            self.stats["evictions"] += 1
+
+    async def get_or_build(self, key: str, build: Callable[[str], Coroutine]) -> Tuple[str, bool]:
+        """Return (path_artefak, cache_hit). `build(output_path)` dipanggil hanya jika key belum ada."""
+        while True:
+            cached = self.lookup(key)
+            if cached:
+                self.stats["hits"] += 1
+                return cached, True
+            inflight = self._inflight.get(key)
+            if inflight is None: break
+            self.stats["deduplicated"] += 1
+            try: return await asyncio.shield(inflight), True
+            except _BuildAbandoned: continue # Builder dibatalkan (bukan waiter ini): ambil alih build
+
+        self.stats["misses"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            with tempfile.TemporaryDirectory(prefix="asu_build_") as build_dir:
+                built_artifact = os.path.join(build_dir, "artifact")
+                await build(built_artifact)
+                path = self._store(key, built_artifact)
+            future.set_result(path)
+            return path, False
+        except BaseException as e:
+            # Jangan future.cancel(): waiter lain akan ikut menerima CancelledError padahal tidak dibatalkan
+            future.set_exception(_BuildAbandoned(key) if isinstance(e, asyncio.CancelledError) else e)
+            future.exception() # Tandai sudah diambil bila tidak ada yang menunggu
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+
+# --- Mirror git lokal (FETCH_REPO) ---
+
+DEFAULT_GIT_MIRROR_DIR = os.environ.get("ASU_GIT_MIRROR_DIR", os.path.join(DEFAULT_STATE_DIR, "git_mirrors"))
+DEFAULT_GIT_FETCH_INTERVAL_SECONDS = 300.0
+DEFAULT_GIT_TIMEOUT_SECONDS = 600.0
+DEFAULT_GIT_SNAPSHOT_CACHE_BYTES = 256 * 1024 * 1024
+GIT_MIRROR_FETCH_MARKER = "asu_last_fetch"
+
+
+class GitMirrorCache:
+    """Mirror bare per URL di disk lokal, dipakai bersama semua Tempik untuk FETCH_REPO.
+
+    Mirror disimpan di <cache_dir>/<key[:2]>/<key>.git dengan key = sha256(url). Fetch pertama membuat
+    mirror (`git clone --mirror`); berikutnya mirror hanya di-`git fetch` bila ref belum ada atau ref
+    bergerak (branch/tag) dan fetch terakhir lebih tua dari fetch_interval. Ref berupa sha penuh yang sudah
+    ada di mirror tidak pernah di-fetch ulang. Isi tree per commit di-cache di memori (LRU berbasis byte),
+    jadi materialisasi ulang commit yang sama ke VFS tidak menyentuh git sama sekali.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_GIT_MIRROR_DIR,
+                 fetch_interval_seconds: float = DEFAULT_GIT_FETCH_INTERVAL_SECONDS,
+                 max_snapshot_bytes: int = DEFAULT_GIT_SNAPSHOT_CACHE_BYTES,
+                 timeout_seconds: float = DEFAULT_GIT_TIMEOUT_SECONDS):
+        self.cache_dir = ensure_private_dir(cache_dir)
+        self.fetch_interval_seconds = fetch_interval_seconds
+        self.max_snapshot_bytes = max_snapshot_bytes
+        self.timeout_seconds = timeout_seconds
+        self._locks: Dict[str, asyncio.Lock] = {} # Satu lock per mirror: clone/fetch URL yang sama tidak pernah paralel
+        # commit -> (files, dirs) relatif terhadap root repo, urut LRU (lama -> baru)
+        self._snapshots: "OrderedDict[str, Tuple[List[Tuple[str, bytes, int]], List[str]]]" = OrderedDict()
+        self._snapshot_sizes: Dict[str, int] = {}
+        self._snapshot_bytes = 0
+        self.stats = {"clones": 0, "fetches": 0, "mirror_hits": 0, "snapshot_hits": 0, "snapshot_misses": 0}
+
+    @staticmethod
+    def mirror_key(url: str) -> str:
+        return hashlib.sha256(url.strip().encode("utf-8")).hexdigest()
+
+    def mirror_path(self, url: str) -> str:
+        key = self.mirror_key(url)
+        return os.path.join(self.cache_dir, key[:2], f"{key}.git")
+
+    @staticmethod
+    def _is_full_sha(ref: str) -> bool:
+        return len(ref) in (40, 64) and all(c in "0123456789abcdef" for c in ref.lower())
+
+    async def _git(self, *args: str) -> bytes:
+        command = args[2] if args[0] == "--git-dir" else args[0]
+        env = dict(os.environ, GIT_TERMINAL_PROMPT="0") # Jangan pernah menunggu input kredensial
+        proc = await asyncio.create_subprocess_exec("git", *args, env=env, stdin=subprocess.DEVNULL,
+                                                    stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=self.timeout_seconds)
+        except asyncio.TimeoutError:
+            raise RuntimeError(f"git {command} timeout setelah {self.timeout_seconds}s")
+        finally:
+            if proc.returncode is None:
+                proc.kill()
+                await proc.wait()
+        if proc.returncode != 0:
+            detail = stderr.decode("utf-8", errors="replace").strip()[-500:]
+            raise RuntimeError(f"git {command} gagal (exit {proc.returncode}): {detail}")
+        return stdout
+
+    async def _resolve(self, mirror: str, ref: str) -> Optional[str]:
+        try:
+            out = await self._git("--git-dir", mirror, "rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}")
+        except RuntimeError:
+            return None
+        return out.decode("ascii").strip() or None
+
+    def _fetch_age(self, mirror: str) -> float:
+        try:
+            return time.time() - os.path.getmtime(os.path.join(mirror, GIT_MIRROR_FETCH_MARKER))
+        except OSError:
+            return float("inf")
+
+    @staticmethod
+    def _mark_fetched(mirror: str):
+        with open(os.path.join(mirror, GIT_MIRROR_FETCH_MARKER), "w") as f:
+            f.write(str(time.time()))
+
+    async def _clone_mirror(self, url: str, mirror: str):
+        os.makedirs(os.path.dirname(mirror), exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(prefix=".clone_", dir=os.path.dirname(mirror))
+        try:
+            await self._git("clone", "--mirror", "--quiet", "--", url, tmp_dir)
+            self._mark_fetched(tmp_dir)
+            try:
+                os.rename(tmp_dir, mirror) # Atomic: proses lain tidak pernah melihat mirror setengah jadi
+            except OSError:
+                if not os.path.isdir(mirror): raise # Selain itu: proses lain menang balapan clone, pakai mirror miliknya
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    async def ensure_mirror(self, url: str, ref: Optional[str] = None) -> Tuple[str, str, str]:
+        """Pastikan mirror `url` ada dan memuat `ref`. Return (path_mirror, commit_sha, outcome).
+
+        outcome: "cloned" (mirror baru), "fetched" (mirror di-update) atau "hit" (tanpa akses jaringan).
+        """
+        ref = ref or "HEAD"
+        if ref.startswith("-"): raise ValueError(f"Ref tidak valid: {ref}")
+        mirror = self.mirror_path(url)
+        async with self._locks.setdefault(self.mirror_key(url), asyncio.Lock()):
+            if not os.path.isdir(mirror):
+                await self._clone_mirror(url, mirror)
+                self.stats["clones"] += 1
+                outcome = "cloned"
+            else:
+                commit = await self._resolve(mirror, ref)
+                pinned = commit is not None and self._is_full_sha(ref)
+                if commit is None or (not pinned and self._fetch_age(mirror) > self.fetch_interval_seconds):
+                    await self._git("--git-dir", mirror, "fetch", "--prune", "--quiet", "origin")
+                    self._mark_fetched(mirror)
+                    self.stats["fetches"] += 1
+                    outcome = "fetched"
+                else:
+                    self.stats["mirror_hits"] += 1
+                    return mirror, commit, "hit"
+            commit = await self._resolve(mirror, ref)
+            if commit is None:
+                raise ValueError(f"Ref '{ref}' tidak ditemukan di repository {url}")
+            return mirror, commit, outcome
+
+    @staticmethod
+    def _parse_archive(archive: bytes) -> Tuple[List[Tuple[str, bytes, int]], List[str]]:
+        import io, tarfile
+        files: List[Tuple[str, bytes, int]] = []
+        dirs: List[str] = []
+        with tarfile.open(fileobj=io.BytesIO(archive), mode="r:") as tf:
+            for member in tf:
+                name = member.name.rstrip("/")
+                if member.isdir():
+                    dirs.append(name)
+                elif member.isfile():
+                    files.append((name, tf.extractfile(member).read(), (member.mode & 0o777) | 0o600))
+                # Symlink/submodule (gitlink) dilewati: VFS tidak punya konsep link
+        return files, dirs
+
+    def _snapshot_put(self, commit: str, snapshot: Tuple[List[Tuple[str, bytes, int]], List[str]]):
+        size = sum(len(content) for _, content, _ in snapshot[0])
+        if size > self.max_snapshot_bytes: return # Repo raksasa: tetap dimaterialisasi, tapi tidak di-cache
+        self._snapshots[commit] = snapshot
+        self._snapshot_sizes[commit] = size
+        self._snapshot_bytes += size
+        while self._snapshot_bytes > self.max_snapshot_bytes:
+            oldest, _ = self._snapshots.popitem(last=False)
+            self._snapshot_bytes -= self._snapshot_sizes.pop(oldest)
+
+    async def materialize(self, url: str, ref: Optional[str] = None) -> Dict[str, Any]:
+        """Isi tree `url`@`ref` sebagai daftar file relatif, siap di-commit ke VFS lewat write_files_batch."""
+        mirror, commit, outcome = await self.ensure_mirror(url, ref)
+        snapshot = self._snapshots.get(commit)
+        snapshot_hit = snapshot is not None
+        if snapshot_hit:
+            self._snapshots.move_to_end(commit)
+            self.stats["snapshot_hits"] += 1
+        else:
+            self.stats["snapshot_misses"] += 1
+            archive = await self._git("--git-dir", mirror, "archive", "--format=tar", commit)
+            snapshot = await asyncio.to_thread(self._parse_archive, archive)
+            self._snapshot_put(commit, snapshot)
+        return {"commit": commit, "files": snapshot[0], "dirs": snapshot[1],
+                "mirror": outcome, "snapshot_cache": "hit" if snapshot_hit else "miss"}
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "snapshots_cached": len(self._snapshots), "snapshot_bytes": self._snapshot_bytes}
+
+
+# --- Cache dependency (INSTALL) ---
+
+DEFAULT_DEPENDENCY_CACHE_DIR = os.environ.get("ASU_DEPENDENCY_CACHE_DIR", os.path.join(DEFAULT_STATE_DIR, "dep_cache"))
+DEFAULT_DEPENDENCY_CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024
+DEFAULT_DEPENDENCY_SNAPSHOT_BYTES = 256 * 1024 * 1024
+DEFAULT_INSTALL_TIMEOUT_SECONDS = 600.0
+DEPENDENCY_ENV_MANIFEST = "asu_env.json"
+DEPENDENCY_MANAGERS = {"pip": "site", "npm": "node_modules"} # manager -> subdirektori env yang dimaterialisasi
+
+
+class DependencyCache:
+    """Cache dependency INSTALL tiga lapis, disimpan di disk lokal dan dipakai bersama semua Tempik.
+
+    1. Artefak: wheel/sdist (pip download) dan tarball npm di <cache_dir>/artifacts/<manager>; tidak pernah
+       diunduh dua kali.
+    2. Environment prebuilt di <cache_dir>/envs/<key[:2]>/<key>, dengan key = sha256(manager, identitas
+       interpreter, set package + opsi index) atau dependency_manifest_hash dari header bila INSTALL memakai
+       file requirements. Environment dibangun sekali lalu read-only; build bersamaan untuk key sama digabung.
+    3. Materialisasi: Tempik memakai environment langsung lewat PYTHONPATH/NODE_PATH (tanpa copy), dan isi
+       tree-nya bisa di-commit ke VFS dari snapshot di memori (bytes immutable dibagi antar Tempik).
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_DEPENDENCY_CACHE_DIR, max_bytes: int = DEFAULT_DEPENDENCY_CACHE_MAX_BYTES,
+                 max_snapshot_bytes: int = DEFAULT_DEPENDENCY_SNAPSHOT_BYTES,
+                 timeout_seconds: float = DEFAULT_INSTALL_TIMEOUT_SECONDS):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_snapshot_bytes = max_snapshot_bytes
+        self.timeout_seconds = timeout_seconds
+        self._index: "OrderedDict[str, int]" = OrderedDict() # key -> ukuran environment, urut LRU (lama -> baru)
+        self._total_bytes = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._tool_ids: Dict[str, str] = {}
+        self._snapshots: "OrderedDict[str, Tuple[List[Tuple[str, bytes, int]], List[str]]]" = OrderedDict()
+        self._snapshot_sizes: Dict[str, int] = {}
+        self._snapshot_bytes = 0
+        self.stats = {"hits": 0, "misses": 0, "deduplicated": 0, "evictions": 0, "snapshot_hits": 0}
+        self._load_index()
+
+    def env_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, "envs", key[:2], key)
+
+    def artifact_dir(self, manager: str) -> str:
+        return os.path.join(self.cache_dir, "artifacts", manager)
+
+    def _load_index(self):
+        envs_dir = os.path.join(ensure_private_dir(self.cache_dir), "envs")
+        os.makedirs(envs_dir, exist_ok=True)
+        entries = []
+        for shard in os.listdir(envs_dir):
+            shard_dir = os.path.join(envs_dir, shard)
+            if not os.path.isdir(shard_dir): continue
+            for name in os.listdir(shard_dir):
+                manifest_path = os.path.join(shard_dir, name, DEPENDENCY_ENV_MANIFEST)
+                if name.startswith(".") or not os.path.exists(manifest_path): continue # Build yang terputus
+                with open(manifest_path) as f:
+                    size = json.load(f).get("bytes", 0)
+                entries.append((os.path.getmtime(manifest_path), name, size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._total_bytes += size
+
+    def tool_id(self, executable: str) -> str:
+        """Identitas interpreter/tool untuk key: path absolut + mtime + ukuran binary (upgrade = key baru)."""
+        if executable not in self._tool_ids:
+            resolved = shutil.which(executable)
+            if not resolved:
+                raise FileNotFoundError(f"Package manager tidak ditemukan: {executable}")
+            real = os.path.realpath(resolved)
+            st = os.stat(real)
+            self._tool_ids[executable] = f"{real}:{st.st_mtime_ns}:{st.st_size}"
+        return self._tool_ids[executable]
+
+    @staticmethod
+    def make_key(manager: str, tool_id: str, packages: List[str], index_options: List[str],
+                 manifest_hash: str = "") -> str:
+        # Set package yang dinormalisasi selalu ikut key; manifest_hash (isi requirements + hash header) hanya input tambahan
+        spec = sorted(p.strip().lower() for p in packages)
+        material = json.dumps([manager, tool_id, spec, list(index_options), manifest_hash], separators=(",", ":"))
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def lookup(self, key: str) -> Optional[str]:
+        if key not in self._index: return None
+        path = self.env_path(key)
+        manifest_path = os.path.join(path, DEPENDENCY_ENV_MANIFEST)
+        if not os.path.exists(manifest_path): # Dihapus dari luar proses
+            self._total_bytes -= self._index.pop(key)
+            return None
+        self._index.move_to_end(key)
+        os.utime(manifest_path) # Simpan urutan LRU di disk
+        return path
+
+    def _evict(self, keep: str):
+        while self._total_bytes > self.max_bytes and len(self._index) > 1:
+            oldest = next(iter(self._index))
+            if oldest == keep: break
+            self._total_bytes -= self._index.pop(oldest)
+            self._drop_snapshot(oldest)
+            shutil.rmtree(self.env_path(oldest), ignore_errors=True)
+            self.stats["evictions"] += 1
+
+    async def _run(self, argv: List[str], cwd: Optional[str] = None):
+        proc = await asyncio.create_subprocess_exec(*argv, cwd=cwd, stdin=subprocess.DEVNULL,
+                                                    stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        try:
+            _, stderr = await asyncio.wait_for(proc.communicate(), timeout=self.timeout_seconds)
+        except asyncio.TimeoutError:
+            raise RuntimeError(f"{os.path.basename(argv[0])} timeout setelah {self.timeout_seconds}s")
+        finally:
+            if proc.returncode is None:
+                proc.kill()
+                await proc.wait()
+        if proc.returncode != 0:
+            detail = stderr.decode("utf-8", errors="replace").strip()[-1000:]
+            raise RuntimeError(f"{' '.join(os.path.basename(a) for a in argv[:3])} gagal (exit {proc.returncode}): {detail}")
+
+    async def _build_pip(self, python: str, packages: List[str], index_options: List[str], env_dir: str) -> List[str]:
+        artifacts = self.artifact_dir("pip")
+        os.makedirs(artifacts, exist_ok=True)
+        pip = [python, "-m", "pip", "--disable-pip-version-check", "--no-input"]
+        # Artefak yang sudah ada di cache ikut jadi find-links, jadi hanya yang belum ada yang diunduh
+        await self._run(pip + ["download", "--dest", artifacts, "--find-links", artifacts] + index_options + ["--", *packages])
+        await self._run(pip + ["install", "--no-index", "--find-links", artifacts, "--target", os.path.join(env_dir, "site"),
+                               "--no-warn-script-location", "--", *packages])
+        site = os.path.join(env_dir, "site")
+        return sorted(name[:-len(".dist-info")] for name in os.listdir(site) if name.endswith(".dist-info"))
+
+    async def _build_npm(self, npm: str, packages: List[str], index_options: List[str], env_dir: str) -> List[str]:
+        artifacts = self.artifact_dir("npm")
+        os.makedirs(artifacts, exist_ok=True)
+        await self._run([npm, "install", "--prefix", env_dir, "--cache", artifacts, "--prefer-offline",
+                         "--no-audit", "--no-fund", *index_options, *packages])
+        lock_path = os.path.join(env_dir, "package-lock.json")
+        if not os.path.exists(lock_path): return []
+        with open(lock_path) as f:
+            lock = json.load(f)
+        return sorted(f"{path.rsplit('node_modules/', 1)[-1]}@{info.get('version', '?')}"
+                      for path, info in lock.get("packages", {}).items() if path)
+
+    async def get_or_build(self, manager: str, executable: str, packages: List[str], index_options: List[str],
+                           manifest_hash: str = "") -> Tuple[str, str, bool]:
+        """Return (path_environment, key, cache_hit). Environment dibangun hanya jika key belum ada."""
+        if manager not in DEPENDENCY_MANAGERS:
+            raise ValueError(f"Package manager tidak didukung: {manager}")
+        key = self.make_key(manager, self.tool_id(executable), packages, index_options, manifest_hash)
+        while True:
+            cached = self.lookup(key)
+            if cached:
+                self.stats["hits"] += 1
+                return cached, key, True
+            inflight = self._inflight.get(key)
+            if inflight is None: break
+            self.stats["deduplicated"] += 1
+            try: return await asyncio.shield(inflight), key, True
+            except _BuildAbandoned: continue # Builder dibatalkan (bukan waiter ini): ambil alih build
+
+        self.stats["misses"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        path = self.env_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        build_dir = tempfile.mkdtemp(prefix=f".{key[:12]}_", dir=os.path.dirname(path))
+        try:
+            start_time = time.perf_counter()
+            build = self._build_pip if manager == "pip" else self._build_npm
+            resolved = await build(executable, packages, index_options, build_dir)
+            size = sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(build_dir) for name in names)
+            with open(os.path.join(build_dir, DEPENDENCY_ENV_MANIFEST), "w") as f:
+                json.dump({"manager": manager, "packages": packages, "resolved": resolved, "index_options": index_options,
+                           "manifest_hash": manifest_hash, "bytes": size,
+                           "build_seconds": round(time.perf_counter() - start_time, 3)}, f)
+            try:
+                os.rename(build_dir, path) # Atomic: Tempik lain tidak pernah melihat environment setengah jadi
+            except OSError:
+                if not os.path.isdir(path): raise # Selain itu proses lain sudah membangun key yang sama
+            self._total_bytes += size - self._index.pop(key, 0)
+            self._index[key] = size
+            self._evict(keep=key)
+            future.set_result(path)
+            return path, key, False
+        except BaseException as e:
+            # Jangan future.cancel(): waiter lain akan ikut menerima CancelledError padahal tidak dibatalkan
+            future.set_exception(_BuildAbandoned(key) if isinstance(e, asyncio.CancelledError) else e)
+            future.exception() # Tandai sudah diambil bila tidak ada yang menunggu
+            raise
+        finally:
+            shutil.rmtree(build_dir, ignore_errors=True)
+            self._inflight.pop(key, None)
+
+    @staticmethod
+    def _read_tree(root: str) -> Tuple[List[Tuple[str, bytes, int]], List[str]]:
+        files: List[Tuple[str, bytes, int]] = []
+        dirs: List[str] = []
+        for dirpath, dirnames, filenames in os.walk(root):
+            rel_dir = os.path.relpath(dirpath, root).replace(os.sep, "/")
+            prefix = "" if rel_dir == "." else rel_dir + "/"
+            dirnames[:] = [d for d in dirnames if d != "__pycache__"]
+            dirs.extend(prefix + d for d in dirnames)
+            for name in filenames:
+                full_path = os.path.join(dirpath, name)
+                if os.path.islink(full_path): continue
+                with open(full_path, "rb") as f:
+                    files.append((prefix + name, f.read(), (os.stat(full_path).st_mode & 0o777) | 0o600))
+        return files, dirs
+
+    def _drop_snapshot(self, key: str):
+        if self._snapshots.pop(key, None) is not None:
+            self._snapshot_bytes -= self._snapshot_sizes.pop(key)
+
+    async def snapshot(self, key: str, manager: str) -> Tuple[List[Tuple[str, bytes, int]], List[str]]:
+        """Isi environment (subdirektori DEPENDENCY_MANAGERS[manager]) sebagai file relatif untuk write_files_batch."""
+        snapshot = self._snapshots.get(key)
+        if snapshot is not None:
+            self._snapshots.move_to_end(key)
+            self.stats["snapshot_hits"] += 1
+            return snapshot
+        snapshot = await asyncio.to_thread(self._read_tree, os.path.join(self.env_path(key), DEPENDENCY_MANAGERS[manager]))
+        size = sum(len(content) for _, content, _ in snapshot[0])
+        if size <= self.max_snapshot_bytes:
+            self._snapshots[key] = snapshot
+            self._snapshot_sizes[key] = size
+            self._snapshot_bytes += size
+            while self._snapshot_bytes > self.max_snapshot_bytes:
+                self._drop_snapshot(next(iter(self._snapshots)))
+        return snapshot
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "environments": len(self._index), "bytes": self._total_bytes,
+                "snapshots_cached": len(self._snapshots), "snapshot_bytes": self._snapshot_bytes}
+
+
 # --- Komponen Pipeline dan Kontrol ---
 
 class Pipeline:
@@ -1331,6 +3918,8 @@ class Pipeline:
             TempikStatus.WRITE_BACK: self._write_back_stage,
         }
         self.current_stage_data: Dict[str, Any] = {} 
+        # Key timer profiler unik per konteks eksekusi (thread dalam Tempik berbagi Profiler)
+        self.timer_key = f"current_instruction:{tempik.tempik_id_str}"
 
     async def _fetch_stage(self) -> Optional[InstruksiEksekusi]:
         pc_value = self.tempik.program_counter.value
@@ -1523,7 +4112,7 @@ class Pipeline:
             final_status = "completed"
 
         if decoded_instruction:
-            duration_ms = self.tempik.profiler.stop_timer("current_instruction")
+            duration_ms = self.tempik.profiler.stop_timer(self.timer_key)
             error_details = data_to_write.get("error", "") if isinstance(data_to_write, dict) else ""
             
             self.tempik.audit_logger.log(
@@ -1545,18 +4134,18 @@ class Pipeline:
         return data_to_write 
 
     async def run_cycle(self) -> Optional[Dict[str, Any]]:
-        self.tempik.set_status(TempikStatus.FETCH)
+        self.tempik.pipeline_stage = TempikStatus.FETCH
         if not await self.stages[TempikStatus.FETCH](): 
             # Jika fetch gagal (EOF atau error), status Tempik sudah diatur di _fetch_stage
             return None 
         
-        self.tempik.set_status(TempikStatus.DECODE)
+        self.tempik.pipeline_stage = TempikStatus.DECODE
         decoded_instruction = await self.stages[TempikStatus.DECODE]()
         if not decoded_instruction: 
             # Jika decode gagal, status Tempik sudah diatur di _decode_stage
             return None 
         
-        self.tempik.set_status(TempikStatus.EXECUTE)
+        self.tempik.pipeline_stage = TempikStatus.EXECUTE
         execution_result = await self.stages[TempikStatus.EXECUTE]()
         # Jika eksekusi gagal, status Tempik sudah diatur di _execute_stage atau oleh interrupt
         # dan result mungkin berisi info error.
@@ -1568,7 +4157,7 @@ class Pipeline:
             
             # Langsung ke write_back untuk logging, skip memory_access jika tidak relevan
             self.current_stage_data['data_for_writeback'] = execution_result
-            self.tempik.set_status(TempikStatus.WRITE_BACK) # Status sementara untuk logging
+            self.tempik.pipeline_stage = TempikStatus.WRITE_BACK
             final_output = await self.stages[TempikStatus.WRITE_BACK]()
             
             # Set status final Tempik jika belum (misal, HALT instruction)
@@ -1578,10 +4167,10 @@ class Pipeline:
             return final_output
 
 
-        self.tempik.set_status(TempikStatus.MEMORY_ACCESS)
+        self.tempik.pipeline_stage = TempikStatus.MEMORY_ACCESS
         await self.stages[TempikStatus.MEMORY_ACCESS]()
         
-        self.tempik.set_status(TempikStatus.WRITE_BACK)
+        self.tempik.pipeline_stage = TempikStatus.WRITE_BACK
         final_output = await self.stages[TempikStatus.WRITE_BACK]()
         
         return final_output
@@ -1594,57 +4183,96 @@ class ControlUnit:
         self.is_running = False
 
     async def start_execution(self, program: List[InstruksiEksekusi], initial_pc: int = 0):
-        self.tempik.load_program(program, initial_pc)
-        self.is_running = True
-        logger.info(f"TEMPİK-{self.tempik.tempik_id_str} ControlUnit: Execution started. Mode: {self.tempik.execution_mode.value}")
-        
-        instruction_count = 0
-        # Batas instruksi bisa dari config atau header .asu
-        max_instructions = self.tempik.execution_context_manager.resource_limits.get("max_instructions", 100000) 
+        try:
+            self.tempik.load_program(program, initial_pc)
+        except ValueError as ve: # Label tidak dikenal/duplikat ditolak sebelum eksekusi dimulai
+            logger.error(f"TEMPİK-{self.tempik.tempik_id_str} ControlUnit: Program ditolak saat load: {ve}")
+            self.tempik.interrupt_controller.raise_interrupt(InterruptType.INVALID_JUMP_LABEL, details={"error": str(ve)})
+            self.tempik.set_status(TempikStatus.FAILED)
+            return
+        await self.run_loaded_program()
+
+    async def run_loaded_program(self):
+        """Loop eksekusi dari PC saat ini atas program yang sudah di-load (dipakai juga oleh TempikThread)."""
+        self.is_running = True
+        logger.info(f"TEMPİK-{self.tempik.tempik_id_str} ControlUnit: Execution started. Mode: {self.tempik.execution_mode.value}")
         
         self.tempik.global_execution_start_time = time.time() # AUDIT POINT 11 (Watchdog)
+        watchdog = self._arm_watchdog()
+        try:
+            instruction_count = await self._execution_loop()
+        finally:
+            if watchdog: watchdog.cancel()
+
+        if self.tempik.status not in [TempikStatus.FAILED, TempikStatus.HALTED]:
+             self.tempik.set_status(TempikStatus.COMPLETED)
+        logger.info(f"TEMPİK-{self.tempik.tempik_id_str} ControlUnit: Execution finished. Final status: {self.tempik.status.value}. Instructions executed: {instruction_count}.")
+        self.is_running = False
+
+    def _arm_watchdog(self) -> Optional[asyncio.TimerHandle]:
+        """AUDIT POINT 11: satu timer asyncio per eksekusi memicu TIMER_EXPIRED tepat di deadline,
+        jadi loop tidak perlu membaca jam di setiap siklus."""
+        limit_s = self.tempik.max_exec_time_seconds
+        if limit_s is None:
+            return None
+        return asyncio.get_running_loop().call_later(limit_s, self._on_watchdog_expired, limit_s)
+
+    def _on_watchdog_expired(self, limit_s: float):
+        if not self.is_running:
+            return
+        logger.warning(f"Tempik-{self.tempik.tempik_id_str}: Global execution timeout ({limit_s}s), watchdog mengajukan TIMER_EXPIRED.")
+        self.tempik.interrupt_controller.raise_interrupt(InterruptType.TIMER_EXPIRED,
+                                                         details={"type": "global_watchdog", "limit_s": limit_s})
+
+    async def _execution_loop(self) -> int:
+        """Loop fetch-execute. Return jumlah instruksi yang dieksekusi."""
+        resource_limits = self.tempik.execution_context_manager.resource_limits
+        # Batas instruksi dibaca sekali lalu dihitung mundur (bukan lookup dict per siklus)
+        max_instructions = resource_limits.get("max_instructions", 100000)
+        instructions_remaining = max_instructions
+        # Tiap N instruksi loop menyerahkan kendali ke event loop agar timer watchdog dan task lain sempat jalan
+        yield_interval = max(1, int(resource_limits.get("preempt_check_interval", DEFAULT_PREEMPT_CHECK_INTERVAL)))
+        until_yield = yield_interval
+        interrupt_controller = self.tempik.interrupt_controller
 
         while self.is_running and \
               self.tempik.status not in [TempikStatus.COMPLETED, TempikStatus.FAILED, TempikStatus.HALTED] and \
               self.tempik.program_counter.value < len(self.tempik.program_memory) and \
-              instruction_count < max_instructions:
+              instructions_remaining > 0:
             
-            # AUDIT POINT 11: Watchdog check
-            self.tempik.check_global_timeout() 
-            if self.tempik.status == TempikStatus.FAILED: # Jika timeout menyebabkan FAILED
-                logger.warning(f"Tempik-{self.tempik.tempik_id_str} halted due to global execution timeout.")
-                break
-
-            self.tempik.interrupt_controller.handle_interrupt_if_pending(self.tempik)
-            if self.tempik.status in [TempikStatus.FAILED, TempikStatus.HALTED]: 
-                break
+            # Satu cek flag per siklus; drain interrupt (termasuk TIMER_EXPIRED dari watchdog) hanya jika ada yang pending
+            if interrupt_controller.preempt_requested:
+                interrupt_controller.handle_interrupt_if_pending(self.tempik)
+                if self.tempik.status in [TempikStatus.FAILED, TempikStatus.HALTED]: 
+                    break
 
-            self.tempik.profiler.start_timer("current_instruction") # AUDIT POINT 16
+            self.tempik.profiler.start_timer(self.pipeline.timer_key) # AUDIT POINT 16
             
             # Simpan PC sebelum eksekusi untuk JMP/CALL relatif
             pc_before_execute = self.tempik.program_counter.value
 
             result = await self.pipeline.run_cycle()
-            instruction_count +=1
+            instructions_remaining -= 1
 
             # Update PC
             instr_obj = self.tempik.register_file.instruction_register
             if self.tempik.status not in [TempikStatus.FAILED, TempikStatus.HALTED]: # Hanya update PC jika tidak ada error fatal
                 if instr_obj:
-                    params = instr_obj.parameter
-                    # Jika JMP/CALL/RET, PC sudah diatur oleh handler atau logika di bawah
-                    is_branch_or_call = instr_obj.instruksi in [InstruksiASU.JMP, InstruksiASU.JZ, InstruksiASU.JNZ, InstruksiASU.CALL, InstruksiASU.RET]
+                    op = instr_obj.instruksi
+                    # Instruksi yang di-skip (blok IF false) tidak boleh mengubah alur
+                    skipped = isinstance(result, dict) and result.get("skipped", False)
                     
-                    if is_branch_or_call:
-                        # Logika JMP/CALL/RET akan set PC
-                        if instr_obj.instruksi == InstruksiASU.JMP and "target_label" in params:
-                            self.tempik.jump_to_label(params["target_label"])
-                        elif instr_obj.instruksi == InstruksiASU.JZ and "target_label" in params and self.tempik.register_file.get_flag("ZF"):
-                            self.tempik.jump_to_label(params["target_label"])
-                        elif instr_obj.instruksi == InstruksiASU.JNZ and "target_label" in params and not self.tempik.register_file.get_flag("ZF"):
-                            self.tempik.jump_to_label(params["target_label"])
-                        # CALL dan RET akan dihandle oleh instruction handler mereka untuk memanipulasi PC & stack
-                        # Jika CALL/RET berhasil, PC sudah di target_address / return_address
+                    if op in BRANCH_INSTRUCTIONS and not skipped:
+                        # target_pc sudah di-resolve saat load_program, tidak ada lookup label di sini
+                        if op is InstruksiASU.JMP or \
+                           (op is InstruksiASU.JZ and self.tempik.register_file.flags["ZF"]) or \
+                           (op is InstruksiASU.JNZ and not self.tempik.register_file.flags["ZF"]):
+                            self.tempik.program_counter.set(instr_obj.target_pc)
+                        elif op is InstruksiASU.JZ or op is InstruksiASU.JNZ: # Branch tidak diambil
+                            self.tempik.program_counter.increment()
+                        elif not (isinstance(result, dict) and result.get("status") == "success"):
+                            # CALL/RET yang berhasil sudah memindahkan PC di handler-nya (misal dry-run tidak)
+                            self.tempik.program_counter.increment()
                     else: # Bukan branch/call/ret, increment PC biasa
                         self.tempik.program_counter.increment() 
                 else: # Tidak ada instruction_register (misal, fetch gagal)
@@ -1664,16 +4292,22 @@ class ControlUnit:
             if self.tempik.status in [TempikStatus.FAILED, TempikStatus.HALTED]:
                 break 
 
-        if instruction_count >= max_instructions and self.tempik.status not in [TempikStatus.COMPLETED, TempikStatus.FAILED, TempikStatus.HALTED]:
+            until_yield -= 1
+            if until_yield == 0:
+                until_yield = yield_interval
+                if self.tempik.checkpoint_due(): # Batas instruksi: PC sudah diperbarui, state konsisten
+                    try:
+                        await self.tempik.write_checkpoint()
+                    except Exception as e:
+                        logger.warning(f"TEMPİK-{self.tempik.tempik_id_str} ControlUnit: Checkpoint gagal: {e}")
+                        self.tempik._fail_checkpoint_waiters(f"Checkpoint gagal: {e}")
+                await asyncio.sleep(0)
+
+        if instructions_remaining <= 0 and self.tempik.status not in [TempikStatus.COMPLETED, TempikStatus.FAILED, TempikStatus.HALTED]:
             logger.warning(f"TEMPİK-{self.tempik.tempik_id_str} ControlUnit: Max instruction limit ({max_instructions}) reached.")
             self.tempik.interrupt_controller.raise_interrupt(InterruptType.MAX_INSTRUCTIONS_REACHED, details={"limit": max_instructions})
             self.tempik.set_status(TempikStatus.FAILED)
-
-
-        if self.tempik.status not in [TempikStatus.FAILED, TempikStatus.HALTED]:
-             self.tempik.set_status(TempikStatus.COMPLETED)
-        logger.info(f"TEMPİK-{self.tempik.tempik_id_str} ControlUnit: Execution finished. Final status: {self.tempik.status.value}. Instructions executed: {instruction_count}.")
-        self.is_running = False
+        return max_instructions - instructions_remaining
 
 
     def halt_execution(self, reason: str = "External Halt"):
@@ -1727,6 +4361,7 @@ class InstructionSet: # AUDIT POINT 3 (kelengkapan handler)
         self.handlers[InstruksiASU.VERIFY] = self._handle_verify 
         self.handlers[InstruksiASU.SIGN] = self._handle_sign
         self.handlers[InstruksiASU.DECRYPT] = self._handle_decrypt
+        self.handlers[InstruksiASU.ENCRYPT] = self._handle_encrypt
         self.handlers[InstruksiASU.LOCK_EXEC] = self._handle_lock_exec
         # Audit, Logging & Events
         self.handlers[InstruksiASU.LOG] = self._handle_log
@@ -1752,6 +4387,8 @@ class InstructionSet: # AUDIT POINT 3 (kelengkapan handler)
         for op in alu_ops:
             self.handlers[op] = self._handle_alu_op
         # JMP, JZ, JNZ ditangani oleh ControlUnit setelah eksekusi CMP atau instruksi lain yang set flag
+        for op in (InstruksiASU.JMP, InstruksiASU.JZ, InstruksiASU.JNZ):
+            self.handlers[op] = self._handle_branch
 
     def get_handler(self, instruksi: InstruksiASU) -> Optional[InstructionHandler]:
         return self.handlers.get(instruksi)
@@ -1781,32 +4418,90 @@ class InstructionSet: # AUDIT POINT 3 (kelengkapan handler)
         command_param = params.get("command", "")
         args = params.get("args", [])
         cmd_str_list = []
-        if isinstance(command_param, list): cmd_str_list.extend(command_param)
-        else: cmd_str_list.append(str(command_param))
+        if isinstance(command_param, list): cmd_str_list.extend(map(str, command_param))
+        else: cmd_str_list.extend(shlex.split(str(command_param)))
         cmd_str_list.extend(map(str, args))
         full_command_str = " ".join(cmd_str_list)
         
-        logger.info(f"TEMPİK-{tempik.tempik_id_str} EXECUTE (simulated): {full_command_str} in VFS CWD: {tempik.execution_context_manager.current_working_directory}")
+        logger.info(f"TEMPİK-{tempik.tempik_id_str} EXECUTE: {full_command_str} in VFS CWD: {tempik.execution_context_manager.current_working_directory}")
         
         if tempik.execution_mode == ExecutionMode.DRY_RUN:
             return {"status": "dry_run_simulated", "command": full_command_str, "output": "Command execution simulated (dry-run)."}
+        if not cmd_str_list or not cmd_str_list[0]:
+            return {"status": "failed", "error": "Command diperlukan untuk EXECUTE."}
 
-        # Contoh eksekusi skrip Python dari VFS (SANGAT BERBAHAYA TANPA SANDBOX KUAT)
-        if cmd_str_list[0] == "python" and len(cmd_str_list) > 1:
-            script_path_vfs = tempik.execution_context_manager.resolve_path(cmd_str_list[1])
-            if await tempik.virtual_fs.file_exists(script_path_vfs): # VFS methods are now async
-                # script_content = (await tempik.virtual_fs.read_file(script_path_vfs)).decode('utf-8')
-                # Eksekusi Python code (TIDAK AMAN, HANYA UNTUK DEMO TERBATAS)
-                logger.warning(f"Direct Python script execution from VFS '{script_path_vfs}' is highly insecure and only for limited demo.")
-                return {"status": "simulated_python_execution", "script": script_path_vfs, "output": "Python script executed (simulated)."}
-            else:
+        ctx_mgr = tempik.execution_context_manager
+        request = ExecuteRequest(
+            argv=cmd_str_list,
+            env=dict(ctx_mgr.env_vars),
+            cpu_seconds=params.get("cpu_seconds", ctx_mgr.resource_limits.get("execute_cpu_seconds")),
+            memory_bytes=params.get("memory_bytes", ctx_mgr.resource_limits.get("execute_memory_bytes")),
+            timeout_seconds=float(params.get("timeout_seconds", ctx_mgr.timeout_profile)))
+
+        # Command yang merujuk file VFS (binary hasil COMPILE) atau argumen pertama yang merujuk file VFS
+        # dianggap script; isinya dikirim ke backend
+        command_path_vfs = ctx_mgr.resolve_path(cmd_str_list[0]) if "/" in cmd_str_list[0] else None
+        if command_path_vfs and tempik.virtual_fs.file_exists(command_path_vfs):
+            request.script_argv_index = 0
+            request.script_vfs_path = command_path_vfs
+            request.script_source = await tempik.io_handler.read_file(command_path_vfs)
+        elif len(cmd_str_list) > 1:
+            script_path_vfs = ctx_mgr.resolve_path(cmd_str_list[1])
+            if tempik.virtual_fs.file_exists(script_path_vfs):
+                request.script_vfs_path = script_path_vfs
+                request.script_source = await tempik.io_handler.read_file(script_path_vfs)
+            elif os.path.basename(cmd_str_list[0]) in PythonWorkerPool.PYTHON_COMMANDS and not cmd_str_list[1].startswith("-"):
                 return {"status": "failed", "error": f"Script VFS tidak ditemukan: {script_path_vfs}"}
-        
-        # Simulasi eksekusi command umum
-        # Di dunia nyata, ini akan menggunakan subprocess dengan isolasi ketat (namespaces, cgroups)
-        # atau WebAssembly runtime.
-        # Untuk sekarang, hanya log.
-        return {"status": "simulated_success", "command": full_command_str, "output": "Command executed (simulated)."}
+
+        # stdout/stderr dikumpulkan per stream di bytearray lalu ditulis sekali ke VFS: append per potongan lewat
+        # write_file menyalin ulang seluruh isi file, walk quota dan latency tiap kali (kuadratik untuk output besar).
+        # Memori dibatasi sisa quota VFS saat mulai; output di atasnya dibuang dan instruksi gagal.
+        output_paths = {
+            "stdout": ctx_mgr.resolve_path(params.get("stdout_vfs_path", f"/temp/execute_{tempik.program_counter.value:04d}.stdout")),
+            "stderr": ctx_mgr.resolve_path(params.get("stderr_vfs_path", f"/temp/execute_{tempik.program_counter.value:04d}.stderr")),
+        }
+        buffers = {"stdout": bytearray(), "stderr": bytearray()}
+        tails = {"stdout": b"", "stderr": b""}
+        output_budget = ctx_mgr.resource_limits.get("max_vfs_size_bytes", float('inf')) - tempik.virtual_fs.get_total_vfs_size()
+        output_dropped = 0
+
+        async def _on_output(stream_name: str, data: bytes):
+            nonlocal output_budget, output_dropped
+            kept = data[:max(0, int(min(output_budget, len(data))))]
+            buffers[stream_name] += kept
+            output_budget -= len(kept)
+            output_dropped += len(data) - len(kept)
+            tails[stream_name] = (tails[stream_name] + data)[-EXECUTE_OUTPUT_TAIL_BYTES:]
+
+        backends = tempik.parent_executor.execute_backends if tempik.parent_executor else [ColdSubprocessBackend()]
+        backend = next(b for b in backends if b.supports(request))
+        start_time = time.perf_counter()
+        with tempfile.TemporaryDirectory(prefix=f"asu_exec_{tempik.tempik_id_str}_") as host_cwd:
+            request.cwd = host_cwd
+            try:
+                outcome = await backend.run(request, _on_output)
+            except (OSError, RuntimeError) as e:
+                outcome = {"error": e}
+        for stream_name, path in output_paths.items(): # Output parsial tetap ditulis jika backend gagal
+            await tempik.io_handler.write_file(path, bytes(buffers[stream_name]))
+        if "error" in outcome:
+            return {"status": "failed", "error": f"Backend {backend.name} gagal: {outcome['error']}", "backend": backend.name}
+
+        result = {
+            "status": "success" if outcome["returncode"] == 0 else "failed",
+            "command": full_command_str, "backend": backend.name, "returncode": outcome["returncode"],
+            "duration_ms": int((time.perf_counter() - start_time) * 1000),
+            "stdout_vfs_path": output_paths["stdout"], "stderr_vfs_path": output_paths["stderr"],
+            "output": tails["stdout"].decode("utf-8", errors="replace"),
+        }
+        if output_dropped:
+            result["status"] = "failed"
+            result["error"] = f"Output EXECUTE melebihi quota VFS; {output_dropped} byte terakhir dibuang"
+        elif outcome["timed_out"]:
+            result["error"] = f"EXECUTE timeout setelah {request.timeout_seconds}s"
+        elif outcome["returncode"] != 0:
+            result["error"] = f"Proses keluar dengan kode {outcome['returncode']}: {tails['stderr'].decode('utf-8', errors='replace')[-500:]}"
+        return result
 
 
     async def _handle_log(self, tempik: 'Tempik', params: Dict[str, Any]) -> Dict[str, Any]:
@@ -1820,27 +4515,38 @@ class InstructionSet: # AUDIT POINT 3 (kelengkapan handler)
         # ... (kode yang ada dipertahankan) ...
         url = params.get("url")
         target_vfs_path = params.get("target", f"/deps/{os.path.basename(url or 'default_repo')}")
+        ref = params.get("ref") # Branch/tag/sha; default HEAD remote
         if not url: return {"status": "failed", "error": "URL repository diperlukan"}
+        target_vfs_path = tempik.execution_context_manager.resolve_path(target_vfs_path)
         if tempik.execution_mode == ExecutionMode.DRY_RUN:
-            return {"status": "dry_run_simulated", "action": "FETCH_REPO", "url": url, "target": target_vfs_path}
-        return await tempik.network_unit.fetch_repo(url, target_vfs_path, tempik.io_handler)
+            return {"status": "dry_run_simulated", "action": "FETCH_REPO", "url": url, "ref": ref, "target": target_vfs_path}
+        return await tempik.network_unit.fetch_repo(url, target_vfs_path, tempik.io_handler, ref=ref)
 
 
     async def _handle_verify_hash(self, tempik: 'Tempik', params: Dict[str, Any]) -> Dict[str, Any]:
         # ... (kode yang ada dipertahankan, dengan penyesuaian untuk VFS async) ...
         file_vfs_path = params.get("file")
-        expected_hash = params.get("hash", "").lower()
-        algorithm = params.get("algorithm", "sha256").lower()
+        # "hashes": {"sha256": "...", "blake2b": "..."} memverifikasi beberapa algoritma dalam satu lintasan;
+        # "hash" + "algorithm" (satu algoritma) tetap didukung
+        expected_hashes = {str(k).lower(): str(v).lower() for k, v in (params.get("hashes") or {}).items()}
+        if not expected_hashes:
+            expected_hashes = {params.get("algorithm", "sha256").lower(): params.get("hash", "").lower()}
         if not file_vfs_path: return {"status": "failed", "error": "Path file VFS diperlukan"}
 
         try:
             resolved_path = tempik.execution_context_manager.resolve_path(file_vfs_path)
-            file_content = await tempik.io_handler.read_file(resolved_path)
-            actual_hash = tempik.crypto_engine.calculate_hash(file_content, algorithm)
-            verified = actual_hash == expected_hash
+            actual_hashes = await tempik.virtual_fs.get_file_digests(resolved_path, list(expected_hashes))
+            mismatched = [algorithm for algorithm, expected in expected_hashes.items() if actual_hashes[algorithm] != expected]
+            verified = not mismatched
             if not verified:
-                logger.warning(f"VERIFY_HASH gagal untuk {resolved_path}. Expected: {expected_hash}, Actual: {actual_hash}")
-            return {"status": "success", "file": resolved_path, "verified": verified, "actual_hash": actual_hash, "expected_hash": expected_hash}
+                logger.warning(f"VERIFY_HASH gagal untuk {resolved_path} ({', '.join(mismatched)}). Expected: {expected_hashes}, Actual: {actual_hashes}")
+            result = {"status": "success", "file": resolved_path, "verified": verified}
+            if len(expected_hashes) == 1:
+                (algorithm, expected_hash), = expected_hashes.items()
+                result.update({"actual_hash": actual_hashes[algorithm], "expected_hash": expected_hash})
+            else:
+                result.update({"actual_hashes": actual_hashes, "expected_hashes": expected_hashes, "mismatched": mismatched})
+            return result
         except FileNotFoundError:
             return {"status": "failed", "error": f"File tidak ditemukan di VFS: {file_vfs_path}"}
         except Exception as e:
@@ -1855,17 +4561,17 @@ class InstructionSet: # AUDIT POINT 3 (kelengkapan handler)
             return {"status": "dry_run_simulated", "action": "CLEANUP", "path": resolved_path}
 
         try:
-            if await tempik.virtual_fs.dir_exists(resolved_path):
+            if tempik.virtual_fs.dir_exists(resolved_path):
                 if resolved_path == "/" : return {"status": "failed", "error": "Tidak dapat cleanup root VFS."}
                 items_to_delete = await tempik.virtual_fs.list_dir(resolved_path)
                 for item in items_to_delete:
                     item_path = os.path.join(resolved_path, item).replace('\\','/')
-                    if await tempik.virtual_fs.file_exists(item_path): await tempik.virtual_fs.remove_file(item_path)
-                    elif await tempik.virtual_fs.dir_exists(item_path): await tempik.virtual_fs.remove_dir(item_path, recursive=True)
-                if resolved_path != tempik.execution_context_manager.current_working_directory and await tempik.virtual_fs.dir_exists(resolved_path):
+                    if tempik.virtual_fs.file_exists(item_path): await tempik.virtual_fs.remove_file(item_path)
+                    elif tempik.virtual_fs.dir_exists(item_path): await tempik.virtual_fs.remove_dir(item_path, recursive=True)
+                if resolved_path != tempik.execution_context_manager.current_working_directory and tempik.virtual_fs.dir_exists(resolved_path):
                      await tempik.virtual_fs.remove_dir(resolved_path, recursive=True)
                 return {"status": "success", "cleaned_vfs_path": resolved_path}
-            elif await tempik.virtual_fs.file_exists(resolved_path):
+            elif tempik.virtual_fs.file_exists(resolved_path):
                 await tempik.virtual_fs.remove_file(resolved_path)
                 return {"status": "success", "cleaned_vfs_file": resolved_path}
             else:
@@ -1953,7 +4659,9 @@ class InstructionSet: # AUDIT POINT 3 (kelengkapan handler)
         if "timeout_profile" in params: ctx_mgr.timeout_profile = float(params["timeout_profile"])
         if "resource_limits" in params: ctx_mgr.resource_limits.update(params["resource_limits"])
         if "current_user" in params: ctx_mgr.current_user = params["current_user"]
-        if "security_policy" in params: ctx_mgr.security_policy.update(params["security_policy"])
+        if "security_policy" in params:
+            ctx_mgr.security_policy.update(params["security_policy"])
+            tempik.security_module.compile_policy(tempik.execution_mode) # Tabel keputusan lama tidak lagi berlaku
         if "working_directory" in params:
             try: ctx_mgr.set_working_directory(params["working_directory"], tempik.virtual_fs)
             except FileNotFoundError as e: return {"status": "failed", "error": str(e), "context_updated": False}
@@ -2024,34 +4732,89 @@ class InstructionSet: # AUDIT POINT 3 (kelengkapan handler)
             return {"status": "dry_run_simulated", "action": "EXPORT", "source": resolved_source_vfs, "target": target_name_or_host_path}
 
         try:
-            if not await tempik.virtual_fs.file_exists(resolved_source_vfs) and not await tempik.virtual_fs.dir_exists(resolved_source_vfs):
+            if not tempik.virtual_fs.file_exists(resolved_source_vfs) and not tempik.virtual_fs.dir_exists(resolved_source_vfs):
                 raise FileNotFoundError(f"Source VFS path tidak ditemukan: {resolved_source_vfs}")
-
-            if os.path.isabs(target_name_or_host_path) or target_name_or_host_path.startswith(("./", "../")):
-                logger.warning(f"Ekspor ke host path '{target_name_or_host_path}' tidak diimplementasikan langsung oleh Tempik. Akan dikembalikan sebagai data.")
-                if await tempik.virtual_fs.file_exists(resolved_source_vfs):
-                    content = await tempik.virtual_fs.read_file(resolved_source_vfs)
-                    import base64
-                    return {"status": "success_data_returned", "export_name": target_name_or_host_path, "data_base64": base64.b64encode(content).decode(), "source_vfs": resolved_source_vfs}
-                else: return {"status": "failed", "error": "Ekspor direktori sebagai data belum didukung penuh."}
-
-            if await tempik.virtual_fs.file_exists(resolved_source_vfs):
-                content = await tempik.virtual_fs.read_file(resolved_source_vfs)
-                tempik.exported_data[target_name_or_host_path] = content
-                return {"status": "success", "exported_as_name": target_name_or_host_path, "source_vfs": resolved_source_vfs, "size": len(content)}
-            elif await tempik.virtual_fs.dir_exists(resolved_source_vfs):
-                # TODO: Implementasi zip VFS direktori
-                logger.info(f"Exporting VFS directory {resolved_source_vfs} as {target_name_or_host_path} (simulated zip).")
-                return {"status": "pending_zip", "message": "Zip export untuk direktori belum diimplementasikan."}
+            if tempik.virtual_fs.dir_exists(resolved_source_vfs):
+                return await self._export_directory(tempik, resolved_source_vfs, target_name_or_host_path, params)
+
+            content = await tempik.virtual_fs.read_file(resolved_source_vfs)
+            host_path = self._resolve_export_host_path(tempik, target_name_or_host_path)
+            if host_path:
+                def _write_file(sink):
+                    sink.write(content)
+                await asyncio.to_thread(self._write_host_export, host_path, _write_file)
+                return {"status": "success", "host_path": host_path, "source_vfs": resolved_source_vfs, "size": len(content)}
+            tempik.export_data(target_name_or_host_path, content)
+            return {"status": "success", "exported_as_name": target_name_or_host_path, "source_vfs": resolved_source_vfs, "size": len(content)}
         except Exception as e: return {"status": "failed", "error": str(e)}
-        return {"status": "failed", "error": "Logika export belum lengkap."}
+
+    @staticmethod
+    def _resolve_export_host_path(tempik: 'Tempik', target: str) -> Optional[str]:
+        """Path host untuk target EXPORT absolut/'./'/'../' (dicek terhadap host_export_dir), None = nama exported_data."""
+        if not (os.path.isabs(target) or target.startswith(("./", "../"))):
+            return None
+        if not tempik.parent_executor:
+            raise RuntimeError("Ekspor ke host path memerlukan UTEKVirtualExecutor.")
+        return tempik.parent_executor.resolve_host_export_path(target)
+
+    @staticmethod
+    def _write_host_export(host_path: str, write: Callable[[Any], Any]) -> Any:
+        """Tulis file host secara atomik: isi ditulis ke .part lalu di-rename; return hasil write(sink)."""
+        os.makedirs(os.path.dirname(host_path), exist_ok=True)
+        partial_path = host_path + ".part"
+        try:
+            with open(partial_path, "wb") as sink:
+                result = write(sink)
+            os.replace(partial_path, host_path)
+        except BaseException:
+            try: os.remove(partial_path)
+            except OSError: pass
+            raise
+        return result
+
+    async def _export_directory(self, tempik: 'Tempik', source_dir: str, target: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """EXPORT direktori VFS sebagai arsip zip/tar, ke exported_data (in-memory) atau ke file host."""
+        import io
+        fmt = params.get("format", "zip")
+        codec = params.get("codec", "deflate" if fmt == "zip" else "none")
+        level = params.get("compression_level")
+        workers = int(params.get("workers", min(4, os.cpu_count() or 1)))
+        manifest_name = params.get("manifest_name", "MANIFEST.json") if params.get("manifest") else None
+
+        files = await tempik.virtual_fs.read_tree(source_dir)
+        if manifest_name and manifest_name in files:
+            return {"status": "failed", "error": f"Nama manifest '{manifest_name}' bentrok dengan file di {source_dir}."}
+        metadata = {rel: tempik.virtual_fs.get_node_metadata(f"{source_dir.rstrip('/')}/{rel}") for rel in files}
+
+        host_path = self._resolve_export_host_path(tempik, target)
+
+        def _write_archive():
+            make_writer = lambda sink: ArchiveWriter(files, fmt, codec, sink, level=level, workers=workers,
+                                                     metadata=metadata, manifest_name=manifest_name)
+            if host_path:
+                return self._write_host_export(host_path, lambda sink: make_writer(sink).write()), None
+            sink = io.BytesIO()
+            stats = make_writer(sink).write()
+            return stats, sink.getvalue() # getvalue() memakai ulang buffer BytesIO, bukan salinan kedua
+
+        start_time = time.perf_counter()
+        stats, archive_bytes = await asyncio.to_thread(_write_archive)
+        result = {"status": "success", "source_vfs": source_dir, "format": fmt, "codec": codec,
+                  "files": len(files), "size": stats["bytes_out"], "uncompressed_size": stats["bytes_in"],
+                  "manifest_sha256": stats["manifest_sha256"], "duration_ms": int((time.perf_counter() - start_time) * 1000)}
+        if host_path:
+            result["host_path"] = host_path
+        else:
+            tempik.export_data(target, archive_bytes)
+            result["exported_as_name"] = target
+        return result
 
 
     async def _handle_unpack(self, tempik: 'Tempik', params: Dict[str, Any]) -> Dict[str, Any]:
-        # ... (kode yang ada dipertahankan, dengan penyesuaian untuk VFS async) ...
         source_vfs_file = params.get("file")
         target_vfs_dir = params.get("target_dir", "/")
-        format_type = params.get("format", "auto") # zip, tar.gz, auto-detect
+        format_type = params.get("format", "auto") # zip, tar, tar.gz, tar.xz, tar.zst, auto-detect
+        workers = int(params.get("workers", min(4, os.cpu_count() or 1))) # Dekompresi member zip paralel
 
         if not source_vfs_file: return {"status": "failed", "error": "File VFS sumber diperlukan untuk UNPACK."}
         
@@ -2062,83 +4825,181 @@ class InstructionSet: # AUDIT POINT 3 (kelengkapan handler)
             return {"status": "dry_run_simulated", "action": "UNPACK", "source": resolved_source_vfs, "target_dir": resolved_target_vfs}
 
         try:
-            if not await tempik.virtual_fs.file_exists(resolved_source_vfs):
+            if not tempik.virtual_fs.file_exists(resolved_source_vfs):
                 raise FileNotFoundError(f"File arsip tidak ditemukan di VFS: {resolved_source_vfs}")
-            if not await tempik.virtual_fs.dir_exists(resolved_target_vfs):
-                tempik.virtual_fs._create_dir_recursive(resolved_target_vfs) # Not async, VFS internal
 
-            archive_bytes = await tempik.virtual_fs.read_file(resolved_source_vfs)
-            
+            opener = await tempik.virtual_fs.open_file(resolved_source_vfs)
             if format_type == "auto":
-                if resolved_source_vfs.endswith(".zip"): format_type = "zip"
-                elif resolved_source_vfs.endswith((".tar.gz", ".tgz")): format_type = "tar.gz"
-                else: return {"status": "failed", "error": "Tidak dapat mendeteksi format arsip."}
-
-            if format_type == "zip":
-                import io
-                with zipfile.ZipFile(io.BytesIO(archive_bytes), 'r') as zip_ref:
-                    for member_name in zip_ref.namelist():
-                        member_path_vfs = os.path.join(resolved_target_vfs, member_name).replace('\\', '/')
-                        # Pastikan path aman (tidak keluar dari target_vfs_dir)
-                        if not os.path.normpath(member_path_vfs).startswith(os.path.normpath(resolved_target_vfs)):
-                            logger.warning(f"Potensi Zip Slip terdeteksi: {member_name}. Dilewati.")
-                            continue
-                        if member_name.endswith('/'): 
-                            tempik.virtual_fs._create_dir_recursive(member_path_vfs)
-                        else: 
-                            dir_of_member = os.path.dirname(member_path_vfs)
-                            if dir_of_member and dir_of_member != "/": tempik.virtual_fs._create_dir_recursive(dir_of_member)
-                            await tempik.virtual_fs.write_file(member_path_vfs, zip_ref.read(member_name))
-                return {"status": "success", "unpacked_to_vfs": resolved_target_vfs}
-            # Implementasi tar.gz jika perlu
-            else: return {"status": "failed", "error": f"Format arsip tidak didukung: {format_type}"}
+                with opener() as head_stream:
+                    format_type = detect_archive_format(resolved_source_vfs, head_stream.read(512))
+                if not format_type: return {"status": "failed", "error": "Tidak dapat mendeteksi format arsip."}
+            if format_type == "tgz": format_type = "tar.gz"
         except Exception as e: return {"status": "failed", "error": str(e)}
 
+        # Ekstraksi (dekompresi) per batch di thread agar event loop tidak terblokir; tiap batch langsung
+        # di-commit ke VFS (cek quota per batch), jadi memori puncak sebatas satu batch, bukan seluruh isi arsip
+        max_vfs = tempik.execution_context_manager.resource_limits.get("max_vfs_size_bytes", float('inf'))
+        extractor = ArchiveExtractor(opener, format_type, resolved_target_vfs,
+                                     max_total_bytes=max_vfs - tempik.virtual_fs.get_total_vfs_size(), workers=workers)
+        start_time = time.perf_counter()
+        files_written = total_bytes = 0
+        batches = extractor.iter_batches()
+        try:
+            await tempik.virtual_fs.write_files_batch([], dirs=[resolved_target_vfs])
+            while True:
+                batch = await asyncio.to_thread(next, batches, None)
+                if batch is None: break
+                batch_files, batch_dirs = batch
+                total_bytes += await tempik.virtual_fs.write_files_batch(batch_files, dirs=batch_dirs)
+                files_written += len(batch_files)
+        except Exception as e:
+            # Batch yang sudah di-commit tetap ada di VFS (UNPACK tidak atomik untuk arsip besar)
+            return {"status": "failed", "error": f"{e} ({files_written} file sudah ditulis ke {resolved_target_vfs})",
+                    "files": files_written, "bytes": total_bytes}
+        finally:
+            await asyncio.to_thread(batches.close) # Tutup arsip/stream dan pool thread zip
+        return {"status": "success", "unpacked_to_vfs": resolved_target_vfs, "format": format_type,
+                "files": files_written, "bytes": total_bytes, "skipped": extractor.skipped,
+                "duration_ms": int((time.perf_counter() - start_time) * 1000)}
+
     # AUDIT POINT 3: Handler baru dan yang diperbaiki
     async def _handle_install(self, tempik: 'Tempik', params: Dict[str, Any]) -> Dict[str, Any]:
-        package_name = params.get("package")
-        version = params.get("version")
+        manager = params.get("manager", "pip")
+        packages = [str(p) for p in params.get("packages", [])]
+        if params.get("package"): # Bentuk lama: satu package + version opsional
+            version = params.get("version")
+            separator = "@" if manager == "npm" else "=="
+            packages.append(f"{params['package']}{separator}{version}" if version else params["package"])
+        requirements_vfs = params.get("requirements") # File requirements di VFS (pip)
         target_dir_vfs = params.get("target_dir", "/deps/installed_pkgs") # Instalasi ke VFS
+        materialize_vfs = params.get("materialize_vfs", True)
         
-        if not package_name: return {"status": "failed", "error": "Nama package diperlukan untuk INSTALL."}
-        logger.info(f"TEMPİK-{tempik.tempik_id_str} INSTALL (simulated): package='{package_name}', version='{version}' to VFS '{target_dir_vfs}'.")
+        if not packages and not requirements_vfs: return {"status": "failed", "error": "Nama package diperlukan untuk INSTALL."}
+        if any(p.startswith("-") for p in packages): return {"status": "failed", "error": "Spesifikasi package tidak boleh berupa opsi."}
+        logger.info(f"TEMPİK-{tempik.tempik_id_str} INSTALL: manager='{manager}', packages={packages}, requirements='{requirements_vfs}' to VFS '{target_dir_vfs}'.")
         
         if tempik.execution_mode == ExecutionMode.DRY_RUN:
-            return {"status": "dry_run_simulated", "action": "INSTALL", "package": package_name, "version": version}
+            return {"status": "dry_run_simulated", "action": "INSTALL", "manager": manager, "packages": packages}
 
-        # Simulasi: Buat folder package di VFS
+        ctx_mgr = tempik.execution_context_manager
+        cache = tempik.parent_executor.dependency_cache if tempik.parent_executor else DependencyCache()
+        # Opsi index ikut jadi bagian key: set package sama dari index berbeda bisa menghasilkan environment berbeda
+        index_options: List[str] = []
+        for link in params.get("find_links", []):
+            index_options += ["--find-links", str(link)]
+        if params.get("index_url"):
+            index_options += ["--registry" if manager == "npm" else "--index-url", str(params["index_url"])]
+        if params.get("offline"):
+            index_options.append("--offline" if manager == "npm" else "--no-index")
+        executable = params.get("python", sys.executable) if manager == "pip" else params.get("npm", "npm")
+        manifest_hash = ""
         try:
-            pkg_path = os.path.join(target_dir_vfs, package_name, version or "latest").replace('\\', '/')
-            tempik.virtual_fs._create_dir_recursive(pkg_path) # Not async, VFS internal
-            await tempik.virtual_fs.write_file(os.path.join(pkg_path, "installed.marker").replace('\\', '/'), b"installed")
-            return {"status": "simulated_success", "message": f"INSTALL {package_name} simulated to {pkg_path}."}
+            if requirements_vfs:
+                if manager != "pip": return {"status": "failed", "error": "Param 'requirements' hanya untuk manager pip."}
+                requirements_path = ctx_mgr.resolve_path(requirements_vfs)
+                requirements = (await tempik.io_handler.read_file(requirements_path)).decode("utf-8")
+                packages += [line.split("#", 1)[0].strip() for line in requirements.splitlines()
+                             if line.split("#", 1)[0].strip() and not line.lstrip().startswith("-")]
+                # Isi file requirements (termasuk baris opsi) selalu ikut; hash header job hanya pembeda tambahan
+                manifest_hash = hashlib.sha256(f"{tempik.dependency_manifest_hash or ''}\0{requirements}".encode("utf-8")).hexdigest()
+
+            start_time = time.perf_counter()
+            key = DependencyCache.make_key(manager, cache.tool_id(executable), packages, index_options, manifest_hash)
+            if cache.lookup(key) is None and "--no-index" not in index_options and "--offline" not in index_options \
+                    and not await tempik.network_unit._check_network_policy():
+                return {"status": "failed", "error": "INSTALL memerlukan akses jaringan (mode isolated); pakai 'offline' + 'find_links' atau environment yang sudah di-cache."}
+            env_path, key, cache_hit = await cache.get_or_build(manager, executable, packages, index_options, manifest_hash)
+
+            # Environment prebuilt dipakai langsung oleh EXECUTE (read-only, tanpa copy)
+            env_lib = os.path.join(env_path, DEPENDENCY_MANAGERS[manager])
+            env_var = "PYTHONPATH" if manager == "pip" else "NODE_PATH"
+            existing = [p for p in (ctx_mgr.get_env_var(env_var) or "").split(os.pathsep) if p and p != env_lib]
+            ctx_mgr.set_env_var(env_var, os.pathsep.join([env_lib] + existing))
+
+            result = {"status": "success", "manager": manager, "packages": packages, "env_key": key,
+                      "env_path": env_lib, "cache_hit": cache_hit}
+            if materialize_vfs:
+                resolved_target = ctx_mgr.resolve_path(target_dir_vfs)
+                files, dirs = await cache.snapshot(key, manager)
+                base = resolved_target.rstrip("/")
+                result["bytes"] = await tempik.virtual_fs.write_files_batch(
+                    [(f"{base}/{rel}", content, perms) for rel, content, perms in files],
+                    dirs=[resolved_target] + [f"{base}/{rel}" for rel in dirs])
+                result.update(installed_to_vfs=resolved_target, files=len(files))
+            result["duration_ms"] = int((time.perf_counter() - start_time) * 1000)
+            return result
         except Exception as e:
-            return {"status": "failed", "error": f"Simulasi INSTALL gagal: {e}"}
+            return {"status": "failed", "error": f"INSTALL gagal: {e}"}
 
 
     async def _handle_compile(self, tempik: 'Tempik', params: Dict[str, Any]) -> Dict[str, Any]:
         source_path_vfs = params.get("source") # Bisa file atau direktori di VFS
         output_name_vfs = params.get("output", "compiled_output") # Nama output di VFS
         compiler_options = params.get("options", "")
+        flags = shlex.split(compiler_options) if isinstance(compiler_options, str) else [str(f) for f in compiler_options]
+        target_platform = params.get("target_platform", host_target_platform())
         
         if not source_path_vfs: return {"status": "failed", "error": "Path source VFS diperlukan untuk COMPILE."}
-        logger.info(f"TEMPİK-{tempik.tempik_id_str} COMPILE (simulated): source='{source_path_vfs}', output='{output_name_vfs}', options='{compiler_options}'.")
+        logger.info(f"TEMPİK-{tempik.tempik_id_str} COMPILE: source='{source_path_vfs}', output='{output_name_vfs}', options='{compiler_options}'.")
 
         if tempik.execution_mode == ExecutionMode.DRY_RUN:
             return {"status": "dry_run_simulated", "action": "COMPILE", "source": source_path_vfs, "output": output_name_vfs}
-        
-        # Simulasi: Buat file output placeholder di VFS
+        if target_platform != host_target_platform() and "compiler" not in params:
+            return {"status": "failed", "error": f"target_platform {target_platform} memerlukan cross-compiler eksplisit (param 'compiler')."}
+
+        resolved_source = tempik.execution_context_manager.resolve_path(source_path_vfs)
+        resolved_output = tempik.execution_context_manager.resolve_path(output_name_vfs)
         try:
-            resolved_source = tempik.execution_context_manager.resolve_path(source_path_vfs)
-            if not await tempik.virtual_fs.file_exists(resolved_source) and not await tempik.virtual_fs.dir_exists(resolved_source):
+            if tempik.virtual_fs.file_exists(resolved_source):
+                sources = {os.path.basename(resolved_source): await tempik.io_handler.read_file(resolved_source)}
+            elif tempik.virtual_fs.dir_exists(resolved_source):
+                sources = await tempik.virtual_fs.read_tree(resolved_source)
+            else:
                 return {"status": "failed", "error": f"Source VFS tidak ditemukan: {resolved_source}"}
 
-            # Asumsi output adalah file di CWD VFS
-            resolved_output = tempik.execution_context_manager.resolve_path(output_name_vfs)
-            await tempik.virtual_fs.write_file(resolved_output, f"compiled_content_for_{source_path_vfs}".encode())
-            return {"status": "simulated_success", "message": f"COMPILE {source_path_vfs} simulated to {resolved_output}."}
+            units = [p for p in sources if p.endswith(C_SOURCE_EXTENSIONS + CPP_SOURCE_EXTENSIONS)]
+            if not units:
+                return {"status": "failed", "error": f"Tidak ada file .c/.cpp di {resolved_source}"}
+            is_cpp = any(p.endswith(CPP_SOURCE_EXTENSIONS) for p in units)
+            compiler = params.get("compiler", "g++" if is_cpp else "gcc")
+
+            # Hash mencakup semua file (termasuk header) beserta path relatifnya
+            source_digest = hashlib.sha256()
+            for rel_path, content in sources.items():
+                source_digest.update(rel_path.encode("utf-8") + b"\0" + hashlib.sha256(content).digest())
+
+            build_cache: BuildCache = tempik.parent_executor.build_cache if tempik.parent_executor else BuildCache()
+            key = build_cache.make_key(source_digest.hexdigest(), build_cache.compiler_id(compiler), flags, target_platform)
+            timeout_s = float(params.get("timeout_seconds", DEFAULT_COMPILE_TIMEOUT_SECONDS))
+
+            async def _build(artifact_path: str):
+                with tempfile.TemporaryDirectory(prefix=f"asu_src_{tempik.tempik_id_str}_") as src_dir:
+                    for rel_path, content in sources.items():
+                        host_path = os.path.join(src_dir, rel_path)
+                        os.makedirs(os.path.dirname(host_path), exist_ok=True)
+                        with open(host_path, "wb") as f: f.write(content)
+                    proc = await asyncio.create_subprocess_exec(
+                        compiler, *flags, *units, "-o", artifact_path, cwd=src_dir,
+                        stdin=asyncio.subprocess.DEVNULL, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+                    try:
+                        _, stderr = await asyncio.wait_for(proc.communicate(), timeout_s)
+                    finally:
+                        if proc.returncode is None:
+                            proc.kill()
+                            await proc.wait()
+                    if proc.returncode != 0:
+                        raise RuntimeError(f"{compiler} keluar dengan kode {proc.returncode}: {stderr.decode('utf-8', errors='replace')[-2000:]}")
+
+            start_time = time.perf_counter()
+            artifact_path, cache_hit = await build_cache.get_or_build(key, _build)
+            with open(artifact_path, "rb") as f:
+                await tempik.io_handler.write_file(resolved_output, f.read())
+            return {"status": "success", "output": resolved_output, "compiler": compiler, "cache_key": key,
+                    "cache_hit": cache_hit, "duration_ms": int((time.perf_counter() - start_time) * 1000)}
+        except asyncio.TimeoutError:
+            return {"status": "failed", "error": f"COMPILE timeout setelah {timeout_s}s"}
         except Exception as e:
-            return {"status": "failed", "error": f"Simulasi COMPILE gagal: {e}"}
+            return {"status": "failed", "error": f"COMPILE gagal: {e}"}
 
     async def _handle_checkout(self, tempik: 'Tempik', params: Dict[str, Any]) -> Dict[str, Any]:
         # Biasanya setelah FETCH_REPO, untuk checkout branch/commit tertentu
@@ -2152,7 +5013,7 @@ class InstructionSet: # AUDIT POINT 3 (kelengkapan handler)
         # Simulasi: Ubah file marker di VFS repo
         try:
             resolved_repo_path = tempik.execution_context_manager.resolve_path(repo_vfs_path)
-            if not await tempik.virtual_fs.dir_exists(resolved_repo_path):
+            if not tempik.virtual_fs.dir_exists(resolved_repo_path):
                 return {"status": "failed", "error": f"Repo VFS tidak ditemukan: {resolved_repo_path}"}
             
             await tempik.virtual_fs.write_file(os.path.join(resolved_repo_path, ".git_ref").replace('\\','/'), branch_or_commit.encode())
@@ -2160,21 +5021,27 @@ class InstructionSet: # AUDIT POINT 3 (kelengkapan handler)
         except Exception as e:
             return {"status": "failed", "error": f"Simulasi CHECKOUT gagal: {e}"}
 
+    async def _handle_branch(self, tempik: 'Tempik', params: Dict[str, Any]) -> Dict[str, Any]:
+        # PC diatur oleh ControlUnit memakai target_pc yang sudah di-resolve saat load_program
+        return {"status": "success", "target_label": params.get("target_label")}
+
     # AUDIT POINT 3, 4: CALL dan RET
     async def _handle_call(self, tempik: 'Tempik', params: Dict[str, Any]) -> Dict[str, Any]:
         target_label = params.get("target_label")
         if not target_label: return {"status": "failed", "error": "Target label diperlukan untuk CALL."}
 
-        if target_label not in tempik.label_map:
+        # target_pc sudah di-resolve dan divalidasi oleh Tempik.load_program
+        target_address = tempik.register_file.instruction_register.target_pc
+        if target_address is None:
             return {"status": "failed", "error": f"Label '{target_label}' tidak ditemukan untuk CALL."}
 
         if tempik.execution_mode == ExecutionMode.DRY_RUN:
             return {"status": "dry_run_simulated", "action": "CALL", "target": target_label}
 
         try:
-            # 1. Push return address (PC saat ini + 1, karena PC akan increment setelah instruksi CALL selesai dieksekusi oleh pipeline)
-            #    Namun, PC di ControlUnit diupdate *setelah* instruksi. Jadi, PC saat ini adalah instruksi *setelah* CALL.
-            return_address = tempik.program_counter.value # PC sudah menunjuk ke instruksi berikutnya
+            # 1. Push return address. PC di ControlUnit diupdate *setelah* instruksi,
+            #    jadi PC saat ini masih menunjuk ke CALL; kembali ke instruksi berikutnya.
+            return_address = tempik.program_counter.value + 1
             tempik.memory_unit.push_stack(return_address.to_bytes(4, 'big')) # Asumsi alamat 4 byte
 
             # 2. (Opsional) Push current Frame Pointer (FP)
@@ -2185,7 +5052,6 @@ class InstructionSet: # AUDIT POINT 3 (kelengkapan handler)
             tempik.register_file.fp = tempik.register_file.sp
 
             # 4. Jump to target_label
-            target_address = tempik.label_map[target_label]
             tempik.program_counter.set(target_address)
             tempik.register_file.pc = target_address # Sinkronkan
             
@@ -2229,60 +5095,181 @@ class InstructionSet: # AUDIT POINT 3 (kelengkapan handler)
         target_label = params.get("target_label") # Label fungsi yang akan dijalankan di thread baru
         thread_params = params.get("params", {}) # Parameter untuk fungsi thread
         
+        handle_env_var = params.get("handle_env_var") # Simpan thread_id ke env var agar bisa di-WAIT
+        
         if not target_label: return {"status": "failed", "error": "Target label diperlukan untuk SPAWN_THREAD."}
-        if target_label not in tempik.label_map:
+        # target_pc sudah di-resolve dan divalidasi oleh Tempik.load_program
+        target_pc = tempik.register_file.instruction_register.target_pc
+        if target_pc is None:
             return {"status": "failed", "error": f"Label '{target_label}' tidak ditemukan untuk SPAWN_THREAD."}
 
-        logger.info(f"TEMPİK-{tempik.tempik_id_str} SPAWN_THREAD request for label '{target_label}' (simulated).")
-        
         if tempik.execution_mode == ExecutionMode.DRY_RUN:
             return {"status": "dry_run_simulated", "action": "SPAWN_THREAD", "target": target_label}
 
-        # Simulasi:
-        # Implementasi nyata bisa berarti:
-        # 1. Jika Tempik mendukung multithreading internal: buat task asyncio baru yang memulai eksekusi dari target_label
-        #    dengan context (register, stack) yang terisolasi atau dibagi secara hati-hati.
-        # 2. Jika UTEK level: minta UTEKVirtualExecutor untuk membuat Tempik baru (atau menggunakan yang idle)
-        #    untuk menjalankan sub-program ini. Ini lebih mirip DELEGATE_TO tapi mungkin lebih ringan.
-        
-        # Untuk saat ini, kita simulasikan dengan log dan tidak ada eksekusi paralel nyata di dalam satu Tempik.
-        # Bisa juga menggunakan ThreadPoolExecutor jika operasinya CPU-bound.
-        # tempik.parent_executor.schedule_sub_task(tempik_id=tempik.tempik_id, 
-        #                                          start_label=target_label, 
-        #                                          params=thread_params)
-        
-        # Placeholder:
-        tempik.background_tasks_info.append({"label": target_label, "params": thread_params, "status": "spawned_simulated"})
-        return {"status": "simulated_thread_spawned", "target_label": target_label}
+        try:
+            thread = tempik.spawn_thread(target_pc, thread_params)
+        except (RuntimeError, MemoryError) as e: # Batas thread per Tempik atau memori stack habis
+            return {"status": "failed", "error": f"SPAWN_THREAD gagal: {e}"}
+
+        logger.info(f"TEMPİK-{tempik.tempik_id_str} SPAWN_THREAD: thread {thread.thread_id} dimulai dari label '{target_label}'.")
+        if handle_env_var:
+            tempik.execution_context_manager.set_env_var(handle_env_var, str(thread.thread_id))
+        return {"status": "success", "thread_id": thread.thread_id, "target_label": target_label}
 
     async def _handle_wait(self, tempik: 'Tempik', params: Dict[str, Any]) -> Dict[str, Any]:
+        # Join thread (thread_id / thread_ids / thread_id_env, atau "all") atau tunggu named event.
+        # duration_seconds hanya dipakai jika tidak ada target join/event.
+        timeout_s = params.get("timeout_seconds")
+        timeout_s = float(timeout_s) if timeout_s is not None else None
+        event_name = params.get("event_name")
+
+        thread_ids: List[int] = []
+        if params.get("thread_ids") == "all":
+            thread_ids = list(tempik.threads.keys())
+        elif "thread_ids" in params:
+            thread_ids = [int(tid) for tid in params["thread_ids"]]
+        if "thread_id" in params:
+            thread_ids.append(int(params["thread_id"]))
+        if "thread_id_env" in params:
+            env_value = tempik.execution_context_manager.get_env_var(params["thread_id_env"])
+            if env_value is None:
+                return {"status": "failed", "error": f"Env var '{params['thread_id_env']}' tidak berisi thread_id."}
+            thread_ids.append(int(env_value))
+
+        delegation_ids: List[str] = []
+        if params.get("delegation_ids") == "all":
+            delegation_ids = list(tempik.delegations.keys())
+        elif "delegation_ids" in params:
+            delegation_ids = list(params["delegation_ids"])
+        if "delegation_id_env" in params:
+            delegation_ids.extend(filter(None, (tempik.execution_context_manager.get_env_var(params["delegation_id_env"]) or "").split(",")))
+
+        if tempik.execution_mode == ExecutionMode.DRY_RUN:
+            return {"status": "dry_run_simulated", "action": "WAIT", "threads": thread_ids, "event_name": event_name}
+
+        if delegation_ids:
+            unknown = [did for did in delegation_ids if did not in tempik.delegations]
+            if unknown:
+                return {"status": "failed", "error": f"Delegasi tidak dikenal: {unknown}"}
+            return await self._gather_delegations(tempik, [tempik.delegations[did] for did in delegation_ids],
+                                                  params.get("output_vfs_dir"), timeout_s, per_job_subdir=len(delegation_ids) > 1)
+
+        if thread_ids:
+            unknown = [tid for tid in thread_ids if tid not in tempik.threads]
+            if unknown:
+                return {"status": "failed", "error": f"Thread tidak dikenal: {unknown}"}
+            try:
+                joined = await tempik.join_threads(thread_ids, timeout=timeout_s)
+            except asyncio.TimeoutError:
+                return {"status": "failed", "error": f"WAIT timeout menunggu thread {thread_ids}."}
+            failed_threads = [tid for tid, status in joined.items() if status == TempikStatus.FAILED.value]
+            return {"status": "failed" if failed_threads else "success", "joined_threads": joined,
+                    **({"error": f"Thread gagal: {failed_threads}"} if failed_threads else {})}
+
+        if event_name:
+            try:
+                await asyncio.wait_for(tempik.get_named_event(event_name).wait(), timeout=timeout_s)
+            except asyncio.TimeoutError:
+                return {"status": "failed", "error": f"WAIT timeout menunggu event '{event_name}'."}
+            return {"status": "success", "event_name": event_name}
+
         duration_s = params.get("duration_seconds", 1.0)
-        # event_to_wait_for = params.get("event_name") # Menunggu event tertentu
-        logger.info(f"TEMPİK-{tempik.tempik_id_str} WAIT for {duration_s}s (simulated).")
-        if tempik.execution_mode != ExecutionMode.DRY_RUN:
-            await asyncio.sleep(float(duration_s))
+        logger.info(f"TEMPİK-{tempik.tempik_id_str} WAIT for {duration_s}s.")
+        await asyncio.sleep(float(duration_s))
         return {"status": "success", "waited_seconds": duration_s}
 
 
     async def _handle_delegate_to(self, tempik: 'Tempik', params: Dict[str, Any]) -> Dict[str, Any]:
-        # ... (kode yang ada dipertahankan) ...
         asu_file_vfs_path = params.get("asu_file_vfs_path") 
         input_params = params.get("input_params", {}) 
+        batch_inputs = params.get("batch_inputs") # Fan-out: satu sub-job per item input
+        wait = params.get("wait", True) # False: kembalikan delegation_ids, join nanti dengan WAIT
+        output_vfs_dir = params.get("output_vfs_dir") # Fan-in: exported_data sub-job ditulis ke sini
         if not asu_file_vfs_path: return {"status": "failed", "error": "asu_file_vfs_path diperlukan."}
         
         resolved_path = tempik.execution_context_manager.resolve_path(asu_file_vfs_path)
         if tempik.execution_mode == ExecutionMode.DRY_RUN:
             return {"status": "dry_run_simulated", "action": "DELEGATE_TO", "target_asu": resolved_path}
 
-        if not await tempik.virtual_fs.file_exists(resolved_path):
+        if not tempik.virtual_fs.file_exists(resolved_path):
             return {"status": "failed", "error": f"File .asu untuk delegasi tidak ditemukan di VFS: {resolved_path}"}
+        if not tempik.parent_executor:
+            return {"status": "failed", "error": "DELEGATE_TO memerlukan Tempik yang dikelola UTEKVirtualExecutor."}
 
-        tempik.delegation_request = {"asu_vfs_path": resolved_path, "params": input_params, "source_tempik_id": tempik.tempik_id}
-        logger.info(f"TEMPİK-{tempik.tempik_id_str} DELEGATE_TO request: {resolved_path} with params {input_params}.")
-        # Tempik saat ini akan menunggu (atau bisa juga tidak, tergantung behavior yang diinginkan)
-        # Untuk membuatnya menunggu, status Tempik bisa diubah dan Scheduler akan menghindarinya.
-        # tempik.set_status(TempikStatus.WAITING_FOR_DELEGATION)
-        return {"status": "delegation_requested", "target_asu": resolved_path}
+        scheduler = tempik.parent_executor.scheduler
+        try:
+            raw_asu = await tempik.virtual_fs.read_file(resolved_path)
+            child_asu = tempik.parent_executor.parse_asu_bytes(raw_asu, source=f"vfs:{resolved_path}")
+            if wait: # Tolak sebelum submit: sub-job yatim tidak boleh tertinggal di antrian
+                blocked = scheduler.delegation_blocked_reason(
+                    tempik, scheduler.cost_model.estimate(child_asu).cpu_seconds >= SCHEDULER_SHORT_JOB_S)
+                if blocked:
+                    return {"status": "failed", "error": f"DELEGATE_TO dengan wait ditolak: {blocked}."}
+            inputs = batch_inputs if batch_inputs is not None else [input_params]
+            jobs = [await tempik.parent_executor.submit_child_job(child_asu, tempik, inp, index=i)
+                    for i, inp in enumerate(inputs)]
+        except Exception as e:
+            return {"status": "failed", "error": f"DELEGATE_TO gagal: {e}"}
+
+        for job in jobs:
+            tempik.delegations[job.job_id] = job
+        delegation_ids = [job.job_id for job in jobs]
+        logger.info(f"TEMPİK-{tempik.tempik_id_str} DELEGATE_TO: {resolved_path} -> {len(jobs)} sub-job {delegation_ids}.")
+
+        if not wait:
+            if params.get("handle_env_var"):
+                tempik.execution_context_manager.set_env_var(params["handle_env_var"], ",".join(delegation_ids))
+            return {"status": "success", "delegation_ids": delegation_ids}
+        return await self._gather_delegations(tempik, jobs, output_vfs_dir, params.get("timeout_seconds"),
+                                              per_job_subdir=batch_inputs is not None)
+
+    async def _gather_delegations(self, tempik: 'Tempik', jobs: List['JobHandle'], output_vfs_dir: Optional[str],
+                                  timeout_s: Optional[float], per_job_subdir: bool) -> Dict[str, Any]:
+        """Tunggu future sub-job dan (opsional) tulis exported_data-nya ke VFS induk.
+        Timeout atau pembatalan induk membatalkan sub-job yang belum selesai lewat Scheduler.cancel."""
+        scheduler = tempik.parent_executor.scheduler
+        queued = [job for job in jobs if job.status == "queued"]
+        if queued:
+            blocked = scheduler.delegation_blocked_reason(
+                tempik, any(job.cost.cpu_seconds >= SCHEDULER_SHORT_JOB_S for job in queued))
+            if blocked:
+                return {"status": "failed", "error": f"Menunggu sub-job {[job.job_id for job in queued]} ditolak: {blocked}."}
+        scheduler.delegation_waiters[tempik.tempik_id] += 1
+        try:
+            results = await asyncio.wait_for(asyncio.gather(*(asyncio.shield(job.future) for job in jobs)),
+                                             timeout=float(timeout_s) if timeout_s is not None else None)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            for job in jobs:
+                scheduler.cancel(job)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            return {"status": "failed", "error": f"Timeout menunggu sub-job {[job.job_id for job in jobs]}; sub-job dibatalkan."}
+        finally:
+            scheduler.delegation_waiters[tempik.tempik_id] -= 1
+            if scheduler.delegation_waiters[tempik.tempik_id] <= 0:
+                del scheduler.delegation_waiters[tempik.tempik_id]
+
+        summary = []
+        for i, (job, result) in enumerate(zip(jobs, results)):
+            exported = result.get("exported_data", {})
+            if output_vfs_dir:
+                base_dir = tempik.execution_context_manager.resolve_path(output_vfs_dir)
+                if per_job_subdir:
+                    base_dir = f"{base_dir.rstrip('/')}/{i}"
+                for export_name, content in exported.items():
+                    await tempik.virtual_fs.write_file(f"{base_dir.rstrip('/')}/{export_name.lstrip('/')}", content)
+            summary.append({"job_id": job.job_id, "status": result["status"], "exported": sorted(exported)})
+
+        if output_vfs_dir:
+            summary_path = f"{tempik.execution_context_manager.resolve_path(output_vfs_dir).rstrip('/')}/delegation_results.json"
+            await tempik.virtual_fs.write_file(summary_path, json.dumps(summary, indent=2).encode('utf-8'))
+        # HALT adalah akhir normal program (bukan kegagalan); sub-job yang dibatalkan berstatus "cancelled"
+        failed = [entry["job_id"] for entry in summary
+                  if entry["status"] not in (TempikStatus.COMPLETED.value, TempikStatus.HALTED.value)]
+        result_payload = {"status": "failed" if failed else "success", "results": summary}
+        if failed:
+            result_payload["error"] = f"Sub-job gagal: {failed}"
+        return result_payload
 
     # AUDIT POINT 3: PUSH_RESULT
     async def _handle_push_result(self, tempik: 'Tempik', params: Dict[str, Any]) -> Dict[str, Any]:
@@ -2300,7 +5287,7 @@ class InstructionSet: # AUDIT POINT 3 (kelengkapan handler)
         actual_data = data_to_push
         if isinstance(data_to_push, str): # Cek apakah ini path VFS
             resolved_path = tempik.execution_context_manager.resolve_path(data_to_push)
-            if await tempik.virtual_fs.file_exists(resolved_path):
+            if tempik.virtual_fs.file_exists(resolved_path):
                 try:
                     actual_data = (await tempik.virtual_fs.read_file(resolved_path)).decode('utf-8') # Asumsi teks
                 except Exception as e:
@@ -2332,19 +5319,23 @@ class InstructionSet: # AUDIT POINT 3 (kelengkapan handler)
         headers = params.get("headers")
         if not endpoint: return {"status": "failed", "error": "Endpoint diperlukan."}
         
+        output_vfs_path = params.get("output") # Opsional: stream body respons ke file VFS
         if tempik.execution_mode == ExecutionMode.DRY_RUN:
             return {"status": "dry_run_simulated", "action": "INVOKE_REMOTE", "endpoint": endpoint, "method": method}
         
-        return await tempik.network_unit.invoke_remote(endpoint, method, payload, headers)
+        if output_vfs_path: output_vfs_path = tempik.execution_context_manager.resolve_path(output_vfs_path)
+        return await tempik.network_unit.invoke_remote(endpoint, method, payload, headers,
+                                                       output_vfs_path=output_vfs_path, io_handler=tempik.io_handler)
 
 
     async def _handle_emit_event(self, tempik: 'Tempik', params: Dict[str, Any]) -> Dict[str, Any]:
         # ... (kode yang ada dipertahankan) ...
         event_type = params.get("type", "custom_event")
         event_data = params.get("data", {})
-        logger.info(f"EVENT EMITTED by TEMPİK-{tempik.tempik_id_str}: Type='{event_type}', Data={event_data}")
+        logger.debug(f"EVENT EMITTED by TEMPİK-{tempik.tempik_id_str}: Type='{event_type}', Data={event_data}")
+        tempik.get_named_event(event_type).set() # Bangunkan WAIT event_name di Tempik ini
         if tempik.parent_executor:
-            tempik.parent_executor.publish_event(tempik.tempik_id_str, event_type, event_data)
+            await tempik.parent_executor.publish_event_async(tempik.tempik_id_str, event_type, event_data)
         return {"status": "success", "event_type": event_type, "event_data": event_data}
 
     async def _handle_sign(self, tempik: 'Tempik', params: Dict[str, Any]) -> Dict[str, Any]:
@@ -2357,7 +5348,7 @@ class InstructionSet: # AUDIT POINT 3 (kelengkapan handler)
         
         data_bytes = b''
         resolved_data_path = tempik.execution_context_manager.resolve_path(str(data_to_sign_str_or_path))
-        if await tempik.virtual_fs.file_exists(resolved_data_path):
+        if tempik.virtual_fs.file_exists(resolved_data_path):
             data_bytes = await tempik.virtual_fs.read_file(resolved_data_path)
         else: data_bytes = str(data_to_sign_str_or_path).encode('utf-8')
 
@@ -2401,8 +5392,8 @@ class InstructionSet: # AUDIT POINT 3 (kelengkapan handler)
 
         ciphertext_bytes = b''
         resolved_cipher_path = tempik.execution_context_manager.resolve_path(str(ciphertext_hex_or_vfs_path))
-        if await tempik.virtual_fs.file_exists(resolved_cipher_path):
-            ciphertext_bytes = await tempik.virtual_fs.read_file(resolved_cipher_path)
+        if tempik.virtual_fs.file_exists(resolved_cipher_path):
+            ciphertext_bytes = await tempik.virtual_fs.read_file(resolved_cipher_path) # Referensi konten VFS, bukan salinan
         else:
             try: ciphertext_bytes = bytes.fromhex(str(ciphertext_hex_or_vfs_path))
             except ValueError: return {"status": "failed", "error": "Ciphertext bukan hex string yang valid atau path VFS."}
@@ -2422,7 +5413,9 @@ class InstructionSet: # AUDIT POINT 3 (kelengkapan handler)
             return {"status": "dry_run_simulated", "action": "DECRYPT"}
             
         try:
-            plaintext_bytes = active_crypto_engine.decrypt_data(ciphertext_bytes)
+            # Envelope bisa berukuran besar: dekripsi per chunk (stream ke satu buffer output) di thread
+            # agar event loop tidak terblokir
+            plaintext_bytes = await asyncio.to_thread(active_crypto_engine.decrypt_data, ciphertext_bytes)
             result_payload = {}
             if output_vfs_path:
                 resolved_output_path = tempik.execution_context_manager.resolve_path(output_vfs_path)
@@ -2443,8 +5436,63 @@ class InstructionSet: # AUDIT POINT 3 (kelengkapan handler)
                     import base64
                     result_payload = {"status": "success", "plaintext_base64": base64.b64encode(plaintext_bytes).decode()}
             return result_payload
+        except InvalidTag: return {"status": "failed", "error": "Dekripsi gagal: envelope rusak, terpotong, atau kunci salah."}
         except Exception as e: return {"status": "failed", "error": f"Gagal melakukan dekripsi: {e}"}
 
+    async def _handle_encrypt(self, tempik: 'Tempik', params: Dict[str, Any]) -> Dict[str, Any]:
+        # Envelope encryption: payload ukuran berapa pun (RSA-OAEP langsung dibatasi ~190 byte)
+        data_str_or_vfs_path = params.get("data")
+        public_key_ref = params.get("public_key_ref") # Opsional; default kunci KeyStore executor
+        algorithm = params.get("algorithm", "aes-256-gcm") # aes-256-gcm | chacha20-poly1305
+        chunk_size = int(params.get("chunk_size", DEFAULT_ENVELOPE_CHUNK_BYTES))
+        output_vfs_path = params.get("output_vfs_path")
+        output_env_var = params.get("output_env_var") # Ciphertext hex (hanya untuk payload kecil)
+
+        if data_str_or_vfs_path is None: return {"status": "failed", "error": "Data untuk dienkripsi diperlukan."}
+        if algorithm not in ENVELOPE_ALGORITHMS:
+            return {"status": "failed", "error": f"Algoritma tidak didukung: {algorithm}. Pilihan: {', '.join(ENVELOPE_ALGORITHMS)}"}
+
+        resolved_data_path = tempik.execution_context_manager.resolve_path(str(data_str_or_vfs_path))
+        if tempik.virtual_fs.file_exists(resolved_data_path):
+            open_source = await tempik.virtual_fs.open_file(resolved_data_path) # Dibaca per chunk, tanpa salinan
+        else:
+            literal = str(data_str_or_vfs_path).encode('utf-8')
+            open_source = lambda: io.BytesIO(literal)
+
+        public_key = None
+        if public_key_ref:
+            try:
+                key_pem_bytes = await tempik.virtual_fs.read_file(tempik.execution_context_manager.resolve_path(public_key_ref))
+                public_key = (tempik.crypto_engine.key_store.load_public_pem(key_pem_bytes) if tempik.crypto_engine.key_store
+                              else serialization.load_pem_public_key(key_pem_bytes))
+            except Exception as e: return {"status": "failed", "error": f"Gagal load public key dari VFS {public_key_ref}: {e}"}
+
+        if tempik.execution_mode == ExecutionMode.DRY_RUN:
+            return {"status": "dry_run_simulated", "action": "ENCRYPT", "plaintext_bytes": len(open_source().getbuffer())}
+
+        def _encrypt():
+            # Chunk plaintext dibaca dari stream VFS dan chunk ciphertext langsung ditulis ke satu buffer output
+            sink = io.BytesIO()
+            with open_source() as source:
+                plaintext_bytes, _ = tempik.crypto_engine.encrypt_envelope_stream(source, sink, algorithm, chunk_size, public_key)
+            return plaintext_bytes, sink.getvalue() # getvalue() memakai ulang buffer BytesIO, bukan salinan kedua
+
+        try:
+            plaintext_bytes, envelope = await asyncio.to_thread(_encrypt)
+        except Exception as e: return {"status": "failed", "error": f"Gagal melakukan enkripsi: {e}"}
+
+        result = {"status": "success", "algorithm": algorithm, "plaintext_bytes": plaintext_bytes, "ciphertext_bytes": len(envelope)}
+        if output_vfs_path:
+            resolved_output_path = tempik.execution_context_manager.resolve_path(output_vfs_path)
+            await tempik.io_handler.write_file(resolved_output_path, envelope)
+            result["encrypted_to_vfs"] = resolved_output_path
+        elif output_env_var:
+            tempik.execution_context_manager.set_env_var(output_env_var, envelope.hex())
+            result["encrypted_to_env_var"] = output_env_var
+        else:
+            result["ciphertext_hex"] = envelope.hex()
+        return result
+
 
     async def _handle_verify(self, tempik: 'Tempik', params: Dict[str, Any]) -> Dict[str, Any]:
         # ... (kode yang ada dipertahankan, dengan penyesuaian untuk VFS async) ...
@@ -2457,7 +5505,7 @@ class InstructionSet: # AUDIT POINT 3 (kelengkapan handler)
 
         data_bytes = b''
         resolved_data_path = tempik.execution_context_manager.resolve_path(str(data_str_or_vfs_path))
-        if await tempik.virtual_fs.file_exists(resolved_data_path):
+        if tempik.virtual_fs.file_exists(resolved_data_path):
             data_bytes = await tempik.virtual_fs.read_file(resolved_data_path)
         else: data_bytes = str(data_str_or_vfs_path).encode('utf-8')
         
@@ -2546,6 +5594,119 @@ class InstructionSet: # AUDIT POINT 3 (kelengkapan handler)
              return {"status": "success", "comparison_result": result, "flags": tempik.register_file.flags}
 
 
+# --- Checkpoint/restore Tempik ---
+# Format checkpoint (biner, per section dikompresi lz4 dan di-CRC):
+#   MAGIC | jumlah_section u16 | section...
+#   section = TEMPIK_CHECKPOINT_SECTION (nama_len u8, raw_len u64, comp_len u64, crc32 u32) | nama | payload
+# Section: meta (JSON kecil), program (header/body/virtual_fs_structure .asu, agar bisa resume di proses lain),
+# registers, memory, vfs, context (JSON), exports. Waktu capture/restore sebanding ukuran state, bukan jumlah instruksi.
+TEMPIK_CHECKPOINT_MAGIC = b"ASUCKPT1"
+TEMPIK_CHECKPOINT_SECTION = struct.Struct("<BQQI")
+TEMPIK_CHECKPOINT_VERSION = 1
+DEFAULT_CHECKPOINT_DIR = os.environ.get("ASU_CHECKPOINT_DIR", os.path.join(DEFAULT_STATE_DIR, "checkpoints"))
+DEFAULT_CHECKPOINT_INTERVAL_S = float(os.environ.get("ASU_CHECKPOINT_INTERVAL_S", "0")) # 0 = hanya on-demand
+
+
+class TempikCheckpoint:
+    """Snapshot state lengkap satu Tempik di batas instruksi: RegisterFile, MemoryUnit (termasuk stack),
+    tree VirtualFS, PC ControlUnit, ExecutionContextManager dan data EXPORT."""
+    def __init__(self, meta: Dict[str, Any], sections: Dict[str, bytes]):
+        self.meta = meta
+        self.sections = sections
+
+    @property
+    def job_id(self) -> Optional[str]:
+        return self.meta.get("job_id")
+
+    @property
+    def pc(self) -> int:
+        return self.meta["pc"]
+
+    @classmethod
+    def capture(cls, tempik: 'Tempik', file_asu: FileASU) -> 'TempikCheckpoint':
+        if any(not t.task.done() for t in tempik.threads.values()):
+            raise RuntimeError("Checkpoint tidak bisa diambil saat SPAWN_THREAD masih berjalan.")
+        exports = bytearray()
+        for name, data in tempik.exported_data.items():
+            name_b = name.encode()
+            exports += struct.pack("<HQ", len(name_b), len(data)) + name_b + bytes(data)
+        program = {"header": file_asu.header.to_dict(), "body": [instr.to_dict() for instr in file_asu.body],
+                   "virtual_fs_structure": file_asu.virtual_fs_structure}
+        meta = {"version": TEMPIK_CHECKPOINT_VERSION, "created_at": time.time(), "tempik_id": tempik.tempik_id,
+                "job_id": tempik.current_job.job_id if tempik.current_job else None,
+                "file_hash": file_asu.hash_sha256, "pc": tempik.program_counter.value,
+                "execution_mode": tempik.execution_mode.value, "mount_points": tempik.virtual_fs.mount_points}
+        return cls(meta, {
+            "program": json.dumps(program, separators=(",", ":")).encode(),
+            "registers": tempik.register_file.snapshot(),
+            "memory": tempik.memory_unit.snapshot(),
+            "vfs": tempik.virtual_fs.snapshot(),
+            "context": json.dumps(tempik.execution_context_manager.snapshot(), separators=(",", ":")).encode(),
+            "exports": bytes(exports),
+        })
+
+    def encode(self) -> bytes:
+        sections = dict(self.sections, meta=json.dumps(self.meta, separators=(",", ":")).encode())
+        out = bytearray(TEMPIK_CHECKPOINT_MAGIC)
+        out += struct.pack("<H", len(sections))
+        for name, raw in sections.items():
+            payload = lz4.frame.compress(raw)
+            name_b = name.encode()
+            out += TEMPIK_CHECKPOINT_SECTION.pack(len(name_b), len(raw), len(payload), zlib.crc32(raw))
+            out += name_b
+            out += payload
+        return bytes(out)
+
+    @classmethod
+    def decode(cls, data: bytes) -> 'TempikCheckpoint':
+        if data[:len(TEMPIK_CHECKPOINT_MAGIC)] != TEMPIK_CHECKPOINT_MAGIC:
+            raise ValueError("Bukan file checkpoint Tempik.")
+        offset = len(TEMPIK_CHECKPOINT_MAGIC)
+        (count,) = struct.unpack_from("<H", data, offset)
+        offset += 2
+        view, sections = memoryview(data), {}
+        for _ in range(count):
+            name_len, raw_len, comp_len, crc = TEMPIK_CHECKPOINT_SECTION.unpack_from(data, offset)
+            offset += TEMPIK_CHECKPOINT_SECTION.size
+            name = bytes(view[offset:offset + name_len]).decode()
+            offset += name_len
+            raw = lz4.frame.decompress(view[offset:offset + comp_len])
+            offset += comp_len
+            if len(raw) != raw_len or zlib.crc32(raw) != crc:
+                raise ValueError(f"Section checkpoint '{name}' rusak.")
+            sections[name] = raw
+        meta = json.loads(sections.pop("meta"))
+        if meta.get("version") != TEMPIK_CHECKPOINT_VERSION:
+            raise ValueError(f"Versi checkpoint tidak didukung: {meta.get('version')}")
+        return cls(meta, sections)
+
+    def to_file_asu(self) -> FileASU:
+        """Bangun ulang FileASU dari section program; hash harus sama dengan file yang di-checkpoint."""
+        program = json.loads(self.sections["program"])
+        file_asu = FileASU(header=HeaderASU.from_dict(program["header"]),
+                           body=[InstruksiEksekusi.from_dict(instr) for instr in program["body"]],
+                           virtual_fs_structure=program["virtual_fs_structure"])
+        if file_asu.generate_hash() != self.meta["file_hash"]:
+            raise ValueError("Program di checkpoint tidak cocok dengan hash file .asu-nya.")
+        return file_asu
+
+    def restore_into(self, tempik: 'Tempik'):
+        """Pulihkan state ke Tempik (VFS Tempik harus instance baru dari Tempik.run). PC di-set oleh load_program."""
+        tempik.register_file.restore(self.sections["registers"])
+        tempik.memory_unit.restore(self.sections["memory"])
+        tempik.virtual_fs.restore(self.sections["vfs"])
+        tempik.virtual_fs.mount_points = dict(self.meta["mount_points"])
+        tempik.execution_context_manager.restore(json.loads(self.sections["context"]))
+        exports, offset, tempik.exported_data = self.sections["exports"], 0, {}
+        while offset < len(exports):
+            name_len, data_len = struct.unpack_from("<HQ", exports, offset)
+            offset += 10
+            name = exports[offset:offset + name_len].decode()
+            offset += name_len
+            tempik.exported_data[name] = exports[offset:offset + data_len]
+            offset += data_len
+
+
 # --- Kelas Tempik (Refactored) ---
 
 class Tempik: # AUDIT POINT 8 (Isolasi sudah baik dengan instance terpisah)
@@ -2556,7 +5717,9 @@ class Tempik: # AUDIT POINT 8 (Isolasi sudah baik dengan instance terpisah)
         self.tempik_id_str = f"Tempik-{tempik_id:03d}" # Untuk logging
         self.parent_executor = parent_executor 
         self.status = TempikStatus.IDLE
+        self.pipeline_stage = TempikStatus.IDLE # Tahap pipeline (FETCH..WRITE_BACK), murah & lokal
         self.current_file_hash: Optional[str] = None 
+        self.dependency_manifest_hash: str = "" # Dari header .asu yang sedang berjalan (key cache INSTALL)
         self.current_instruction_start_time: float = 0.0
         self.global_execution_start_time: float = 0.0 # AUDIT POINT 11
         self.max_exec_time_seconds: Optional[float] = None # AUDIT POINT 11
@@ -2575,12 +5738,16 @@ class Tempik: # AUDIT POINT 8 (Isolasi sudah baik dengan instance terpisah)
         self.virtual_fs = VirtualFS(self.tempik_id_str, context_manager_ref=self.execution_context_manager) # AUDIT POINT 7
         self.io_handler = IOHandler(self.virtual_fs, self.tempik_id_str)
         self.instruction_decoder = InstructionDecoder(self.register_file)
-        self.crypto_engine = CryptoEngine() 
-        self.network_unit = NetworkUnit(self.execution_context_manager, self.tempik_id_str)
-        self.security_module = SecurityModule(self.execution_context_manager, self.crypto_engine)
-        self.audit_logger = audit_logger 
-        self.interrupt_controller = InterruptController() # AUDIT POINT 6
+        self.crypto_engine = CryptoEngine(key_store=parent_executor.key_store if parent_executor else None)
+        self.network_unit = NetworkUnit(self.execution_context_manager, self.tempik_id_str,
+                                        git_mirror_cache=parent_executor.git_mirror_cache if parent_executor else None,
+                                        http_client=parent_executor.http_client if parent_executor else None)
         self.profiler = Profiler(self.tempik_id_str) # AUDIT POINT 16
+        self.security_module = SecurityModule(self.execution_context_manager, self.crypto_engine,
+                                              signature_cache=parent_executor.signature_cache if parent_executor else None,
+                                              profiler=self.profiler)
+        self.audit_logger = audit_logger 
+        self.interrupt_controller = InterruptController(profiler=self.profiler) # AUDIT POINT 6
         
         # Kontrol dan Program
         self.instruction_set = InstructionSet() 
@@ -2591,12 +5758,29 @@ class Tempik: # AUDIT POINT 8 (Isolasi sudah baik dengan instance terpisah)
         # Hasil dan Permintaan Antar Komponen
         self.exported_data: Dict[str, bytes] = {} 
         self.port_mapping_requests: List[Dict] = [] 
-        self.delegation_request: Optional[Dict] = None 
+        self.current_job: Optional['JobHandle'] = None
+        self.delegations: Dict[str, 'JobHandle'] = {} # Sub-job DELEGATE_TO milik job saat ini
+        self.final_status: TempikStatus = TempikStatus.IDLE # Status terminal terakhir (sebelum kembali IDLE)
         self.lock_requests: List[str] = [] 
-        self.background_tasks_info: List[Dict] = [] # Untuk SPAWN_THREAD (AUDIT POINT 3)
+
+        # SPAWN_THREAD / WAIT (AUDIT POINT 3): thread asyncio dengan register, PC, dan segmen stack sendiri
+        self.max_threads: int = (global_config or {}).get("max_threads_per_tempik", DEFAULT_MAX_THREADS_PER_TEMPIK)
+        self.threads: Dict[int, 'TempikThread'] = {}
+        self.named_events: Dict[str, asyncio.Event] = {}
+        self._next_thread_id = 1
+        self._free_stack_slots: List[int] = list(range(self.max_threads))
 
         self.execution_mode: ExecutionMode = ExecutionMode.BATCH # Default (AUDIT POINT 15)
 
+        # Checkpoint/restore: periodik (checkpoint_interval_s) atau on-demand (request_checkpoint), diambil di batas instruksi
+        self.current_file_asu: Optional[FileASU] = None
+        self.checkpoint_interval_s: float = 0.0
+        self._next_checkpoint_at: float = 0.0
+        self._checkpoint_waiters: List[asyncio.Future] = []
+
+        # Mode SERVICE (AUDIT POINT 15): program tetap resident setelah init, request di-dispatch ke label entry
+        self.service: Optional['TempikService'] = None
+
         # AUDIT POINT 17: Bus (opsional, untuk arsitektur mikro lebih detail)
         # self.instruction_bus = Bus(f"{self.tempik_id_str}-InstructionBus")
         # self.memory_bus = Bus(f"{self.tempik_id_str}-MemoryBus")
@@ -2620,7 +5804,7 @@ class Tempik: # AUDIT POINT 8 (Isolasi sudah baik dengan instance terpisah)
             InterruptType.ASSERTION_FAILURE, InterruptType.ARITHMETIC_ERROR,
             InterruptType.RESOURCE_LIMIT_EXCEEDED, InterruptType.TIMER_EXPIRED # Timer expired juga FAILED
         ]
-        forftype in failure_types:
+        for ftype in failure_types:
             self.interrupt_controller.register_handler(ftype, _handle_failure_interrupt)
         
         self.interrupt_controller.register_handler(InterruptType.HALT_REQUESTED, _handle_halt_interrupt)
@@ -2628,15 +5812,34 @@ class Tempik: # AUDIT POINT 8 (Isolasi sudah baik dengan instance terpisah)
 
 
     def load_program(self, program_instructions: List[InstruksiEksekusi], initial_pc: int = 0):
+        """Load program dan resolve semua target_label ke PC integer sekali saja.
+
+        Raise ValueError untuk label duplikat atau referensi label yang tidak dikenal,
+        sehingga error ditemukan sebelum eksekusi, bukan saat branch dijalankan.
+        """
+        label_map: Dict[str, int] = {}
+        for i, instr in enumerate(program_instructions):
+            if instr.label:
+                if instr.label in label_map:
+                    raise ValueError(f"Label duplikat ditemukan: {instr.label} di alamat {i} dan {label_map[instr.label]}")
+                label_map[instr.label] = i
+
+        for i, instr in enumerate(program_instructions):
+            target_label = instr.parameter.get("target_label")
+            if target_label is None:
+                if instr.instruksi in LABEL_TARGET_INSTRUCTIONS:
+                    raise ValueError(f"Instruksi {instr.instruksi.value} di alamat {i} tidak punya target_label.")
+                instr.target_pc = None
+            elif target_label in label_map:
+                instr.target_pc = label_map[target_label]
+            else:
+                raise ValueError(f"Label '{target_label}' untuk {instr.instruksi.value} di alamat {i} tidak ditemukan.")
+
         self.program_memory = program_instructions
+        self.label_map = label_map
+        self.instruction_cache.clear() # Cache dikunci per PC; jangan jalankan instruksi program sebelumnya
         self.program_counter.set(initial_pc)
         self.register_file.pc = initial_pc 
-        self.label_map.clear()
-        for i, instr in enumerate(program_instructions):
-            if instr.label:
-                if instr.label in self.label_map:
-                    logger.warning(f"Label duplikat ditemukan: {instr.label} di alamat {i} dan {self.label_map[instr.label]}")
-                self.label_map[instr.label] = i
         logger.info(f"{self.tempik_id_str}: Program ({len(program_instructions)} instructions) loaded. PC set to {initial_pc}.")
 
     def jump_to_label(self, label: str):
@@ -2651,24 +5854,121 @@ class Tempik: # AUDIT POINT 8 (Isolasi sudah baik dengan instance terpisah)
             # Status akan diubah oleh handler interrupt
 
 
-    async def run(self, file_asu: FileASU):
+    def spawn_thread(self, start_pc: int, thread_params: Optional[Dict[str, Any]] = None) -> 'TempikThread':
+        active = sum(1 for t in self.threads.values() if not t.task.done())
+        if active >= self.max_threads or not self._free_stack_slots:
+            raise RuntimeError(f"Batas thread per Tempik tercapai ({self.max_threads}).")
+        slot = self._free_stack_slots.pop()
+        try:
+            thread = TempikThread(self, self._next_thread_id, slot, start_pc, thread_params or {})
+        except MemoryError:
+            self._free_stack_slots.append(slot)
+            raise
+        self._next_thread_id += 1
+        self.threads[thread.thread_id] = thread
+        thread.task = asyncio.create_task(thread.run())
+        return thread
+
+    def _release_stack_slot(self, slot: int):
+        self._free_stack_slots.append(slot)
+
+    async def join_threads(self, thread_ids: List[int], timeout: Optional[float] = None) -> Dict[int, str]:
+        """Tunggu thread selesai; return {thread_id: status akhir}."""
+        tasks = [self.threads[tid].task for tid in thread_ids]
+        if tasks:
+            await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), timeout=timeout)
+        return {tid: self.threads[tid].status.value for tid in thread_ids}
+
+    async def cancel_threads(self):
+        pending = [t.task for t in self.threads.values() if not t.task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning(f"{self.tempik_id_str}: {len(pending)} thread masih berjalan saat program selesai, dibatalkan.")
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def get_named_event(self, name: str) -> asyncio.Event:
+        event = self.named_events.get(name)
+        if event is None:
+            event = self.named_events[name] = asyncio.Event()
+        return event
+
+    def checkpoint_due(self) -> bool:
+        """Dicek ControlUnit tiap preempt_check_interval instruksi. Ditunda selama thread masih berjalan."""
+        if not self._checkpoint_waiters and not (self.checkpoint_interval_s and time.monotonic() >= self._next_checkpoint_at):
+            return False
+        return all(t.task.done() for t in self.threads.values())
+
+    def request_checkpoint(self) -> asyncio.Future:
+        """Checkpoint on-demand; future berisi bytes checkpoint setelah batas instruksi berikutnya."""
+        if self.current_file_asu is None or not self.control_unit.is_running:
+            raise RuntimeError(f"{self.tempik_id_str} tidak sedang menjalankan job.")
+        waiter = asyncio.get_running_loop().create_future()
+        self._checkpoint_waiters.append(waiter)
+        return waiter
+
+    async def write_checkpoint(self) -> bytes:
+        started = time.perf_counter()
+        checkpoint = TempikCheckpoint.capture(self, self.current_file_asu)
+        data = checkpoint.encode()
+        self._next_checkpoint_at = time.monotonic() + self.checkpoint_interval_s
+        waiters, self._checkpoint_waiters = self._checkpoint_waiters, []
+        for waiter in waiters:
+            if not waiter.done(): waiter.set_result(data)
+        if self.parent_executor and self.current_job:
+            self.current_job.checkpoint_path = await self.parent_executor.save_checkpoint(self.current_job.job_id, data)
+        logger.info(f"{self.tempik_id_str}: Checkpoint di PC {checkpoint.pc} ({len(data)} bytes, "
+                    f"{(time.perf_counter() - started) * 1000:.1f} ms).")
+        return data
+
+    def export_data(self, name: str, data: bytes):
+        """Simpan hasil EXPORT in-memory dan umumkan ke event job (klien API bisa langsung men-stream datanya)."""
+        self.exported_data[name] = data
+        if self.current_job:
+            self.current_job.events.append("export", name=name, size=len(data))
+
+    def _fail_checkpoint_waiters(self, reason: str):
+        waiters, self._checkpoint_waiters = self._checkpoint_waiters, []
+        for waiter in waiters:
+            if not waiter.done(): waiter.set_exception(RuntimeError(reason))
+
+    async def run(self, file_asu: FileASU, job: Optional['JobHandle'] = None) -> Dict[str, Any]:
         self.set_status(TempikStatus.BUSY) 
         self.current_file_hash = file_asu.hash_sha256
+        self.current_file_asu = file_asu
+        self.io_handler.job_events = job.events if job else None
+        self.dependency_manifest_hash = file_asu.header.dependency_manifest_hash
+        self.current_job = job
+        self.threads.clear()
+        self.named_events.clear()
+        self.delegations.clear()
+        self.crypto_engine.reset_keys() # Kunci yang di-load job sebelumnya (SIGN/DECRYPT/VERIFY *_key_ref) tidak boleh terbawa
+        self.interrupt_controller.clear_interrupts() # Sisa interrupt job sebelumnya (misal MAX_INSTRUCTIONS_REACHED) tidak boleh bocor
+        self.exported_data = {}
         self.execution_context_manager.env_vars.clear() 
+        if job:
+            self.execution_context_manager.env_vars.update(job.inherited_env)
         self.execution_context_manager.current_working_directory = "/" 
         self.virtual_fs = VirtualFS(self.tempik_id_str, context_manager_ref=self.execution_context_manager) # Reset VFS
-        if file_asu.virtual_fs_structure: 
+        self.io_handler.virtual_fs = self.virtual_fs # IOHandler harus menunjuk VFS baru, bukan instance lama
+        resume = job.resume_checkpoint if job else None
+        if resume is not None: # Lanjut dari checkpoint: VFS, register, memori, context langsung dipulihkan
+            resume.restore_into(self)
+            logger.info(f"{self.tempik_id_str}: Resume {resume.job_id} dari checkpoint di PC {resume.pc}.")
+        elif file_asu.virtual_fs_structure: 
             await self.virtual_fs.populate_from_dict(file_asu.virtual_fs_structure)
 
         # Apply header info ke context
         self.execution_context_manager.security_policy["flags"] = file_asu.header.security_flags.split(',')
         self.execution_context_manager.security_policy["networking_mode"] = file_asu.header.networking_mode
+        self.execution_context_manager.security_policy["allowed_hosts"] = list(self.parent_executor.network_allowed_hosts) if self.parent_executor else []
         self.max_exec_time_seconds = file_asu.header.get_max_exec_time_seconds() # AUDIT POINT 11
         try: # AUDIT POINT 15
             self.execution_mode = ExecutionMode(file_asu.header.execution_mode)
         except ValueError:
             logger.warning(f"Execution mode tidak valid: {file_asu.header.execution_mode}. Default ke BATCH.")
             self.execution_mode = ExecutionMode.BATCH
+        self.security_module.compile_policy(self.execution_mode) # Policy dievaluasi sekali per job, bukan per instruksi
         
         # Parse memory_profile dan set ukuran MemoryUnit jika perlu (belum diimplementasikan dinamis)
         # self.memory_unit.resize(parse_memory_profile(file_asu.header.memory_profile))
@@ -2678,24 +5978,73 @@ class Tempik: # AUDIT POINT 8 (Isolasi sudah baik dengan instance terpisah)
            if not self.security_module.verify_asu_signature(file_asu, self.parent_executor.global_public_key_for_verification_pem):
                logger.error(f"{self.tempik_id_str}: Verifikasi signature file .asu GAGAL.")
                self.set_status(TempikStatus.FAILED)
-               return # Jangan jalankan jika signature gagal
+               return self.collect_result() # Jangan jalankan jika signature gagal
 
+        self.checkpoint_interval_s = self.parent_executor.checkpoint_interval_s if self.parent_executor else 0.0
+        self._next_checkpoint_at = time.monotonic() + self.checkpoint_interval_s
         logger.info(f"{self.tempik_id_str} memulai eksekusi file .asu: {self.current_file_hash[:12]}...")
-        await self.control_unit.start_execution(file_asu.body)
+        await self.control_unit.start_execution(file_asu.body, resume.pc if resume is not None else 0)
+        await self.cancel_threads() # Thread tidak boleh hidup lebih lama dari programnya
+        self._fail_checkpoint_waiters(f"Job selesai sebelum checkpoint diambil ({self.status.value}).")
+        if job and job.checkpoint_path and self.status == TempikStatus.COMPLETED: # Checkpoint hanya berguna untuk resume
+            try: os.remove(job.checkpoint_path)
+            except OSError: pass
+            job.checkpoint_path = None
         logger.info(f"{self.tempik_id_str} selesai eksekusi file .asu: {self.current_file_hash[:12]}. Status akhir: {self.status.value}")
         
-        # Jika service mode, mungkin tidak langsung COMPLETED
+        # Mode SERVICE: init selesai -> program, VFS, policy dan cache tetap resident dan melayani request
         if self.execution_mode == ExecutionMode.SERVICE and self.status == TempikStatus.COMPLETED:
-            logger.info(f"{self.tempik_id_str} dalam mode SERVICE, tetap running (simulasi).")
-            # Di sini bisa masuk ke loop event atau tunggu sinyal shutdown
-            # self.status = TempikStatus.IDLE # Atau status khusus SERVICE_RUNNING
+            service_stats = await self._serve(job)
+            result = self.collect_result()
+            result["service"] = service_stats
+            return result
+        return self.collect_result()
+
+    async def _serve(self, job: Optional['JobHandle']) -> Dict[str, Any]:
+        executor = self.parent_executor
+        self.service = TempikService(
+            self, executor.service_concurrency if executor else DEFAULT_SERVICE_CONCURRENCY,
+            executor.service_queue_depth if executor else DEFAULT_SERVICE_QUEUE_DEPTH,
+            executor.service_idle_timeout_s if executor else DEFAULT_SERVICE_IDLE_TIMEOUT_S)
+        self.set_status(TempikStatus.BUSY) # Tetap teralokasi selama service hidup
+        if job:
+            job.service = self.service
+            job.events.append("service", status="ready", entries=sorted(self.label_map))
+        logger.info(f"{self.tempik_id_str}: Service {self.current_file_hash[:12]} siap "
+                    f"(concurrency {self.service.concurrency}, idle timeout {self.service.idle_timeout_s}s).")
+        try:
+            stats = await self.service.serve()
+        finally:
+            if job: job.service = None
+            self.service = None
+            await self.cancel_threads() # SPAWN_THREAD dari handler tidak boleh hidup lebih lama dari service
+        if job:
+            job.events.append("service", status="stopped", reason=stats["stop_reason"])
+        self.set_status(TempikStatus.COMPLETED if stats["stop_reason"] == "idle" else TempikStatus.HALTED)
+        return stats
+
+    def collect_result(self) -> Dict[str, Any]:
+        """Ringkasan hasil job terakhir (dipakai sebagai nilai future JobHandle)."""
+        return {
+            "status": self.final_status.value,
+            "job_id": self.current_job.job_id if self.current_job else None,
+            "tempik_id": self.tempik_id,
+            "file_hash": self.current_file_hash,
+            "exported_data": dict(self.exported_data),
+            "checkpoint_path": self.current_job.checkpoint_path if self.current_job else None,
+        }
 
     def set_status(self, new_status: TempikStatus):
+        if new_status in PIPELINE_STAGES: # Tahap pipeline bukan perubahan lifecycle; tidak dinotifikasi
+            self.pipeline_stage = new_status
+            return
         if self.status != new_status: # Hanya log jika ada perubahan
             logger.debug(f"{self.tempik_id_str}: Status changed from {self.status.value} to {new_status.value}")
-            self.status = new_status
+            old_status, self.status = self.status, new_status
+            if new_status in (TempikStatus.COMPLETED, TempikStatus.FAILED, TempikStatus.HALTED):
+                self.final_status = new_status
             if self.parent_executor: # Notifikasi TempikManager/Scheduler (AUDIT POINT 2)
-                self.parent_executor.notify_tempik_status_change(self.tempik_id, new_status)
+                self.parent_executor.notify_tempik_status_change(self.tempik_id, new_status, old_status)
 
 
     def get_status_summary(self) -> Dict[str, Any]:
@@ -2705,6 +6054,7 @@ class Tempik: # AUDIT POINT 8 (Isolasi sudah baik dengan instance terpisah)
         return {
             "tempik_id": self.tempik_id,
             "status": self.status.value,
+            "pipeline_stage": self.pipeline_stage.value,
             "pc": self.program_counter.value,
             "sp": self.register_file.sp, # AUDIT POINT 4
             "fp": self.register_file.fp, # AUDIT POINT 4
@@ -2712,10 +6062,11 @@ class Tempik: # AUDIT POINT 8 (Isolasi sudah baik dengan instance terpisah)
             "current_instruction": instr_val,
             "cwd_vfs": self.execution_context_manager.current_working_directory,
             "execution_mode": self.execution_mode.value, # AUDIT POINT 15
+            "service": self.service.get_stats() if self.service else None,
             "profiler_summary_sample": list(self.profiler.get_summary().keys())[:3] # AUDIT POINT 16
         }
 
-    def check_global_timeout(self): # AUDIT POINT 11 (Watchdog)
+    def check_global_timeout(self): # AUDIT POINT 11 (Watchdog). ControlUnit memakai timer watchdog; ini untuk cek manual
         if self.max_exec_time_seconds is not None and self.global_execution_start_time > 0:
             elapsed_time = time.time() - self.global_execution_start_time
             if elapsed_time > self.max_exec_time_seconds:
@@ -2725,34 +6076,676 @@ class Tempik: # AUDIT POINT 8 (Isolasi sudah baik dengan instance terpisah)
                 # Handler interrupt akan set status FAILED
 
 
+DEFAULT_MAX_THREADS_PER_TEMPIK = 8
+THREAD_STACK_SEGMENT_BYTES = 16 * 1024
+
+class TempikThread: # AUDIT POINT 3: SPAWN_THREAD
+    """Konteks eksekusi ringan di dalam satu Tempik.
+
+    Punya RegisterFile, PC, ALU, ControlUnit dan segmen stack sendiri di MemoryUnit Tempik;
+    VFS, env, security, profiler dan program dibagi dengan Tempik induk (via __getattr__).
+    """
+    def __init__(self, parent: Tempik, thread_id: int, stack_slot: int, start_pc: int, thread_params: Dict[str, Any]):
+        self.parent = parent
+        self.thread_id = thread_id
+        self.stack_slot = stack_slot
+        self.params = thread_params
+        self.tempik_id_str = f"{parent.tempik_id_str}/T{thread_id}"
+        self.status = TempikStatus.IDLE
+        self.pipeline_stage = TempikStatus.IDLE # Tahap pipeline (FETCH..WRITE_BACK), murah & lokal
+        self.task: Optional[asyncio.Task] = None
+
+        self.register_file = RegisterFile()
+        self.program_counter = ProgramCounter(start_pc)
+        self.register_file.pc = start_pc
+        self.alu = ALU(self.register_file)
+        self.memory_unit = parent.memory_unit.create_stack_segment(self.register_file, stack_slot, THREAD_STACK_SEGMENT_BYTES)
+        self.instruction_cache = InstructionCache()
+        self.instruction_decoder = InstructionDecoder(self.register_file)
+        self.interrupt_controller = InterruptController(profiler=parent.profiler)
+        Tempik._setup_default_interrupt_handlers(self)
+        self.control_unit = ControlUnit(self)
+
+        self.service_exports: Optional[Dict[str, bytes]] = None # Diisi per request jika thread milik TempikService
+
+        for reg_idx, value in thread_params.get("registers", {}).items():
+            self.register_file.write_register(int(reg_idx), int(value))
+        self._push_entry_frame()
+
+    def _push_entry_frame(self):
+        # Frame awal seperti CALL: RET di level teratas kembali ke akhir program -> thread selesai
+        self.memory_unit.push_stack(len(self.parent.program_memory).to_bytes(4, 'big'))
+        self.memory_unit.push_stack(self.register_file.fp.to_bytes(4, 'big'))
+        self.register_file.fp = self.register_file.sp
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.parent, name)
+
+    def export_data(self, name: str, data: bytes):
+        if self.service_exports is None:
+            self.parent.export_data(name, data)
+        else:
+            self.service_exports[name] = data # Bagian dari respons request, bukan hasil job
+
+    async def serve_request(self, start_pc: int, registers: Dict[Any, int]) -> Dict[str, Any]:
+        """Jalankan satu request service di konteks ini (dipakai ulang antar request: cache instruksi tetap hangat)."""
+        register_file = self.register_file
+        register_file.general_registers[:] = [0] * len(register_file.general_registers)
+        register_file.float_registers[:] = [0.0] * len(register_file.float_registers)
+        for flag in register_file.flags:
+            register_file.flags[flag] = False
+        register_file.instruction_register = None
+        register_file.sp = register_file.fp = self.memory_unit.stack_base_address
+        for reg_idx, value in registers.items():
+            register_file.write_register(int(reg_idx), int(value))
+        self.program_counter.set(start_pc)
+        register_file.pc = start_pc
+        self._push_entry_frame()
+        self.interrupt_controller.clear_interrupts()
+        self.service_exports = {}
+        self.set_status(TempikStatus.BUSY)
+        await self.control_unit.run_loaded_program()
+        return {"status": self.status.value, "return_value": register_file.general_registers[0],
+                "registers": list(register_file.general_registers), "exported_data": self.service_exports}
+
+    def set_status(self, new_status: TempikStatus):
+        self.status = new_status # Status thread lokal, tidak dipublikasikan ke executor
+
+    def checkpoint_due(self) -> bool:
+        return False # Checkpoint hanya diambil oleh ControlUnit Tempik induk
+
+    async def run(self):
+        self.set_status(TempikStatus.BUSY)
+        try:
+            await self.control_unit.run_loaded_program()
+        except asyncio.CancelledError:
+            self.set_status(TempikStatus.HALTED)
+            raise
+        except Exception as e:
+            logger.error(f"{self.tempik_id_str}: Thread gagal: {e}", exc_info=True)
+            self.set_status(TempikStatus.FAILED)
+        finally:
+            self.parent._release_stack_slot(self.stack_slot)
+
+
+DEFAULT_SERVICE_CONCURRENCY = int(os.environ.get("ASU_SERVICE_CONCURRENCY", "4"))
+DEFAULT_SERVICE_QUEUE_DEPTH = int(os.environ.get("ASU_SERVICE_QUEUE_DEPTH", "256"))
+DEFAULT_SERVICE_IDLE_TIMEOUT_S = float(os.environ.get("ASU_SERVICE_IDLE_TIMEOUT_S", "300")) # 0 = tidak pernah di-evict
+
+
+class TempikService: # AUDIT POINT 15 (SERVICE mode)
+    """Dispatcher request untuk program SERVICE yang resident di satu Tempik.
+
+    Request (label entry + register awal) masuk antrian terbatas per Tempik dan dilayani oleh `concurrency`
+    konteks TempikThread yang dibuat sekali dan dipakai ulang. Handler berakhir dengan RET di level teratas;
+    r0 menjadi return_value. Service berhenti jika idle lebih lama dari idle_timeout_s, atau lewat stop().
+    """
+    def __init__(self, tempik: Tempik, concurrency: int, queue_depth: int, idle_timeout_s: float):
+        self.tempik = tempik
+        self.concurrency = max(1, min(concurrency, tempik.max_threads))
+        self.idle_timeout_s = idle_timeout_s
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_depth)
+        self.in_flight = 0
+        self.last_activity = time.monotonic()
+        self.stop_reason: Optional[str] = None
+        self.stats: Counter = Counter()
+        self.latency_ewma_us = 0.0
+        self._stopping = asyncio.Event()
+
+    def submit(self, entry: str, registers: Optional[Dict[Any, int]] = None) -> asyncio.Future:
+        """Masukkan request ke antrian; future berisi respons handler. Raise jika label/antrian tidak valid."""
+        if self._stopping.is_set():
+            raise RuntimeError(f"Service di {self.tempik.tempik_id_str} sedang berhenti.")
+        start_pc = self.tempik.label_map.get(entry)
+        if start_pc is None:
+            raise ValueError(f"Label entry '{entry}' tidak ada di program service.")
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((start_pc, entry, registers or {}, future, time.perf_counter()))
+        except asyncio.QueueFull:
+            self.stats["rejected"] += 1
+            raise RuntimeError(f"Antrian service {self.tempik.tempik_id_str} penuh ({self.queue.maxsize}).")
+        self.last_activity = time.monotonic()
+        return future
+
+    def stop(self, reason: str):
+        if not self._stopping.is_set():
+            self.stop_reason = reason
+            self._stopping.set()
+
+    async def _worker(self, context: 'TempikThread'):
+        # Cek _stopping, bukan hanya cancel(): wait_for di EXECUTE stage (Python < 3.12) bisa menelan CancelledError
+        while not self._stopping.is_set():
+            start_pc, entry, registers, future, enqueued_at = await self.queue.get()
+            if future.done(): # Pemanggil sudah timeout/batal sebelum request sempat dilayani
+                continue
+            self.in_flight += 1
+            try:
+                response = await context.serve_request(start_pc, registers)
+            except asyncio.CancelledError:
+                if not future.done(): future.set_exception(RuntimeError(f"Service berhenti ({self.stop_reason})."))
+                raise
+            except Exception as e:
+                logger.error(f"{context.tempik_id_str}: Request service '{entry}' gagal: {e}", exc_info=True)
+                response = {"status": TempikStatus.FAILED.value, "error": str(e), "exported_data": {}}
+            finally:
+                self.in_flight -= 1
+                self.last_activity = time.monotonic()
+            latency_us = (time.perf_counter() - enqueued_at) * 1e6
+            self.latency_ewma_us = latency_us if not self.stats["requests"] else \
+                COST_HISTORY_EWMA_ALPHA * latency_us + (1 - COST_HISTORY_EWMA_ALPHA) * self.latency_ewma_us
+            self.stats["requests"] += 1
+            self.stats["completed" if response["status"] == TempikStatus.COMPLETED.value else "failed"] += 1
+            if not future.done():
+                future.set_result(dict(response, entry=entry, latency_us=round(latency_us, 1)))
+
+    async def serve(self) -> Dict[str, Any]:
+        """Layani request sampai stop() atau idle eviction. Return statistik service."""
+        tempik = self.tempik
+        contexts: List[TempikThread] = []
+        for _ in range(self.concurrency): # Slot stack dipegang selama service hidup (dibagi dengan SPAWN_THREAD)
+            if not tempik._free_stack_slots:
+                break
+            slot = tempik._free_stack_slots.pop()
+            contexts.append(TempikThread(tempik, tempik._next_thread_id, slot, len(tempik.program_memory), {}))
+            tempik._next_thread_id += 1
+        self.concurrency = len(contexts)
+        workers = [asyncio.create_task(self._worker(context)) for context in contexts]
+        try:
+            while not self._stopping.is_set():
+                timeout = None
+                if self.idle_timeout_s > 0:
+                    idle_for = time.monotonic() - self.last_activity
+                    if idle_for >= self.idle_timeout_s and self.in_flight == 0 and self.queue.empty():
+                        self.stop("idle")
+                        break
+                    timeout = max(self.idle_timeout_s - idle_for, 0.05)
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self.stop(self.stop_reason or "stopped")
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            while not self.queue.empty(): # Request yang belum sempat dilayani
+                future = self.queue.get_nowait()[3]
+                if not future.done(): future.set_exception(RuntimeError(f"Service berhenti ({self.stop_reason})."))
+            for context in contexts:
+                tempik._release_stack_slot(context.stack_slot)
+        logger.info(f"{tempik.tempik_id_str}: Service berhenti ({self.stop_reason}) setelah {self.stats['requests']} request.")
+        return self.get_stats()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"concurrency": self.concurrency, "queued": self.queue.qsize(), "in_flight": self.in_flight,
+                "latency_ewma_us": round(self.latency_ewma_us, 1), "stop_reason": self.stop_reason, **self.stats}
+
+
 # --- Scheduler dan TempikManager (Bagian dari UTEKVirtualExecutor) ---
 # AUDIT POINT 1 & 2: Scheduler dan TempikManager
 # UTEKVirtualExecutor akan berperan sebagai TempikManager/TempikFarm.
 # Scheduler akan menjadi komponen di dalamnya.
 
+# --- Estimasi biaya job (placement Scheduler) ---
+# Biaya statis per opcode (detik, byte peak memori). Opcode lain dihitung COST_DEFAULT_INSTRUCTION_SECONDS.
+COST_OPCODE_SECONDS = {
+    InstruksiASU.EXECUTE: 0.5, InstruksiASU.COMPILE: 2.0, InstruksiASU.INSTALL: 3.0, InstruksiASU.FETCH_REPO: 2.0,
+    InstruksiASU.CHECKOUT: 0.5, InstruksiASU.UNPACK: 0.1, InstruksiASU.DELEGATE_TO: 0.5, InstruksiASU.INVOKE_REMOTE: 0.2,
+    InstruksiASU.PUSH_RESULT: 0.2, InstruksiASU.ENCRYPT: 0.05, InstruksiASU.DECRYPT: 0.05, InstruksiASU.SIGN: 0.01,
+    InstruksiASU.VERIFY: 0.01, InstruksiASU.VERIFY_HASH: 0.01,
+}
+COST_OPCODE_MEMORY_BYTES = {
+    InstruksiASU.EXECUTE: 64 * 1024 * 1024, InstruksiASU.COMPILE: 256 * 1024 * 1024,
+    InstruksiASU.INSTALL: 128 * 1024 * 1024, InstruksiASU.FETCH_REPO: 32 * 1024 * 1024,
+}
+COST_OPCODE_IO_BYTES = { # I/O di luar VFS awal (jaringan/disk host)
+    InstruksiASU.FETCH_REPO: 50 * 1024 * 1024, InstruksiASU.INSTALL: 50 * 1024 * 1024,
+    InstruksiASU.INVOKE_REMOTE: 1024 * 1024, InstruksiASU.PUSH_RESULT: 1024 * 1024,
+}
+COST_DEFAULT_INSTRUCTION_SECONDS = 2e-5 # Instruksi ALU/kontrol di interpreter
+COST_DEFAULT_LOOP_ITERATIONS = 100 # Tebakan trip count loop jika tidak bisa disimpulkan dari CMP
+COST_UNPACK_EXPANSION = 3 # Perkiraan rasio ukuran hasil UNPACK terhadap arsip
+COST_BASE_MEMORY_BYTES = 2 * 1024 * 1024 # MemoryUnit Tempik (1 MiB) + overhead
+COST_HISTORY_EWMA_ALPHA = 0.3
+DEFAULT_COST_HISTORY_PATH = os.environ.get("ASU_COST_HISTORY_PATH", os.path.join(DEFAULT_STATE_DIR, "cost_history.json"))
+
+
+@dataclass
+class JobCostEstimate:
+    cpu_seconds: float
+    peak_memory_bytes: int
+    io_bytes: int
+    dynamic_instructions: int # Perkiraan jumlah instruksi yang dieksekusi (loop dikalikan trip count)
+    source: str = "static" # "static" atau "learned" (runtime aktual per hash konten)
+    samples: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"cpu_seconds": round(self.cpu_seconds, 6), "peak_memory_bytes": self.peak_memory_bytes,
+                "io_bytes": self.io_bytes, "dynamic_instructions": self.dynamic_instructions,
+                "source": self.source, "samples": self.samples}
+
+
+class JobCostModel:
+    """Analisis statis FileASU saat load (sekali per hash konten) + koreksi dari runtime aktual per hash."""
+    def __init__(self, history_path: Optional[str] = DEFAULT_COST_HISTORY_PATH, capacity: int = 4096):
+        self.history_path = history_path
+        self.capacity = capacity
+        self._static: "OrderedDict[str, JobCostEstimate]" = OrderedDict()
+        # hash -> {"runtime_s": ewma, "vfs_bytes": max, "samples": n}
+        self.history: "OrderedDict[str, Dict[str, float]]" = OrderedDict()
+        self.stats = {"static_analyses": 0, "learned_hits": 0, "records": 0}
+        if history_path and os.path.exists(history_path):
+            try:
+                with open(history_path, "r", encoding="utf-8") as f:
+                    self.history.update(json.load(f))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Riwayat biaya job tidak bisa dibaca ({history_path}): {e}")
+
+    @staticmethod
+    def _vfs_sizes(structure: Dict[str, Any], base: str = "/") -> Dict[str, int]:
+        sizes: Dict[str, int] = {}
+        for name, content in structure.items():
+            path = os.path.join(base, name).replace('\\', '/')
+            if isinstance(content, dict):
+                sizes.update(JobCostModel._vfs_sizes(content, path))
+            elif isinstance(content, (str, bytes)):
+                sizes[path] = len(content)
+        return sizes
+
+    @staticmethod
+    def _loop_trip_count(body: List[InstruksiEksekusi], start: int, end: int) -> int:
+        """Trip count loop [start, end]: dari CMP dengan operand2_val literal jika ada, selain itu tebakan."""
+        for instr in body[start:end + 1]:
+            if instr.instruksi is InstruksiASU.CMP and "operand2_val" in instr.parameter:
+                try:
+                    return max(1, abs(int(instr.parameter["operand2_val"])))
+                except (TypeError, ValueError):
+                    break
+        return COST_DEFAULT_LOOP_ITERATIONS
+
+    def analyze(self, file_asu: FileASU) -> JobCostEstimate:
+        body = file_asu.body
+        labels = {instr.label: i for i, instr in enumerate(body) if instr.label}
+        max_instructions = 100000 # Sama dengan default resource_limits["max_instructions"] ControlUnit
+        # Bobot eksekusi per instruksi: 1, dikali trip count untuk tiap loop (branch mundur) yang mencakupnya
+        weights = [1] * len(body)
+        for i, instr in enumerate(body):
+            if instr.instruksi in (InstruksiASU.JMP, InstruksiASU.JZ, InstruksiASU.JNZ):
+                target = labels.get(instr.parameter.get("target_label"))
+                if target is not None and target <= i:
+                    trips = self._loop_trip_count(body, target, i)
+                    for j in range(target, i + 1):
+                        weights[j] = min(weights[j] * trips, max_instructions)
+
+        vfs_sizes = self._vfs_sizes(file_asu.virtual_fs_structure)
+        vfs_bytes = sum(vfs_sizes.values())
+        cpu_seconds, io_bytes, unpack_bytes, op_memory = 0.0, vfs_bytes, 0, 0
+        for instr, weight in zip(body, weights):
+            op = instr.instruksi
+            op_seconds = COST_OPCODE_SECONDS.get(op, COST_DEFAULT_INSTRUCTION_SECONDS)
+            cpu_seconds += weight * min(op_seconds, instr.timeout)
+            io_bytes += weight * COST_OPCODE_IO_BYTES.get(op, 0)
+            op_memory = max(op_memory, COST_OPCODE_MEMORY_BYTES.get(op, 0))
+            if op is InstruksiASU.UNPACK:
+                archive_size = vfs_sizes.get(os.path.normpath("/" + str(instr.parameter.get("file", "")).lstrip("/")), 0)
+                unpack_bytes += archive_size * COST_UNPACK_EXPANSION
+        io_bytes += unpack_bytes
+
+        max_exec_time = file_asu.header.get_max_exec_time_seconds()
+        if max_exec_time is not None: # Watchdog menghentikan job di time_budget
+            cpu_seconds = min(cpu_seconds, max_exec_time)
+        peak_memory = COST_BASE_MEMORY_BYTES + vfs_bytes + unpack_bytes + op_memory
+        peak_memory = min(peak_memory, max(file_asu.header.get_memory_profile_bytes(), COST_BASE_MEMORY_BYTES))
+        return JobCostEstimate(cpu_seconds=cpu_seconds, peak_memory_bytes=peak_memory, io_bytes=io_bytes,
+                               dynamic_instructions=min(sum(weights), max_instructions))
+
+    def estimate(self, file_asu: FileASU) -> JobCostEstimate:
+        key = file_asu.hash_sha256
+        static = self._static.get(key)
+        if static is None:
+            static = self._static[key] = self.analyze(file_asu)
+            self.stats["static_analyses"] += 1
+            if len(self._static) > self.capacity:
+                self._static.popitem(last=False)
+        else:
+            self._static.move_to_end(key)
+        learned = self.history.get(key)
+        if not learned:
+            return static
+        self.stats["learned_hits"] += 1
+        return JobCostEstimate(cpu_seconds=learned["runtime_s"],
+                               peak_memory_bytes=max(static.peak_memory_bytes, int(learned["vfs_bytes"]) + COST_BASE_MEMORY_BYTES),
+                               io_bytes=static.io_bytes, dynamic_instructions=static.dynamic_instructions,
+                               source="learned", samples=int(learned["samples"]))
+
+    def record(self, file_hash: str, runtime_s: float, vfs_bytes: int):
+        """Catat runtime aktual job yang selesai; estimasi berikutnya untuk hash ini memakai EWMA-nya."""
+        entry = self.history.get(file_hash)
+        if entry is None:
+            entry = self.history[file_hash] = {"runtime_s": runtime_s, "vfs_bytes": vfs_bytes, "samples": 0}
+        else:
+            entry["runtime_s"] += COST_HISTORY_EWMA_ALPHA * (runtime_s - entry["runtime_s"])
+            entry["vfs_bytes"] = max(entry["vfs_bytes"], vfs_bytes)
+            self.history.move_to_end(file_hash)
+        entry["samples"] += 1
+        self.stats["records"] += 1
+        if len(self.history) > self.capacity:
+            self.history.popitem(last=False)
+
+    def save(self):
+        if not self.history_path:
+            return
+        try:
+            directory = ensure_private_dir(os.path.dirname(os.path.abspath(self.history_path)))
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".cost_history.", suffix=".tmp") # O_EXCL, nama acak
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self.history, f)
+            os.replace(tmp_path, self.history_path)
+        except OSError as e:
+            logger.warning(f"Riwayat biaya job gagal disimpan ke {self.history_path}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self.stats, static_cached=len(self._static), learned_hashes=len(self.history))
+
+
+JOB_EVENT_LOG_MAXLEN = 1000
+
+
+class JobEventLog:
+    """Event satu job (status, log, export) dengan nomor urut, untuk long-poll dan stream API job.
+    Dibatasi maxlen; pembaca yang tertinggal melihat lompatan seq (event lama sudah dibuang)."""
+    def __init__(self, maxlen: int = JOB_EVENT_LOG_MAXLEN):
+        self.events: deque = deque(maxlen=maxlen)
+        self.next_seq = 0
+        self.closed = False # True setelah status akhir job dicatat
+        self._changed = asyncio.Event()
+
+    def append(self, kind: str, **data: Any):
+        self.events.append({"seq": self.next_seq, "ts": time.time(), "kind": kind, **data})
+        self.next_seq += 1
+        self._wake()
+
+    def close(self):
+        self.closed = True
+        self._wake()
+
+    def _wake(self):
+        changed, self._changed = self._changed, asyncio.Event() # Event baru untuk penunggu berikutnya
+        changed.set()
+
+    def since(self, seq: int) -> List[Dict[str, Any]]:
+        return [event for event in self.events if event["seq"] >= seq]
+
+    async def wait(self, seq: int, timeout: Optional[float] = None) -> bool:
+        """Tunggu sampai ada event dengan nomor >= seq atau log ditutup. Return False jika timeout."""
+        if self.next_seq > seq or self.closed:
+            return True
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+
+@dataclass
+class JobHandle:
+    """Satu file .asu di antrian Scheduler beserta future hasil eksekusinya."""
+    job_id: str
+    file_asu: FileASU
+    target_tempik_id: Optional[int] = None
+    parent_job_id: Optional[str] = None # Diisi untuk sub-job DELEGATE_TO
+    inherited_env: Dict[str, str] = field(default_factory=dict)
+    future: Optional[asyncio.Future] = None
+    status: str = "queued" # queued, running, lalu status akhir Tempik (completed/failed/halted)
+    tempik_id: Optional[int] = None
+    result: Optional[Dict[str, Any]] = None
+    cost: Optional[JobCostEstimate] = None # Estimasi JobCostModel, menentukan prioritas & reservasi memori
+    submitted_at: float = field(default_factory=time.monotonic)
+    resume_checkpoint: Optional[TempikCheckpoint] = None # Diisi jika job melanjutkan checkpoint, bukan mulai dari PC 0
+    checkpoint_path: Optional[str] = None # Checkpoint terakhir job ini di disk (dihapus jika job COMPLETED)
+    events: JobEventLog = field(default_factory=JobEventLog)
+    cancelled: bool = False
+    service: Optional['TempikService'] = None # Terisi selama job SERVICE melayani request
+
+    def to_summary(self) -> Dict[str, Any]:
+        """Ringkasan JSON-safe (exported_data hanya nama dan ukuran; isinya di-stream terpisah)."""
+        result = None
+        if self.result is not None:
+            result = dict(self.result, exported_data={name: len(data) for name, data in self.result.get("exported_data", {}).items()})
+        return {"job_id": self.job_id, "status": self.status, "tempik_id": self.tempik_id,
+                "file_hash": self.file_asu.hash_sha256, "parent_job_id": self.parent_job_id,
+                "cost": self.cost.to_dict() if self.cost else None, "events": self.events.next_seq,
+                "service": self.service.get_stats() if self.service else None, "result": result}
+
+
+@dataclass
+class BatchHandle:
+    """Hasil submit_batch: satu handle untuk banyak sumber .asu. Sumber dengan hash konten sama memakai satu job."""
+    batch_id: str
+    items: List[Dict[str, Any]] # Per sumber, urut input: source, status (queued/duplicate/failed), job_id, file_hash, error
+    jobs: Dict[str, JobHandle] # hash konten -> job
+
+    def progress(self) -> Dict[str, Any]:
+        return {"batch_id": self.batch_id, "sources": len(self.items), "jobs": len(self.jobs),
+                "rejected": sum(1 for item in self.items if item["status"] == "failed"),
+                "duplicates": sum(1 for item in self.items if item["status"] == "duplicate"),
+                "done": sum(1 for job in self.jobs.values() if job.future.done()),
+                "job_status": dict(Counter(job.status for job in self.jobs.values()))}
+
+    def results(self) -> List[Dict[str, Any]]:
+        """Item per sumber, ditambah hasil job-nya jika sudah selesai."""
+        by_id = {job.job_id: job for job in self.jobs.values()}
+        return [dict(item, result=by_id[item["job_id"]].result if item["job_id"] else None) for item in self.items]
+
+    async def wait(self, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        if self.jobs:
+            await asyncio.wait_for(asyncio.gather(*(job.future for job in self.jobs.values())), timeout)
+        return self.results()
+
+
+class TempikStatusIndex: # AUDIT POINT 2 (monitoring)
+    """Indeks status lifecycle Tempik yang diperbarui saat transisi (bukan dihitung ulang saat query).
+
+    Query agregat O(jumlah status), detail per-Tempik per halaman; biaya tidak tergantung jumlah Tempik.
+    """
+    def __init__(self, tempik_pool: List[Tempik]):
+        self.tempik_ids: List[int] = [t.tempik_id for t in tempik_pool] # Urut, untuk paginasi tanpa filter
+        self.by_status: Dict[TempikStatus, Set[int]] = {status: set() for status in TempikStatus}
+        for tempik in tempik_pool:
+            self.by_status[tempik.status].add(tempik.tempik_id)
+        self.transitions = 0
+
+    def transition(self, tempik_id: int, old_status: TempikStatus, new_status: TempikStatus):
+        self.by_status[old_status].discard(tempik_id)
+        self.by_status[new_status].add(tempik_id)
+        self.transitions += 1
+
+    def count(self, *statuses: TempikStatus) -> int:
+        return sum(len(self.by_status[status]) for status in statuses)
+
+    def counts(self) -> Dict[str, int]:
+        return {status.value: len(ids) for status, ids in self.by_status.items() if ids}
+
+    def page(self, offset: int = 0, limit: int = 50, status: Optional[TempikStatus] = None) -> Tuple[int, List[int]]:
+        """(total, tempik_id halaman ini). Tanpa filter: slice list urut; dengan filter: hanya set status itu."""
+        if status is None:
+            return len(self.tempik_ids), self.tempik_ids[offset:offset + limit]
+        ids = self.by_status[status]
+        return len(ids), sorted(ids)[offset:offset + limit]
+
+
+SCHEDULER_PRIORITY_CAP_S = 30.0 # Job panjang mengalah ke job pendek paling lama sekian detik (anti-starvation)
+SCHEDULER_SHORT_JOB_S = 1.0 # Estimasi CPU di bawah ini = job pendek (boleh memakai Tempik cadangan)
+SCHEDULER_MAX_BACKFILL_WAIT_S = 30.0 # Setelah ini job besar yang tertunda mendapat reservasi memori (tanpa backfill)
+
+
+def _default_scheduler_memory_bytes() -> int:
+    configured = os.environ.get("ASU_SCHEDULER_MEMORY_BYTES")
+    if configured:
+        return int(configured)
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (ValueError, OSError, AttributeError):
+        return 8 * 1024 * 1024 * 1024
+
+
 class Scheduler: # AUDIT POINT 1 (Multi-Tempik Scheduling)
+    """Antrian prioritas berdasar estimasi biaya (JobCostModel): prioritas = waktu submit + estimasi CPU (dibatasi),
+    jadi job pendek mendahului job panjang tanpa membuatnya kelaparan. Penempatan mem-bin-pack estimasi peak memori
+    terhadap memory_capacity_bytes dan menyisakan beberapa Tempik untuk job pendek."""
     def __init__(self, tempik_pool: List[Tempik], parent_executor: 'UTEKVirtualExecutor'):
         self.tempik_pool = tempik_pool
         self.parent_executor = parent_executor
-        self.task_queue: asyncio.Queue[Tuple[FileASU, Optional[int]]] = asyncio.Queue() # (file_asu, optional_target_tempik_id)
-        self.tempik_assignment: Dict[int, Optional[FileASU]] = {t.tempik_id: None for t in tempik_pool}
+        self.task_queue: "asyncio.PriorityQueue[Tuple[float, int, JobHandle]]" = asyncio.PriorityQueue()
+        self._queue_seq = itertools.count() # Tie-breaker FIFO untuk prioritas yang sama
+        self._job_counter = itertools.count(1)
+        self.cost_model = parent_executor.cost_model
+        self.memory_capacity_bytes = _default_scheduler_memory_bytes()
+        self.memory_reserved_bytes = 0 # Jumlah estimasi peak memori job yang sedang berjalan
+        self.short_job_reserved_tempiks = len(tempik_pool) // 8 # Tempik yang tidak boleh diambil job panjang
+        self.deferred_jobs: List[JobHandle] = [] # Ditunda karena memori/reservasi; masuk antrian lagi saat job selesai
+        self.jobs: "OrderedDict[str, JobHandle]" = OrderedDict() # Registry job (lookup API), urut submit
+        self.job_history_capacity = 10000 # Job selesai tertua dibuang dari registry setelah batas ini
+        self.tempik_assignment: Dict[int, FileASU] = {} # Hanya Tempik yang sedang ditugaskan
+        self.job_counts: Counter = Counter() # submitted + per status akhir job, untuk snapshot status
+        self.delegation_waiters: Counter = Counter() # tempik_id -> jumlah DELEGATE_TO/WAIT yang sedang menunggu sub-job
         # Untuk ThreadPoolExecutor (jika ada instruksi CPU-bound yang perlu di-offload dari event loop utama Tempik)
         self.cpu_bound_executor = ThreadPoolExecutor(max_workers=max(1, os.cpu_count() // 2 if os.cpu_count() else 1))
 
 
-    async def submit_task(self, file_asu: FileASU, target_tempik_id: Optional[int] = None):
-        await self.task_queue.put((file_asu, target_tempik_id))
-        logger.info(f"SCHEDULER: File .asu {file_asu.hash_sha256[:12]} ditambahkan ke antrian (target: {target_tempik_id}).")
+    async def submit_task(self, file_asu: FileASU, target_tempik_id: Optional[int] = None,
+                          inherited_env: Optional[Dict[str, str]] = None, parent_job_id: Optional[str] = None,
+                          resume_checkpoint: Optional[TempikCheckpoint] = None) -> 'JobHandle':
+        job = JobHandle(job_id=f"job-{next(self._job_counter):06d}", file_asu=file_asu, target_tempik_id=target_tempik_id,
+                        parent_job_id=parent_job_id, inherited_env=inherited_env or {}, resume_checkpoint=resume_checkpoint,
+                        future=asyncio.get_running_loop().create_future(), cost=self.cost_model.estimate(file_asu))
+        self._register(job)
+        await self._enqueue(job)
+        self.job_counts["submitted"] += 1
+        logger.info(f"SCHEDULER: File .asu {file_asu.hash_sha256[:12]} ditambahkan ke antrian sebagai {job.job_id} "
+                    f"(target: {target_tempik_id}, estimasi CPU {job.cost.cpu_seconds:.3f}s, memori {job.cost.peak_memory_bytes} B).")
+        return job
+
+    def submit_many(self, file_asus: List[FileASU], target_tempik_id: Optional[int] = None) -> List['JobHandle']:
+        """Enqueue banyak job sekaligus tanpa await: scheduler loop tidak melihat batch setengah jadi."""
+        loop = asyncio.get_running_loop()
+        jobs = [JobHandle(job_id=f"job-{next(self._job_counter):06d}", file_asu=file_asu, target_tempik_id=target_tempik_id,
+                          future=loop.create_future(), cost=self.cost_model.estimate(file_asu)) for file_asu in file_asus]
+        for job in jobs:
+            self._register(job)
+            self.task_queue.put_nowait(self._queue_item(job))
+        self.job_counts["submitted"] += len(jobs)
+        return jobs
+
+    def _register(self, job: 'JobHandle'):
+        self.jobs[job.job_id] = job
+        job.events.append("status", status=job.status)
+        while len(self.jobs) > self.job_history_capacity:
+            oldest = next(iter(self.jobs.values()))
+            if not oldest.future.done():
+                break # Job yang belum selesai tidak pernah dibuang
+            self.jobs.popitem(last=False)
+
+    def delegation_blocked_reason(self, tempik: Tempik, long_job: bool) -> Optional[str]:
+        """None jika sub-job yang ditunggu Tempik ini bisa mendapat Tempik lain, selain itu alasan penolakannya.
+        Tempik yang menunggu tetap BUSY; tanpa Tempik lain yang suatu saat bebas, sub-job antre selamanya."""
+        available = sum(1 for t in self.tempik_pool
+                        if t.tempik_id != tempik.tempik_id and not self.delegation_waiters[t.tempik_id] and t.service is None)
+        needed = 1 + (self.short_job_reserved_tempiks if long_job else 0) # Job panjang tidak boleh memakai Tempik cadangan
+        if available < needed:
+            return (f"hanya {available} Tempik lain yang bisa menjalankan sub-job (perlu {needed}); "
+                    f"Tempik lain sedang menunggu delegasi atau melayani SERVICE")
+        return None
+
+    def cancel(self, job: 'JobHandle') -> bool:
+        """Batalkan job: yang masih antre langsung selesai 'cancelled' (dilewati saat keluar antrian),
+        yang sedang berjalan di-HALT lewat interrupt Tempik-nya. Sub-job DELEGATE_TO-nya ikut dibatalkan."""
+        if job.future.done():
+            return False
+        job.cancelled = True
+        for child in [j for j in self.jobs.values() if j.parent_job_id == job.job_id and not j.future.done()]:
+            self.cancel(child) # Membangunkan induk yang sedang menunggu sub-job ini
+        if job.service is not None:
+            job.service.stop("cancelled")
+        elif job.status == "running" and job.tempik_id is not None:
+            self.parent_executor.tempik_by_id[job.tempik_id].interrupt_controller.raise_interrupt(
+                InterruptType.HALT_REQUESTED, details={"reason": f"{job.job_id} dibatalkan"})
+        else:
+            self._finish(job, {"status": "cancelled", "job_id": job.job_id, "tempik_id": None, "exported_data": {}})
+        return True
+
+    def _finish(self, job: 'JobHandle', result: Dict[str, Any]):
+        job.status = result["status"]
+        job.result = result
+        self.job_counts[job.status] += 1
+        job.events.append("status", status=job.status)
+        job.events.close()
+        if not job.future.done():
+            job.future.set_result(result)
+
+    def _queue_item(self, job: 'JobHandle') -> Tuple[float, int, 'JobHandle']:
+        priority = job.submitted_at + min(job.cost.cpu_seconds, SCHEDULER_PRIORITY_CAP_S)
+        return (priority, next(self._queue_seq), job)
+
+    async def _enqueue(self, job: 'JobHandle'):
+        await self.task_queue.put(self._queue_item(job))
+
+    def _placement_allowed(self, job: 'JobHandle', idle_count: int) -> Optional[str]:
+        """None jika job boleh ditempatkan sekarang, selain itu alasan penundaan."""
+        if self.memory_reserved_bytes and self.memory_reserved_bytes + job.cost.peak_memory_bytes > self.memory_capacity_bytes:
+            return "memori"
+        if job.cost.cpu_seconds >= SCHEDULER_SHORT_JOB_S and idle_count <= self.short_job_reserved_tempiks:
+            return "Tempik cadangan job pendek"
+        if self.memory_reserved_bytes and any(d is not job and time.monotonic() - d.submitted_at > SCHEDULER_MAX_BACKFILL_WAIT_S
+                                              for d in self.deferred_jobs):
+            return "reservasi job tertunda" # Jangan backfill terus di depan job besar yang sudah lama menunggu
+        return None
+
+    async def _requeue_deferred(self):
+        deferred, self.deferred_jobs = self.deferred_jobs, []
+        for job in deferred:
+            await self._enqueue(job)
+
+    async def _run_job(self, tempik: Tempik, job: 'JobHandle'):
+        started = time.monotonic()
+        try:
+            result = await tempik.run(job.file_asu, job)
+        except Exception as e:
+            logger.error(f"SCHEDULER: {job.job_id} gagal di {tempik.tempik_id_str}: {e}", exc_info=True)
+            tempik.set_status(TempikStatus.FAILED)
+            result = {"status": TempikStatus.FAILED.value, "error": str(e), "job_id": job.job_id,
+                      "tempik_id": tempik.tempik_id, "exported_data": {}}
+        self.memory_reserved_bytes -= job.cost.peak_memory_bytes
+        if result["status"] == TempikStatus.COMPLETED.value and job.resume_checkpoint is None: # Runtime parsial tidak representatif
+            self.cost_model.record(job.file_asu.hash_sha256, time.monotonic() - started, tempik.virtual_fs.get_total_vfs_size())
+        if job.cancelled and result["status"] == TempikStatus.HALTED.value:
+            result = dict(result, status="cancelled")
+        self._finish(job, result)
+        tempik.set_status(TempikStatus.IDLE) # Hasil sudah dikumpulkan, Tempik boleh dijadwalkan lagi
+        await self._requeue_deferred()
 
     async def run_scheduler_loop(self):
         logger.info(f"SCHEDULER: Loop dimulai. Mengelola {len(self.tempik_pool)} Tempik.")
         while not self.parent_executor.is_shutting_down: # Loop utama scheduler
             try:
-                file_asu_to_run, target_tempik_id = await asyncio.wait_for(self.task_queue.get(), timeout=0.5) # Tunggu task baru
-                
+                _, _, job = await asyncio.wait_for(self.task_queue.get(), timeout=0.5) # Tunggu task baru (prioritas terkecil)
+                file_asu_to_run, target_tempik_id = job.file_asu, job.target_tempik_id
+                if job.cancelled: # Dibatalkan selagi antre; future sudah diselesaikan oleh cancel()
+                    self.task_queue.task_done()
+                    continue
+
+                idle_count = self.parent_executor.status_index.count(TempikStatus.IDLE)
+                deferral = self._placement_allowed(job, idle_count) if idle_count else None
+                if deferral:
+                    logger.debug(f"SCHEDULER: {job.job_id} ditunda ({deferral}); job berikutnya boleh backfill.")
+                    self.deferred_jobs.append(job)
+                    self.task_queue.task_done()
+                    continue
+
                 assigned_tempik: Optional[Tempik] = None
                 if target_tempik_id is not None: # Jika ada target spesifik
-                    tempik = next((t for t in self.tempik_pool if t.tempik_id == target_tempik_id), None)
+                    tempik = self.parent_executor.tempik_by_id.get(target_tempik_id)
                     if tempik and tempik.status == TempikStatus.IDLE:
                         assigned_tempik = tempik
                     else:
@@ -2767,12 +6760,16 @@ class Scheduler: # AUDIT POINT 1 (Multi-Tempik Scheduling)
                 if assigned_tempik:
                     logger.info(f"SCHEDULER: Menugaskan {file_asu_to_run.hash_sha256[:12]} ke {assigned_tempik.tempik_id_str}.")
                     self.tempik_assignment[assigned_tempik.tempik_id] = file_asu_to_run
+                    self.memory_reserved_bytes += job.cost.peak_memory_bytes # Dilepas di _run_job
                     assigned_tempik.set_status(TempikStatus.BUSY) # Tandai BUSY sebelum task dimulai
+                    job.status = "running"
+                    job.tempik_id = assigned_tempik.tempik_id
+                    job.events.append("status", status="running", tempik_id=job.tempik_id)
                     # Jalankan Tempik.run dalam task asyncio terpisah (non-blocking)
-                    asyncio.create_task(assigned_tempik.run(file_asu_to_run)) 
+                    asyncio.create_task(self._run_job(assigned_tempik, job))
                 else:
                     logger.warning(f"SCHEDULER: Tidak ada Tempik idle. Mengembalikan {file_asu_to_run.hash_sha256[:12]} ke antrian.")
-                    await self.task_queue.put((file_asu_to_run, target_tempik_id)) # Kembalikan ke antrian
+                    await self._enqueue(job) # Kembalikan ke antrian (prioritas tetap)
                 
                 self.task_queue.task_done()
 
@@ -2789,6 +6786,294 @@ class Scheduler: # AUDIT POINT 1 (Multi-Tempik Scheduling)
         logger.info("Scheduler CPU-bound executor shutdown.")
 
 
+# --- API HTTP job (submit, status, stream log/export, cancel) ---
+JOB_API_MAX_BODY_BYTES = int(os.environ.get("ASU_JOB_API_MAX_BODY_BYTES", 64 * 1024 * 1024))
+JOB_API_MAX_WAIT_S = 60.0 # Batas long-poll ?wait= dan jeda heartbeat stream event
+JOB_API_LIST_LIMIT = 100
+JOB_API_TOKEN_FILE = os.path.join(DEFAULT_STATE_DIR, "job_api.token") # Token bearer TCP yang dibuat otomatis (mode 0600)
+JOB_API_DEFAULT_SOCKET = os.path.join(DEFAULT_STATE_DIR, "job_api.sock")
+
+
+def _is_loopback_host(host: Optional[str]) -> bool:
+    if not host:
+        return False
+    if host.lower() == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host.strip("[]")).is_loopback
+    except ValueError:
+        return False
+
+
+class JobAPIServer: # AUDIT POINT 2, 12
+    """Server HTTP/1.1 lokal (TCP atau Unix socket) di event loop executor, untuk klien tanpa proses CLI sendiri.
+
+    Route:
+      POST /jobs                              body .asu mentah, atau JSON {"paths": [...]} -> 202 + item batch
+      GET  /jobs[?limit=N]                    job terbaru
+      GET  /jobs/<id>[?wait=S]                ringkasan job; long-poll sampai selesai atau S detik
+      GET  /jobs/<id>/events[?since=N&follow=1]  NDJSON chunked (status, log, export); follow = tunggu event baru
+      GET  /jobs/<id>/exports[/<name>]        daftar export, atau isi satu export di-stream per chunk
+      DELETE /jobs/<id>, POST /jobs/<id>/cancel  batalkan job
+      POST /jobs/<id>/call/<entry>[?timeout=S&export=<name>]  request ke job SERVICE, body JSON {"registers": {...}};
+                                              respons JSON (export hanya ukuran), atau isi satu export jika ?export=
+      GET  /status                            status agregat sistem
+    Hasil job tidak pernah dibuffer utuh ke satu respons JSON: exported_data hanya ukuran, isinya lewat /exports.
+
+    Keamanan: POST /jobs menjalankan kode di host, jadi setiap request harus lolos _authorize.
+      - TCP selalu memerlukan "Authorization: Bearer <token>"; tanpa token eksplisit dibuat token acak di
+        JOB_API_TOKEN_FILE (0600). Unix socket dibuat 0600; token hanya diperiksa jika dikonfigurasi.
+      - Host harus loopback (atau alamat bind eksplisit) dan Origin, jika ada, harus loopback: menolak
+        DNS rebinding dan POST lintas situs dari browser.
+      - {"paths": [...]} hanya diterima untuk file di bawah allowed_path_roots (default: tidak ada).
+    """
+    def __init__(self, executor: 'UTEKVirtualExecutor', host: str = "127.0.0.1", port: int = 0,
+                 unix_path: Optional[str] = None, token: Optional[str] = None,
+                 allowed_path_roots: Optional[List[str]] = None):
+        self.executor = executor
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+        self.token = token
+        self.token_file: Optional[str] = None # Diisi jika token dibuat otomatis
+        self.allowed_path_roots = [os.path.realpath(root) for root in (allowed_path_roots or [])]
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._writers: Set[asyncio.StreamWriter] = set()
+        self.stats = {"connections": 0, "requests": 0}
+
+    async def start(self) -> str:
+        """Mulai server; return alamatnya (URL http, atau unix:<path>)."""
+        if self.unix_path:
+            if os.path.lexists(self.unix_path):
+                if not stat.S_ISSOCK(os.lstat(self.unix_path).st_mode):
+                    raise FileExistsError(f"{self.unix_path} sudah ada dan bukan socket; tidak ditimpa.")
+                os.remove(self.unix_path) # Socket basi dari proses sebelumnya
+            self._server = await asyncio.start_unix_server(self._handle_connection, path=self.unix_path)
+            os.chmod(self.unix_path, 0o600) # Hanya user proses ini yang boleh connect
+            address = f"unix:{self.unix_path}"
+        else:
+            if not self.token:
+                self.token = secrets.token_urlsafe(32)
+                self.token_file = JOB_API_TOKEN_FILE
+                ensure_private_dir(os.path.dirname(self.token_file))
+                fd = os.open(self.token_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+                with os.fdopen(fd, "w") as f:
+                    f.write(self.token)
+                logger.info(f"JobAPIServer: token bearer dibuat di {self.token_file}")
+            self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+            self.port = self._server.sockets[0].getsockname()[1]
+            address = f"http://{self.host}:{self.port}"
+        logger.info(f"JobAPIServer: mendengarkan di {address}")
+        return address
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._writers):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+            if self.unix_path and os.path.exists(self.unix_path):
+                os.remove(self.unix_path)
+
+    @staticmethod
+    def _head(status: int, content_type: str, framing: str, keep_alive: bool) -> bytes:
+        return (f"HTTP/1.1 {status} {'OK' if status < 400 else 'Error'}\r\nContent-Type: {content_type}\r\n"
+                f"{framing}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n").encode("latin-1")
+
+    async def _send_json(self, writer: asyncio.StreamWriter, status: int, payload: Any, keep_alive: bool):
+        body = json.dumps(payload, default=str).encode()
+        writer.write(self._head(status, "application/json", f"Content-Length: {len(body)}", keep_alive) + body)
+        await writer.drain()
+
+    @staticmethod
+    async def _write_chunk(writer: asyncio.StreamWriter, data: Union[bytes, memoryview]):
+        writer.write(f"{len(data):x}\r\n".encode())
+        writer.write(data)
+        writer.write(b"\r\n")
+        await writer.drain() # Backpressure: klien lambat menahan producer, bukan menumpuk di buffer
+
+    async def _stream_events(self, writer: asyncio.StreamWriter, job: 'JobHandle', since: int, follow: bool, keep_alive: bool):
+        writer.write(self._head(200, "application/x-ndjson", "Transfer-Encoding: chunked", keep_alive))
+        log, seq = job.events, since
+        while True:
+            events = log.since(seq)
+            if events and events[0]["seq"] > seq: # Event lama sudah terbuang dari buffer
+                events.insert(0, {"seq": seq, "kind": "gap", "missed": events[0]["seq"] - seq})
+            if events:
+                await self._write_chunk(writer, "".join(json.dumps(e, default=str) + "\n" for e in events).encode())
+                seq = log.next_seq
+            if not follow or (log.closed and seq >= log.next_seq) or self.executor.is_shutting_down:
+                break
+            if not await log.wait(seq, JOB_API_MAX_WAIT_S):
+                await self._write_chunk(writer, b'{"kind": "heartbeat"}\n') # Jaga koneksi idle tetap hidup
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    async def _stream_export(self, writer: asyncio.StreamWriter, data: bytes, keep_alive: bool):
+        writer.write(self._head(200, "application/octet-stream", "Transfer-Encoding: chunked", keep_alive))
+        view = memoryview(data)
+        for offset in range(0, len(view), HTTP_STREAM_CHUNK_BYTES):
+            await self._write_chunk(writer, view[offset:offset + HTTP_STREAM_CHUNK_BYTES])
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    def _job_exports(self, job: 'JobHandle') -> Dict[str, bytes]:
+        if job.result is not None:
+            return job.result.get("exported_data", {})
+        if job.status == "running" and job.tempik_id is not None:
+            return self.executor.tempik_by_id[job.tempik_id].exported_data # Export yang sudah ada selagi job berjalan
+        return {}
+
+    def _authorize(self, headers: Dict[str, str]) -> Optional[Tuple[int, str]]:
+        """None jika request boleh diproses, selain itu (status HTTP, pesan error)."""
+        origin = headers.get("origin")
+        if origin is not None and not _is_loopback_host(urlsplit(origin).hostname):
+            return 403, "Origin tidak diizinkan"
+        if not self.unix_path:
+            host = urlsplit(f"//{headers.get('host', '')}").hostname
+            if not (_is_loopback_host(host) or (host and host == self.host.lower())):
+                return 403, "Host tidak diizinkan"
+        if self.token:
+            scheme, _, supplied = headers.get("authorization", "").partition(" ")
+            if scheme.lower() != "bearer" or not hmac.compare_digest(supplied.strip().encode(), self.token.encode()):
+                return 401, "Token bearer tidak valid"
+        return None
+
+    def _resolve_allowed_path(self, path: str) -> Optional[str]:
+        real_path = os.path.realpath(path)
+        for root in self.allowed_path_roots:
+            if os.path.commonpath([real_path, root]) == root:
+                return real_path
+        return None
+
+    async def _submit(self, headers: Dict[str, str], body: bytes) -> Tuple[int, Dict[str, Any]]:
+        if headers.get("content-type", "").startswith("application/json"):
+            data = json.loads(body)
+            paths = data.get("paths") if isinstance(data, dict) else None
+            if not isinstance(paths, list) or not all(isinstance(path, str) for path in paths):
+                return 400, {"error": "JSON body harus berisi 'paths': [string, ...]"}
+            if not self.allowed_path_roots:
+                return 403, {"error": "Submit lewat 'paths' dinonaktifkan (tidak ada direktori yang diizinkan)"}
+            resolved = [self._resolve_allowed_path(path) for path in paths]
+            denied = [path for path, real_path in zip(paths, resolved) if real_path is None]
+            if denied:
+                return 403, {"error": f"Path di luar direktori yang diizinkan: {denied}"}
+            sources: List[Union[str, bytes]] = resolved
+        else:
+            sources = [body]
+        target = headers.get("x-target-tempik")
+        batch = await self.executor.submit_batch(sources, int(target) if target else None)
+        return 202, {"batch_id": batch.batch_id, "items": batch.items}
+
+    async def _route(self, writer: asyncio.StreamWriter, method: str, target: str, headers: Dict[str, str],
+                     body: bytes, keep_alive: bool):
+        path, _, query = target.partition("?")
+        params = {key: values[-1] for key, values in parse_qs(query).items()}
+        parts = [unquote(part) for part in path.strip("/").split("/")]
+        jobs = self.executor.scheduler.jobs
+
+        if parts == ["status"] and method == "GET":
+            return await self._send_json(writer, 200, self.executor.get_sistem_status(), keep_alive)
+        if parts == ["jobs"] and method == "POST":
+            status, payload = await self._submit(headers, body)
+            return await self._send_json(writer, status, payload, keep_alive)
+        if parts == ["jobs"] and method == "GET":
+            limit = min(int(params.get("limit", JOB_API_LIST_LIMIT)), JOB_API_LIST_LIMIT)
+            recent = list(itertools.islice(reversed(jobs.values()), limit))
+            return await self._send_json(writer, 200, {"jobs": [job.to_summary() for job in recent]}, keep_alive)
+        if len(parts) < 2 or parts[0] != "jobs":
+            return await self._send_json(writer, 404, {"error": "not found"}, keep_alive)
+
+        job = jobs.get(parts[1])
+        if job is None:
+            return await self._send_json(writer, 404, {"error": f"Job {parts[1]} tidak dikenal."}, keep_alive)
+        action = parts[2:]
+        if not action and method == "GET":
+            wait = min(float(params.get("wait", 0)), JOB_API_MAX_WAIT_S)
+            if wait > 0 and not job.future.done():
+                try:
+                    await asyncio.wait_for(asyncio.shield(job.future), wait) # shield: timeout tidak membatalkan job
+                except asyncio.TimeoutError:
+                    pass
+            return await self._send_json(writer, 200, job.to_summary(), keep_alive)
+        if (not action and method == "DELETE") or (action == ["cancel"] and method == "POST"):
+            cancelled = self.executor.cancel_job(job.job_id)
+            return await self._send_json(writer, 202 if cancelled else 409,
+                                         {"job_id": job.job_id, "cancelled": cancelled, "status": job.status}, keep_alive)
+        if len(action) == 2 and action[0] == "call" and method == "POST":
+            data = json.loads(body) if body else {}
+            registers = data.get("registers", {}) if isinstance(data, dict) else None
+            if not isinstance(registers, dict):
+                return await self._send_json(writer, 400, {"error": "JSON body harus berupa objek {\"registers\": {...}}"}, keep_alive)
+            timeout = min(float(params.get("timeout", JOB_API_MAX_WAIT_S)), JOB_API_MAX_WAIT_S)
+            response = await self.executor.call_service(job.job_id, action[1], registers, timeout)
+            exports = response.pop("exported_data", {})
+            if "export" in params:
+                if params["export"] not in exports:
+                    return await self._send_json(writer, 404, {"error": f"Export '{params['export']}' tidak ada."}, keep_alive)
+                return await self._stream_export(writer, exports[params["export"]], keep_alive)
+            response["exported_data"] = {name: len(data) for name, data in exports.items()}
+            return await self._send_json(writer, 200, response, keep_alive)
+        if action == ["events"] and method == "GET":
+            return await self._stream_events(writer, job, int(params.get("since", 0)),
+                                             params.get("follow") in ("1", "true"), keep_alive)
+        if action and action[0] == "exports" and method == "GET":
+            exports = self._job_exports(job)
+            if len(action) == 1:
+                return await self._send_json(writer, 200, {name: len(data) for name, data in exports.items()}, keep_alive)
+            name = "/".join(action[1:])
+            if name not in exports:
+                return await self._send_json(writer, 404, {"error": f"Export '{name}' tidak ada."}, keep_alive)
+            return await self._stream_export(writer, exports[name], keep_alive)
+        return await self._send_json(writer, 405 if action in ([], ["events"], ["cancel"]) else 404,
+                                     {"error": f"{method} {path} tidak didukung"}, keep_alive)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.stats["connections"] += 1
+        self._writers.add(writer)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line: break
+                method, target, version = request_line.decode("latin-1").split()
+                headers: Dict[str, str] = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""): break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                self.stats["requests"] += 1
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                denied = self._authorize(headers)
+                if denied:
+                    await self._send_json(writer, denied[0], {"error": denied[1]}, False)
+                    break
+                length = int(headers.get("content-length", 0))
+                if length > JOB_API_MAX_BODY_BYTES:
+                    await self._send_json(writer, 413, {"error": f"Body melebihi {JOB_API_MAX_BODY_BYTES} byte"}, False)
+                    break
+                body = await reader.readexactly(length)
+                try:
+                    await self._route(writer, method.upper(), target, headers, body, keep_alive)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    raise
+                except (ValueError, KeyError, RuntimeError) as e: # Parameter/body tidak valid, atau executor sedang shutdown
+                    await self._send_json(writer, 400, {"error": str(e)}, keep_alive)
+                except asyncio.TimeoutError:
+                    await self._send_json(writer, 504, {"error": "Timeout menunggu respons service"}, keep_alive)
+                except Exception as e: # Bug di handler tidak boleh memutus klien tanpa respons
+                    logger.error(f"JobAPIServer: error tak terduga pada {method} {target}: {e}", exc_info=True)
+                    await self._send_json(writer, 500, {"error": f"Internal error: {e}"}, False)
+                    break # State koneksi tidak pasti (respons mungkin sudah setengah terkirim)
+                if not keep_alive: break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+
 # --- UTEKVirtualExecutor (Refactored sebagai TempikManager/TempikFarm) ---
 # AUDIT POINT 2: UTEKVirtualExecutor sebagai TempikManager
 class UTEKVirtualExecutor:
@@ -2799,18 +7084,55 @@ class UTEKVirtualExecutor:
             
         self.num_tempik_engines = num_tempik_engines
         self.audit_logger = AuditLogger() 
+        # Cache key & hasil verifikasi signature dibagi semua Tempik (dibuat sebelum tempik_pool)
+        self.signature_cache = SignatureVerificationCache()
+        self.key_store = KeyStore() # Key pair RSA bersama semua Tempik (ENCRYPT/DECRYPT/SIGN default)
+        self.profiler = Profiler("executor") # Latensi verifikasi saat parse .asu
+        self.git_mirror_cache = GitMirrorCache() # Mirror bare FETCH_REPO di disk lokal, dibagi semua Tempik
+        self.http_client = AsyncHTTPClient() # Pool koneksi keep-alive INVOKE_REMOTE/PUSH_RESULT, dibagi semua Tempik
+        self.api_server: Optional[JobAPIServer] = None # Lihat start_api_server
+        # Whitelist host untuk networking_mode "restricted" (pola fnmatch, dipisah koma); kosong = semua host.
+        # Repo lokal (path host / file://) hanya jika whitelist memuat "file://"
+        self.network_allowed_hosts = [h.strip() for h in os.environ.get("ASU_NETWORK_ALLOWED_HOSTS", "").split(",") if h.strip()]
+        self.checkpoint_dir = DEFAULT_CHECKPOINT_DIR
+        self.checkpoint_interval_s = DEFAULT_CHECKPOINT_INTERVAL_S # Checkpoint periodik tiap job (0 = nonaktif)
+        self.service_concurrency = DEFAULT_SERVICE_CONCURRENCY # Konteks request paralel per Tempik SERVICE
+        self.service_queue_depth = DEFAULT_SERVICE_QUEUE_DEPTH
+        self.service_idle_timeout_s = DEFAULT_SERVICE_IDLE_TIMEOUT_S
         
         # AUDIT POINT 8: Isolasi sudah ditangani di Tempik (tiap Tempik punya VFS & Context sendiri)
         self.tempik_pool: List[Tempik] = [Tempik(i, self.audit_logger, self) for i in range(num_tempik_engines)]
+        self.tempik_by_id: Dict[int, Tempik] = {t.tempik_id: t for t in self.tempik_pool}
+        # Perubahan lifecycle Tempik dikumpulkan lalu diproses sekali per putaran event loop (status terakhir menang)
+        self._pending_status_changes: Dict[int, TempikStatus] = {}
+        self._status_flush_scheduled = False
+        self.status_index = TempikStatusIndex(self.tempik_pool) # Counter status, diperbarui tiap transisi lifecycle
+        self.cost_model = JobCostModel() # Estimasi biaya job untuk prioritas & penempatan Scheduler
+        self.started_at = time.time()
         self.scheduler = Scheduler(self.tempik_pool, self)
         
         self.locked_executions: Set[str] = set() 
         self.global_private_key_for_signing_pem: Optional[bytes] = None # Untuk menandatangani .asu yang dibuat
         self.global_public_key_for_verification_pem: Optional[bytes] = None # Untuk verifikasi .asu yang diterima
         self.crypto_engine_for_asu_mgnt = CryptoEngine() # Untuk sign/verify .asu oleh executor
+        self.asu_verifier = SecurityModule(ExecutionContextManager("verifier"), self.crypto_engine_for_asu_mgnt,
+                                           signature_cache=self.signature_cache, profiler=self.profiler)
 
         self.is_shutting_down = False
-        self.event_listeners: Dict[str, List[Callable]] = {} # AUDIT POINT 6 (event listener global)
+        self.event_bus = EventBus("executor") # AUDIT POINT 6 (event listener global)
+
+        # Cache hasil parse .asu (key: sha256 konten mentah), dipakai juga oleh DELEGATE_TO
+        self.parse_cache: "OrderedDict[str, FileASU]" = OrderedDict()
+        self.parse_cache_capacity = 256
+        self._batch_counter = itertools.count(1)
+
+        # Backend EXECUTE dipakai bersama semua Tempik; urutan = prioritas (lihat ExecuteBackend.supports)
+        self.python_worker_pool = PythonWorkerPool()
+        self.execute_backends: List[ExecuteBackend] = [self.python_worker_pool, ColdSubprocessBackend()]
+        self.build_cache = BuildCache() # Artefak COMPILE di disk lokal, dipakai bersama semua Tempik
+        self.dependency_cache = DependencyCache() # Environment INSTALL prebuilt, dipakai bersama semua Tempik
+        # EXPORT ke host path hanya diizinkan di bawah direktori ini
+        self.host_export_dir = os.path.abspath(os.environ.get("ASU_EXPORT_DIR", "asu_exports"))
 
         # AUDIT POINT 12: Bootloader / Entry Point Executor (CLI/API akan menggunakan metode di kelas ini)
         logger.info(f"UTEKVirtualExecutor (TempikManager) initialized with {num_tempik_engines} Tempik engines.")
@@ -2821,6 +7143,7 @@ class UTEKVirtualExecutor:
             with open(private_key_path, 'rb') as f:
                 self.global_private_key_for_signing_pem = f.read()
                 self.crypto_engine_for_asu_mgnt.load_private_key(self.global_private_key_for_signing_pem)
+                self.key_store.load_private_pem(self.global_private_key_for_signing_pem, set_default=True)
             logger.info(f"Global private key untuk signing .asu di-load dari {private_key_path}.")
         
         if public_key_path and os.path.exists(public_key_path):
@@ -2831,16 +7154,36 @@ class UTEKVirtualExecutor:
             logger.info(f"Global public key untuk verifikasi .asu di-load dari {public_key_path}.")
 
 
+    def resolve_host_export_path(self, target: str) -> str:
+        """Resolve target EXPORT host ('./x' relatif ke host_export_dir). Path di luar host_export_dir ditolak."""
+        base = os.path.realpath(self.host_export_dir)
+        candidate = os.path.realpath(target if os.path.isabs(target) else os.path.join(base, target))
+        if os.path.commonpath([base, candidate]) != base:
+            raise PermissionError(f"Target EXPORT '{target}' di luar direktori ekspor host {base}.")
+        return candidate
+
     def parse_asu_file(self, file_path: str) -> FileASU: # AUDIT POINT 10 (load_from_file)
+        return self.parse_asu_bytes(self._read_asu_file(file_path), source=file_path)
+
+    @staticmethod
+    def _read_asu_file(file_path: str) -> bytes:
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"File .asu tidak ditemukan: {file_path}")
         if not file_path.endswith('.asu'):
             raise ValueError("File harus memiliki ekstensi .asu")
+        with open(file_path, 'rb') as f:
+            return f.read() # Baca seluruh file dulu untuk validasi ukuran
+
+    def parse_asu_bytes(self, raw_data: bytes, source: str = "<bytes>", verify_signature: bool = True) -> FileASU:
+        """Parse konten .asu mentah (dari disk atau VFS). Hasil di-cache per hash konten mentah.
+        verify_signature=False dipakai batch verify; hasilnya tidak masuk parse_cache karena belum diverifikasi."""
+        cache_key = hashlib.sha256(raw_data).hexdigest()
+        cached = self.parse_cache.get(cache_key)
+        if cached is not None:
+            self.parse_cache.move_to_end(cache_key)
+            return cached
 
         try:
-            with open(file_path, 'rb') as f:
-                raw_data = f.read() # Baca seluruh file dulu untuk validasi ukuran
-            
             # AUDIT POINT 9: Validasi Ukuran Maksimum .asu (sebelum dekompresi)
             # Header belum bisa dibaca untuk max_size sebelum dekompresi.
             # Ini adalah batasan. Validasi ukuran sebenarnya dilakukan setelah dekompresi
@@ -2851,15 +7194,18 @@ class UTEKVirtualExecutor:
 
             data = b''
             compression_type = "none"
-            if raw_data.startswith(b'\x1f\x8b'):  # gzip
-                data = gzip.decompress(raw_data)
-                compression_type = "gzip"
-            elif raw_data.startswith(b'\x04\x22\x4d\x18'):  # lz4
-                data = lz4.frame.decompress(raw_data)
-                compression_type = "lz4"
-            else: data = raw_data 
-            
-            content = json.loads(data.decode('utf-8'))
+            if ASUFrameContainer.is_container(raw_data): # Multi-frame (zstd / lz4-frames)
+                content, content_size, compression_type = self._parse_asu_container(raw_data)
+            else:
+                if raw_data.startswith(b'\x1f\x8b'):  # gzip
+                    data = gzip.decompress(raw_data)
+                    compression_type = "gzip"
+                elif raw_data.startswith(b'\x04\x22\x4d\x18'):  # lz4
+                    data = lz4.frame.decompress(raw_data)
+                    compression_type = "lz4"
+                else: data = raw_data
+                content = json.loads(data.decode('utf-8'))
+                content_size = len(data)
             
             if 'header' not in content or 'body' not in content:
                 raise ValueError("Struktur file .asu tidak valid - header dan body diperlukan")
@@ -2868,8 +7214,8 @@ class UTEKVirtualExecutor:
 
             # AUDIT POINT 9: Validasi ukuran dekompresi terhadap header.max_size
             max_size_bytes_from_header = header.get_max_size_bytes()
-            if len(data) > max_size_bytes_from_header:
-                raise ValueError(f"Ukuran konten .asu ({len(data)} bytes) melebihi batas max_size di header ({max_size_bytes_from_header} bytes).")
+            if content_size > max_size_bytes_from_header:
+                raise ValueError(f"Ukuran konten .asu ({content_size} bytes) melebihi batas max_size di header ({max_size_bytes_from_header} bytes).")
 
             # Konsistensi info kompresi
             if header.compression_info != compression_type and header.compression_info != "none" and compression_type != "none":
@@ -2891,32 +7237,187 @@ class UTEKVirtualExecutor:
             file_asu = FileASU(header=header, body=body_instructions, virtual_fs_structure=vfs_structure_from_body)
             file_asu.generate_hash() # Hitung hash konten (tanpa signature di header)
             
+            if not verify_signature:
+                return file_asu
+
             # Verifikasi signature jika ada (AUDIT POINT 13)
             if file_asu.header.checksum_signature and self.global_public_key_for_verification_pem:
-                temp_security_module = SecurityModule(ExecutionContextManager("verifier"), self.crypto_engine_for_asu_mgnt)
-                if not temp_security_module.verify_asu_signature(file_asu, self.global_public_key_for_verification_pem):
+                if not self.asu_verifier.verify_asu_signature(file_asu, self.global_public_key_for_verification_pem):
                     raise InvalidSignature("Verifikasi signature file .asu GAGAL saat parsing.")
-                logger.info(f"Signature file .asu {file_path} berhasil diverifikasi.")
+                logger.info(f"Signature file .asu {source} berhasil diverifikasi.")
             elif file_asu.header.checksum_signature:
-                logger.warning(f"File .asu {file_path} punya signature tapi tidak ada global public key untuk verifikasi.")
-
+                logger.warning(f"File .asu {source} punya signature tapi tidak ada global public key untuk verifikasi.")
 
+            self.parse_cache[cache_key] = file_asu
+            if len(self.parse_cache) > self.parse_cache_capacity:
+                self.parse_cache.popitem(last=False)
             return file_asu
             
         except json.JSONDecodeError as e:
             raise ValueError(f"Format JSON tidak valid dalam file .asu: {e}")
         except InvalidSignature as ise:
-            logger.error(f"Error parsing file .asu '{file_path}': Signature tidak valid. {ise}")
+            logger.error(f"Error parsing file .asu '{source}': Signature tidak valid. {ise}")
             raise
         except Exception as e:
-            logger.error(f"Error parsing file .asu '{file_path}': {e}", exc_info=True)
+            logger.error(f"Error parsing file .asu '{source}': {e}", exc_info=True)
             raise RuntimeError(f"Error parsing file .asu: {e}")
     
+    async def verify_asu_files_batch(self, file_paths: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Verifikasi signature banyak file .asu yang antre secara paralel (thread pool).
+        Hasil sukses masuk signature_cache, jadi parse/eksekusi berikutnya tidak mengulang verifikasi RSA."""
+        results: Dict[str, Dict[str, Any]] = {}
+        parsed: List[Tuple[str, FileASU]] = []
+        for path in file_paths:
+            try:
+                with open(path, 'rb') as f:
+                    raw_data = f.read()
+                file_asu = await asyncio.to_thread(self.parse_asu_bytes, raw_data, path, False)
+            except Exception as e:
+                results[path] = {"status": "failed", "error": str(e)}
+                continue
+            if not file_asu.header.checksum_signature:
+                results[path] = {"status": "unsigned", "file_hash": file_asu.hash_sha256}
+            else:
+                parsed.append((path, file_asu))
+
+        if parsed and not self.global_public_key_for_verification_pem:
+            for path, file_asu in parsed:
+                results[path] = {"status": "failed", "error": "Global public key untuk verifikasi belum di-load."}
+            parsed = []
+        if parsed:
+            start_time = time.perf_counter()
+            verdicts = await asyncio.to_thread(self.asu_verifier.verify_asu_signatures_batch,
+                                               [fa for _, fa in parsed], self.global_public_key_for_verification_pem)
+            for (path, file_asu), is_valid in zip(parsed, verdicts):
+                results[path] = ({"status": "verified", "file_hash": file_asu.hash_sha256} if is_valid
+                                 else {"status": "failed", "error": "Signature tidak valid."})
+            logger.info(f"Batch verify {len(parsed)} file .asu selesai dalam {(time.perf_counter() - start_time) * 1000:.1f} ms.")
+        return {path: results[path] for path in file_paths if path in results}
+
+    def _parse_batch_chunk(self, chunk: List[Tuple[int, Union[str, bytes]]]) -> List[Tuple[int, Optional[str], Any, bool]]:
+        """Worker submit_batch: baca + parse satu potong sumber tanpa verifikasi signature.
+        Return (index, key parse_cache, FileASU atau Exception, dari_cache) per sumber."""
+        parsed = []
+        for index, source in chunk:
+            cache_key = None
+            try:
+                raw_data = self._read_asu_file(source) if isinstance(source, str) else source
+                cache_key = hashlib.sha256(raw_data).hexdigest()
+                cached = self.parse_cache.get(cache_key) # Hanya dibaca di thread; ditulis di event loop
+                if cached is not None:
+                    parsed.append((index, cache_key, cached, True))
+                else:
+                    label = source if isinstance(source, str) else f"<bytes#{index}>"
+                    parsed.append((index, cache_key, self.parse_asu_bytes(raw_data, label, False), False))
+            except Exception as e:
+                parsed.append((index, cache_key, e, False))
+        return parsed
+
+    async def submit_batch(self, sources: List[Union[str, bytes]], target_tempik_id: Optional[int] = None) -> BatchHandle:
+        """Submit banyak .asu (path atau bytes) sekaligus: parse paralel di thread pool, verifikasi signature batch,
+        dedupe per hash konten, lalu enqueue atomik (tanpa titik await di antara job). Return satu BatchHandle."""
+        if self.is_shutting_down:
+            raise RuntimeError("UTEK sedang shutdown, tidak menerima batch baru.")
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        pool = self.scheduler.cpu_bound_executor
+        indexed = list(enumerate(sources))
+        chunk_size = max(1, -(-len(indexed) // ((os.cpu_count() or 1) * 4))) # Beberapa potong per worker untuk load balancing
+        chunks = [indexed[i:i + chunk_size] for i in range(0, len(indexed), chunk_size)]
+        parsed = [entry for part in await asyncio.gather(*(loop.run_in_executor(pool, self._parse_batch_chunk, chunk)
+                                                           for chunk in chunks)) for entry in part]
+
+        items = [{"source": source if isinstance(source, str) else f"<bytes#{index}>", "status": "failed",
+                  "job_id": None, "file_hash": None, "error": None} for index, source in indexed]
+        unique: "OrderedDict[str, FileASU]" = OrderedDict() # hash konten -> FileASU (urut kemunculan pertama)
+        to_verify: Dict[str, Tuple[FileASU, str]] = {}
+        for index, cache_key, outcome, from_cache in sorted(parsed, key=lambda entry: entry[0]):
+            if isinstance(outcome, Exception):
+                items[index]["error"] = str(outcome)
+                continue
+            items[index]["file_hash"] = outcome.hash_sha256
+            unique.setdefault(outcome.hash_sha256, outcome)
+            if not from_cache and outcome.hash_sha256 not in to_verify:
+                to_verify[outcome.hash_sha256] = (outcome, cache_key)
+
+        # Verifikasi signature sekali per hash konten, paralel (AUDIT POINT 13); yang lolos masuk parse_cache
+        rejected: Dict[str, str] = {}
+        signed = [(fa, key) for fa, key in to_verify.values() if fa.header.checksum_signature]
+        if signed and self.global_public_key_for_verification_pem:
+            verdicts = await asyncio.to_thread(self.asu_verifier.verify_asu_signatures_batch, [fa for fa, _ in signed],
+                                               self.global_public_key_for_verification_pem)
+            for (file_asu, _), is_valid in zip(signed, verdicts):
+                if not is_valid: rejected[file_asu.hash_sha256] = "Signature tidak valid."
+        elif signed:
+            logger.warning(f"{len(signed)} file .asu di batch punya signature tapi tidak ada global public key untuk verifikasi.")
+        for file_hash, (file_asu, cache_key) in to_verify.items():
+            if file_hash not in rejected and cache_key:
+                self.parse_cache[cache_key] = file_asu
+        while len(self.parse_cache) > self.parse_cache_capacity:
+            self.parse_cache.popitem(last=False)
+        for file_hash in unique:
+            if file_hash in self.locked_executions:
+                rejected[file_hash] = "Execution locked."
+        for file_hash in rejected:
+            del unique[file_hash]
+
+        jobs = dict(zip(unique, self.scheduler.submit_many(list(unique.values()), target_tempik_id)))
+        seen: Set[str] = set()
+        for item in items:
+            file_hash = item["file_hash"]
+            if file_hash is None:
+                continue
+            if file_hash in rejected:
+                item["error"] = rejected[file_hash]
+                continue
+            item["job_id"] = jobs[file_hash].job_id
+            item["status"] = "duplicate" if file_hash in seen else "queued"
+            seen.add(file_hash)
+
+        batch = BatchHandle(batch_id=f"batch-{next(self._batch_counter):06d}", items=items, jobs=jobs)
+        logger.info(f"{batch.batch_id}: {len(sources)} sumber -> {len(jobs)} job di-enqueue "
+                    f"({sum(1 for item in items if item['status'] == 'failed')} gagal) "
+                    f"dalam {(time.perf_counter() - started) * 1000:.1f} ms.")
+        return batch
+
+    def _parse_asu_container(self, raw_data: bytes) -> Tuple[Dict[str, Any], int, str]:
+        """Decode kontainer multi-frame. Header didekode dulu agar max_size dicek sebelum body didekompresi."""
+        index = ASUFrameContainer.read_index(raw_data)
+        if 'header' not in index['sections'] or 'body' not in index['sections']:
+            raise ValueError("Struktur file .asu tidak valid - header dan body diperlukan")
+        header_dict = json.loads(ASUFrameContainer.decode_sections(raw_data, ['header'], index=index)['header'])
+        content_size = sum(ASUFrameContainer.section_size(index, name) for name in index['sections'])
+        max_size_bytes = HeaderASU.from_dict(header_dict).get_max_size_bytes()
+        if content_size > max_size_bytes: # AUDIT POINT 9: ditolak tanpa mendekompresi body
+            raise ValueError(f"Ukuran konten .asu ({content_size} bytes) melebihi batas max_size di header ({max_size_bytes} bytes).")
+
+        sections = ASUFrameContainer.decode_sections(raw_data, [n for n in index['sections'] if n != 'header'], index=index)
+        main_sequence = json.loads(sections['body'])
+        if 'virtual_fs' in sections:
+            body: Union[List[Dict], Dict[str, Any]] = {"main_sequence": main_sequence,
+                                                       "virtual_fs": json.loads(sections['virtual_fs'])}
+        else:
+            body = main_sequence
+        compression_type = {codec: info for info, codec in ASU_FRAMED_CODECS.items()}.get(index['codec'], index['codec'])
+        return {"header": header_dict, "body": body}, content_size, compression_type
+
+    def read_asu_header(self, file_path: str) -> HeaderASU:
+        """Baca header saja. Untuk kontainer multi-frame hanya frame header yang dibaca dari disk."""
+        with open(file_path, 'rb') as f:
+            is_container = ASUFrameContainer.is_container(f.read(len(ASU_FRAME_MAGIC)))
+        if is_container:
+            return HeaderASU.from_dict(json.loads(ASUFrameContainer.read_section_from_file(file_path, 'header')))
+        return self.parse_asu_file(file_path).header
+
     def create_asu_file(self, header: HeaderASU, instructions: List[InstruksiEksekusi], 
                         virtual_fs_structure: Optional[Dict[str,Any]] = None,
-                        output_dir: str = ".", sign_if_possible: bool = True) -> str: # AUDIT POINT 10 (save_to_file)
+                        output_dir: str = ".", sign_if_possible: bool = True,
+                        frame_size: int = DEFAULT_ASU_FRAME_SIZE) -> str: # AUDIT POINT 10 (save_to_file)
         
         file_asu = FileASU(header=header, body=instructions, virtual_fs_structure=virtual_fs_structure or {})
+        # Build info di-set sebelum hash/sign supaya ikut ter-sign (kalau di-set sesudahnya, verifikasi selalu gagal)
+        current_time_iso = datetime.now().isoformat()
+        file_asu.header.asu_build_info = f"build-date={current_time_iso}, asu-sdk=refactored-audit-v1"
         
         # AUDIT POINT 13: Signature signing
         if sign_if_possible and self.crypto_engine_for_asu_mgnt.private_key:
@@ -2928,9 +7429,6 @@ class UTEKVirtualExecutor:
         filename = f"{file_hash_for_name}.asu" 
         output_path = os.path.join(output_dir, filename)
         
-        current_time_iso = datetime.now().isoformat()
-        file_asu.header.asu_build_info = f"build-date={current_time_iso}, asu-sdk=refactored-audit-v1"
-        
         # Struktur body bisa jadi dict jika ada VFS
         body_content_for_json: Union[List[Dict], Dict[str, Any]]
         if file_asu.virtual_fs_structure:
@@ -2946,14 +7444,25 @@ class UTEKVirtualExecutor:
             "body": body_content_for_json
         }
 
-        json_data = json.dumps(content_to_serialize, indent=2, ensure_ascii=False, sort_keys=True)
-        
         compressed_data = b''
-        if header.compression_info == "gzip":
-            compressed_data = gzip.compress(json_data.encode('utf-8'))
-        elif header.compression_info == "lz4":
-            compressed_data = lz4.frame.compress(json_data.encode('utf-8'))
-        else: compressed_data = json_data.encode('utf-8')
+        level = header.compression_level
+        if header.compression_info in ASU_FRAMED_CODECS:
+            # Section terpisah supaya reader bisa membaca header tanpa mendekompresi body
+            sections = {
+                "header": json.dumps(content_to_serialize["header"], ensure_ascii=False, sort_keys=True).encode('utf-8'),
+                "body": json.dumps([instr.to_dict() for instr in file_asu.body], ensure_ascii=False, sort_keys=True).encode('utf-8'),
+            }
+            if file_asu.virtual_fs_structure:
+                sections["virtual_fs"] = json.dumps(file_asu.virtual_fs_structure, ensure_ascii=False, sort_keys=True).encode('utf-8')
+            compressed_data = ASUFrameContainer.encode(sections, ASU_FRAMED_CODECS[header.compression_info],
+                                                       level=level, frame_size=frame_size)
+        else:
+            json_data = json.dumps(content_to_serialize, indent=2, ensure_ascii=False, sort_keys=True)
+            if header.compression_info == "gzip":
+                compressed_data = gzip.compress(json_data.encode('utf-8'), compresslevel=level or 9)
+            elif header.compression_info == "lz4":
+                compressed_data = lz4.frame.compress(json_data.encode('utf-8'), compression_level=level or 0)
+            else: compressed_data = json_data.encode('utf-8')
         
         os.makedirs(output_dir, exist_ok=True)
         with open(output_path, 'wb') as f:
@@ -2980,6 +7489,82 @@ class UTEKVirtualExecutor:
             logger.error(f"Gagal mengirim file .asu {file_path} ke scheduler: {e}", exc_info=True)
             return {"status": "failed", "error": str(e)}
 
+    async def submit_child_job(self, file_asu: FileASU, parent_tempik: 'Tempik', input_params: Dict[str, Any],
+                               index: int = 0) -> 'JobHandle':
+        """Kirim sub-job DELEGATE_TO ke scheduler dengan env yang diwarisi dari Tempik induk."""
+        if self.is_shutting_down:
+            raise RuntimeError("UTEK sedang shutdown, tidak menerima sub-job baru.")
+        if file_asu.hash_sha256 in self.locked_executions:
+            raise RuntimeError(f"Eksekusi file {file_asu.hash_sha256} terkunci.")
+        parent_job = parent_tempik.current_job
+        inherited_env = dict(parent_tempik.execution_context_manager.env_vars)
+        inherited_env.update({str(k): str(v) for k, v in input_params.items()})
+        inherited_env["ASU_DELEGATION_INDEX"] = str(index)
+        if parent_job:
+            inherited_env["ASU_PARENT_JOB_ID"] = parent_job.job_id
+        return await self.scheduler.submit_task(file_asu, inherited_env=inherited_env,
+                                                parent_job_id=parent_job.job_id if parent_job else None)
+
+    async def save_checkpoint(self, job_id: str, data: bytes) -> str:
+        """Tulis checkpoint job ke checkpoint_dir secara atomik (checkpoint baru menimpa yang lama)."""
+        path = os.path.join(self.checkpoint_dir, f"{job_id}.ckpt")
+        def _write():
+            fd, tmp_path = tempfile.mkstemp(dir=ensure_private_dir(self.checkpoint_dir), prefix=f".{job_id}.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except BaseException:
+                try: os.remove(tmp_path)
+                except OSError: pass
+                raise
+        await asyncio.to_thread(_write)
+        return path
+
+    async def checkpoint_tempik(self, tempik_id: int, timeout: Optional[float] = None) -> bytes:
+        """Checkpoint on-demand job yang sedang berjalan di Tempik; return bytes checkpoint (juga disimpan ke disk)."""
+        return await asyncio.wait_for(self.tempik_by_id[tempik_id].request_checkpoint(), timeout)
+
+    async def resume_from_checkpoint(self, source: Union[str, bytes], target_tempik_id: Optional[int] = None) -> 'JobHandle':
+        """Lanjutkan job dari checkpoint (path atau bytes) di Tempik mana pun, juga dari proses lain."""
+        if self.is_shutting_down:
+            raise RuntimeError("UTEK sedang shutdown, tidak menerima job baru.")
+        if isinstance(source, str):
+            with open(source, "rb") as f:
+                source = f.read()
+        checkpoint = TempikCheckpoint.decode(source)
+        file_asu = checkpoint.to_file_asu()
+        if file_asu.hash_sha256 in self.locked_executions:
+            raise RuntimeError(f"Eksekusi file {file_asu.hash_sha256} terkunci.")
+        job = await self.scheduler.submit_task(file_asu, target_tempik_id, resume_checkpoint=checkpoint)
+        logger.info(f"Checkpoint {checkpoint.job_id} (PC {checkpoint.pc}) dilanjutkan sebagai {job.job_id}.")
+        return job
+
+    def cancel_job(self, job_id: str) -> bool:
+        """Batalkan job (antre atau berjalan). False jika job tidak dikenal atau sudah selesai."""
+        job = self.scheduler.jobs.get(job_id)
+        return job is not None and self.scheduler.cancel(job)
+
+    async def call_service(self, job_id: str, entry: str, registers: Optional[Dict[Any, int]] = None,
+                           timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Kirim request ke job SERVICE (menunggu init selesai jika perlu); return respons handler label `entry`."""
+        job = self.scheduler.jobs.get(job_id)
+        if job is None:
+            raise KeyError(f"Job {job_id} tidak dikenal.")
+        async def _call():
+            while job.service is None:
+                if job.future.done():
+                    raise RuntimeError(f"{job_id} bukan service yang aktif ({job.status}).")
+                await job.events.wait(job.events.next_seq) # Dibangunkan event "service ready" atau status akhir
+            return await job.service.submit(entry, registers)
+        return await asyncio.wait_for(_call(), timeout)
+
+    async def start_api_server(self, host: str = "127.0.0.1", port: int = 0, unix_path: Optional[str] = None,
+                               token: Optional[str] = None, allowed_path_roots: Optional[List[str]] = None) -> str:
+        """Jalankan JobAPIServer di event loop executor; ditutup saat shutdown. Return alamat server."""
+        self.api_server = JobAPIServer(self, host, port, unix_path, token, allowed_path_roots)
+        return await self.api_server.start()
+
     def lock_execution(self, file_hash: str):
         self.locked_executions.add(file_hash)
         logger.info(f"Eksekusi untuk file hash {file_hash} telah dikunci.")
@@ -2991,6 +7576,8 @@ class UTEKVirtualExecutor:
     async def start(self): # AUDIT POINT 1, 2, 12
         logger.info(f"UTEKVirtualExecutor (TempikManager) starting with {self.num_tempik_engines} Tempiks...")
         self.scheduler_task = asyncio.create_task(self.scheduler.run_scheduler_loop())
+        if PythonWorkerPool.is_supported():
+            await self.python_worker_pool.start() # Pre-fork worker Python sebelum job pertama datang
         logger.info("UTEKVirtualExecutor (TempikManager) started. Scheduler is running.")
 
     async def shutdown(self, reason: str = "Shutdown requested"): # AUDIT POINT 2
@@ -3010,6 +7597,8 @@ class UTEKVirtualExecutor:
         for tempik in self.tempik_pool:
             if tempik.status not in [TempikStatus.IDLE, TempikStatus.COMPLETED, TempikStatus.FAILED, TempikStatus.HALTED]:
                 logger.info(f"Requesting HALT for active {tempik.tempik_id_str}")
+                if tempik.service is not None:
+                    tempik.service.stop("shutdown")
                 # tempik.control_unit.halt_execution("UTEK Shutdown") # Ini bisa jadi sync
                 # Lebih baik trigger interrupt yang akan dihandle oleh loop Tempik jika masih jalan
                 tempik.interrupt_controller.raise_interrupt(InterruptType.HALT_REQUESTED, 
@@ -3019,54 +7608,109 @@ class UTEKVirtualExecutor:
         
         # Beri waktu untuk Tempik menyelesaikan/halt (opsional)
         # await asyncio.sleep(1) 
+
+        if self.api_server is not None:
+            await self.api_server.close()
+        for backend in self.execute_backends:
+            await backend.close()
+        await self.event_bus.close()
+        await self.http_client.close()
+        self.cost_model.save()
         
         logger.info("UTEKVirtualExecutor (TempikManager) shutdown complete.")
 
-    def get_sistem_status(self) -> Dict[str, Any]: # AUDIT POINT 2
-        tempik_statuses = [t.get_status_summary() for t in self.tempik_pool]
-        return {
+    def get_sistem_status(self, detail_limit: int = 0, detail_offset: int = 0,
+                          detail_status: Optional[TempikStatus] = None) -> Dict[str, Any]: # AUDIT POINT 2
+        """Snapshot agregat murah (counter dari TempikStatusIndex). Detail per-Tempik hanya jika detail_limit > 0,
+        sebagai satu halaman dari get_tempik_details (bisa difilter per status)."""
+        status = {
             "total_tempik_engines": self.num_tempik_engines,
+            "uptime_s": round(time.time() - self.started_at, 3),
+            "tempik_status_counts": self.status_index.counts(),
+            "status_transitions": self.status_index.transitions,
+            "jobs": dict(self.scheduler.job_counts),
             "scheduler_queue_size": self.scheduler.task_queue.qsize(),
-            "active_tempik_assignments": {tid: (f.hash_sha256[:12] if f else None) for tid, f in self.scheduler.tempik_assignment.items() if f},
+            "active_tempik_assignments": len(self.scheduler.tempik_assignment),
+            "scheduler_deferred_jobs": len(self.scheduler.deferred_jobs),
+            "scheduler_memory_reserved_bytes": self.scheduler.memory_reserved_bytes,
+            "scheduler_memory_capacity_bytes": self.scheduler.memory_capacity_bytes,
+            "job_cost_model": self.cost_model.get_stats(),
             "locked_executions_count": len(self.locked_executions),
             "is_shutting_down": self.is_shutting_down,
-            "tempik_details": tempik_statuses
+            "event_bus": self.event_bus.get_metrics(),
+            "git_mirror_cache": self.git_mirror_cache.get_stats(),
+            "dependency_cache": self.dependency_cache.get_stats(),
+            "http_client": self.http_client.get_stats(),
         }
+        if detail_limit > 0:
+            status["tempik_details"] = self.get_tempik_details(detail_offset, detail_limit, detail_status)
+        return status
+
+    def get_tempik_details(self, offset: int = 0, limit: int = 50, status: Optional[TempikStatus] = None) -> Dict[str, Any]:
+        """Satu halaman ringkasan per-Tempik (urut tempik_id), opsional hanya Tempik dengan status tertentu."""
+        offset, limit = max(0, offset), max(0, limit)
+        total, page_ids = self.status_index.page(offset, limit, status)
+        items = []
+        for tempik_id in page_ids:
+            summary = self.tempik_by_id[tempik_id].get_status_summary()
+            assigned = self.scheduler.tempik_assignment.get(tempik_id)
+            summary["assigned_file"] = assigned.hash_sha256[:12] if assigned else None
+            items.append(summary)
+        return {"total": total, "offset": offset, "limit": limit,
+                "status": status.value if status else None, "items": items}
 
     # AUDIT POINT 2: Notifikasi dari Tempik ke Manager
-    def notify_tempik_status_change(self, tempik_id: int, new_status: TempikStatus):
-        logger.debug(f"TempikManager: Tempik-{tempik_id:03d} status changed to {new_status.value}.")
-        if new_status in [TempikStatus.COMPLETED, TempikStatus.FAILED, TempikStatus.HALTED]:
-            # Jika Tempik selesai, kosongkan assignment di scheduler
-            if self.scheduler.tempik_assignment.get(tempik_id) is not None:
-                logger.info(f"TempikManager: Tempik-{tempik_id:03d} (assigned {self.scheduler.tempik_assignment[tempik_id].hash_sha256[:12] if self.scheduler.tempik_assignment[tempik_id] else 'N/A'}) is now free.")
-                self.scheduler.tempik_assignment[tempik_id] = None
-            # Set Tempik kembali ke IDLE agar bisa dijadwalkan lagi
-            tempik = next((t for t in self.tempik_pool if t.tempik_id == tempik_id), None)
-            if tempik and tempik.status != TempikStatus.IDLE: # Hindari rekursi jika sudah IDLE
-                tempik.set_status(TempikStatus.IDLE) # Ini akan log lagi, tapi OK.
+    def notify_tempik_status_change(self, tempik_id: int, new_status: TempikStatus, old_status: TempikStatus):
+        """Dipanggil Tempik.set_status untuk perubahan lifecycle saja. Counter status diperbarui langsung;
+        sisanya diproses terkumpul (coalesced): beberapa perubahan satu Tempik dalam satu putaran event loop
+        menjadi satu notifikasi status terakhir."""
+        self.status_index.transition(tempik_id, old_status, new_status)
+        self._pending_status_changes[tempik_id] = new_status
+        if self._status_flush_scheduled:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError: # Dipanggil di luar event loop (misal saat setup): proses langsung
+            self._flush_status_changes()
+            return
+        self._status_flush_scheduled = True
+        loop.call_soon(self._flush_status_changes)
+
+    def _flush_status_changes(self):
+        self._status_flush_scheduled = False
+        pending, self._pending_status_changes = self._pending_status_changes, {}
+        for tempik_id, new_status in pending.items():
+            logger.debug(f"TempikManager: Tempik-{tempik_id:03d} status changed to {new_status.value}.")
+            # Tempik selesai (atau sudah kembali IDLE dalam putaran yang sama): kosongkan assignment di scheduler.
+            # Tempik dikembalikan ke IDLE oleh Scheduler._run_job setelah hasil job dikumpulkan
+            if new_status in (TempikStatus.COMPLETED, TempikStatus.FAILED, TempikStatus.HALTED, TempikStatus.IDLE):
+                assigned = self.scheduler.tempik_assignment.pop(tempik_id, None)
+                if assigned is not None:
+                    logger.info(f"TempikManager: Tempik-{tempik_id:03d} (assigned {assigned.hash_sha256[:12]}) is now free.")
 
     # AUDIT POINT 6: Event bus global
-    def subscribe_to_event(self, event_type: str, callback: Callable):
-        self.event_listeners.setdefault(event_type, []).append(callback)
-        logger.info(f"Callback {callback.__name__} subscribed to event type '{event_type}'.")
+    def subscribe_to_event(self, event_type: str, callback: Callable, **options) -> EventSubscription:
+        """event_type boleh wildcard ('build.*'). options: max_queue, overflow, batch_size, batched (lihat EventBus.subscribe)."""
+        subscription = self.event_bus.subscribe(event_type, callback, **options)
+        logger.info(f"Callback {getattr(callback, '__name__', callback)} subscribed to event type '{event_type}'.")
+        return subscription
 
     def publish_event(self, source_id: str, event_type: str, event_data: Dict):
-        logger.info(f"Global Event Published by {source_id}: Type='{event_type}', Data={event_data}")
-        if event_type in self.event_listeners:
-            for callback in self.event_listeners[event_type]:
-                try:
-                    # Bisa async atau sync callback
-                    if asyncio.iscoroutinefunction(callback):
-                        asyncio.create_task(callback(source_id, event_type, event_data))
-                    else:
-                        callback(source_id, event_type, event_data)
-                except Exception as e:
-                    logger.error(f"Error in event listener for '{event_type}': {e}")
+        logger.debug(f"Global Event Published by {source_id}: Type='{event_type}', Data={event_data}")
+        self.event_bus.publish(source_id, event_type, event_data)
+        self._forward_external_signal(event_type, event_data)
+
+    async def publish_event_async(self, source_id: str, event_type: str, event_data: Dict):
+        """Dipakai EMIT_EVENT: subscriber dengan overflow='block' menahan Tempik pengirim (backpressure)."""
+        logger.debug(f"Global Event Published by {source_id}: Type='{event_type}', Data={event_data}")
+        await self.event_bus.publish_async(source_id, event_type, event_data)
+        self._forward_external_signal(event_type, event_data)
+
+    def _forward_external_signal(self, event_type: str, event_data: Dict):
         # AUDIT POINT 6: Jika event adalah sinyal eksternal untuk Tempik lain
         if event_type == InterruptType.EXTERNAL_SIGNAL.value and "target_tempik_id" in event_data:
             target_id = event_data["target_tempik_id"]
-            target_tempik = next((t for t in self.tempik_pool if t.tempik_id == target_id), None)
+            target_tempik = self.tempik_by_id.get(target_id)
             if target_tempik:
                 logger.info(f"Forwarding EXTERNAL_SIGNAL to Tempik-{target_id}.")
                 target_tempik.interrupt_controller.raise_interrupt(InterruptType.EXTERNAL_SIGNAL, details=event_data)
@@ -3122,16 +7766,30 @@ def create_sample_asu_file_audited(output_dir: str = ".", executor_ref_for_signi
 async def main_cli_audited(): # AUDIT POINT 12 (Bootloader/CLI)
     import argparse
     parser = argparse.ArgumentParser(description="UTEK Virtual 963-Tempik Executor (Audited & Refactored)")
-    parser.add_argument("command", choices=["run", "create", "validate", "status", "run_multiple"], help="Command to execute")
+    parser.add_argument("command", choices=["run", "create", "validate", "status", "run_multiple", "resume", "serve", "bench_network", "bench_policy"], help="Command to execute")
     parser.add_argument("--file", "-f", help="Path to .asu file for 'run' or 'validate'")
     parser.add_argument("--files", nargs='+', help="Paths to multiple .asu files for 'run_multiple'")
     parser.add_argument("--output_dir", "-o", default=".", help="Output directory for 'create'")
     parser.add_argument("--num_tempik", "-n", type=int, default=3, help="Number of Tempik engines (1-963)") # AUDIT POINT 1
     parser.add_argument("--private_key", help="Path to PEM private key for signing created .asu files.") # AUDIT POINT 13
     parser.add_argument("--public_key", help="Path to PEM public key for verifying received .asu files.") # AUDIT POINT 13
+    parser.add_argument("--detail_limit", type=int, default=16, help="Tempik details per status update (0 = aggregate only)") # AUDIT POINT 2
+    parser.add_argument("--detail_offset", type=int, default=0, help="Offset of the Tempik detail page")
+    parser.add_argument("--detail_status", choices=[s.value for s in TempikStatus], help="Only show Tempik details with this status")
+    parser.add_argument("--api_host", default="127.0.0.1", help="Bind address of the job API for 'serve'")
+    parser.add_argument("--api_port", type=int, help="Serve the job API on this TCP port (bearer token required) instead of the Unix socket")
+    parser.add_argument("--api_socket", help=f"Unix socket path of the job API for 'serve' (default {JOB_API_DEFAULT_SOCKET}, mode 0600)")
+    parser.add_argument("--api_allowed_dir", action="append", default=[], help="Allow job API 'paths' submissions under this host directory (repeatable)")
     
     args = parser.parse_args()
     
+    if args.command == "bench_network": # Benchmark klien HTTP ber-pool terhadap server loopback lokal
+        print(json.dumps(await benchmark_http_client(), indent=2))
+        return
+    if args.command == "bench_policy": # Overhead check_instruction_policy per instruksi, sebelum/sesudah compile
+        print(json.dumps(benchmark_security_policy(), indent=2))
+        return
+
     executor = UTEKVirtualExecutor(num_tempik_engines=args.num_tempik)
     executor.load_global_keys(private_key_path=args.private_key, public_key_path=args.public_key) # AUDIT POINT 13
     
@@ -3150,15 +7808,17 @@ async def main_cli_audited(): # AUDIT POINT 12 (Bootloader/CLI)
             result = await executor.execute_asu_file_async(args.file)
             print(f"Submission result: {result}")
         
+        elif args.command == "resume":
+            if not args.file: parser.error("--file (checkpoint) is required for 'resume' command.")
+            job = await executor.resume_from_checkpoint(args.file)
+            print(f"Resumed checkpoint {args.file} as {job.job_id}")
+
         elif args.command == "run_multiple": # AUDIT POINT 1
             if not args.files: parser.error("--files are required for 'run_multiple' command.")
-            submission_results = []
-            for file_path_multi in args.files:
-                print(f"Submitting .asu file for execution: {file_path_multi}")
-                result_multi = await executor.execute_asu_file_async(file_path_multi)
-                submission_results.append(result_multi)
-                print(f"Submission result for {file_path_multi}: {result_multi}")
-            print(f"\nAll multiple files submitted. Results: {submission_results}")
+            batch = await executor.submit_batch(args.files)
+            for item in batch.items:
+                print(f"Submission result for {item['source']}: {item['status']} {item['job_id'] or item['error']}")
+            print(f"\nAll multiple files submitted as {batch.batch_id}. Progress: {batch.progress()}")
 
 
         elif args.command == "validate": # AUDIT POINT 10 (validasi)
@@ -3175,20 +7835,31 @@ async def main_cli_audited(): # AUDIT POINT 12 (Bootloader/CLI)
         elif args.command == "status": # AUDIT POINT 2 (monitoring)
             pass # Status akan ditampilkan di loop di bawah
 
-        if args.command in ["run", "run_multiple", "status"]:
+        elif args.command == "serve": # Job API; klien submit/poll/stream lewat HTTP
+            unix_path = args.api_socket
+            if args.api_port is None and not unix_path:
+                unix_path = JOB_API_DEFAULT_SOCKET
+                ensure_private_dir(os.path.dirname(unix_path))
+            address = await executor.start_api_server(args.api_host, args.api_port or 0, unix_path,
+                                                      os.environ.get("ASU_JOB_API_TOKEN"), args.api_allowed_dir)
+            print(f"Job API listening on {address}")
+            if executor.api_server.token_file:
+                print(f"Bearer token written to {executor.api_server.token_file}")
+
+        if args.command in ["run", "run_multiple", "resume", "status", "serve"]:
             print("Executor running. Monitor logs or status. Press Ctrl+C to stop executor.")
             while not executor.is_shutting_down: 
                 await asyncio.sleep(5)
-                status_info = executor.get_sistem_status()
+                detail_status = TempikStatus(args.detail_status) if args.detail_status else None
+                status_info = executor.get_sistem_status(args.detail_limit, args.detail_offset, detail_status)
                 print("\n=== UTEK VIRTUAL SYSTEM STATUS (Update) ===")
                 print(json.dumps(status_info, indent=2, default=str)) # default=str untuk Enum, dll.
                 
                 # Cek apakah semua task selesai (jika bukan mode status murni)
-                if args.command != "status" and executor.scheduler.task_queue.empty():
-                    all_tempik_idle_or_done = all(
-                        t.status in [TempikStatus.IDLE, TempikStatus.COMPLETED, TempikStatus.FAILED, TempikStatus.HALTED] 
-                        for t in executor.tempik_pool
-                    )
+                if args.command not in ("status", "serve") and executor.scheduler.task_queue.empty():
+                    all_tempik_idle_or_done = executor.status_index.count(
+                        TempikStatus.IDLE, TempikStatus.COMPLETED, TempikStatus.FAILED, TempikStatus.HALTED
+                    ) == executor.num_tempik_engines
                     if all_tempik_idle_or_done:
                         logger.info("All tasks processed and Tempiks are idle/done. CLI will exit shortly.")
                         await asyncio.sleep(2) # Beri waktu untuk log terakhir
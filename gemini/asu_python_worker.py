@@ -0,0 +1,122 @@
+"""Worker Python hangat untuk EXECUTE .py, dipakai bersama oleh AsuGemini1 dan Claude/Utekv1.
+
+Dijalankan sebagai script: `python asu_python_worker.py [modul_preload ...]`. Interpreter (dan modul preload)
+start sekali saja; tiap request di-fork dari worker, jadi state script tidak bocor antar eksekusi dan RLIMIT
+diterapkan per eksekusi tanpa mematikan worker.
+
+Protokol: host -> worker = 4 byte panjang (big-endian) + JSON request (lihat encode_request).
+          worker -> host = 1 byte jenis (O=stdout, E=stderr, X=exit) + 4 byte panjang + payload.
+Hanya modul standar yang di-import di sini: host meng-import modul ini untuk konstanta dan helper protokol.
+"""
+import base64
+import json
+import os
+import selectors
+import struct
+import sys
+import traceback
+from typing import Any, Dict, Optional, Tuple
+
+WORKER_SCRIPT = os.path.abspath(__file__)
+OUTPUT_CHUNK_BYTES = 64 * 1024
+FRAME_HEADER_BYTES = 5
+FRAME_STDOUT, FRAME_STDERR, FRAME_EXIT = b"O", b"E", b"X"
+
+
+def encode_request(source: bytes, filename: str, cwd: str, args=(), env: Optional[Dict[str, str]] = None,
+                   sys_path=(), cpu_seconds: Optional[int] = None, memory_bytes: Optional[int] = None) -> bytes:
+    """Frame request host -> worker. Source dikirim sebagai bytes (base64): compile() di worker membaca
+    deklarasi encoding PEP 263 sendiri, jadi script non-UTF-8 tidak merusak worker."""
+    payload = json.dumps({
+        "source_b64": base64.b64encode(source).decode("ascii"), "filename": filename, "cwd": cwd,
+        "args": list(args), "env": env or {}, "sys_path": list(sys_path),
+        "cpu_seconds": cpu_seconds, "memory_bytes": memory_bytes,
+    }).encode("utf-8")
+    return struct.pack(">I", len(payload)) + payload
+
+
+def decode_frame_header(header: bytes) -> Tuple[bytes, int]:
+    """(jenis frame, panjang payload) dari FRAME_HEADER_BYTES byte header worker -> host."""
+    return header[:1], struct.unpack(">I", header[1:])[0]
+
+
+def _read_exact(stream, n: int) -> Optional[bytes]:
+    buf = b""
+    while len(buf) < n:
+        chunk = stream.read(n - len(buf))
+        if not chunk: return None
+        buf += chunk
+    return buf
+
+
+def _run_child(req: Dict[str, Any], w_out: int, w_err: int):
+    code = 1
+    try:
+        os.dup2(w_out, 1); os.dup2(w_err, 2)
+        import resource
+        if req.get("cpu_seconds"):
+            resource.setrlimit(resource.RLIMIT_CPU, (req["cpu_seconds"], req["cpu_seconds"]))
+        if req.get("memory_bytes"):
+            resource.setrlimit(resource.RLIMIT_AS, (req["memory_bytes"], req["memory_bytes"]))
+        os.chdir(req["cwd"])
+        env = req.get("env") or {}
+        os.environ.update(env)
+        extra_paths = list(req.get("sys_path") or []) + env.get("PYTHONPATH", "").split(os.pathsep)
+        for path in reversed(extra_paths): # Interpreter sudah start: PYTHONPATH tidak dibaca ulang
+            if path and path not in sys.path: sys.path.insert(0, path)
+        sys.argv = [req["filename"]] + list(req.get("args") or [])
+        code = 0
+        try:
+            exec(compile(base64.b64decode(req["source_b64"]), req["filename"], "exec"),
+                 {"__name__": "__main__", "__file__": req["filename"], "__builtins__": __builtins__})
+        except SystemExit as e:
+            if e.code is None: code = 0
+            elif isinstance(e.code, int): code = e.code
+            else: print(e.code, file=sys.stderr); code = 1
+        except BaseException:
+            traceback.print_exc(); code = 1
+    finally:
+        try: sys.stdout.flush(); sys.stderr.flush()
+        except Exception: pass
+        os._exit(code)
+
+
+def main():
+    sys.path[0] = "" # Seperti `python -c`: import relatif ke cwd eksekusi, bukan direktori worker ini
+    for module in sys.argv[1:]:
+        try: __import__(module)
+        except Exception: pass
+    proto_in = os.fdopen(os.dup(0), "rb", buffering=0)
+    proto_out = os.fdopen(os.dup(1), "wb", buffering=0)
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0); os.dup2(2, 1)
+
+    def _send(kind: bytes, payload: bytes):
+        proto_out.write(kind + struct.pack(">I", len(payload)) + payload)
+
+    while True:
+        header = _read_exact(proto_in, 4)
+        if header is None: break
+        req = json.loads(_read_exact(proto_in, struct.unpack(">I", header)[0]))
+        r_out, w_out = os.pipe(); r_err, w_err = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(r_out); os.close(r_err); proto_in.close(); proto_out.close()
+            _run_child(req, w_out, w_err)
+        os.close(w_out); os.close(w_err)
+        sel = selectors.DefaultSelector()
+        sel.register(r_out, selectors.EVENT_READ, FRAME_STDOUT); sel.register(r_err, selectors.EVENT_READ, FRAME_STDERR)
+        open_fds = 2
+        while open_fds:
+            for key, _ in sel.select():
+                data = os.read(key.fd, OUTPUT_CHUNK_BYTES)
+                if data: _send(key.data, data)
+                else: sel.unregister(key.fd); os.close(key.fd); open_fds -= 1
+        sel.close()
+        _, status = os.waitpid(pid, 0)
+        rc = -os.WTERMSIG(status) if os.WIFSIGNALED(status) else os.WEXITSTATUS(status)
+        _send(FRAME_EXIT, json.dumps({"returncode": rc}).encode())
+
+
+if __name__ == "__main__":
+    main()